@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Retrieval Benchmark for EhkoContextBuilder
+
+Builds synthetic Mirrorwell vaults (markdown files with the frontmatter and
+sections of _mirrorwell_template/Templates/reflection_template.md, indexed
+by the real EhkoIndexer), replays a labeled query log through
+search_reflections and reports latency percentiles, file reads per query
+and recall@k, for keyword-only and blended (semantic) ranking.
+
+Each query targets one synthetic topic. Five reflections are planted per
+topic: three that contain the query's words and two that only use the
+topic's other words, so recall@k shows both keyword matching and how much
+the semantic index recovers. Topic words also appear as noise in
+unrelated reflections.
+
+Vaults are written under --workdir and reused on later runs with the same
+size and seed. A query log from a real vault can be replayed with --db
+and --log (JSON lines: {"query": "...", "expected": [file paths or titles]}).
+
+Runs offline (no API usage). Blended ranking needs numpy.
+
+Usage:
+    cd "5.0 Scripts"
+    python benchmark_retrieval.py                          # 1k / 10k / 100k
+    python benchmark_retrieval.py --sizes 1000 10000 --k 5
+    python benchmark_retrieval.py --workdir ~/ehko_bench --json results.json
+    python benchmark_retrieval.py --db ehko_index.db --log queries.jsonl
+"""
+
+import argparse
+import json
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Ensure ehkoforge is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ehko_refresh import EhkoDatabase, EhkoIndexer
+from ehkoforge.llm import EhkoContextBuilder
+from ehkoforge.llm.context_builder import _read_preview
+from ehkoforge.metrics import percentile
+from ehkoforge.vector_index import NUMPY_AVAILABLE
+
+SIZES = [1000, 10000, 100000]
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tu", "sa", "vel", "or", "pi", "dan", "mu", "shi",
+             "ta", "bre", "gon", "fi", "nal", "ux", "zer", "hol"]
+EMOTIONS = ["sad", "hopeful", "angry", "calm", "anxious", "grateful", "lonely", "proud"]
+PILLARS = ["The Core", "The Compass", "The Web", "The Thread", "The Horizon", "The Divergent Mind"]
+QUERY_TEMPLATES = [
+    "I keep thinking about {a} and {b}",
+    "what did I write about {a} when {b} came up?",
+    "{a} {b} again today",
+    "remind me how the {b} and {a} stuff felt",
+]
+
+FILLER_WORDS = 5000
+"""Zipf-distributed background vocabulary."""
+
+TOPIC_WORDS = 8
+"""Words per topic; a query uses two of them."""
+
+PLANTED_KEYWORD = 3
+"""Reflections per topic containing both query words."""
+
+PLANTED_RELATED = 2
+"""Reflections per topic using only the topic's other words."""
+
+NOISE_RATE = 0.2
+"""Chance an unrelated reflection mentions one random topic word."""
+
+
+@dataclass
+class LabeledQuery:
+    """One query-log entry and the reflections that should come back."""
+    
+    text: str
+    expected: frozenset
+    """File paths (or titles) of the relevant reflections."""
+
+
+# =============================================================================
+# SYNTHETIC VAULT
+# =============================================================================
+
+def pseudo_words(count: int, rng: random.Random) -> List[str]:
+    words = set()
+    while len(words) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if len(word) >= 4:
+            words.add(word)
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def reflection_markdown(title: str, raw_input: str, context: str, rng: random.Random,
+                        tags: List[str], day: str) -> str:
+    """A reflection in the Mirrorwell template's shape."""
+    pillar = rng.choice(PILLARS) if rng.random() < 0.3 else None
+    return f"""---
+title: "{title}"
+vault: Mirrorwell
+type: reflection
+category: journaling
+status: active
+version: "1.2"
+created: {day}
+updated: {day}
+tags: {json.dumps(tags)}
+emotional_tags: {json.dumps(rng.sample(EMOTIONS, 2))}
+related: []
+source: internal
+confidence: 0.95
+revealed: true
+core_memory: {"true" if rng.random() < 0.02 else "false"}
+identity_pillar: {json.dumps(pillar)}
+---
+
+# {title}
+
+## 0. Raw Input (Preserved)
+{raw_input}
+
+---
+
+## 1. Context
+{context}
+
+---
+
+## 2. Observations
+Nothing unusual.
+
+---
+
+## 3. Reflection / Interpretation
+Still working through it.
+
+---
+
+## 4. Actions / Updates
+- Revisit next week
+
+---
+
+## 5. Cross-References
+- None yet
+
+---
+
+**Changelog**
+- v1.0 — {day} — Synthetic benchmark entry
+"""
+
+
+def build_vault(root: Path, size: int, seed: int = 7, vectors: bool = True,
+                queries: int = 200) -> List[LabeledQuery]:
+    """
+    Write and index a synthetic vault of `size` reflections under root.
+    
+    Reuses root if it already holds a vault built with the same size and
+    seed (root/vault.json records the query log).
+    
+    Returns:
+        The labeled query log (at most `queries` entries).
+    """
+    manifest = root / "vault.json"
+    if manifest.exists():
+        saved = json.loads(manifest.read_text(encoding="utf-8"))
+        if saved["size"] == size and saved["seed"] == seed and saved["vectors"] >= vectors:
+            return [LabeledQuery(q["query"], frozenset(q["expected"])) for q in saved["queries"]]
+    
+    rng = random.Random(seed)
+    topics = max(10, min(500, size // 50))
+    vocabulary = pseudo_words(FILLER_WORDS + topics * TOPIC_WORDS + 40, rng)
+    filler = vocabulary[:FILLER_WORDS]
+    weights = [1 / rank for rank in range(1, FILLER_WORDS + 1)]
+    topic_words = [vocabulary[FILLER_WORDS + t * TOPIC_WORDS:FILLER_WORDS + (t + 1) * TOPIC_WORDS]
+                   for t in range(topics)]
+    tag_pool = vocabulary[-40:]
+    
+    # Planted reflections take the first slots, topic by topic
+    plan = []
+    for words in topic_words:
+        query_words, others = words[:2], words[2:]
+        plan += [query_words + rng.sample(others, 2) for _ in range(PLANTED_KEYWORD)]
+        plan += [rng.sample(others, 4) for _ in range(PLANTED_RELATED)]
+    plan += [None] * max(0, size - len(plan))
+    plan = plan[:size]
+    
+    folder = root / "Mirrorwell" / "2_Reflection Library" / "2.1 Journals"
+    root.mkdir(parents=True, exist_ok=True)
+    db = EhkoDatabase(root / "ehko_index.db")
+    db.connect()
+    db.initialize_schema()
+    indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False,
+                          build_vectors=vectors)
+    
+    paths = []
+    start = time.perf_counter()
+    for i, planted in enumerate(plan):
+        words = rng.choices(filler, weights, k=70)
+        if planted:
+            words[10:10 + len(planted)] = planted
+        elif rng.random() < NOISE_RATE:
+            words[rng.randrange(10, 70)] = rng.choice(rng.choice(topic_words))
+        path = folder / f"{i // 1000:03d}" / f"reflection_{i:06d}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        day = f"{2023 + i % 3}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        path.write_text(reflection_markdown(
+            " ".join(words[:4]).capitalize(), " ".join(words[4:60]), " ".join(words[60:]),
+            rng, rng.sample(tag_pool, 2), day,
+        ), encoding="utf-8")
+        indexer.index_file(path, "Mirrorwell", {})
+        paths.append(str(path))
+        if i % 1000 == 999:
+            db.commit()
+    db.commit()
+    
+    if vectors and NUMPY_AVAILABLE:
+        indexer.refresh_vectors()
+    indexer.refresh_digests()
+    db.bump_generation()
+    db.close()
+    
+    log = []
+    per_topic = PLANTED_KEYWORD + PLANTED_RELATED
+    for t, words in enumerate(topic_words):
+        if t * per_topic + per_topic > size:
+            break
+        template = QUERY_TEMPLATES[t % len(QUERY_TEMPLATES)]
+        log.append(LabeledQuery(template.format(a=words[0], b=words[1]),
+                                frozenset(paths[t * per_topic:(t + 1) * per_topic])))
+    log = log[:queries]
+    
+    manifest.write_text(json.dumps({
+        "size": size,
+        "seed": seed,
+        "vectors": vectors and NUMPY_AVAILABLE,
+        "build_seconds": round(time.perf_counter() - start, 1),
+        "queries": [{"query": q.text, "expected": sorted(q.expected)} for q in log],
+    }), encoding="utf-8")
+    return log
+
+
+def load_query_log(path: Path) -> List[LabeledQuery]:
+    """JSON lines of {"query": str, "expected": [file path or title, ...]} (expected optional)."""
+    log = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            log.append(LabeledQuery(entry["query"], frozenset(entry.get("expected", []))))
+    return log
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+@contextmanager
+def count_file_reads() -> Iterator[List[int]]:
+    """Count Path.open calls (read_text / read_bytes go through it) in the block."""
+    reads = [0]
+    original = pathlib.Path.open
+    
+    def counting_open(self, *args, **kwargs):
+        reads[0] += 1
+        return original(self, *args, **kwargs)
+    
+    pathlib.Path.open = counting_open
+    try:
+        yield reads
+    finally:
+        pathlib.Path.open = original
+
+
+def replay(builder: EhkoContextBuilder, log: List[LabeledQuery], k: int = 10,
+           rounds: int = 1, cache: bool = False) -> Dict:
+    """
+    Run the query log through search_reflections and score it.
+    
+    Args:
+        builder: Context builder for the index under test.
+        log: Queries to replay, in order.
+        k: Results requested per query (recall@k).
+        rounds: Times to replay the whole log.
+        cache: Keep the search result cache between queries (off measures
+               the search itself).
+    
+    Returns:
+        Latency percentiles (ms), file reads per query and mean recall@k
+        (over queries that have expectations).
+    """
+    _read_preview.cache_clear()
+    latencies, recalls = [], []
+    with count_file_reads() as reads:
+        for _ in range(rounds):
+            for query in log:
+                if not cache:
+                    builder.clear_cache()
+                start = time.perf_counter()
+                matches = builder.search_reflections(query.text, limit=k)
+                latencies.append(time.perf_counter() - start)
+                if query.expected:
+                    found = sum(1 for m in matches
+                                if m.file_path in query.expected or m.title in query.expected)
+                    recalls.append(found / min(len(query.expected), k))
+    
+    ordered = sorted(latencies)
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "reads_per_query": round(reads[0] / len(latencies), 3) if latencies else 0.0,
+        "recall": round(sum(recalls) / len(recalls), 3) if recalls else None,
+    }
+
+
+def benchmark(db_path: Path, mirrorwell_root: Path, log: List[LabeledQuery], k: int,
+              rounds: int, cache: bool) -> Dict[str, Dict]:
+    """Replay `log` with keyword-only and (if available) blended ranking."""
+    results = {"keyword": replay(EhkoContextBuilder(db_path, mirrorwell_root, semantic=False),
+                                 log, k, rounds, cache)}
+    blended = EhkoContextBuilder(db_path, mirrorwell_root)
+    if blended._get_vector_index() is not None:
+        results["blended"] = replay(blended, log, k, rounds, cache)
+    return results
+
+
+def print_rows(label: str, results: Dict[str, Dict], k: int):
+    for mode, row in results.items():
+        recall = f"{row['recall']:.3f}" if row["recall"] is not None else "-"
+        print(f"{label:>8}  {mode:<8}{row['queries']:>8}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+              f"{row['p99_ms']:>9.2f}{row['reads_per_query']:>9.2f}{recall:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EhkoContextBuilder retrieval")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="Synthetic vault sizes (reflections)")
+    parser.add_argument("--k", type=int, default=10, help="Results per query (recall@k)")
+    parser.add_argument("--queries", type=int, default=200, help="Max queries per synthetic vault")
+    parser.add_argument("--rounds", type=int, default=1, help="Replays of the query log")
+    parser.add_argument("--cache", action="store_true", help="Keep the search result cache on")
+    parser.add_argument("--no-vectors", action="store_true", help="Skip the semantic index")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", type=Path, help="Where vaults are built / reused")
+    parser.add_argument("--db", type=Path, help="Replay --log against this existing index instead")
+    parser.add_argument("--log", type=Path, help="Query log (JSON lines) for --db")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+    
+    print("=" * 72)
+    print(f"Retrieval benchmark: recall@{args.k}, {args.rounds} round(s), "
+          f"result cache {'on' if args.cache else 'off'}")
+    print("=" * 72)
+    header = (f"{'vault':>8}  {'mode':<8}{'queries':>8}{'p50 ms':>9}{'p95 ms':>9}"
+              f"{'p99 ms':>9}{'reads/q':>9}{f'recall@{args.k}':>11}")
+    
+    all_results = {}
+    if args.db:
+        if not args.log:
+            parser.error("--db needs --log")
+        results = benchmark(args.db, args.db.parent, load_query_log(args.log),
+                            args.k, args.rounds, args.cache)
+        print(header)
+        print_rows(args.db.name, results, args.k)
+        all_results[str(args.db)] = results
+    else:
+        workdir = args.workdir or Path(tempfile.mkdtemp(prefix="ehko_bench_"))
+        rows = []
+        for size in args.sizes:
+            root = workdir / f"vault_{size}"
+            print(f"Building {size} reflection vault in {root}...", flush=True)
+            start = time.perf_counter()
+            log = build_vault(root, size, seed=args.seed, vectors=not args.no_vectors,
+                              queries=args.queries)
+            print(f"  ready in {time.perf_counter() - start:.1f}s "
+                  f"({(root / 'ehko_index.db').stat().st_size / 1e6:.1f} MB index)")
+            results = benchmark(root / "ehko_index.db", root / "Mirrorwell", log,
+                                args.k, args.rounds, args.cache)
+            rows.append((size, results))
+            all_results[size] = results
+        print("-" * 72)
+        print(header)
+        for size, results in rows:
+            print_rows(str(size), results, args.k)
+    print("=" * 72)
+    
+    if args.json:
+        args.json.write_text(json.dumps(all_results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,18 @@ Scans EhkoForge and Mirrorwell vaults:
 
 Usage:
     python ehko_refresh.py                  # Incremental update + process transcriptions
-    python ehko_refresh.py --full           # Full rebuild + process all transcriptions
+    python ehko_refresh.py --full           # Full rebuild (in a shadow DB, swapped in) + process all transcriptions
     python ehko_refresh.py --report         # Show stats only
     python ehko_refresh.py --no-process     # Index only, skip transcription processing
     python ehko_refresh.py --health         # Run vault health checks, generate report
+    python ehko_refresh.py --no-vectors     # Skip rebuilding the semantic search index
+    python ehko_refresh.py --jobs 4         # Parse files in 4 worker processes (default: CPU count)
+    python ehko_refresh.py --watch          # Refresh, then reindex files as they change
+    python ehko_refresh.py --watch --poll   # Same, rescanning instead of using inotify
 
 Dependencies:
     pip install pyyaml
+    pip install numpy    (optional: semantic search index)
 
 Author: Brent Lefebure / EhkoForge
 Created: 2025-11-26
@@ -31,9 +36,11 @@ import os
 import re
 import shutil
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 try:
     import yaml
@@ -41,6 +48,26 @@ except ImportError:
     print("ERROR: PyYAML not installed. Run: pip install pyyaml")
     exit(1)
 
+from ehkoforge.db import DEFAULT_PRAGMAS, open_connection
+from ehkoforge.pillar_digest import PILLAR_FOLDER, ensure_digest_table, refresh_pillar_digests
+from ehkoforge.search_index import (
+    FTS_TABLE,
+    SEARCH_INSERT_SQL,
+    bump_index_generation,
+    ensure_preview_column,
+    ensure_search_index,
+    extract_preview,
+    search_row,
+)
+from ehkoforge.specificity import CHALLENGE_THRESHOLD, DEFAULT_SCORE, specificity_score
+from ehkoforge.vault_watch import DEBOUNCE_SECONDS, Debouncer, PollingWatcher, make_watcher
+from ehkoforge.vector_index import (
+    NUMPY_AVAILABLE,
+    build_vector_index,
+    manifest_path,
+    reflection_documents,
+)
+
 
 # =============================================================================
 # CONFIGURATION
@@ -70,6 +97,21 @@ SKIP_DIRS = {".obsidian", "_inbox", "attachments", "archive", "_data", "_ledger"
 # File patterns to skip
 SKIP_PATTERNS = {"index.md", "README.md", "Start Here.md"}
 
+# Frontmatter fields a file needs to be indexed
+REQUIRED_FIELDS = ["title", "vault", "type", "status", "version", "created", "updated"]
+
+# reflection_objects columns holding the file's stat when it was indexed
+STAT_COLUMNS = ("file_mtime_ns", "file_size", "file_inode")
+
+# Parallel indexing: smallest file list worth a process pool, files per worker task,
+# and parsed records written per transaction
+PARALLEL_MIN_FILES = 200
+PARSE_CHUNK = 64
+WRITE_BATCH = 500
+
+# Watch mode: least seconds between semantic index rebuilds
+VECTOR_REBUILD_INTERVAL = 300
+
 
 # =============================================================================
 # TRANSCRIPTION DETECTION & PROCESSING
@@ -300,8 +342,20 @@ def process_transcription_file(file_path: Path) -> Optional[Path]:
     
     Returns path to generated reflection file, or None if failed.
     """
+    converted = convert_transcription(file_path)
+    return converted[0] if converted else None
+
+
+def convert_transcription(file_path: Path, content: Optional[str] = None) -> Optional[tuple[Path, str]]:
+    """
+    process_transcription_file for a file whose content has already been
+    read (read here if content is None).
+    
+    Returns (generated reflection path, its content), or None if failed.
+    """
     try:
-        content = file_path.read_text(encoding="utf-8")
+        if content is None:
+            content = file_path.read_text(encoding="utf-8")
         
         if not is_transcription_file(content):
             return None
@@ -338,7 +392,7 @@ def process_transcription_file(file_path: Path) -> Optional[Path]:
         shutil.move(str(file_path), str(archive_path))
         print(f"    ARCHIVED: {archive_path.name}")
         
-        return output_path
+        return output_path, entry
         
     except Exception as e:
         print(f"    ERROR processing transcription: {e}")
@@ -367,6 +421,11 @@ CREATE TABLE IF NOT EXISTS reflection_objects (
     revealed BOOLEAN DEFAULT 1,
     raw_input_hash TEXT,
     content_hash TEXT,
+    content_preview TEXT,
+    file_mtime_ns INTEGER,
+    file_size INTEGER,
+    file_inode INTEGER,
+    specificity_score REAL,
     indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -526,9 +585,14 @@ CREATE INDEX IF NOT EXISTS idx_reflection_updated ON reflection_objects(updated)
 CREATE INDEX IF NOT EXISTS idx_tags_lookup ON tags(tag);
 CREATE INDEX IF NOT EXISTS idx_tags_object ON tags(object_id);
 CREATE INDEX IF NOT EXISTS idx_crossref_object ON cross_references(object_id);
+CREATE INDEX IF NOT EXISTS idx_changelog_object ON changelog_entries(object_id);
+CREATE INDEX IF NOT EXISTS idx_emotional_object ON emotional_tags(object_id);
+CREATE INDEX IF NOT EXISTS idx_shared_with_object ON shared_with_friends(object_id);
+CREATE INDEX IF NOT EXISTS idx_mirrorwell_pillar_core ON mirrorwell_extensions(identity_pillar COLLATE NOCASE, core_memory);
 CREATE INDEX IF NOT EXISTS idx_friend_email ON friend_registry(email);
 CREATE INDEX IF NOT EXISTS idx_friend_name ON friend_registry(name);
 CREATE INDEX IF NOT EXISTS idx_shared_memory_friend ON shared_memories(friend_id);
+CREATE INDEX IF NOT EXISTS idx_shared_memory_path ON shared_memories(friend_id, memory_file_path);
 CREATE INDEX IF NOT EXISTS idx_shared_memory_eligible ON shared_memories(challenge_eligible);
 CREATE INDEX IF NOT EXISTS idx_token ON authentication_tokens(token);
 CREATE INDEX IF NOT EXISTS idx_token_expiry ON authentication_tokens(expires_at);
@@ -610,20 +674,195 @@ def extract_changelog(body: str) -> list[dict]:
     return entries
 
 
+def stat_key(file_path: Path) -> tuple[int, int, int]:
+    """(mtime_ns, size, inode) of a file; unchanged means the content needn't be read."""
+    st = os.stat(file_path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def parse_file(file_path: Path, vault_name: str, known_hash: Optional[str] = None,
+               transcriptions: bool = False) -> dict:
+    """
+    Read and parse one markdown file into an index record.
+    
+    Touches no database state, so EhkoIndexer can run it in worker processes
+    and write the records from one connection. Each file is read once: with
+    transcriptions=True, transcription files come back with their content
+    for the writer to convert rather than parsed.
+    
+    The file's stat_key, taken before reading, is stored with the record.
+    
+    Returns a dict with "status":
+    - "transcription": with "content" and "file_stat"
+    - "unchanged": content hash equals known_hash (with "file_stat", so the
+      stored stat can be refreshed)
+    - "skipped" / "error": with "reason" / "error"
+    - "parsed": with data (the reflection_objects row), tags, emotional_tags,
+      shared_with, wiki_links, changelog, search_body, mirrorwell
+      ((core_memory, identity_pillar) or None) and prepared_message (or None)
+    """
+    try:
+        file_stat = stat_key(file_path)
+        content = file_path.read_text(encoding="utf-8")
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    
+    if transcriptions and is_transcription_file(content):
+        return {"status": "transcription", "content": content, "file_stat": file_stat}
+    return parse_content(file_path, vault_name, content, file_stat, known_hash)
+
+
+def parse_content(file_path: Path, vault_name: str, content: str, file_stat: tuple,
+                  known_hash: Optional[str] = None) -> dict:
+    """parse_file for content already read (file_stat taken before reading it)."""
+    try:
+        content_hash = compute_hash(content)
+        if known_hash == content_hash:
+            return {"status": "unchanged", "file_stat": file_stat}
+        
+        frontmatter, body = extract_frontmatter(content)
+        if not frontmatter:
+            return {"status": "skipped", "reason": "no frontmatter"}
+        
+        missing = [f for f in REQUIRED_FIELDS if f not in frontmatter]
+        if missing:
+            return {"status": "skipped", "reason": f"missing fields {missing}"}
+        
+        # Extract raw input and calculate hash
+        raw_input = extract_raw_input(body)
+        data = {
+            "file_path": str(file_path),
+            "vault": frontmatter.get("vault", vault_name),
+            "type": frontmatter["type"],
+            "title": frontmatter["title"],
+            "category": frontmatter.get("category"),
+            "status": frontmatter["status"],
+            "version": str(frontmatter["version"]),
+            "created": str(frontmatter["created"]),
+            "updated": str(frontmatter["updated"]),
+            "source": frontmatter.get("source"),
+            "confidence": frontmatter.get("confidence", 0.95),
+            "revealed": frontmatter.get("revealed", True),
+            "raw_input_hash": compute_hash(raw_input) if raw_input else None,
+            "content_hash": content_hash,
+            "content_preview": extract_preview(content),
+            **dict(zip(STAT_COLUMNS, file_stat)),
+        }
+        
+        shared_with = frontmatter.get("shared_with") or []
+        emotional_tags = frontmatter.get("emotional_tags") or []
+        if shared_with:
+            # For shared_memories (contextual authentication)
+            data["specificity_score"] = specificity_score(
+                raw_input or body, emotional_tags, shared_with
+            )
+        
+        # Cross-references from the body and the related field
+        wiki_links = extract_wiki_links(body)
+        for item in frontmatter.get("related", []):
+            wiki_links.extend(extract_wiki_links(item))
+        
+        mirrorwell = None
+        if vault_name == "Mirrorwell" or frontmatter.get("vault") == "Mirrorwell":
+            mirrorwell = (frontmatter.get("core_memory", False), frontmatter.get("identity_pillar"))
+        
+        prepared_message = None
+        if frontmatter.get("type") == "prepared_message":
+            prepared_message = {
+                "file_path": str(file_path),
+                "title": frontmatter["title"],
+                "addressed_to": frontmatter.get("addressed_to", ["*"]),
+                "trigger_type": frontmatter.get("trigger_type", "manual"),
+                "trigger_conditions": frontmatter.get("trigger_conditions", {}),
+                "delivery_priority": frontmatter.get("delivery_priority", 5),
+                "one_time_delivery": frontmatter.get("one_time_delivery", True),
+            }
+        
+        return {
+            "status": "parsed",
+            "data": data,
+            "tags": frontmatter.get("tags") or [],
+            "emotional_tags": emotional_tags,
+            "shared_with": shared_with,
+            "wiki_links": sorted(set(wiki_links)),
+            "changelog": extract_changelog(body),
+            # Full-text search row: Raw Input if present, else the whole body
+            "search_body": raw_input or body,
+            "mirrorwell": mirrorwell,
+            "prepared_message": prepared_message,
+        }
+    
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 # =============================================================================
 # DATABASE OPERATIONS (unchanged from v1.1)
 # =============================================================================
 
+# Per-object child tables: cleared when an object is re-indexed, written in
+# batches (see EhkoDatabase.flush_pending)
+CHILD_INSERT_SQL = {
+    "tags": "INSERT INTO tags (object_id, tag) VALUES (?, ?)",
+    "emotional_tags": "INSERT INTO emotional_tags (object_id, emotion) VALUES (?, ?)",
+    "cross_references": "INSERT INTO cross_references (object_id, target_path) VALUES (?, ?)",
+    "changelog_entries": "INSERT INTO changelog_entries (object_id, version, change_date, description) VALUES (?, ?, ?, ?)",
+    "shared_with_friends": "INSERT INTO shared_with_friends (object_id, friend_name) VALUES (?, ?)",
+}
+
+# One row per object, also batched (the search row is cleared on re-index too)
+UPSERT_EXTENSION_SQL = """
+    INSERT INTO mirrorwell_extensions (object_id, core_memory, identity_pillar)
+    VALUES (?, ?, ?)
+    ON CONFLICT(object_id) DO UPDATE SET
+        core_memory = excluded.core_memory,
+        identity_pillar = excluded.identity_pillar
+"""
+BATCHED_SQL = {**CHILD_INSERT_SQL, "mirrorwell_extensions": UPSERT_EXTENSION_SQL,
+               FTS_TABLE: SEARCH_INSERT_SQL}
+
+# Object ids per DELETE ... WHERE object_id IN (...) (under SQLite's variable limit)
+DELETE_CHUNK = 500
+
+# Tables a full rebuild regenerates from the vault (see rebuild()); the FTS
+# table and prepared_messages are swapped separately
+SHADOW_TABLES = (
+    "reflection_objects", "tags", "cross_references", "changelog_entries",
+    "mirrorwell_extensions", "emotional_tags", "shared_with_friends", "pillar_digest",
+)
+
+SHADOW_SUFFIX = ".rebuild"
+"""Shadow database for a full rebuild: ehko_index.db.rebuild next to the live one."""
+
+# Shadow database pragmas: nothing to recover if a rebuild dies, so no
+# journal and no fsyncs
+BULK_PRAGMAS = (
+    ("journal_mode", "OFF"),
+    ("synchronous", "OFF"),
+    ("cache_size", -65536),          # 64 MB page cache
+    ("temp_store", "MEMORY"),
+)
+
+
 class EhkoDatabase:
     """Database handler for ehko_index.db"""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, pragmas=DEFAULT_PRAGMAS):
         self.db_path = db_path
+        self.pragmas = pragmas
         self.conn = None
+        self.has_search_index = False
+        self.needs_digests = False
+        
+        # Child rows queued by the insert_* methods, and objects whose old child
+        # rows must go first; written by flush_pending (commit() flushes)
+        self._pending_rows: dict[str, list[tuple]] = {table: [] for table in BATCHED_SQL}
+        self._pending_objects: set[int] = set()
+        self._stale_objects: list[int] = []
     
     def connect(self):
         """Open database connection."""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = open_connection(self.db_path, pragmas=self.pragmas)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
     
@@ -634,9 +873,62 @@ class EhkoDatabase:
             self.conn = None
     
     def initialize_schema(self):
-        """Create tables if they don't exist."""
+        """Create tables (and the full-text search index) if they don't exist."""
         self.conn.executescript(SCHEMA_SQL)
         self.conn.commit()
+        ensure_preview_column(self.conn)
+        self.ensure_stat_columns()
+        self.ensure_specificity_column()
+        self.has_search_index = ensure_search_index(self.conn)
+        if not self.has_search_index:
+            print("  WARNING: SQLite FTS5 unavailable, context search will use LIKE scans")
+        
+        # Databases from before pillar_digest get every digest built once
+        self.needs_digests = not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pillar_digest'"
+        ).fetchone()
+        ensure_digest_table(self.conn)
+        self.conn.commit()
+    
+    def ensure_stat_columns(self):
+        """Add the file stat columns to databases indexed before they existed."""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reflection_objects)")]
+        for column in STAT_COLUMNS:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE reflection_objects ADD COLUMN {column} INTEGER")
+        self.conn.commit()
+    
+    def ensure_specificity_column(self):
+        """
+        Add specificity_score to databases indexed before it existed, and
+        clear the stored hash and stat of shared memories so the next run
+        re-parses (and scores) them.
+        """
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reflection_objects)")]
+        if "specificity_score" in columns:
+            return
+        self.conn.execute("ALTER TABLE reflection_objects ADD COLUMN specificity_score REAL")
+        self.conn.execute("""
+            UPDATE reflection_objects SET content_hash = NULL, file_mtime_ns = NULL
+            WHERE id IN (SELECT object_id FROM shared_with_friends)
+        """)
+        self.conn.commit()
+    
+    def get_existing_stats(self) -> dict[str, tuple]:
+        """Get file_path -> (mtime_ns, size, inode) for indexed files with a stored stat."""
+        cursor = self.conn.execute(
+            f"SELECT file_path, {', '.join(STAT_COLUMNS)} FROM reflection_objects "
+            "WHERE file_mtime_ns IS NOT NULL"
+        )
+        return {row[0]: tuple(row[1:]) for row in cursor}
+    
+    def update_file_stat(self, file_path: str, file_stat: tuple):
+        """Record a new stat for a file whose content didn't change (e.g. touched)."""
+        self.conn.execute(
+            "UPDATE reflection_objects SET file_mtime_ns = ?, file_size = ?, file_inode = ? "
+            "WHERE file_path = ?",
+            (*file_stat, file_path)
+        )
     
     def get_existing_hashes(self) -> dict[str, str]:
         """Get file_path -> content_hash mapping for all indexed files."""
@@ -645,6 +937,15 @@ class EhkoDatabase:
         )
         return {row["file_path"]: row["content_hash"] for row in cursor}
     
+    def get_indexed_under(self, path: str) -> list[str]:
+        """Indexed file paths equal to path or inside it (if it is a folder)."""
+        prefix = path.rstrip(os.sep) + os.sep
+        cursor = self.conn.execute(
+            "SELECT file_path FROM reflection_objects WHERE file_path = ? OR substr(file_path, 1, ?) = ?",
+            (path, len(prefix), prefix)
+        )
+        return [row["file_path"] for row in cursor]
+    
     def delete_object(self, file_path: str):
         """Delete a reflection object and all related records."""
         cursor = self.conn.execute(
@@ -654,6 +955,8 @@ class EhkoDatabase:
         row = cursor.fetchone()
         if row:
             obj_id = row["id"]
+            if obj_id in self._pending_objects:
+                self.flush_pending()
             # Cascade deletes handle related tables
             self.conn.execute("DELETE FROM reflection_objects WHERE id = ?", (obj_id,))
     
@@ -674,22 +977,26 @@ class EhkoDatabase:
                     vault = ?, type = ?, title = ?, category = ?,
                     status = ?, version = ?, created = ?, updated = ?,
                     source = ?, confidence = ?, revealed = ?,
-                    raw_input_hash = ?, content_hash = ?, indexed_at = ?
+                    raw_input_hash = ?, content_hash = ?, content_preview = ?,
+                    file_mtime_ns = ?, file_size = ?, file_inode = ?,
+                    specificity_score = ?, indexed_at = ?
                 WHERE id = ?
             """, (
                 data["vault"], data["type"], data["title"], data.get("category"),
                 data["status"], data["version"], data["created"], data["updated"],
                 data.get("source"), data.get("confidence", 0.95), data.get("revealed", True),
-                data.get("raw_input_hash"), data["content_hash"], datetime.now().isoformat(),
+                data.get("raw_input_hash"), data["content_hash"], data.get("content_preview"),
+                *(data.get(column) for column in STAT_COLUMNS),
+                data.get("specificity_score"),
+                datetime.now().isoformat(),
                 obj_id
             ))
             
-            # Clear related tables for re-population
-            self.conn.execute("DELETE FROM tags WHERE object_id = ?", (obj_id,))
-            self.conn.execute("DELETE FROM cross_references WHERE object_id = ?", (obj_id,))
-            self.conn.execute("DELETE FROM changelog_entries WHERE object_id = ?", (obj_id,))
-            self.conn.execute("DELETE FROM emotional_tags WHERE object_id = ?", (obj_id,))
-            self.conn.execute("DELETE FROM shared_with_friends WHERE object_id = ?", (obj_id,))
+            # Clear related tables for re-population (at the next flush, before
+            # the new rows; flush now if this batch already queued rows for it)
+            if obj_id in self._pending_objects:
+                self.flush_pending()
+            self._stale_objects.append(obj_id)
         else:
             # Insert new
             cursor = self.conn.execute("""
@@ -697,67 +1004,94 @@ class EhkoDatabase:
                     file_path, vault, type, title, category,
                     status, version, created, updated,
                     source, confidence, revealed,
-                    raw_input_hash, content_hash, indexed_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    raw_input_hash, content_hash, content_preview,
+                    file_mtime_ns, file_size, file_inode, specificity_score, indexed_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 data["file_path"], data["vault"], data["type"], data["title"], data.get("category"),
                 data["status"], data["version"], data["created"], data["updated"],
                 data.get("source"), data.get("confidence", 0.95), data.get("revealed", True),
-                data.get("raw_input_hash"), data["content_hash"], datetime.now().isoformat()
+                data.get("raw_input_hash"), data["content_hash"], data.get("content_preview"),
+                *(data.get(column) for column in STAT_COLUMNS),
+                data.get("specificity_score"),
+                datetime.now().isoformat()
             ))
             obj_id = cursor.lastrowid
         
         return obj_id
     
+    def _queue(self, table: str, object_id: int, rows: list[tuple]):
+        self._pending_rows[table].extend(rows)
+        self._pending_objects.add(object_id)
+    
     def insert_tags(self, object_id: int, tags: list[str]):
-        """Insert tags for an object."""
-        for tag in tags:
-            self.conn.execute(
-                "INSERT INTO tags (object_id, tag) VALUES (?, ?)",
-                (object_id, tag.lower().strip())
-            )
+        """Queue tags for an object."""
+        self._queue("tags", object_id, [(object_id, tag.lower().strip()) for tag in tags])
     
     def insert_emotional_tags(self, object_id: int, emotions: list[str]):
-        """Insert emotional tags for an object."""
-        for emotion in emotions:
-            self.conn.execute(
-                "INSERT INTO emotional_tags (object_id, emotion) VALUES (?, ?)",
-                (object_id, emotion.lower().strip())
-            )
+        """Queue emotional tags for an object."""
+        self._queue("emotional_tags", object_id,
+                    [(object_id, emotion.lower().strip()) for emotion in emotions])
     
     def insert_cross_references(self, object_id: int, targets: list[str]):
-        """Insert cross-references for an object."""
-        for target in targets:
-            self.conn.execute(
-                "INSERT INTO cross_references (object_id, target_path) VALUES (?, ?)",
-                (object_id, target)
-            )
+        """Queue cross-references for an object."""
+        self._queue("cross_references", object_id, [(object_id, target) for target in targets])
     
     def insert_changelog_entries(self, object_id: int, entries: list[dict]):
-        """Insert changelog entries for an object."""
-        for entry in entries:
-            self.conn.execute(
-                "INSERT INTO changelog_entries (object_id, version, change_date, description) VALUES (?, ?, ?, ?)",
-                (object_id, entry["version"], entry["date"], entry["description"])
-            )
+        """Queue changelog entries for an object."""
+        self._queue("changelog_entries", object_id, [
+            (object_id, entry["version"], entry["date"], entry["description"])
+            for entry in entries
+        ])
     
     def insert_shared_with(self, object_id: int, friends: list[str]):
-        """Insert shared_with_friends records."""
-        for friend in friends:
-            self.conn.execute(
-                "INSERT INTO shared_with_friends (object_id, friend_name) VALUES (?, ?)",
-                (object_id, friend.lower().strip())
-            )
+        """Queue shared_with_friends records."""
+        self._queue("shared_with_friends", object_id,
+                    [(object_id, friend.lower().strip()) for friend in friends])
+    
+    def flush_pending(self):
+        """
+        Write queued rows: old child and search rows of re-indexed objects
+        are deleted with DELETE ... IN per table, then new rows written with
+        executemany. Runs inside the current transaction (commit() calls it).
+        """
+        stale, self._stale_objects = self._stale_objects, []
+        for start in range(0, len(stale), DELETE_CHUNK):
+            chunk = stale[start:start + DELETE_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for table in CHILD_INSERT_SQL:
+                self.conn.execute(f"DELETE FROM {table} WHERE object_id IN ({placeholders})", chunk)
+            if self.has_search_index:
+                self.conn.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+        
+        for table, rows in self._pending_rows.items():
+            if rows:
+                self.conn.executemany(BATCHED_SQL[table], rows)
+                rows.clear()
+        self._pending_objects.clear()
+    
+    def index_search_text(self, object_id: int, title: str, tags: list[str],
+                          emotions: list[str], body: Optional[str]):
+        """Queue the full-text search row for an object (no-op without FTS5)."""
+        if self.has_search_index:
+            self._queue(FTS_TABLE, object_id, [search_row(
+                object_id, title,
+                [t.lower().strip() for t in tags], [e.lower().strip() for e in emotions],
+                body,
+            )])
+    
+    def get_mirrorwell_extension(self, file_path: str) -> Optional[tuple]:
+        """(core_memory, identity_pillar) currently indexed for a file, or None."""
+        return self.conn.execute("""
+            SELECT me.core_memory, me.identity_pillar
+            FROM reflection_objects ro
+            JOIN mirrorwell_extensions me ON me.object_id = ro.id
+            WHERE ro.file_path = ?
+        """, (file_path,)).fetchone()
     
     def upsert_mirrorwell_extension(self, object_id: int, core_memory: bool, identity_pillar: Optional[str]):
-        """Insert or update Mirrorwell extension data."""
-        self.conn.execute("""
-            INSERT INTO mirrorwell_extensions (object_id, core_memory, identity_pillar)
-            VALUES (?, ?, ?)
-            ON CONFLICT(object_id) DO UPDATE SET
-                core_memory = excluded.core_memory,
-                identity_pillar = excluded.identity_pillar
-        """, (object_id, core_memory, identity_pillar))
+        """Queue an insert or update of Mirrorwell extension data."""
+        self._queue("mirrorwell_extensions", object_id, [(object_id, core_memory, identity_pillar)])
     
     def upsert_prepared_message(self, data: dict):
         """Insert or update a prepared message."""
@@ -782,54 +1116,167 @@ class EhkoDatabase:
             data.get("one_time_delivery", True)
         ))
     
-    def update_shared_memories(self):
+    def update_shared_memories(self) -> int:
         """
         Populate shared_memories table from shared_with_friends.
-        Links memories to friends in friend_registry.
+        Links memories to friends in friend_registry, with the specificity
+        score stored at indexing time (memories that couldn't be scored get
+        DEFAULT_SCORE and are not challenge_eligible). Scores of existing
+        rows follow their memory when it is re-indexed.
+        
+        Returns:
+            Number of shared_memories rows added
         """
-        # Get all friends
-        friends = self.conn.execute("SELECT id, name FROM friend_registry").fetchall()
+        self.flush_pending()
         
-        for friend in friends:
-            friend_id = friend["id"]
-            friend_name = friend["name"].lower()
-            
-            # Find all memories shared with this friend
-            cursor = self.conn.execute("""
-                SELECT DISTINCT ro.file_path, ro.id
-                FROM reflection_objects ro
-                JOIN shared_with_friends swf ON ro.id = swf.object_id
-                WHERE LOWER(swf.friend_name) = ?
-            """, (friend_name,))
-            
-            for row in cursor:
-                # Check if already in shared_memories
-                existing = self.conn.execute(
-                    "SELECT id FROM shared_memories WHERE friend_id = ? AND memory_file_path = ?",
-                    (friend_id, row["file_path"])
-                ).fetchone()
-                
-                if not existing:
-                    # Calculate specificity score
-                    # Would need to re-read file here, so we'll use a default for now
-                    # In production, this should be calculated during indexing
-                    self.conn.execute("""
-                        INSERT INTO shared_memories (friend_id, memory_file_path, specificity_score, challenge_eligible)
-                        VALUES (?, ?, 0.5, 1)
-                    """, (friend_id, row["file_path"]))
+        self.conn.execute("""
+            UPDATE shared_memories SET
+                specificity_score = ro.specificity_score,
+                challenge_eligible = ro.specificity_score >= ?
+            FROM reflection_objects ro
+            WHERE ro.file_path = shared_memories.memory_file_path
+              AND ro.specificity_score IS NOT NULL
+              AND shared_memories.specificity_score IS NOT ro.specificity_score
+        """, (CHALLENGE_THRESHOLD,))
+        
+        cursor = self.conn.execute("""
+            INSERT INTO shared_memories (friend_id, memory_file_path, specificity_score, challenge_eligible)
+            SELECT DISTINCT fr.id, ro.file_path,
+                   COALESCE(ro.specificity_score, ?),
+                   COALESCE(ro.specificity_score >= ?, 0)
+            FROM friend_registry fr
+            JOIN shared_with_friends swf ON LOWER(swf.friend_name) = LOWER(fr.name)
+            JOIN reflection_objects ro ON ro.id = swf.object_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM shared_memories sm
+                WHERE sm.friend_id = fr.id AND sm.memory_file_path = ro.file_path
+            )
+        """, (DEFAULT_SCORE, CHALLENGE_THRESHOLD))
+        return cursor.rowcount
     
     def clear_all_objects(self):
         """Delete all reflection objects (for full rebuild)."""
+        self.flush_pending()
         self.conn.execute("DELETE FROM reflection_objects")
         self.conn.execute("DELETE FROM prepared_messages")
         self.conn.commit()
     
+    def drop_indexes(self, tables: Iterable[str] = SHADOW_TABLES, schema: str = "main") -> list[str]:
+        """Drop the explicit indexes on tables. Returns their CREATE statements."""
+        indexes = self.conn.execute(f"""
+            SELECT name, sql FROM {schema}.sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+              AND tbl_name IN ({', '.join('?' * len(tables))})
+        """, tuple(tables)).fetchall()
+        for name, _ in indexes:
+            self.conn.execute(f'DROP INDEX {schema}."{name}"')
+        return [sql for _, sql in indexes]
+    
+    def prepare_shadow(self, live: sqlite3.Connection):
+        """
+        Ready a freshly initialized shadow database for a bulk load: drop the
+        indexes on the rebuilt tables (they're created on the live side after
+        the swap) and continue the live database's AUTOINCREMENT sequences,
+        so rebuilt objects get ids the live index hasn't used.
+        """
+        self.drop_indexes()
+        sequences = live.execute(f"""
+            SELECT name, seq FROM sqlite_sequence
+            WHERE name IN ({', '.join('?' * len(SHADOW_TABLES))})
+        """, SHADOW_TABLES).fetchall()
+        self.conn.executemany("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                              [tuple(row) for row in sequences])
+        self.conn.commit()
+    
+    def swap_in(self, shadow_path: Path):
+        """
+        Replace the rebuilt tables with a shadow database's, in one transaction.
+        
+        Readers (WAL) see the old index until the commit and the new one
+        after it, and nothing else in the database is touched. Indexes on
+        the swapped tables are dropped for the copy and created after it.
+        Prepared messages are upserted by file path (keeping their ids and
+        delivery history); messages no longer in the vault go, with their
+        deliveries, as a full rebuild always did.
+        
+        The caller bumps the index generation once dependent state (shared
+        memories, semantic index) has caught up.
+        """
+        self.commit()
+        conn = self.conn
+        conn.execute("PRAGMA foreign_keys = OFF")  # the copy replaces child rows itself
+        conn.execute("ATTACH DATABASE ? AS shadow", (str(shadow_path),))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                indexes = self.drop_indexes()
+                copy_search = self.has_search_index and conn.execute(
+                    "SELECT 1 FROM shadow.sqlite_master WHERE name = ?", (FTS_TABLE,)
+                ).fetchone()
+                if self.has_search_index:
+                    conn.execute(f"DELETE FROM main.{FTS_TABLE}")
+                
+                for table in SHADOW_TABLES:
+                    columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA shadow.table_info({table})"))
+                    conn.execute(f"DELETE FROM main.{table}")
+                    conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM shadow.{table}")
+                if copy_search:
+                    conn.execute(f"""
+                        INSERT INTO main.{FTS_TABLE} (rowid, title, tags, emotions, body)
+                        SELECT rowid, title, tags, emotions, body FROM shadow.{FTS_TABLE}
+                    """)
+                
+                conn.execute("""
+                    DELETE FROM main.message_deliveries WHERE message_id IN (
+                        SELECT id FROM main.prepared_messages
+                        WHERE file_path NOT IN (SELECT file_path FROM shadow.prepared_messages)
+                    )
+                """)
+                conn.execute("""
+                    DELETE FROM main.prepared_messages
+                    WHERE file_path NOT IN (SELECT file_path FROM shadow.prepared_messages)
+                """)
+                conn.execute("""
+                    INSERT INTO main.prepared_messages (
+                        file_path, title, addressed_to, trigger_type,
+                        trigger_conditions, delivery_priority, one_time_delivery
+                    )
+                    SELECT file_path, title, addressed_to, trigger_type,
+                           trigger_conditions, delivery_priority, one_time_delivery
+                    FROM shadow.prepared_messages WHERE true
+                    ON CONFLICT(file_path) DO UPDATE SET
+                        title = excluded.title,
+                        addressed_to = excluded.addressed_to,
+                        trigger_type = excluded.trigger_type,
+                        trigger_conditions = excluded.trigger_conditions,
+                        delivery_priority = excluded.delivery_priority,
+                        one_time_delivery = excluded.one_time_delivery
+                """)
+                
+                for sql in indexes:
+                    conn.execute(sql)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            conn.execute("DETACH DATABASE shadow")
+            conn.execute("PRAGMA foreign_keys = ON")
+    
     def commit(self):
-        """Commit current transaction."""
+        """Write queued rows and commit current transaction."""
+        self.flush_pending()
         self.conn.commit()
     
+    def bump_generation(self) -> int:
+        """Mark the index as changed (invalidates cached context searches)."""
+        generation = bump_index_generation(self.conn)
+        self.commit()
+        return generation
+    
     def get_stats(self) -> dict:
         """Get index statistics."""
+        self.flush_pending()
         stats = {}
         
         stats["total_objects"] = self.conn.execute(
@@ -874,10 +1321,13 @@ class EhkoDatabase:
 class EhkoIndexer:
     """Main indexing engine with transcription processing."""
     
-    def __init__(self, db: EhkoDatabase, incremental: bool = True, process_transcriptions: bool = True):
+    def __init__(self, db: EhkoDatabase, incremental: bool = True, process_transcriptions: bool = True,
+                 build_vectors: bool = True, jobs: int = 1):
         self.db = db
         self.incremental = incremental
         self.process_transcriptions = process_transcriptions
+        self.build_vectors = build_vectors
+        self.jobs = max(1, jobs)  # parse_file worker processes
         self.stats = {
             "scanned": 0,
             "indexed": 0,
@@ -886,6 +1336,36 @@ class EhkoIndexer:
             "deleted": 0,
             "transcriptions_processed": 0,
         }
+        # Transcription originals converted by index_files -> generated reflection
+        self.transcribed: dict[Path, Path] = {}
+        
+        # Digests to rebuild at the end of the run (None = every pillar)
+        rebuild_all = not incremental or db.needs_digests
+        self.dirty_pillars: Optional[set] = None if rebuild_all else set()
+        self.core_dirty = rebuild_all
+    
+    def mark_pillars(self, file_path: str, core_memory=False, identity_pillar=None):
+        """Queue digest rebuilds for a reflection's pillar / core memory state."""
+        if identity_pillar and self.dirty_pillars is not None:
+            self.dirty_pillars.add(str(identity_pillar).strip())
+        if core_memory:
+            self.core_dirty = True
+        if PILLAR_FOLDER.as_posix() in Path(file_path).as_posix():
+            self.dirty_pillars = None  # a pillar note changed; names match loosely
+    
+    def refresh_digests(self) -> int:
+        """Rebuild the pillar / core memory digests touched by this run."""
+        if self.dirty_pillars == set() and not self.core_dirty:
+            return 0
+        self.db.flush_pending()
+        mirrorwell = VAULTS.get("Mirrorwell")
+        changed = refresh_pillar_digests(
+            self.db.conn, self.dirty_pillars, core=self.core_dirty,
+            pillar_dir=mirrorwell / PILLAR_FOLDER if mirrorwell else None,
+        )
+        self.dirty_pillars, self.core_dirty = set(), False
+        self.db.needs_digests = False
+        return changed
     
     def should_skip_path(self, path: Path) -> bool:
         """Check if path should be skipped."""
@@ -921,110 +1401,63 @@ class EhkoIndexer:
         Index a single markdown file.
         Returns True if indexed, False if skipped.
         """
+        known_hash = existing_hashes.get(str(file_path)) if self.incremental else None
+        return self.apply_record(file_path, parse_file(file_path, vault_name, known_hash))
+    
+    def apply_record(self, file_path: Path, record: dict) -> bool:
+        """
+        Write one parse_file record to the database (the single writer).
+        Returns True if indexed, False if skipped.
+        """
         self.stats["scanned"] += 1
         relative_path = str(file_path)
         
+        if record["status"] == "unchanged":
+            if record.get("file_stat"):
+                self.db.update_file_stat(relative_path, record["file_stat"])
+            self.stats["skipped"] += 1
+            return False
+        if record["status"] == "skipped":
+            print(f"  SKIP ({record['reason']}): {file_path.name}")
+            self.stats["skipped"] += 1
+            return False
+        if record["status"] == "error":
+            print(f"  ERROR indexing {file_path.name}: {record['error']}")
+            self.stats["errors"] += 1
+            return False
+        
         try:
-            # Read file content
-            content = file_path.read_text(encoding="utf-8")
-            content_hash = compute_hash(content)
-            
-            # Check if unchanged (incremental mode)
-            if self.incremental and relative_path in existing_hashes:
-                if existing_hashes[relative_path] == content_hash:
-                    self.stats["skipped"] += 1
-                    return False
-            
-            # Parse frontmatter
-            frontmatter, body = extract_frontmatter(content)
+            data = record["data"]
             
-            if not frontmatter:
-                print(f"  SKIP (no frontmatter): {file_path.name}")
-                self.stats["skipped"] += 1
-                return False
-            
-            # Validate required fields
-            required = ["title", "vault", "type", "status", "version", "created", "updated"]
-            missing = [f for f in required if f not in frontmatter]
-            if missing:
-                print(f"  SKIP (missing fields {missing}): {file_path.name}")
-                self.stats["skipped"] += 1
-                return False
-            
-            # Extract raw input and calculate hash
-            raw_input = extract_raw_input(body)
-            raw_input_hash = compute_hash(raw_input) if raw_input else None
-            
-            # Build data dict
-            data = {
-                "file_path": relative_path,
-                "vault": frontmatter.get("vault", vault_name),
-                "type": frontmatter["type"],
-                "title": frontmatter["title"],
-                "category": frontmatter.get("category"),
-                "status": frontmatter["status"],
-                "version": str(frontmatter["version"]),
-                "created": str(frontmatter["created"]),
-                "updated": str(frontmatter["updated"]),
-                "source": frontmatter.get("source"),
-                "confidence": frontmatter.get("confidence", 0.95),
-                "revealed": frontmatter.get("revealed", True),
-                "raw_input_hash": raw_input_hash,
-                "content_hash": content_hash,
-            }
+            # Digests covering the file's previous pillar / core memory state
+            previous = self.db.get_mirrorwell_extension(relative_path)
+            if previous:
+                self.mark_pillars(relative_path, previous[0], previous[1])
             
             # Insert/update reflection object
             obj_id = self.db.upsert_reflection(data)
             
-            # Process tags
-            tags = frontmatter.get("tags", [])
-            if tags:
-                self.db.insert_tags(obj_id, tags)
+            if record["tags"]:
+                self.db.insert_tags(obj_id, record["tags"])
+            if record["emotional_tags"]:
+                self.db.insert_emotional_tags(obj_id, record["emotional_tags"])
+            if record["shared_with"]:
+                self.db.insert_shared_with(obj_id, record["shared_with"])
+            if record["wiki_links"]:
+                self.db.insert_cross_references(obj_id, record["wiki_links"])
+            if record["changelog"]:
+                self.db.insert_changelog_entries(obj_id, record["changelog"])
             
-            # Process emotional tags (Mirrorwell)
-            emotional_tags = frontmatter.get("emotional_tags", [])
-            if emotional_tags:
-                self.db.insert_emotional_tags(obj_id, emotional_tags)
+            self.db.index_search_text(obj_id, data["title"], record["tags"],
+                                      record["emotional_tags"], record["search_body"])
             
-            # Process shared_with (Mirrorwell)
-            shared_with = frontmatter.get("shared_with", [])
-            if shared_with:
-                self.db.insert_shared_with(obj_id, shared_with)
-            
-            # Process cross-references
-            wiki_links = extract_wiki_links(body)
-            related = frontmatter.get("related", [])
-            # Parse wiki-links from related field too
-            for item in related:
-                links = extract_wiki_links(item)
-                wiki_links.extend(links)
-            
-            if wiki_links:
-                self.db.insert_cross_references(obj_id, list(set(wiki_links)))
-            
-            # Process changelog
-            changelog = extract_changelog(body)
-            if changelog:
-                self.db.insert_changelog_entries(obj_id, changelog)
-            
-            # Mirrorwell extensions
-            if vault_name == "Mirrorwell" or frontmatter.get("vault") == "Mirrorwell":
-                core_memory = frontmatter.get("core_memory", False)
-                identity_pillar = frontmatter.get("identity_pillar")
+            if record["mirrorwell"] is not None:
+                core_memory, identity_pillar = record["mirrorwell"]
                 self.db.upsert_mirrorwell_extension(obj_id, core_memory, identity_pillar)
+                self.mark_pillars(relative_path, core_memory, identity_pillar)
             
-            # Prepared messages
-            if frontmatter.get("type") == "prepared_message":
-                pm_data = {
-                    "file_path": relative_path,
-                    "title": frontmatter["title"],
-                    "addressed_to": frontmatter.get("addressed_to", ["*"]),
-                    "trigger_type": frontmatter.get("trigger_type", "manual"),
-                    "trigger_conditions": frontmatter.get("trigger_conditions", {}),
-                    "delivery_priority": frontmatter.get("delivery_priority", 5),
-                    "one_time_delivery": frontmatter.get("one_time_delivery", True),
-                }
-                self.db.upsert_prepared_message(pm_data)
+            if record["prepared_message"] is not None:
+                self.db.upsert_prepared_message(record["prepared_message"])
             
             self.stats["indexed"] += 1
             return True
@@ -1034,13 +1467,114 @@ class EhkoIndexer:
             self.stats["errors"] += 1
             return False
     
+    def parse_files(self, files: list[Path], vault_name: str,
+                    existing_hashes: dict) -> Iterator[tuple[Path, dict]]:
+        """
+        (path, parse_file record) for each file, in order.
+        
+        With jobs > 1 the files are parsed in a process pool while the caller
+        writes the records already returned.
+        """
+        known = [existing_hashes.get(str(f)) if self.incremental else None for f in files]
+        transcriptions = self.process_transcriptions
+        if self.jobs > 1 and len(files) >= PARALLEL_MIN_FILES:
+            try:
+                pool = ProcessPoolExecutor(max_workers=self.jobs)
+            except (OSError, NotImplementedError) as e:
+                print(f"  WARNING: process pool unavailable ({e}), parsing serially")
+            else:
+                chunksize = max(1, min(PARSE_CHUNK, len(files) // (self.jobs * 4)))
+                with pool:
+                    yield from zip(files, pool.map(parse_file, files, [vault_name] * len(files),
+                                                   known, [transcriptions] * len(files),
+                                                   chunksize=chunksize))
+                return
+        
+        for file_path, known_hash in zip(files, known):
+            yield file_path, parse_file(file_path, vault_name, known_hash, transcriptions)
+    
+    def stat_changed(self, files: list[Path], existing_stats: dict) -> list[Path]:
+        """
+        Files whose stat differs from existing_stats (or that aren't indexed).
+        
+        The rest are counted as scanned and skipped without being read.
+        """
+        changed = []
+        for file_path in files:
+            try:
+                unchanged = existing_stats.get(str(file_path)) == stat_key(file_path)
+            except OSError:
+                unchanged = False  # parse_file reports the error
+            if unchanged:
+                self.stats["scanned"] += 1
+                self.stats["skipped"] += 1
+            else:
+                changed.append(file_path)
+        return changed
+    
+    def index_files(self, files: list[Path], vault_name: str, existing_hashes: dict) -> int:
+        """
+        Parse and index files, committing every WRITE_BATCH indexed files.
+        Transcription files (if process_transcriptions) are converted on the
+        way and the generated reflections indexed in their place.
+        Returns the number indexed.
+        """
+        indexed = 0
+        generated = set()
+        for file_path, record in self.parse_files(files, vault_name, existing_hashes):
+            if record["status"] == "transcription":
+                file_path, record = self.handle_transcription(file_path, record, vault_name)
+                generated.add(file_path)
+            elif file_path in generated:
+                continue  # overwritten by a transcription above; this record is stale
+            if self.apply_record(file_path, record):
+                print(f"  INDEXED: {file_path.name}")
+                indexed += 1
+                if indexed % WRITE_BATCH == 0:
+                    self.db.commit()
+        return indexed
+    
+    def handle_transcription(self, file_path: Path, record: dict,
+                             vault_name: str) -> tuple[Path, dict]:
+        """
+        Convert a transcription file from its parse_file record (no re-read).
+        
+        The original is recorded in self.transcribed (-> generated reflection).
+        
+        Returns:
+            (path, parse record) to index: the generated reflection, parsed
+            from the content just written, or the original file if the
+            conversion failed.
+        """
+        converted = convert_transcription(file_path, record["content"])
+        if converted is None:
+            return file_path, parse_content(file_path, vault_name, record["content"],
+                                            record["file_stat"])
+        
+        result_path, entry = converted
+        self.stats["transcriptions_processed"] += 1
+        self.transcribed[file_path] = result_path
+        try:
+            result_stat = stat_key(result_path)
+        except OSError as e:
+            return result_path, {"status": "error", "error": str(e)}
+        return result_path, parse_content(result_path, self.vault_for(result_path) or vault_name,
+                                          entry, result_stat)
+    
+    def remove_file(self, file_path: str):
+        """Drop one file's index entries (it was deleted or moved away)."""
+        print(f"  REMOVING: {Path(file_path).name}")
+        previous = self.db.get_mirrorwell_extension(file_path)
+        if previous:
+            self.mark_pillars(file_path, previous[0], previous[1])
+        self.db.delete_object(file_path)
+        self.stats["deleted"] += 1
+    
     def cleanup_deleted(self, existing_hashes: dict, current_files: set[str]):
         """Remove index entries for deleted files."""
         for file_path in existing_hashes:
             if file_path not in current_files:
-                print(f"  REMOVING: {Path(file_path).name}")
-                self.db.delete_object(file_path)
-                self.stats["deleted"] += 1
+                self.remove_file(file_path)
     
     def run(self) -> dict:
         """Run the full indexing process."""
@@ -1049,11 +1583,13 @@ class EhkoIndexer:
         print("=" * 60)
         print(f"Mode: {'Incremental' if self.incremental else 'Full Rebuild'}")
         print(f"Transcription Processing: {'Enabled' if self.process_transcriptions else 'Disabled'}")
+        print(f"Parse Workers: {self.jobs}")
         print(f"Database: {DB_PATH}")
         print()
         
-        # Get existing hashes for incremental mode
+        # Get existing hashes / file stats for incremental mode
         existing_hashes = self.db.get_existing_hashes() if self.incremental else {}
+        existing_stats = self.db.get_existing_stats() if self.incremental else {}
         
         all_current_files = set()
         
@@ -1066,32 +1602,21 @@ class EhkoIndexer:
             print(f"Scanning {vault_name}...")
             files = self.scan_vault(vault_name, vault_path)
             print(f"  Found {len(files)} files")
+            all_current_files.update(str(file_path) for file_path in files)
             
-            # First pass: process transcriptions
-            if self.process_transcriptions:
-                print(f"  Processing transcriptions...")
-                for file_path in files[:]:  # Copy list to allow modification
-                    try:
-                        content = file_path.read_text(encoding="utf-8")
-                        if is_transcription_file(content):
-                            result_path = process_transcription_file(file_path)
-                            if result_path:
-                                self.stats["transcriptions_processed"] += 1
-                                # Remove from files list (it's been moved)
-                                files.remove(file_path)
-                                # Add generated reflection to files list
-                                if result_path.exists():
-                                    files.append(result_path)
-                    except Exception as e:
-                        print(f"    ERROR checking transcription: {e}")
+            # Files with the same stat as when they were indexed aren't read again
+            if self.incremental:
+                files = self.stat_changed(files, existing_stats)
+                print(f"  {len(files)} new or changed")
             
-            # Second pass: index all remaining files
+            # One pass: each file is read once, and transcriptions are
+            # converted and their reflections indexed as they come up
             print(f"  Indexing files...")
-            for file_path in files:
-                all_current_files.add(str(file_path))
-                result = self.index_file(file_path, vault_name, existing_hashes)
-                if result:
-                    print(f"  INDEXED: {file_path.name}")
+            self.index_files(files, vault_name, existing_hashes)
+            for original, result_path in self.transcribed.items():
+                all_current_files.discard(str(original))
+                all_current_files.add(str(result_path))
+            self.transcribed.clear()
             
             print()
         
@@ -1103,10 +1628,206 @@ class EhkoIndexer:
         print("Updating shared memories linkage...")
         self.db.update_shared_memories()
         
+        # Identity digests for pillars / core memories touched above
+        digests_changed = self.refresh_digests()
+        
         # Commit all changes
         self.db.commit()
         
+        if self.build_vectors:
+            self.refresh_vectors()
+        
+        # After the vectors, so a reader that sees the new generation sees both
+        if self.stats["indexed"] or self.stats["deleted"] or digests_changed or not self.incremental:
+            self.db.bump_generation()
+        
         return self.stats
+    
+    def refresh_vectors(self):
+        """Rebuild the semantic index if anything changed (or it doesn't exist yet)."""
+        if not NUMPY_AVAILABLE:
+            print("Semantic index skipped (pip install numpy to enable)")
+            return
+        
+        changed = self.stats["indexed"] or self.stats["deleted"] or not self.incremental
+        if not changed and manifest_path(self.db.db_path).exists():
+            return
+        
+        print("Building semantic index...")
+        result = build_vector_index(reflection_documents(self.db.conn), self.db.db_path)
+        print(f"  {result['documents']} reflections, {result['vocabulary']} terms "
+              f"({result['seconds']}s)")
+    
+    def vault_for(self, path: Path) -> Optional[str]:
+        """Name of the vault in VAULTS that contains path (None if none does)."""
+        for vault_name, vault_path in VAULTS.items():
+            if path == vault_path or vault_path in path.parents:
+                return vault_name
+        return None
+    
+    def reindex_paths(self, paths: Iterable[Path]) -> bool:
+        """
+        Bring the index up to date for paths reported by a vault watcher.
+        
+        Existing .md files go through index_files (transcriptions included);
+        existing folders are rescanned (skipping files whose stat
+        is unchanged) and indexed files no longer in them removed; paths that
+        no longer exist are removed along with anything indexed under them,
+        which covers deletes and both ends of a rename.
+        
+        The semantic index is left to the caller (see watch()).
+        
+        Returns:
+            True if the index changed (the generation has been bumped).
+        """
+        before = (self.stats["indexed"], self.stats["deleted"])
+        by_vault: dict[str, list[Path]] = {}
+        existing_stats = None
+        
+        for path in sorted(set(paths)):
+            vault_name = self.vault_for(path)
+            if vault_name is None:
+                continue
+            if path.is_dir():
+                if existing_stats is None:
+                    existing_stats = self.db.get_existing_stats()
+                found = self.scan_vault(vault_name, path)
+                current = {str(f) for f in found}
+                for file_path in self.db.get_indexed_under(str(path)):
+                    if file_path not in current:
+                        self.remove_file(file_path)
+                by_vault.setdefault(vault_name, []).extend(self.stat_changed(found, existing_stats))
+            elif path.is_file():
+                if not self.should_skip_path(path):
+                    by_vault.setdefault(vault_name, []).append(path)
+            else:
+                for file_path in self.db.get_indexed_under(str(path)):
+                    self.remove_file(file_path)
+        
+        for vault_name, files in by_vault.items():
+            files = list(dict.fromkeys(files))
+            existing_hashes = {}
+            for file_path in files:
+                row = self.db.conn.execute(
+                    "SELECT content_hash FROM reflection_objects WHERE file_path = ?",
+                    (str(file_path),)).fetchone()
+                if row:
+                    existing_hashes[str(file_path)] = row["content_hash"]
+            self.index_files(files, vault_name, existing_hashes)
+        self.transcribed.clear()  # the watcher reports the moved originals
+        
+        if (self.stats["indexed"], self.stats["deleted"]) != before:
+            self.db.update_shared_memories()
+        digests_changed = self.refresh_digests()
+        self.db.commit()
+        
+        changed = (self.stats["indexed"], self.stats["deleted"]) != before or digests_changed
+        if changed:
+            self.db.bump_generation()
+        return bool(changed)
+
+
+# =============================================================================
+# FULL REBUILD
+# =============================================================================
+
+def rebuild(db: EhkoDatabase, process_transcriptions: bool = True, build_vectors: bool = True,
+            jobs: int = 1) -> dict:
+    """
+    Full rebuild that never exposes a half-built index.
+    
+    The vault is indexed into a shadow database (db path + SHADOW_SUFFIX,
+    BULK_PRAGMAS, no indexes on the rebuilt tables) while forge_server
+    keeps reading the live one; EhkoDatabase.swap_in then replaces the
+    rebuilt tables in a single transaction. The live file is never
+    replaced: pooled connections elsewhere (and their WAL) stay valid and
+    see the new index on their next read, and the index generation carries
+    on from the live value.
+    
+    Returns:
+        The indexer stats from the shadow run.
+    """
+    shadow_path = db.db_path.with_name(db.db_path.name + SHADOW_SUFFIX)
+    shadow_path.unlink(missing_ok=True)  # left over from an interrupted rebuild
+    
+    shadow = EhkoDatabase(shadow_path, pragmas=BULK_PRAGMAS)
+    try:
+        shadow.connect()
+        shadow.initialize_schema()
+        shadow.prepare_shadow(db.conn)
+        indexer = EhkoIndexer(shadow, incremental=False, process_transcriptions=process_transcriptions,
+                              build_vectors=False, jobs=jobs)
+        stats = indexer.run()
+        shadow.close()
+        
+        print("Swapping rebuilt index into place...")
+        started = time.perf_counter()
+        db.swap_in(shadow_path)
+        print(f"  Swapped in {time.perf_counter() - started:.2f}s")
+    finally:
+        shadow.close()
+        shadow_path.unlink(missing_ok=True)
+    
+    db.update_shared_memories()
+    db.needs_digests = False
+    db.commit()
+    if build_vectors:
+        EhkoIndexer(db, incremental=False).refresh_vectors()
+    db.bump_generation()
+    return stats
+
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+def watch(indexer: EhkoIndexer, polling: bool = False, debounce: float = DEBOUNCE_SECONDS,
+          vector_interval: float = VECTOR_REBUILD_INTERVAL):
+    """
+    Reindex vault files as they change until interrupted (Ctrl+C).
+    
+    Changes are collected until the vault has been quiet for `debounce`
+    seconds, then applied with indexer.reindex_paths. The semantic index is
+    rebuilt at most every `vector_interval` seconds (and on exit) since a
+    rebuild covers the whole vault.
+    """
+    roots = [path for path in VAULTS.values() if path.exists()]
+    watcher = make_watcher(roots, SKIP_DIRS, polling=polling)
+    debouncer = Debouncer(quiet=debounce)
+    vectors_stale, last_vectors = False, time.monotonic()
+    print(f"Watching {', '.join(str(root) for root in roots)} "
+          f"({type(watcher).__name__}) — Ctrl+C to stop")
+    
+    try:
+        while True:
+            try:
+                debouncer.add(watcher.changes(timeout=0.5))
+            except OSError as e:
+                # e.g. out of inotify watches after new folders appeared
+                print(f"WARNING: watcher failed ({e}), falling back to polling")
+                watcher.close()
+                watcher = PollingWatcher(roots, SKIP_DIRS)
+                debouncer.add(roots)
+                continue
+            
+            batch = debouncer.ready()
+            if batch:
+                print(f"[{datetime.now():%H:%M:%S}] {len(batch)} changed path(s)")
+                vectors_stale |= indexer.reindex_paths(batch)
+            
+            if vectors_stale and time.monotonic() - last_vectors >= vector_interval:
+                if indexer.build_vectors:
+                    indexer.refresh_vectors()
+                vectors_stale, last_vectors = False, time.monotonic()
+    except KeyboardInterrupt:
+        batch = debouncer.flush()
+        if batch:
+            vectors_stale |= indexer.reindex_paths(batch)
+        if vectors_stale and indexer.build_vectors:
+            indexer.refresh_vectors()
+        print("Stopped watching.")
+    finally:
+        watcher.close()
 
 
 # =============================================================================
@@ -1327,7 +2048,7 @@ def main():
     )
     parser.add_argument(
         "--full", action="store_true",
-        help="Full rebuild (ignore existing hashes)"
+        help="Full rebuild (ignore existing hashes) in a shadow database, swapped in when done"
     )
     parser.add_argument(
         "--report", action="store_true",
@@ -1341,6 +2062,22 @@ def main():
         "--health", action="store_true",
         help="Run vault health checks and generate report"
     )
+    parser.add_argument(
+        "--no-vectors", action="store_true",
+        help="Skip rebuilding the semantic search index"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="After refreshing, keep running and reindex files as they change"
+    )
+    parser.add_argument(
+        "--poll", action="store_true",
+        help="Watch by rescanning the vaults instead of inotify"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+        help="Worker processes for reading and parsing files (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
@@ -1378,15 +2115,23 @@ def main():
         else:
             # Run indexing
             if args.full:
-                print("Clearing existing index for full rebuild...")
-                db.clear_all_objects()
-            indexer = EhkoIndexer(
-                db,
-                incremental=not args.full,
-                process_transcriptions=not args.no_process
-            )
-            stats = indexer.run()
+                print("Full rebuild into a shadow database...")
+                stats = rebuild(db, process_transcriptions=not args.no_process,
+                                build_vectors=not args.no_vectors, jobs=args.jobs)
+            else:
+                indexer = EhkoIndexer(
+                    db,
+                    incremental=True,
+                    process_transcriptions=not args.no_process,
+                    build_vectors=not args.no_vectors,
+                    jobs=args.jobs,
+                )
+                stats = indexer.run()
             print_report(db, stats)
+            
+            if args.watch:
+                watch(EhkoIndexer(db, process_transcriptions=not args.no_process,
+                                  build_vectors=not args.no_vectors), polling=args.poll)
     
     finally:
         db.close()
@@ -0,0 +1,334 @@
+"""
+Shared SQLite connection layer.
+
+Every module that touches ehko_index.db gets its connections from here
+instead of calling sqlite3.connect directly. Connections are pooled per
+database path and tuned once when opened (WAL, synchronous=NORMAL, page
+cache, mmap), so a request pays for a pool checkout rather than an open,
+schema parse and pragma setup.
+
+Callers keep the usual pattern:
+
+    conn = connect(db_path)
+    try:
+        ...
+        conn.commit()
+    finally:
+        conn.close()    # returns the connection to the pool
+
+Closing rolls back anything left uncommitted and resets row_factory and
+isolation_level, so a pooled connection behaves like a fresh one.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# Applied once per physical connection, in order
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -8192),           # KiB (negative) -> 8 MB page cache
+    ("mmap_size", 64 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+)
+
+DEFAULT_MAX_IDLE = 8
+"""Idle connections kept per database."""
+
+DEFAULT_MAX_AGE = 300.0
+"""Seconds before a connection is retired instead of returned to the pool."""
+
+DEFAULT_TIMEOUT = 5.0
+"""Busy timeout in seconds (sqlite3 default)."""
+
+
+def open_connection(db_path: Union[str, Path], timeout: float = DEFAULT_TIMEOUT,
+                    pragmas=DEFAULT_PRAGMAS, factory=sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Open a tuned connection outside the pool.
+    
+    For long-lived owners (e.g. the indexer) that hold one connection for a
+    whole run and may change per-connection state such as foreign_keys.
+    """
+    conn = sqlite3.connect(str(db_path), timeout=timeout,
+                           check_same_thread=False, factory=factory)
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands it back to its pool."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool: Optional["ConnectionPool"] = None
+        self.opened_at = time.monotonic()
+        self.uses = 0
+        self.released = False  # back in the pool; a second close() is a no-op
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the physical connection was opened."""
+        return time.monotonic() - self.opened_at
+    
+    def close(self):
+        if self.released:
+            return
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+    
+    def discard(self):
+        """Close the physical connection, bypassing the pool."""
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    LIFO pool of tuned connections to one database file.
+    
+    Connections are opened with check_same_thread=False and handed to one
+    borrower at a time, so they may be returned from a different thread
+    (e.g. a streaming response generator).
+    """
+    
+    def __init__(self, db_path: Union[str, Path], max_idle: int = DEFAULT_MAX_IDLE,
+                 max_age: float = DEFAULT_MAX_AGE, timeout: float = DEFAULT_TIMEOUT,
+                 pragmas=DEFAULT_PRAGMAS):
+        """
+        Args:
+            db_path: Database file.
+            max_idle: Idle connections to keep; extras are closed on release.
+            max_age: Retire connections older than this many seconds.
+            timeout: Busy timeout passed to sqlite3.connect.
+            pragmas: (name, value) pairs applied when a connection is opened.
+        """
+        self.db_path = str(db_path)
+        self.max_idle = max_idle
+        self.max_age = max_age
+        self.timeout = timeout
+        self.pragmas = pragmas
+        
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "reused": 0, "retired": 0, "checked_out": 0}
+    
+    def _open(self) -> PooledConnection:
+        return open_connection(self.db_path, timeout=self.timeout,
+                               pragmas=self.pragmas, factory=PooledConnection)
+    
+    def acquire(self) -> PooledConnection:
+        """Check out an idle connection, opening a new one if none is free."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._stats["checked_out"] += 1
+            if conn is not None:
+                self._stats["reused"] += 1
+        
+        if conn is None:
+            try:
+                conn = self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._stats["checked_out"] -= 1
+                raise
+            with self._lock:
+                self._stats["opened"] += 1
+        
+        conn.pool = self
+        conn.released = False
+        conn.uses += 1
+        return conn
+    
+    def release(self, conn: PooledConnection):
+        """
+        Reset a connection and return it to the pool (or retire it).
+        
+        Releasing a connection twice does nothing the second time, so a
+        double close() can't hand one connection to two borrowers.
+        """
+        with self._lock:
+            if conn.released:
+                return
+            conn.released = True
+        
+        keep = conn.age < self.max_age
+        if keep:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.row_factory = None
+                conn.isolation_level = ""
+            except sqlite3.Error:
+                keep = False
+        
+        with self._lock:
+            self._stats["checked_out"] -= 1
+            if keep and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self._stats["retired"] += 1
+        conn.discard()
+    
+    def close_all(self):
+        """Close every idle connection. Checked-out ones close on release."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._stats["retired"] += len(idle)
+        for conn in idle:
+            conn.discard()
+    
+    def stats(self) -> Dict:
+        """
+        Counters for the pool (opened, reused, retired, checked_out, idle).
+        
+        checked_out also counts connections that were never closed, so a
+        value that keeps growing points at a leak.
+        """
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle))
+
+
+# =============================================================================
+# MODULE-LEVEL POOLS
+# =============================================================================
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_counters: Dict[str, "ChangeCounter"] = {}
+
+
+def get_pool(db_path: Union[str, Path]) -> ConnectionPool:
+    """Return the shared pool for a database path, creating it on first use."""
+    key = str(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, ConnectionPool(key))
+    return pool
+
+
+def connect(db_path: Union[str, Path], row_factory=None) -> sqlite3.Connection:
+    """
+    Get a tuned connection to db_path from the shared pool.
+    
+    In-memory databases are never pooled (each connect() must stay private).
+    
+    Args:
+        db_path: Database file.
+        row_factory: Optional row factory (e.g. sqlite3.Row).
+    
+    Returns:
+        Connection; call close() to return it to the pool.
+    """
+    if str(db_path) == ":memory:":
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+    else:
+        conn = get_pool(db_path).acquire()
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+
+def close_all(db_path: Union[str, Path] = None):
+    """
+    Close idle pooled connections (and change counters) for one database,
+    or for all of them.
+    
+    Call before moving, deleting or replacing a database file.
+    """
+    with _pools_lock:
+        if db_path is None:
+            pools = list(_pools.values())
+            counters = list(_counters.values())
+        else:
+            pools = [_pools[str(db_path)]] if str(db_path) in _pools else []
+            counters = [_counters[str(db_path)]] if str(db_path) in _counters else []
+    for pool in pools:
+        pool.close_all()
+    for counter in counters:
+        counter.close()
+
+
+class ChangeCounter:
+    """
+    Database-wide change generation, for HTTP cache validators.
+    
+    Polls `PRAGMA data_version` on a dedicated connection that never
+    writes. SQLite changes that value whenever another connection commits,
+    whether from this process's pool, the indexer, or another process, so a
+    poll costs one pragma instead of re-running the queries it guards.
+    """
+    
+    def __init__(self, db_path: Union[str, Path], timeout: float = DEFAULT_TIMEOUT):
+        self.db_path = str(db_path)
+        self.timeout = timeout
+        self.generation = 0
+        self.changed_at = time.time()
+        
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def poll(self) -> Tuple[int, float]:
+        """
+        Returns:
+            (generation, changed_at): generation increments each time a
+            change is observed; changed_at is when (epoch seconds).
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                             check_same_thread=False, isolation_level=None)
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                self._data_version = version
+                self.generation += 1
+                self.changed_at = time.time()
+            return self.generation, self.changed_at
+    
+    def close(self):
+        """Drop the watcher connection; the next poll reopens it and counts as a change."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._data_version = None
+
+
+def get_change_counter(db_path: Union[str, Path]) -> ChangeCounter:
+    """Return the shared change counter for a database path."""
+    key = str(db_path)
+    counter = _counters.get(key)
+    if counter is None:
+        with _pools_lock:
+            counter = _counters.setdefault(key, ChangeCounter(key))
+    return counter
+
+
+def pool_stats() -> Dict[str, Dict]:
+    """Per-database pool counters, keyed by path."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.db_path: pool.stats() for pool in pools}
+
+
+__all__ = [
+    "DEFAULT_PRAGMAS",
+    "open_connection",
+    "PooledConnection",
+    "ConnectionPool",
+    "get_pool",
+    "connect",
+    "close_all",
+    "pool_stats",
+    "ChangeCounter",
+    "get_change_counter",
+]
@@ -0,0 +1,221 @@
+"""
+Background job queue.
+
+Runs slow work (e.g. generating an Ehko reply) on a bounded pool of worker
+threads so the request that asked for it can return immediately with a
+job id. Jobs live in memory for one server process; finished jobs are kept
+for `ttl` seconds so clients can collect the result, then swept.
+
+Usage:
+    jobs = JobQueue(max_workers=4)
+    job = jobs.submit(generate_reply, session_id, kind="chat_reply")
+    ...
+    job = jobs.get(job.id)
+    if job.finished:
+        print(job.status, job.result)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by JobQueue.submit when max_pending jobs are already waiting or running."""
+
+
+@dataclass
+class Job:
+    """One unit of background work and its outcome."""
+    
+    id: str
+    kind: str
+    status: str = "queued"
+    """queued -> running -> done | error"""
+    
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    finished_at: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    meta: Dict = field(default_factory=dict)
+    
+    _finished: Optional[float] = field(default=None, repr=False)
+    _event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _callbacks: List[Callable[["Job"], None]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes. Returns False on timeout."""
+        return self._event.wait(timeout)
+    
+    def add_done_callback(self, fn: Callable[["Job"], None]):
+        """
+        Call fn(job) once the job finishes: on the worker thread, or right
+        away if it already has. Lets async code await a job without a thread.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+    
+    def _complete(self):
+        """Wake waiters and run done callbacks. Status must already be final."""
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                logger.exception(f"Done callback for job {self.id} failed")
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            **self.meta,
+        }
+
+
+class JobQueue:
+    """
+    Bounded worker pool plus an in-memory job registry.
+    
+    At most `max_workers` jobs run at once; at most `max_pending` jobs may
+    be queued or running before submit() refuses new work.
+    """
+    
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, ttl: float = 600.0):
+        """
+        Args:
+            max_workers: Worker threads (concurrent jobs).
+            max_pending: Queued + running jobs allowed before JobQueueFull.
+            ttl: Seconds a finished job stays retrievable.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="ehko-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Timer] = None
+    
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+    
+    def has_capacity(self) -> bool:
+        """True if submit() would currently accept a job."""
+        with self._lock:
+            return self._pending() < self.max_pending
+    
+    def submit(self, fn: Callable, *args, kind: str = "job",
+               meta: Dict = None, **kwargs) -> Job:
+        """
+        Queue fn(*args, **kwargs). Its return value becomes job.result.
+        
+        Raises:
+            JobQueueFull: if max_pending jobs are already queued or running.
+        """
+        with self._lock:
+            self._prune()
+            if self._pending() >= self.max_pending:
+                raise JobQueueFull(f"{self.max_pending} jobs already pending")
+            job = Job(id=uuid4().hex, kind=kind, meta=meta or {})
+            self._jobs[job.id] = job
+        
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+    
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status."""
+        with self._lock:
+            self._prune()
+            counts = {"queued": 0, "running": 0, "done": 0, "error": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return dict(counts, workers=self.max_workers)
+    
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._sweeper:
+                self._sweeper.cancel()
+                self._sweeper = None
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: Dict):
+        job.status = "running"
+        status = "error"
+        try:
+            job.result = fn(*args, **kwargs)
+            status = "done"
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.kind}) failed")
+            job.error = str(e)
+        finally:
+            # Status flips last so a finished job always has finished_at set
+            job.finished_at = datetime.utcnow().isoformat() + "Z"
+            job._finished = time.monotonic()
+            job.status = status
+            job._complete()
+            with self._lock:
+                self._schedule_sweep(self.ttl)
+    
+    def _prune(self):
+        """Drop finished jobs older than ttl. Caller holds the lock."""
+        cutoff = time.monotonic() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job._finished is not None and job._finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+    
+    def _schedule_sweep(self, delay: float):
+        """
+        Start the sweep timer unless one is pending. Caller holds the lock.
+        
+        Finished jobs (and their results) are dropped after ttl even if no
+        further request touches the queue.
+        """
+        if self._sweeper is None:
+            self._sweeper = threading.Timer(delay, self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+    
+    def _sweep(self):
+        with self._lock:
+            self._sweeper = None
+            self._prune()
+            finished = [job._finished for job in self._jobs.values() if job._finished is not None]
+            if finished:
+                # Next sweep when the oldest remaining job expires
+                self._schedule_sweep(max(0.0, min(finished) + self.ttl - time.monotonic()))
+
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobQueueFull",
+]
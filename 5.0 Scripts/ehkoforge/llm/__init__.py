@@ -5,10 +5,19 @@ Provides API-agnostic interface for multiple LLM providers.
 Supports Claude (Anthropic), OpenAI, and extensible to other providers.
 """
 
-from .base import LLMProvider, LLMResponse
+from .base import (
+    AsyncLLMStream,
+    LLMProvider,
+    LLMResponse,
+    LLMStream,
+    SystemPrompt,
+    augment_system_prompt,
+)
 from .claude_provider import ClaudeProvider
 from .openai_provider import OpenAIProvider
 from .context_builder import EhkoContextBuilder
+from .context_packer import PackedContext, pack_context
+from .conversation import ConversationWindow, build_conversation_window, estimate_tokens
 from .config import LLMConfig, ProviderConfig, create_default_config
 from .provider_factory import (
     ProviderFactory,
@@ -23,6 +32,10 @@ __all__ = [
     # Base classes
     "LLMProvider",
     "LLMResponse",
+    "LLMStream",
+    "AsyncLLMStream",
+    "SystemPrompt",
+    "augment_system_prompt",
     # Providers
     "ClaudeProvider",
     "OpenAIProvider",
@@ -33,6 +46,12 @@ __all__ = [
     "get_provider_for_ehko",
     # Context
     "EhkoContextBuilder",
+    "PackedContext",
+    "pack_context",
+    # Conversation
+    "ConversationWindow",
+    "build_conversation_window",
+    "estimate_tokens",
     # Config
     "LLMConfig",
     "ProviderConfig",
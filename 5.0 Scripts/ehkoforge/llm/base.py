@@ -5,9 +5,14 @@ All providers inherit from LLMProvider and implement the same interface,
 allowing seamless swapping between Claude, ChatGPT, Gemini, or local models.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import partial
+from typing import AsyncGenerator, AsyncIterator, Dict, Generator, Iterator, List, Optional, Union
+
+History = Optional[List[Dict[str, str]]]
+"""Earlier turns as chronological {"role": "user"|"assistant", "content"} dicts."""
 
 
 @dataclass
@@ -29,6 +34,12 @@ class LLMResponse:
     output_tokens: int = 0
     """Token count for generated response."""
     
+    cache_read_tokens: int = 0
+    """Input tokens served from the provider's prompt cache."""
+    
+    cache_write_tokens: int = 0
+    """Input tokens written to the provider's prompt cache."""
+    
     raw_response: Optional[dict] = field(default=None, repr=False)
     """Full API response for debugging."""
     
@@ -46,6 +57,109 @@ class LLMResponse:
         return self.input_tokens + self.output_tokens
 
 
+class LLMStream:
+    """
+    Iterator over text deltas from a streaming generation.
+    
+    Iterate to receive chunks as they arrive. Once exhausted, `response`
+    holds the assembled LLMResponse (content, token counts, error).
+    """
+    
+    def __init__(self, chunks: Generator[str, None, LLMResponse]):
+        """
+        Args:
+            chunks: Generator yielding text deltas and returning the final LLMResponse.
+        """
+        self._chunks = chunks
+        self.response: Optional[LLMResponse] = None
+    
+    def __iter__(self) -> Iterator[str]:
+        self.response = yield from self._chunks
+    
+    def close(self) -> None:
+        """Abandon the stream (e.g. client disconnected)."""
+        self._chunks.close()
+
+
+class AsyncLLMStream:
+    """
+    Async iterator over text deltas from a streaming generation.
+    
+    Async counterpart of LLMStream: `async for` receives chunks, and once
+    exhausted `response` holds the assembled LLMResponse.
+    """
+    
+    def __init__(self, chunks: AsyncGenerator[Union[str, LLMResponse], None]):
+        """
+        Args:
+            chunks: Async generator yielding text deltas, then the final LLMResponse.
+        """
+        self._chunks = chunks
+        self.response: Optional[LLMResponse] = None
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for item in self._chunks:
+            if isinstance(item, LLMResponse):
+                self.response = item
+            else:
+                yield item
+    
+    async def aclose(self) -> None:
+        """Abandon the stream (e.g. client disconnected)."""
+        await self._chunks.aclose()
+
+
+@dataclass(frozen=True)
+class SystemPrompt:
+    """
+    System prompt split into a static prefix and a per-turn tail.
+    
+    Accepted anywhere a `system_prompt` string is. Providers that support
+    prompt caching mark the end of `static` as a cache breakpoint, so keep
+    it byte-identical across turns and put anything that varies per turn
+    in `dynamic`. str(prompt) is the full text.
+    """
+    
+    static: str
+    """Identical across turns (identity, stage, mode rules)."""
+    
+    dynamic: str = ""
+    """Per-turn text appended after the prefix, including its leading separator."""
+    
+    def __str__(self) -> str:
+        return self.static + self.dynamic
+    
+    def extend(self, text: str, separator: str = "\n\n") -> "SystemPrompt":
+        """New prompt with `text` appended to the dynamic tail."""
+        return SystemPrompt(self.static, f"{self.dynamic}{separator}{text}")
+
+
+def augment_system_prompt(system_prompt: Union[str, SystemPrompt, None],
+                          context: Optional[str]) -> Union[str, SystemPrompt, None]:
+    """
+    Append reflection context to a system prompt as an <ehko_context> block.
+    
+    Returns the system prompt unchanged when there is no context. For a
+    SystemPrompt the block goes in the dynamic tail, keeping the prefix stable.
+    """
+    if not context:
+        return system_prompt
+    
+    context_block = f"""<ehko_context>
+The following are relevant reflections and memories from the Forger's vault.
+Use these to inform your responses, but do not quote them verbatim.
+Speak about the Forger, not as the Forger.
+
+{context}
+</ehko_context>"""
+    
+    if isinstance(system_prompt, SystemPrompt):
+        return system_prompt.extend(context_block)
+    if system_prompt:
+        return f"{system_prompt}\n\n{context_block}"
+    return context_block
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -80,6 +194,7 @@ class LLMProvider(ABC):
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate a response from the LLM.
@@ -89,6 +204,7 @@ class LLMProvider(ABC):
             system_prompt: System instructions (Ehko behaviour rules).
             max_tokens: Maximum response length.
             temperature: Creativity control (0.0 = deterministic, 1.0 = creative).
+            history: Earlier conversation turns, sent before `prompt`.
         
         Returns:
             LLMResponse with generated content or error.
@@ -103,6 +219,7 @@ class LLMProvider(ABC):
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate response with injected reflection context.
@@ -113,12 +230,141 @@ class LLMProvider(ABC):
             system_prompt: System instructions.
             max_tokens: Maximum response length.
             temperature: Creativity control.
+            history: Earlier conversation turns, sent before `prompt`.
         
         Returns:
             LLMResponse with generated content or error.
         """
         pass
     
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: History = None,
+    ) -> LLMStream:
+        """
+        Generate a response, yielding text as it arrives.
+        
+        Providers with native streaming override `_stream`. The default
+        falls back to a single blocking `generate` call emitted as one chunk.
+        
+        Args:
+            prompt: User message/query.
+            system_prompt: System instructions (Ehko behaviour rules).
+            max_tokens: Maximum response length.
+            temperature: Creativity control.
+            history: Earlier conversation turns, sent before `prompt`.
+        
+        Returns:
+            LLMStream of text deltas; `stream.response` is set once exhausted.
+        """
+        return LLMStream(self._stream(prompt, system_prompt, max_tokens, temperature, history))
+    
+    def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> Generator[str, None, LLMResponse]:
+        """Non-streaming fallback: one chunk containing the full response."""
+        response = self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            history=history,
+        )
+        if response.success:
+            yield response.content
+        return response
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: History = None,
+    ) -> LLMResponse:
+        """
+        Async version of `generate` for ASGI callers.
+        
+        Providers with an async SDK client override this. The default runs
+        the blocking `generate` in the event loop's thread pool.
+        
+        Returns:
+            LLMResponse with generated content or error.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(
+            self.generate,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            history=history,
+        ))
+    
+    def agenerate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: History = None,
+    ) -> AsyncLLMStream:
+        """
+        Async version of `generate_stream`.
+        
+        Providers with an async SDK client override `_astream`.
+        
+        Returns:
+            AsyncLLMStream of text deltas; `stream.response` is set once exhausted.
+        """
+        return AsyncLLMStream(self._astream(prompt, system_prompt, max_tokens, temperature, history))
+    
+    async def _astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> AsyncGenerator[Union[str, LLMResponse], None]:
+        """Fallback: pull the blocking stream chunk by chunk in the thread pool."""
+        loop = asyncio.get_running_loop()
+        stream = self.generate_stream(prompt, system_prompt, max_tokens, temperature, history)
+        chunks = iter(stream)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            stream.close()
+        yield stream.response
+    
+    @staticmethod
+    def _messages(prompt: str, history: History = None) -> List[Dict[str, str]]:
+        """
+        Chat message list: history turns, then the prompt as a user turn.
+        
+        A trailing user turn in history is merged into the prompt so roles
+        keep alternating.
+        """
+        messages = [{"role": m["role"], "content": m["content"]} for m in history or []]
+        if messages and messages[-1]["role"] == "user":
+            messages[-1]["content"] = f"{messages[-1]['content']}\n\n{prompt}"
+        else:
+            messages.append({"role": "user", "content": prompt})
+        return messages
+    
     def test_connection(self) -> bool:
         """
         Verify API key and connectivity.
@@ -5,7 +5,7 @@ Uses the official Anthropic Python SDK.
 Install: pip install anthropic
 """
 
-from typing import Optional
+from typing import AsyncGenerator, Dict, Generator, List, Optional, Union
 
 try:
     import anthropic
@@ -13,7 +13,36 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
-from .base import LLMProvider, LLMResponse
+from .base import History, LLMProvider, LLMResponse, SystemPrompt, augment_system_prompt
+
+
+def system_blocks(system_prompt: Union[str, SystemPrompt]) -> Union[str, List[Dict]]:
+    """
+    Messages API `system` value for a prompt.
+    
+    A SystemPrompt becomes text blocks with a cache breakpoint after the
+    static prefix, so later turns read it from the prompt cache instead of
+    paying full input price for it. Plain strings are passed through.
+    """
+    if not isinstance(system_prompt, SystemPrompt):
+        return system_prompt
+    
+    blocks = [{
+        "type": "text",
+        "text": system_prompt.static,
+        "cache_control": {"type": "ephemeral"},
+    }]
+    if system_prompt.dynamic:
+        blocks.append({"type": "text", "text": system_prompt.dynamic})
+    return blocks
+
+
+def _cache_usage(usage) -> Dict[str, int]:
+    """Prompt cache token counts from a Messages API usage object."""
+    return {
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
 
 
 class ClaudeProvider(LLMProvider):
@@ -40,18 +69,67 @@ class ClaudeProvider(LLMProvider):
         
         super().__init__(api_key, model)
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
     
     @property
     def default_model(self) -> str:
         """Default to Claude Sonnet 4 for balance of quality and cost."""
         return "claude-sonnet-4-20250514"
     
+    def _request_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[Union[str, SystemPrompt]],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> Dict:
+        """Messages API arguments shared by the sync/async and streaming calls."""
+        kwargs = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": self._messages(prompt, history),
+        }
+        
+        if system_prompt:
+            kwargs["system"] = system_blocks(system_prompt)
+        
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        
+        return kwargs
+    
+    def _error_response(self, exc: Exception, content: str = "") -> LLMResponse:
+        """
+        LLMResponse for a failed call.
+        
+        Args:
+            exc: The exception raised by the SDK (or anything else).
+            content: Text already streamed before the failure.
+        """
+        if isinstance(exc, anthropic.AuthenticationError):
+            error = f"Authentication failed: {exc}"
+        elif isinstance(exc, anthropic.RateLimitError):
+            error = f"Rate limit exceeded: {exc}"
+        elif isinstance(exc, anthropic.APIError):
+            error = f"API error: {exc}"
+        else:
+            error = f"Unexpected error: {exc}"
+        
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            provider=self.PROVIDER_NAME,
+            error=error,
+        )
+    
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate response from Claude.
@@ -61,28 +139,15 @@ class ClaudeProvider(LLMProvider):
             system_prompt: System instructions for Ehko behaviour.
             max_tokens: Maximum response tokens.
             temperature: Creativity (0.0-1.0).
+            history: Earlier conversation turns, sent before the prompt.
         
         Returns:
             LLMResponse with content or error.
         """
         try:
-            # Build message payload
-            messages = [{"role": "user", "content": prompt}]
-            
-            # API call
-            kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "messages": messages,
-            }
-            
-            if system_prompt:
-                kwargs["system"] = system_prompt
-            
-            if temperature is not None:
-                kwargs["temperature"] = temperature
-            
-            response = self.client.messages.create(**kwargs)
+            response = self.client.messages.create(
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
+            )
             
             # Extract content
             content = ""
@@ -95,37 +160,112 @@ class ClaudeProvider(LLMProvider):
                 provider=self.PROVIDER_NAME,
                 input_tokens=response.usage.input_tokens,
                 output_tokens=response.usage.output_tokens,
+                **_cache_usage(response.usage),
                 raw_response=response.model_dump() if hasattr(response, "model_dump") else None,
             )
             
-        except anthropic.AuthenticationError as e:
+        except Exception as e:
+            return self._error_response(e)
+    
+    def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> Generator[str, None, LLMResponse]:
+        """
+        Stream response text from Claude via the Messages streaming API.
+        
+        Yields text deltas as they arrive and returns the assembled LLMResponse.
+        """
+        parts = []
+        try:
+            kwargs = self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
+            with self.client.messages.stream(**kwargs) as stream:
+                for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+                final = stream.get_final_message()
+            
             return LLMResponse(
-                content="",
+                content="".join(parts),
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"Authentication failed: {e}",
+                input_tokens=final.usage.input_tokens,
+                output_tokens=final.usage.output_tokens,
+                **_cache_usage(final.usage),
             )
-        except anthropic.RateLimitError as e:
-            return LLMResponse(
-                content="",
-                model=self.model,
-                provider=self.PROVIDER_NAME,
-                error=f"Rate limit exceeded: {e}",
+            
+        except Exception as e:
+            return self._error_response(e, "".join(parts))
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: History = None,
+    ) -> LLMResponse:
+        """
+        Generate response from Claude without blocking the event loop.
+        
+        Same arguments and result as `generate`, via AsyncAnthropic.
+        """
+        try:
+            response = await self.async_client.messages.create(
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
             )
-        except anthropic.APIError as e:
+            
+            content = ""
+            if response.content:
+                content = response.content[0].text
+            
             return LLMResponse(
-                content="",
+                content=content,
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"API error: {e}",
+                input_tokens=response.usage.input_tokens,
+                output_tokens=response.usage.output_tokens,
+                **_cache_usage(response.usage),
+                raw_response=response.model_dump() if hasattr(response, "model_dump") else None,
             )
+            
         except Exception as e:
-            return LLMResponse(
-                content="",
+            return self._error_response(e)
+    
+    async def _astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> AsyncGenerator[Union[str, LLMResponse], None]:
+        """Async Messages streaming: yields text deltas, then the final LLMResponse."""
+        parts = []
+        try:
+            kwargs = self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
+            async with self.async_client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+                final = await stream.get_final_message()
+            
+            yield LLMResponse(
+                content="".join(parts),
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"Unexpected error: {e}",
+                input_tokens=final.usage.input_tokens,
+                output_tokens=final.usage.output_tokens,
+                **_cache_usage(final.usage),
             )
+            return
+            
+        except Exception as e:
+            yield self._error_response(e, "".join(parts))
     
     def generate_with_context(
         self,
@@ -134,6 +274,7 @@ class ClaudeProvider(LLMProvider):
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate response with reflection context injected.
@@ -146,27 +287,15 @@ class ClaudeProvider(LLMProvider):
             system_prompt: Base system instructions.
             max_tokens: Maximum response tokens.
             temperature: Creativity (0.0-1.0).
+            history: Earlier conversation turns, sent before the prompt.
         
         Returns:
             LLMResponse with content or error.
         """
-        # Build augmented system prompt with context
-        context_block = f"""<ehko_context>
-The following are relevant reflections and memories from the Forger's vault.
-Use these to inform your responses, but do not quote them verbatim.
-Speak about the Forger, not as the Forger.
-
-{context}
-</ehko_context>"""
-        
-        if system_prompt:
-            augmented_system = f"{system_prompt}\n\n{context_block}"
-        else:
-            augmented_system = context_block
-        
         return self.generate(
             prompt=prompt,
-            system_prompt=augmented_system,
+            system_prompt=augment_system_prompt(system_prompt, context),
             max_tokens=max_tokens,
             temperature=temperature,
+            history=history,
         )
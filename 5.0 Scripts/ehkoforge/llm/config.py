@@ -58,6 +58,9 @@ class LLMConfig:
     temperature: float = 0.7
     """Default temperature for generation."""
     
+    history_token_budget: int = 1500
+    """Token budget for earlier chat turns sent with each Ehko reply."""
+    
     # Role-based provider routing
     processing_provider: str = "openai"
     """Provider for processing tasks (smelt, tier ops). Cost-optimised."""
@@ -91,6 +94,7 @@ class LLMConfig:
             - EHKO_DEFAULT_PROVIDER
             - EHKO_MAX_TOKENS
             - EHKO_TEMPERATURE
+            - EHKO_HISTORY_TOKENS
         
         Role-based settings:
             - EHKO_PROCESSING_PROVIDER
@@ -138,6 +142,9 @@ class LLMConfig:
         if os.environ.get("EHKO_TEMPERATURE"):
             config.temperature = float(os.environ["EHKO_TEMPERATURE"])
         
+        if os.environ.get("EHKO_HISTORY_TOKENS"):
+            config.history_token_budget = int(os.environ["EHKO_HISTORY_TOKENS"])
+        
         # Role-based settings
         config.processing_provider = os.environ.get("EHKO_PROCESSING_PROVIDER", "openai")
         config.processing_model = os.environ.get("EHKO_PROCESSING_MODEL", "gpt-4o-mini")
@@ -165,6 +172,7 @@ class LLMConfig:
             "default_provider": "claude",
             "max_tokens": 1024,
             "temperature": 0.7,
+            "history_token_budget": 1500,
             "processing_provider": "openai",
             "processing_model": "gpt-4o-mini",
             "conversation_provider": "claude",
@@ -199,6 +207,7 @@ class LLMConfig:
         config.default_provider = data.get("default_provider", "claude")
         config.max_tokens = data.get("max_tokens", 1024)
         config.temperature = data.get("temperature", 0.7)
+        config.history_token_budget = data.get("history_token_budget", 1500)
         
         # Role-based settings
         config.processing_provider = data.get("processing_provider", "openai")
@@ -226,6 +235,7 @@ class LLMConfig:
             "default_provider": self.default_provider,
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
+            "history_token_budget": self.history_token_budget,
             "processing_provider": self.processing_provider,
             "processing_model": self.processing_model,
             "conversation_provider": self.conversation_provider,
@@ -357,6 +367,9 @@ def create_default_config(config_dir: Path, db_path: Optional[Path] = None) -> L
             else:
                 config.providers[name] = env_provider
     
+    if os.environ.get("EHKO_HISTORY_TOKENS"):
+        config.history_token_budget = env_config.history_token_budget
+    
     # Also merge role settings from env if explicitly set
     if os.environ.get("EHKO_PROCESSING_PROVIDER"):
         config.processing_provider = env_config.processing_provider
@@ -6,9 +6,53 @@ for LLM prompts based on user queries.
 """
 
 import sqlite3
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+from ehkoforge.db import connect
+from ehkoforge.llm.context_packer import PackedContext, pack_context
+from ehkoforge.pillar_digest import (
+    PILLAR_FOLDER,
+    find_pillar_note,
+    identity_digest,
+    pillar_summary,
+)
+from ehkoforge.search_index import (
+    FTS_TABLE,
+    PREVIEW_CHARS,
+    bm25_expression,
+    build_match_query,
+    ensure_extensions_index,
+    ensure_preview_column,
+    ensure_search_index,
+    extract_preview,
+    index_generation,
+)
+from ehkoforge.vector_index import (
+    CANDIDATE_FACTOR,
+    SEMANTIC_WEIGHT,
+    VectorIndex,
+    manifest_path,
+)
+
+CORE_MEMORY_BOOST = 1.5
+"""Score multiplier for core memories when include_core_memories is set."""
+
+SEARCH_CACHE_SIZE = 128
+"""search_reflections results kept per builder (LRU)."""
+
+PREVIEW_CACHE_SIZE = 256
+"""Previews read from disk (reflections not yet re-indexed) kept in memory."""
+
+
+@lru_cache(maxsize=PREVIEW_CACHE_SIZE)
+def _read_preview(path: str, mtime_ns: int, size: int, max_chars: int) -> str:
+    """File preview, cached per (path, mtime, size) so edits invalidate it."""
+    return extract_preview(Path(path).read_text(encoding="utf-8"), max_chars)
 
 
 @dataclass
@@ -23,57 +67,126 @@ class ReflectionMatch:
     relevance_score: float
     is_core_memory: bool = False
     identity_pillar: Optional[str] = None
+    file_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class _Filters:
+    """SQL fragments for the mirrorwell_extensions side of a search."""
+    
+    has_extensions: bool
+    boost_core: bool
+    pillar: Optional[str] = None
+    
+    @property
+    def columns(self) -> str:
+        base = "ro.id, ro.title, ro.vault, ro.type, ro.file_path"
+        if self.has_extensions:
+            return f"{base}, me.core_memory, me.identity_pillar"
+        return f"{base}, 0 AS core_memory, NULL AS identity_pillar"
+    
+    @property
+    def join(self) -> str:
+        if self.has_extensions:
+            return "LEFT JOIN mirrorwell_extensions me ON me.object_id = ro.id"
+        return ""
+    
+    @property
+    def boost(self) -> str:
+        if self.boost_core:
+            return f"(CASE WHEN me.core_memory = 1 THEN {CORE_MEMORY_BOOST} ELSE 1.0 END)"
+        return "1.0"
 
 
 class EhkoContextBuilder:
     """
     Builds context from the reflection corpus for LLM prompts.
     
-    Phase 1: Keyword-based search using SQLite FTS or LIKE queries.
-    Phase 2: TF-IDF or embedding-based semantic search.
+    Phase 1: Keyword-based search using SQLite FTS5 (bm25 ranking), with
+    LIKE queries as the fallback when FTS5 is unavailable.
+    Phase 2: Blended with the local semantic index (ehkoforge.vector_index)
+    when ehko_refresh.py has built one.
     """
     
-    def __init__(self, database_path: Path, mirrorwell_root: Path):
+    def __init__(self, database_path: Path, mirrorwell_root: Path, semantic: bool = True):
         """
         Initialise context builder.
         
         Args:
             database_path: Path to ehko_index.db.
             mirrorwell_root: Path to Mirrorwell vault root.
+            semantic: Blend in the vector index when one exists (False =
+                      keyword ranking only).
         """
         self.database_path = database_path
         self.mirrorwell_root = mirrorwell_root
-        self._has_mirrorwell_extensions = None
+        self.semantic = semantic
+        self._has_mirrorwell_extensions = {}
+        self._search_index_ready = {}
+        self._preview_column_ready = {}
+        self._vector_index = (None, None, None)  # (manifest path, mtime_ns, index)
+        
+        # Search results keyed by index generation + normalised query
+        self._search_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._identity_digest = (None, "")  # (index generation, digest)
     
     def _get_db(self) -> sqlite3.Connection:
         """Get database connection with row factory (thread-safe)."""
-        conn = sqlite3.connect(str(self.database_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(self.database_path, row_factory=sqlite3.Row)
     
     def _check_schema(self, conn: sqlite3.Connection) -> bool:
-        """Check if mirrorwell_extensions table exists with expected columns."""
-        if self._has_mirrorwell_extensions is not None:
-            return self._has_mirrorwell_extensions
+        """
+        Check if mirrorwell_extensions exists with expected columns.
         
-        cursor = conn.cursor()
+        Probed once per database path for the life of the process (and
+        its pillar/core-memory index created on the way).
+        """
+        key = str(self.database_path)
+        if key not in self._has_mirrorwell_extensions:
+            try:
+                self._has_mirrorwell_extensions[key] = ensure_extensions_index(conn)
+            except sqlite3.Error:
+                self._has_mirrorwell_extensions[key] = False
+        return self._has_mirrorwell_extensions[key]
+    
+    def _check_search_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS index on first use (once per database path)."""
+        key = str(self.database_path)
+        if key not in self._search_index_ready:
+            try:
+                self._search_index_ready[key] = ensure_search_index(conn)
+            except sqlite3.Error:
+                self._search_index_ready[key] = False
+        return self._search_index_ready[key]
+    
+    def _check_preview_column(self, conn: sqlite3.Connection) -> bool:
+        """Add the stored-preview column on first use (once per database path)."""
+        key = str(self.database_path)
+        if key not in self._preview_column_ready:
+            try:
+                self._preview_column_ready[key] = ensure_preview_column(conn)
+            except sqlite3.Error:
+                self._preview_column_ready[key] = False
+        return self._preview_column_ready[key]
+    
+    def _get_vector_index(self) -> Optional[VectorIndex]:
+        """The semantic index for this database, reloaded after a rebuild."""
+        if not self.semantic:
+            return None
+        path = manifest_path(self.database_path)
         try:
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='mirrorwell_extensions'
-            """)
-            if not cursor.fetchone():
-                self._has_mirrorwell_extensions = False
-                return False
-            
-            # Check columns
-            cursor.execute("PRAGMA table_info(mirrorwell_extensions)")
-            columns = [row[1] for row in cursor.fetchall()]
-            self._has_mirrorwell_extensions = 'object_id' in columns
-            return self._has_mirrorwell_extensions
-        except Exception:
-            self._has_mirrorwell_extensions = False
-            return False
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        
+        cached_path, cached_mtime, index = self._vector_index
+        if cached_path != path or cached_mtime != mtime:
+            index = VectorIndex.load(self.database_path)
+            self._vector_index = (path, mtime, index)
+        return index
     
     def search_reflections(
         self,
@@ -83,7 +196,13 @@ class EhkoContextBuilder:
         pillar_filter: Optional[str] = None,
     ) -> list[ReflectionMatch]:
         """
-        Search reflections by keyword matching.
+        Search reflections by keyword matching, blended with semantic
+        similarity when a vector index is available.
+        
+        Results are cached until the index generation changes (the
+        indexer and the Forge bump it), keyed by the query as every search
+        path reads it (lowercased, whitespace collapsed) and the search
+        parameters.
         
         Args:
             query: User query to match against.
@@ -94,19 +213,176 @@ class EhkoContextBuilder:
         Returns:
             List of ReflectionMatch objects sorted by relevance.
         """
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+        
         conn = self._get_db()
+        try:
+            index = self._get_vector_index()
+            key = (
+                index_generation(conn),
+                index.build_id if index is not None else None,
+                " ".join(query.lower().split()),
+                limit,
+                include_core_memories,
+                pillar_filter.lower() if pillar_filter else None,
+            )
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+            
+            matches = self._search(conn, index, query, match_query, limit,
+                                   include_core_memories, pillar_filter)
+            self._cache_put(key, matches)
+            return matches
+        finally:
+            conn.close()
+    
+    def _search(self, conn: sqlite3.Connection, index: Optional[VectorIndex], query: str,
+                match_query: str, limit: int, include_core_memories: bool,
+                pillar_filter: Optional[str]) -> list[ReflectionMatch]:
+        """Run a search on the best available path (FTS, blended or LIKE)."""
+        has_extensions = self._check_schema(conn)
+        if pillar_filter and not has_extensions:
+            return []  # no pillar data to filter on
+        boost_core = include_core_memories and has_extensions
+        
+        if self._check_search_index(conn):
+            filters = _Filters(has_extensions, boost_core, pillar_filter)
+            if index is None:
+                matches = self._search_fts(conn, match_query, limit, filters)
+            else:
+                matches = self._search_blended(conn, index, query, match_query, limit, filters)
+        else:
+            matches = self._search_like(
+                conn, query, limit * CANDIDATE_FACTOR if has_extensions else limit)
+            if has_extensions:
+                matches = self._apply_extensions(conn, matches, boost_core, pillar_filter)[:limit]
+        self._load_previews(conn, matches)
+        return matches
+    
+    def _cache_get(self, key: tuple) -> Optional[list[ReflectionMatch]]:
+        with self._cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is None:
+                self._cache_misses += 1
+                return None
+            self._search_cache.move_to_end(key)
+            self._cache_hits += 1
+        return [replace(match) for match in cached]
+    
+    def _cache_put(self, key: tuple, matches: list[ReflectionMatch]):
+        stored = tuple(replace(match) for match in matches)
+        with self._cache_lock:
+            # Entries from older generations can never hit again
+            stale = [k for k in self._search_cache if k[:2] != key[:2]]
+            for k in stale:
+                del self._search_cache[k]
+            self._search_cache[key] = stored
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+    
+    def cache_stats(self) -> Dict:
+        """Search cache counters (hits, misses, size) for /api/metrics."""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": round(self._cache_hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._search_cache),
+                "capacity": SEARCH_CACHE_SIZE,
+            }
+    
+    def clear_cache(self):
+        """Drop cached search results (counters are kept)."""
+        with self._cache_lock:
+            self._search_cache.clear()
+    
+    def _search_fts(self, conn: sqlite3.Connection, match_query: str, limit: int,
+                    filters: _Filters) -> list[ReflectionMatch]:
+        """
+        One MATCH over title, tags, emotions and body, ranked by bm25.
+        
+        The pillar filter is applied inside the MATCH (via the
+        (identity_pillar, core_memory) index). With the core-memory boost
+        on, the best limit * CANDIDATE_FACTOR keyword hits are re-ranked.
+        """
+        pillar_sql, params = "", [match_query]
+        if filters.pillar:
+            pillar_sql = """AND rowid IN (SELECT object_id FROM mirrorwell_extensions
+                                          WHERE identity_pillar = ? COLLATE NOCASE)"""
+            params.append(filters.pillar)
+        window = limit * CANDIDATE_FACTOR if filters.boost_core else limit
+        
+        rows = conn.execute(f"""
+            SELECT {filters.columns}, -f.score * {filters.boost} AS relevance
+            FROM (
+                SELECT rowid, {bm25_expression()} AS score
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH ? {pillar_sql}
+                ORDER BY score
+                LIMIT ?
+            ) f
+            JOIN reflection_objects ro ON ro.id = f.rowid
+            {filters.join}
+            ORDER BY relevance DESC
+            LIMIT ?
+        """, params + [window, limit]).fetchall()
+        
+        # bm25 is negative, lower = better; relevance is its boosted negation
+        return [self._row_to_match_simple(row, None, row["relevance"]) for row in rows]
+    
+    def _search_blended(self, conn: sqlite3.Connection, index: VectorIndex, query: str,
+                        match_query: str, limit: int, filters: _Filters) -> list[ReflectionMatch]:
+        """
+        FTS and semantic candidates, re-ranked on a blended score.
+        
+        bm25 is scaled to 0..1 by the best keyword hit and mixed with cosine
+        similarity (SEMANTIC_WEIGHT), so a reflection that shares no words
+        with the query can still surface on meaning alone.
+        """
+        candidates = limit * CANDIDATE_FACTOR
+        keyword = self._search_fts(conn, match_query, candidates, filters)
+        embedded = index.embed(query)
+        if embedded is None:
+            return keyword[:limit]
+        
+        semantic = dict(index.search(embedded, candidates))
+        semantic.update(index.scores(embedded, [m.id for m in keyword if m.id not in semantic]))
+        
+        by_id = {m.id: m for m in keyword}
+        missing = [object_id for object_id in semantic if object_id not in by_id]
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            pillar_sql = "AND me.identity_pillar = ? COLLATE NOCASE" if filters.pillar else ""
+            params = missing + ([filters.pillar] if filters.pillar else [])
+            for row in conn.execute(f"""
+                SELECT {filters.columns} FROM reflection_objects ro
+                {filters.join}
+                WHERE ro.id IN ({placeholders}) {pillar_sql}
+            """, params):
+                by_id[row["id"]] = self._row_to_match_simple(row, None, 0.0)
+        
+        best = max((m.relevance_score for m in keyword), default=0.0) or 1.0
+        for match in by_id.values():
+            similarity = max(semantic.get(match.id, 0.0), 0.0)
+            if filters.boost_core and match.is_core_memory:
+                similarity *= CORE_MEMORY_BOOST
+            match.relevance_score = ((1 - SEMANTIC_WEIGHT) * match.relevance_score / best
+                                     + SEMANTIC_WEIGHT * similarity)
+        
+        return sorted(by_id.values(), key=lambda m: m.relevance_score, reverse=True)[:limit]
+    
+    def _search_like(self, conn: sqlite3.Connection, query: str,
+                     limit: int) -> list[ReflectionMatch]:
+        """Substring scans per keyword (databases without FTS5)."""
         cursor = conn.cursor()
         
         # Extract keywords from query (simple tokenisation)
         keywords = [w.lower().strip() for w in query.split() if len(w) > 2]
         
-        if not keywords:
-            conn.close()
-            return []
-        
-        # Check if we have mirrorwell_extensions
-        has_extensions = self._check_schema(conn)
-        
         matches = []
         
         for keyword in keywords:
@@ -153,8 +429,6 @@ class EhkoContextBuilder:
                 # emotional_tags table might not exist
                 pass
         
-        conn.close()
-        
         # Deduplicate and aggregate scores
         seen = {}
         for match in matches:
@@ -172,28 +446,78 @@ class EhkoContextBuilder:
         
         return sorted_matches[:limit]
     
+    def _apply_extensions(self, conn: sqlite3.Connection, matches: list[ReflectionMatch],
+                          boost_core: bool, pillar_filter: Optional[str]) -> list[ReflectionMatch]:
+        """Core-memory / pillar data for LIKE matches: filter, boost, re-sort."""
+        if not matches:
+            return matches
+        
+        placeholders = ",".join("?" * len(matches))
+        extensions = {row["object_id"]: row for row in conn.execute(f"""
+            SELECT object_id, core_memory, identity_pillar FROM mirrorwell_extensions
+            WHERE object_id IN ({placeholders})
+        """, [m.id for m in matches])}
+        
+        kept = []
+        for match in matches:
+            extension = extensions.get(match.id)
+            if extension is not None:
+                match.is_core_memory = bool(extension["core_memory"])
+                match.identity_pillar = extension["identity_pillar"]
+            if pillar_filter and (match.identity_pillar or "").lower() != pillar_filter.lower():
+                continue
+            if boost_core and match.is_core_memory:
+                match.relevance_score *= CORE_MEMORY_BOOST
+            kept.append(match)
+        
+        return sorted(kept, key=lambda m: m.relevance_score, reverse=True)
+    
     def _row_to_match_simple(
         self, 
         row: sqlite3.Row, 
-        matched_keyword: str,
+        matched_keyword: Optional[str],
         base_score: float
     ) -> ReflectionMatch:
-        """Convert database row to ReflectionMatch (simple version)."""
-        # Try to get content preview from file
-        content_preview = self._get_content_preview(row["file_path"])
-        
+        """Convert database row to ReflectionMatch (preview loaded later)."""
+        keys = row.keys()
         return ReflectionMatch(
             id=row["id"],
             title=row["title"],
             vault=row["vault"],
             type=row["type"],
-            content_preview=content_preview,
+            content_preview="",
             relevance_score=base_score,
-            is_core_memory=False,
-            identity_pillar=None,
+            is_core_memory=bool(row["core_memory"]) if "core_memory" in keys else False,
+            identity_pillar=row["identity_pillar"] if "identity_pillar" in keys else None,
+            file_path=row["file_path"],
         )
     
-    def _get_content_preview(self, file_path: Optional[str], max_chars: int = 500) -> str:
+    def _load_previews(self, conn: sqlite3.Connection, matches: list[ReflectionMatch]):
+        """
+        Fill content_preview for the final matches.
+        
+        Stored previews come from one query; reflections indexed before
+        previews were stored fall back to reading the file (LRU-cached).
+        """
+        if not matches:
+            return
+        
+        stored = {}
+        if self._check_preview_column(conn):
+            placeholders = ",".join("?" * len(matches))
+            rows = conn.execute(f"""
+                SELECT id, content_preview FROM reflection_objects
+                WHERE id IN ({placeholders}) AND content_preview IS NOT NULL
+            """, [m.id for m in matches]).fetchall()
+            stored = {row["id"]: row["content_preview"] for row in rows}
+        
+        for match in matches:
+            if match.id in stored:
+                match.content_preview = stored[match.id]
+            else:
+                match.content_preview = self._get_content_preview(match.file_path)
+    
+    def _get_content_preview(self, file_path: Optional[str], max_chars: int = PREVIEW_CHARS) -> str:
         """
         Extract content preview from reflection file.
         
@@ -211,28 +535,8 @@ class EhkoContextBuilder:
             if not path.exists():
                 return ""
             
-            content = path.read_text(encoding="utf-8")
-            
-            # Try to extract Raw Input section
-            if "## 0. Raw Input" in content:
-                start = content.find("## 0. Raw Input")
-                end = content.find("##", start + 20)
-                if end == -1:
-                    end = len(content)
-                raw_input = content[start:end].strip()
-                # Remove header
-                raw_input = raw_input.replace("## 0. Raw Input (Preserved)", "").strip()
-                raw_input = raw_input.replace("## 0. Raw Input", "").strip()
-                return raw_input[:max_chars]
-            
-            # Fallback: extract after frontmatter
-            if "---" in content:
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    body = parts[2].strip()
-                    return body[:max_chars]
-            
-            return content[:max_chars]
+            stat = path.stat()
+            return _read_preview(str(path), stat.st_mtime_ns, stat.st_size, max_chars)
             
         except Exception:
             return ""
@@ -249,34 +553,33 @@ class EhkoContextBuilder:
         Args:
             query: User query to find relevant context for.
             max_reflections: Maximum reflections to include.
-            max_tokens_estimate: Rough token budget (chars / 4).
+            max_tokens_estimate: Token budget (local estimate, see estimate_tokens).
         
         Returns:
             Formatted context string for system prompt.
         """
-        matches = self.search_reflections(query, limit=max_reflections)
-        
-        if not matches:
-            return ""
-        
-        # Build context blocks
-        blocks = []
-        char_budget = max_tokens_estimate * 4  # Rough chars-to-tokens
-        chars_used = 0
-        
-        for match in matches:
-            block = f"""### {match.title}
-Type: {match.type} | Vault: {match.vault}
-
-{match.content_preview}
-"""
-            if chars_used + len(block) > char_budget:
-                break
-            
-            blocks.append(block)
-            chars_used += len(block)
+        return self.build_packed_context(query, max_reflections, max_tokens_estimate).text
+    
+    def build_packed_context(
+        self,
+        query: str,
+        max_reflections: int = 3,
+        max_tokens: int = 2000,
+    ) -> PackedContext:
+        """
+        build_context, returning the PackedContext (token count, duplicates
+        skipped, whether the last reflection was truncated).
         
-        return "\n---\n".join(blocks)
+        Fetches a few extra matches so near-duplicates can be skipped
+        without leaving the budget unused.
+        """
+        matches = self.search_reflections(query, limit=max_reflections * 2)
+        sections = [
+            (f"### {match.title}\nType: {match.type} | Vault: {match.vault}",
+             match.content_preview)
+            for match in matches
+        ]
+        return pack_context(sections, max_tokens, max_sections=max_reflections)
     
     def get_core_memories(self, limit: int = 10) -> list[ReflectionMatch]:
         """
@@ -305,17 +608,18 @@ Type: {match.type} | Vault: {match.vault}
             
             matches = []
             for row in cursor.fetchall():
-                content_preview = self._get_content_preview(row["file_path"])
                 matches.append(ReflectionMatch(
                     id=row["id"],
                     title=row["title"],
                     vault=row["vault"],
                     type=row["type"],
-                    content_preview=content_preview,
+                    content_preview="",
                     relevance_score=1.0,
                     is_core_memory=True,
                     identity_pillar=row["identity_pillar"],
+                    file_path=row["file_path"],
                 ))
+            self._load_previews(conn, matches)
             
             conn.close()
             return matches
@@ -323,33 +627,45 @@ Type: {match.type} | Vault: {match.vault}
             conn.close()
             return []
     
+    def get_identity_digest(self) -> str:
+        """
+        Core memory and pillar digests for identity grounding in system prompts.
+        
+        Read from the pillar_digest table ehko_refresh.py maintains, and
+        re-read only when the index generation changes.
+        
+        Returns:
+            Digest text ("" if none has been built).
+        """
+        conn = self._get_db()
+        try:
+            generation = index_generation(conn)
+            cached_generation, digest = self._identity_digest
+            if cached_generation != generation:
+                digest = identity_digest(conn)
+                self._identity_digest = (generation, digest)
+            return digest
+        finally:
+            conn.close()
+    
     def get_pillar_summary(self, pillar_name: str) -> Optional[str]:
         """
         Get summary content for an identity pillar.
         
+        Uses the stored pillar note from pillar_digest when there is one,
+        else reads the pillar file.
+        
         Args:
             pillar_name: Pillar name (e.g., "The Web", "The Thread").
         
         Returns:
             Pillar summary content or None.
         """
-        # Look for pillar file in Mirrorwell
-        pillar_dir = self.mirrorwell_root / "1_Core Identity" / "1.1 Pillars"
-        
-        if not pillar_dir.exists():
-            return None
-        
-        # Find matching pillar file
-        for file in pillar_dir.glob("*.md"):
-            if pillar_name.lower().replace("the ", "") in file.stem.lower():
-                try:
-                    content = file.read_text(encoding="utf-8")
-                    # Extract after frontmatter
-                    if "---" in content:
-                        parts = content.split("---", 2)
-                        if len(parts) >= 3:
-                            return parts[2].strip()[:1500]
-                except Exception:
-                    pass
-        
-        return None
+        conn = self._get_db()
+        try:
+            stored = pillar_summary(conn, pillar_name)
+        finally:
+            conn.close()
+        if stored:
+            return stored
+        return find_pillar_note(self.mirrorwell_root / PILLAR_FOLDER, pillar_name)
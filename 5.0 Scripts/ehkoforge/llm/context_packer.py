@@ -0,0 +1,188 @@
+"""
+Token-budgeted packing of reflection context.
+
+Takes ranked (header, body) sections and fits as many as possible into a
+token budget, measured with the same local estimator as the chat history
+window (estimate_tokens):
+
+- Near-duplicate bodies (e.g. a reflection forged twice from the same raw
+  input) are dropped by comparing hashed word shingles.
+- The first section that doesn't fit is cut at a sentence boundary (words,
+  if no whole sentence fits) to use the rest of the budget, and packing
+  stops there.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .conversation import estimate_tokens
+
+SEPARATOR = "\n---\n"
+"""Placed between packed sections."""
+
+SHINGLE_SIZE = 4
+"""Words per shingle for duplicate detection."""
+
+DUPLICATE_THRESHOLD = 0.6
+"""Shingle Jaccard similarity at or above which a body counts as a repeat."""
+
+MIN_TRUNCATED_TOKENS = 24
+"""Smallest body worth including as a truncated last section."""
+
+ELLIPSIS = "…"
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class PackedContext:
+    """Packed context text plus what went into it."""
+    
+    text: str = ""
+    
+    tokens: int = 0
+    """Estimated tokens in text."""
+    
+    sections: int = 0
+    """Sections included (a truncated one counts)."""
+    
+    duplicates: int = 0
+    """Sections skipped as near-duplicates of an included one."""
+    
+    dropped: int = 0
+    """Sections left out for lack of budget."""
+    
+    truncated: bool = False
+    """True if the last included section was cut to fit."""
+    
+    def to_dict(self) -> Dict:
+        return {
+            "tokens": self.tokens,
+            "sections": self.sections,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+            "truncated": self.truncated,
+        }
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """CRC32 hashes of the overlapping `size`-word runs in text (lowercased)."""
+    words = _WORD.findall((text or "").lower())
+    if not words:
+        return frozenset()
+    if len(words) <= size:
+        return frozenset([zlib.crc32(" ".join(words).encode("utf-8"))])
+    return frozenset(zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+                     for i in range(len(words) - size + 1))
+
+
+def similarity(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard similarity of two shingle sets (0.0 if either is empty)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Longest prefix of text within `budget` tokens.
+    
+    Whole sentences are preferred; if not even the first sentence fits,
+    whole words are kept and an ellipsis marks the cut.
+    
+    Returns:
+        The prefix ("" if nothing fits).
+    """
+    text = " ".join(text.split())
+    if estimate_tokens(text) <= budget:
+        return text
+    
+    kept, used = [], 0
+    for sentence in _SENTENCE_END.split(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > budget:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return " ".join(kept)
+    
+    room = budget - estimate_tokens(ELLIPSIS)
+    words, used = [], 0
+    for word in text.split():
+        cost = estimate_tokens(word)
+        if used + cost > room:
+            break
+        words.append(word)
+        used += cost
+    return " ".join(words) + ELLIPSIS if words else ""
+
+
+def _section(header: str, body: str) -> str:
+    return f"{header}\n\n{body}\n"
+
+
+def pack_context(sections: Sequence[Tuple[str, str]], max_tokens: int,
+                 max_sections: Optional[int] = None) -> PackedContext:
+    """
+    Fit ranked sections into a token budget.
+    
+    Args:
+        sections: (header, body) pairs, best first. Headers are never cut.
+        max_tokens: Budget for the packed text, separators included.
+        max_sections: Stop after this many sections (None = no limit).
+    
+    Returns:
+        PackedContext (tokens never exceeds max_tokens).
+    """
+    packed = PackedContext()
+    separator_cost = estimate_tokens(SEPARATOR)
+    blocks: List[str] = []
+    seen: List[FrozenSet[int]] = []
+    
+    for position, (header, body) in enumerate(sections):
+        if max_sections is not None and len(blocks) >= max_sections:
+            break
+        
+        body = (body or "").strip()
+        signature = shingles(body)
+        if any(similarity(signature, other) >= DUPLICATE_THRESHOLD for other in seen):
+            packed.duplicates += 1
+            continue
+        
+        overhead = separator_cost if blocks else 0
+        block = _section(header, body)
+        cost = estimate_tokens(block) + overhead
+        if packed.tokens + cost <= max_tokens:
+            blocks.append(block)
+            seen.append(signature)
+            packed.tokens += cost
+            continue
+        
+        # Doesn't fit: cut it to fill the remaining budget, then stop
+        room = max_tokens - packed.tokens - overhead - estimate_tokens(_section(header, ""))
+        cut = truncate_to_tokens(body, room) if room >= MIN_TRUNCATED_TOKENS else ""
+        if cut:
+            blocks.append(_section(header, cut))
+            packed.tokens += estimate_tokens(blocks[-1]) + overhead
+            packed.truncated = True
+        packed.dropped = len(sections) - position - (1 if cut else 0)
+        if max_sections is not None:
+            packed.dropped = min(packed.dropped, max_sections - len(blocks))
+        break
+    
+    packed.text = SEPARATOR.join(blocks)
+    packed.sections = len(blocks)
+    return packed
+
+
+__all__ = [
+    "PackedContext",
+    "pack_context",
+    "shingles",
+    "similarity",
+    "truncate_to_tokens",
+]
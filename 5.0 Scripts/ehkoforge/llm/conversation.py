@@ -0,0 +1,191 @@
+"""
+Conversation window builder.
+
+Turns role-tagged chat history into the message list sent to a provider.
+The newest turns are kept verbatim within a token budget; older turns that
+overflow are condensed into a short extractive summary (no LLM call) or
+dropped once the summary allowance is used up.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Forge roles -> provider message roles
+ROLE_MAP = {
+    "user": "user",
+    "ehko": "assistant",
+    "assistant": "assistant",
+}
+
+MESSAGE_OVERHEAD_TOKENS = 4
+"""Per-message framing cost (role markers, separators)."""
+
+SUMMARY_RATIO = 0.2
+"""Share of the budget reserved for the summary when turns overflow."""
+
+SUMMARY_LINE_CHARS = 160
+"""Longest excerpt kept per summarised turn."""
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate BPE token count locally (no tokenizer dependency).
+    
+    Counts words, digit runs and punctuation marks; words longer than six
+    letters count one extra token per six letters, which tracks common
+    English BPE vocabularies more closely than a flat chars/4 rule.
+    """
+    if not text:
+        return 0
+    
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if piece.isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif piece.isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+@dataclass
+class ConversationWindow:
+    """History that fits the budget, ready to pass as `history=`."""
+    
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    """Chronological {"role", "content"} dicts, starting with a user turn."""
+    
+    summary: Optional[str] = None
+    """Condensed older turns, for the system prompt (None if nothing overflowed)."""
+    
+    summarised: int = 0
+    """Older turns represented in the summary."""
+    
+    dropped: int = 0
+    """Older turns left out entirely."""
+    
+    tokens: int = 0
+    """Estimated tokens for messages + summary."""
+    
+    def to_dict(self) -> Dict:
+        return {
+            "messages": self.messages,
+            "summary": self.summary,
+            "summarised": self.summarised,
+            "dropped": self.dropped,
+            "tokens": self.tokens,
+        }
+
+
+def _normalise(history: List[Dict]) -> List[Dict[str, str]]:
+    """Map roles, skip unknown/empty turns, merge consecutive same-role turns."""
+    turns: List[Dict[str, str]] = []
+    for message in history:
+        role = ROLE_MAP.get(message.get("role"))
+        content = (message.get("content") or "").strip()
+        if not role or not content:
+            continue
+        if turns and turns[-1]["role"] == role:
+            turns[-1] = {"role": role, "content": f"{turns[-1]['content']}\n\n{content}"}
+        else:
+            turns.append({"role": role, "content": content})
+    return turns
+
+
+def _turn_cost(turn: Dict[str, str]) -> int:
+    return estimate_tokens(turn["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _split(turns: List[Dict[str, str]], budget: int):
+    """Newest-first fill. Returns (kept, overflow), both chronological."""
+    used = 0
+    start = len(turns)
+    while start > 0 and used + _turn_cost(turns[start - 1]) <= budget:
+        start -= 1
+        used += _turn_cost(turns[start])
+    
+    # Providers expect the first message to be from the user
+    while start < len(turns) and turns[start]["role"] != "user":
+        start += 1
+    
+    return turns[start:], turns[:start]
+
+
+def _excerpt(text: str) -> str:
+    """First sentence of a turn, clipped to SUMMARY_LINE_CHARS."""
+    first = _SENTENCE_END.split(" ".join(text.split()), maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[:SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + "…"
+    return first
+
+
+def _summarise(overflow: List[Dict[str, str]], budget: int):
+    """
+    Extractive summary of the newest overflowed turns that fit `budget`.
+    
+    Returns (summary or None, turns summarised).
+    """
+    header = "Condensed earlier turns:"
+    used = estimate_tokens(header)
+    lines: List[str] = []
+    for turn in reversed(overflow):
+        speaker = "Forger" if turn["role"] == "user" else "Ehko"
+        line = f"- {speaker}: {_excerpt(turn['content'])}"
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    
+    if not lines:
+        return None, 0
+    return "\n".join([header] + lines[::-1]), len(lines)
+
+
+def build_conversation_window(history: List[Dict], max_tokens: int = 1500,
+                              summary_ratio: float = SUMMARY_RATIO) -> ConversationWindow:
+    """
+    Fit chat history into a token budget.
+    
+    Args:
+        history: Chronological {"role", "content"} dicts, excluding the
+                 message being answered. Roles 'user' and 'ehko'/'assistant'.
+        max_tokens: Budget for history messages plus summary.
+        summary_ratio: Share of the budget reserved for the summary of
+                       overflowed turns (0 disables summarising: they are dropped).
+    
+    Returns:
+        ConversationWindow.
+    """
+    turns = _normalise(history)
+    kept, overflow = _split(turns, max_tokens)
+    
+    summary, summarised = None, 0
+    if overflow and summary_ratio > 0:
+        reserve = int(max_tokens * summary_ratio)
+        reserved_kept, reserved_overflow = _split(turns, max_tokens - reserve)
+        summary, summarised = _summarise(reserved_overflow, reserve)
+        if summary:
+            kept, overflow = reserved_kept, reserved_overflow
+    
+    tokens = sum(_turn_cost(turn) for turn in kept) + estimate_tokens(summary or "")
+    return ConversationWindow(
+        messages=kept,
+        summary=summary,
+        summarised=summarised,
+        dropped=len(overflow) - summarised,
+        tokens=tokens,
+    )
+
+
+__all__ = [
+    "ConversationWindow",
+    "build_conversation_window",
+    "estimate_tokens",
+]
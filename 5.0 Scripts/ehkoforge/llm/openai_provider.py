@@ -5,7 +5,7 @@ Uses the official OpenAI Python SDK.
 Install: pip install openai
 """
 
-from typing import Optional
+from typing import AsyncGenerator, Dict, Generator, Optional, Union
 
 try:
     import openai
@@ -13,7 +13,7 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
-from .base import LLMProvider, LLMResponse
+from .base import History, LLMProvider, LLMResponse, augment_system_prompt
 
 
 class OpenAIProvider(LLMProvider):
@@ -45,18 +45,67 @@ class OpenAIProvider(LLMProvider):
         
         super().__init__(api_key, model)
         self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key)
     
     @property
     def default_model(self) -> str:
         """Default to GPT-4o-mini for cost-effective processing."""
         return "gpt-4o-mini"
     
+    def _request_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> Dict:
+        """Chat completions arguments shared by the sync/async and streaming calls."""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": str(system_prompt)})
+        
+        messages.extend(self._messages(prompt, history))
+        
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+    
+    def _error_response(self, exc: Exception, content: str = "") -> LLMResponse:
+        """
+        LLMResponse for a failed call.
+        
+        Args:
+            exc: The exception raised by the SDK (or anything else).
+            content: Text already streamed before the failure.
+        """
+        if isinstance(exc, openai.AuthenticationError):
+            error = f"Authentication failed: {exc}"
+        elif isinstance(exc, openai.RateLimitError):
+            error = f"Rate limit exceeded: {exc}"
+        elif isinstance(exc, openai.APIError):
+            error = f"API error: {exc}"
+        else:
+            error = f"Unexpected error: {exc}"
+        
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            provider=self.PROVIDER_NAME,
+            error=error,
+        )
+    
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate response from OpenAI.
@@ -66,25 +115,14 @@ class OpenAIProvider(LLMProvider):
             system_prompt: System instructions for behaviour.
             max_tokens: Maximum response tokens.
             temperature: Creativity (0.0-2.0 for OpenAI).
+            history: Earlier conversation turns, sent before the prompt.
         
         Returns:
             LLMResponse with content or error.
         """
         try:
-            # Build messages array
-            messages = []
-            
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            messages.append({"role": "user", "content": prompt})
-            
-            # API call
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
             )
             
             # Extract content
@@ -108,34 +146,134 @@ class OpenAIProvider(LLMProvider):
                 raw_response=response.model_dump() if hasattr(response, "model_dump") else None,
             )
             
-        except openai.AuthenticationError as e:
-            return LLMResponse(
-                content="",
-                model=self.model,
-                provider=self.PROVIDER_NAME,
-                error=f"Authentication failed: {e}",
+        except Exception as e:
+            return self._error_response(e)
+    
+    def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> Generator[str, None, LLMResponse]:
+        """
+        Stream response text from OpenAI chat completions.
+        
+        Yields text deltas as they arrive and returns the assembled LLMResponse.
+        Usage is requested via stream_options and arrives on the final chunk.
+        """
+        parts = []
+        input_tokens = 0
+        output_tokens = 0
+        try:
+            stream = self.client.chat.completions.create(
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history),
+                stream=True,
+                stream_options={"include_usage": True},
             )
-        except openai.RateLimitError as e:
+            
+            for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                if chunk.usage:
+                    input_tokens = chunk.usage.prompt_tokens
+                    output_tokens = chunk.usage.completion_tokens
+            
             return LLMResponse(
-                content="",
+                content="".join(parts),
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"Rate limit exceeded: {e}",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
             )
-        except openai.APIError as e:
+            
+        except Exception as e:
+            return self._error_response(e, "".join(parts))
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: History = None,
+    ) -> LLMResponse:
+        """
+        Generate response from OpenAI without blocking the event loop.
+        
+        Same arguments and result as `generate`, via AsyncOpenAI.
+        """
+        try:
+            response = await self.async_client.chat.completions.create(
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history)
+            )
+            
+            content = ""
+            if response.choices:
+                content = response.choices[0].message.content or ""
+            
+            input_tokens = 0
+            output_tokens = 0
+            if response.usage:
+                input_tokens = response.usage.prompt_tokens
+                output_tokens = response.usage.completion_tokens
+            
             return LLMResponse(
-                content="",
+                content=content,
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"API error: {e}",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                raw_response=response.model_dump() if hasattr(response, "model_dump") else None,
             )
+            
         except Exception as e:
-            return LLMResponse(
-                content="",
+            return self._error_response(e)
+    
+    async def _astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        history: History = None,
+    ) -> AsyncGenerator[Union[str, LLMResponse], None]:
+        """Async chat completions stream: yields text deltas, then the final LLMResponse."""
+        parts = []
+        input_tokens = 0
+        output_tokens = 0
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **self._request_kwargs(prompt, system_prompt, max_tokens, temperature, history),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            
+            async for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                if chunk.usage:
+                    input_tokens = chunk.usage.prompt_tokens
+                    output_tokens = chunk.usage.completion_tokens
+            
+            yield LLMResponse(
+                content="".join(parts),
                 model=self.model,
                 provider=self.PROVIDER_NAME,
-                error=f"Unexpected error: {e}",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
             )
+            return
+            
+        except Exception as e:
+            yield self._error_response(e, "".join(parts))
     
     def generate_with_context(
         self,
@@ -144,6 +282,7 @@ class OpenAIProvider(LLMProvider):
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        history: History = None,
     ) -> LLMResponse:
         """
         Generate response with reflection context injected.
@@ -156,27 +295,15 @@ class OpenAIProvider(LLMProvider):
             system_prompt: Base system instructions.
             max_tokens: Maximum response tokens.
             temperature: Creativity (0.0-2.0).
+            history: Earlier conversation turns, sent before the prompt.
         
         Returns:
             LLMResponse with content or error.
         """
-        # Build augmented system prompt with context
-        context_block = f"""<ehko_context>
-The following are relevant reflections and memories from the Forger's vault.
-Use these to inform your responses, but do not quote them verbatim.
-Speak about the Forger, not as the Forger.
-
-{context}
-</ehko_context>"""
-        
-        if system_prompt:
-            augmented_system = f"{system_prompt}\n\n{context_block}"
-        else:
-            augmented_system = context_block
-        
         return self.generate(
             prompt=prompt,
-            system_prompt=augmented_system,
+            system_prompt=augment_system_prompt(system_prompt, context),
             max_tokens=max_tokens,
             temperature=temperature,
+            history=history,
         )
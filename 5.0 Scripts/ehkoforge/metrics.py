@@ -0,0 +1,147 @@
+"""
+Lightweight latency metrics.
+
+Named spans time a block of code and feed a per-name rolling window of
+durations, from which p50/p95/p99 are reported. Spans opened inside a
+trace() are also collected for that request, e.g. for a Server-Timing
+header.
+
+Usage:
+    metrics = Metrics()
+    with metrics.trace() as trace:
+        with metrics.span("provider_call"):
+            response = provider.generate(...)
+    print(trace.server_timing())
+    print(metrics.snapshot()["provider_call"]["p95_ms"])
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("ehko_metrics_trace", default=None)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 if empty)."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
+
+
+@dataclass
+class Trace:
+    """Spans recorded during one request, in completion order."""
+    
+    spans: List[Tuple[str, float]] = field(default_factory=list)
+    """(name, seconds) pairs."""
+    
+    def add(self, name: str, seconds: float):
+        self.spans.append((name, seconds))
+    
+    def totals(self) -> Dict[str, float]:
+        """Seconds per span name (repeated spans are summed)."""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in ms)."""
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}"
+                         for name, seconds in self.totals().items())
+
+
+class LatencyWindow:
+    """Rolling window of the most recent durations for one span name."""
+    
+    def __init__(self, size: int = 1024):
+        self.samples: deque = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def summary(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of span latencies.
+    
+    Percentiles cover the last `window` samples per span; count, mean and
+    max cover the process lifetime.
+    """
+    
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._spans: Dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, name: str, seconds: float):
+        """Add one duration for `name` (and to the current trace, if any)."""
+        with self._lock:
+            latency = self._spans.get(name)
+            if latency is None:
+                latency = self._spans[name] = LatencyWindow(self.window)
+            latency.add(seconds)
+        
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, seconds)
+    
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as `name` (recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+    
+    @contextmanager
+    def trace(self) -> Iterator[Trace]:
+        """Collect the spans recorded in this context (thread / task)."""
+        trace = Trace()
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Summary per span name, sorted by name."""
+        with self._lock:
+            return {name: self._spans[name].summary() for name in sorted(self._spans)}
+    
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+
+
+__all__ = [
+    "LatencyWindow",
+    "Metrics",
+    "Trace",
+    "percentile",
+]
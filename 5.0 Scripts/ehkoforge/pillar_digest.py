@@ -0,0 +1,302 @@
+"""
+Materialized identity digests.
+
+pillar_digest holds one row per identity pillar (the identity_pillar values
+in mirrorwell_extensions) plus one row for core memories across all
+pillars. Each row carries a compact digest, bounded to a token budget,
+listing the pillar's core memories (title and first sentence) and its most
+recent other reflections, headed by an excerpt of the pillar's own note
+from "1_Core Identity/1.1 Pillars" when there is one.
+
+ehko_refresh.py rebuilds only the rows for pillars whose reflections it
+touched (and the core memory row when a core memory changed), so reading
+identity grounding for a system prompt is a single small-table query.
+
+Usage:
+    refresh_pillar_digests(conn, pillars={"The Web"}, pillar_dir=pillar_dir)
+    conn.commit()
+    grounding = identity_digest(conn)
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ehkoforge.llm.context_packer import truncate_to_tokens
+from ehkoforge.llm.conversation import estimate_tokens
+
+DIGEST_TABLE = "pillar_digest"
+
+CORE_MEMORIES = "*core memories*"
+"""Row key for the all-pillar core memory digest."""
+
+PILLAR_DIGEST_TOKENS = 300
+"""Budget per pillar digest."""
+
+CORE_DIGEST_TOKENS = 400
+"""Budget for the core memory digest."""
+
+LINE_TOKENS = 40
+"""Longest excerpt per reflection line."""
+
+SUMMARY_TOKENS = 120
+"""Longest pillar note excerpt at the head of a pillar digest."""
+
+SUMMARY_CHARS = 1500
+"""Longest stored pillar note (what get_pillar_summary returns)."""
+
+PILLAR_FOLDER = Path("1_Core Identity") / "1.1 Pillars"
+"""Pillar notes, relative to the Mirrorwell root."""
+
+DIGEST_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {DIGEST_TABLE} (
+    pillar TEXT PRIMARY KEY COLLATE NOCASE,
+    summary TEXT,
+    digest TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    reflections INTEGER NOT NULL DEFAULT 0,
+    core_memories INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def ensure_digest_table(conn: sqlite3.Connection) -> bool:
+    """
+    Create pillar_digest if missing.
+    
+    Returns:
+        True if digests can be built (mirrorwell_extensions exists).
+    """
+    if not _table_exists(conn, "mirrorwell_extensions"):
+        return False
+    conn.execute(DIGEST_SCHEMA_SQL)
+    return True
+
+
+def find_pillar_note(pillar_dir: Optional[Path], pillar: str) -> Optional[str]:
+    """Body (after frontmatter, clipped) of the pillar's note, if one matches."""
+    if pillar_dir is None or not Path(pillar_dir).exists():
+        return None
+    
+    needle = pillar.lower().replace("the ", "")
+    for file in sorted(Path(pillar_dir).glob("*.md")):
+        if needle in file.stem.lower():
+            try:
+                content = file.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            if "---" in content:
+                parts = content.split("---", 2)
+                if len(parts) >= 3:
+                    return parts[2].strip()[:SUMMARY_CHARS]
+    return None
+
+
+def pillar_names(conn: sqlite3.Connection) -> List[str]:
+    """Distinct identity pillars in use (one spelling per case-insensitive name)."""
+    return [row[0] for row in conn.execute("""
+        SELECT MIN(identity_pillar) FROM mirrorwell_extensions
+        WHERE identity_pillar IS NOT NULL AND TRIM(identity_pillar) != ''
+        GROUP BY identity_pillar COLLATE NOCASE
+        ORDER BY identity_pillar COLLATE NOCASE
+    """)]
+
+
+def _fill(lines: List[str], candidates: Iterable[str], budget: int) -> int:
+    """Append candidates to lines while the total stays within budget; returns how many."""
+    used = sum(estimate_tokens(line) for line in lines)
+    added = 0
+    for line in candidates:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+        added += 1
+    return added
+
+
+def _memory_line(title: str, preview: Optional[str], suffix: str = "") -> str:
+    excerpt = truncate_to_tokens(preview or "", LINE_TOKENS)
+    return f"- {title}{suffix}: {excerpt}" if excerpt else f"- {title}{suffix}"
+
+
+def build_pillar_digest(conn: sqlite3.Connection, pillar: str,
+                        pillar_dir: Optional[Path] = None) -> Optional[Dict]:
+    """Digest row for one pillar, or None if no reflection carries it."""
+    rows = conn.execute("""
+        SELECT ro.title, ro.content_preview, me.core_memory
+        FROM mirrorwell_extensions me
+        JOIN reflection_objects ro ON ro.id = me.object_id
+        WHERE me.identity_pillar = ? COLLATE NOCASE
+        ORDER BY me.core_memory DESC, ro.updated DESC, ro.id DESC
+    """, (pillar,)).fetchall()
+    if not rows:
+        return None
+    
+    summary = find_pillar_note(pillar_dir, pillar)
+    lines = [f"### {pillar}"]
+    if summary:
+        lines.append(truncate_to_tokens(summary, SUMMARY_TOKENS))
+    
+    core = [row for row in rows if row[2]]
+    other = [row for row in rows if not row[2]]
+    if core:
+        lines.append("Core memories:")
+        _fill(lines, (_memory_line(row[0], row[1]) for row in core), PILLAR_DIGEST_TOKENS)
+    if other:
+        with_others = lines + ["Other reflections:"]
+        if _fill(with_others, (f"- {row[0]}" for row in other), PILLAR_DIGEST_TOKENS):
+            lines = with_others
+    
+    digest = "\n".join(lines)
+    return {
+        "pillar": pillar,
+        "summary": summary,
+        "digest": digest,
+        "tokens": estimate_tokens(digest),
+        "reflections": len(rows),
+        "core_memories": len(core),
+    }
+
+
+def build_core_digest(conn: sqlite3.Connection) -> Optional[Dict]:
+    """Digest row for core memories across all pillars, or None if there are none."""
+    rows = conn.execute("""
+        SELECT ro.title, ro.content_preview, me.identity_pillar
+        FROM mirrorwell_extensions me
+        JOIN reflection_objects ro ON ro.id = me.object_id
+        WHERE me.core_memory = 1
+        ORDER BY ro.updated DESC, ro.id DESC
+    """).fetchall()
+    if not rows:
+        return None
+    
+    lines = ["### Core memories"]
+    _fill(lines, (_memory_line(row[0], row[1], f" ({row[2]})" if row[2] else "")
+                  for row in rows), CORE_DIGEST_TOKENS)
+    digest = "\n".join(lines)
+    return {
+        "pillar": CORE_MEMORIES,
+        "summary": None,
+        "digest": digest,
+        "tokens": estimate_tokens(digest),
+        "reflections": len(rows),
+        "core_memories": len(rows),
+    }
+
+
+def _store(conn: sqlite3.Connection, key: str, row: Optional[Dict]) -> bool:
+    """Write (or delete, for None) one digest row; True if anything changed."""
+    if row is None:
+        return conn.execute(f"DELETE FROM {DIGEST_TABLE} WHERE pillar = ?", (key,)).rowcount > 0
+    
+    current = conn.execute(
+        f"SELECT pillar, summary, digest, reflections, core_memories FROM {DIGEST_TABLE} WHERE pillar = ?",
+        (key,)).fetchone()
+    if current is not None and tuple(current) == (row["pillar"], row["summary"], row["digest"],
+                                                  row["reflections"], row["core_memories"]):
+        return False
+    
+    conn.execute(f"""
+        INSERT INTO {DIGEST_TABLE}
+            (pillar, summary, digest, tokens, reflections, core_memories, updated_at)
+        VALUES (:pillar, :summary, :digest, :tokens, :reflections, :core_memories, :updated_at)
+        ON CONFLICT(pillar) DO UPDATE SET
+            pillar = excluded.pillar, summary = excluded.summary, digest = excluded.digest,
+            tokens = excluded.tokens, reflections = excluded.reflections,
+            core_memories = excluded.core_memories, updated_at = excluded.updated_at
+    """, dict(row, updated_at=datetime.now().isoformat()))
+    return True
+
+
+def refresh_pillar_digests(conn: sqlite3.Connection, pillars: Optional[Iterable[str]] = None,
+                           core: bool = True, pillar_dir: Optional[Path] = None) -> int:
+    """
+    Rebuild digest rows (caller commits).
+    
+    Args:
+        conn: Index connection.
+        pillars: Pillars to rebuild; None rebuilds every pillar and drops
+                 rows for pillars no longer in use.
+        core: Also rebuild the core memory digest.
+        pillar_dir: Folder holding the pillar notes (optional).
+    
+    Returns:
+        Number of rows whose content changed (written or removed).
+    """
+    if not ensure_digest_table(conn):
+        return 0
+    
+    changed = 0
+    spelling = {name.lower(): name for name in pillar_names(conn)}
+    if pillars is None:
+        pillars = list(spelling.values())
+        stale = [row[0] for row in conn.execute(
+            f"SELECT pillar FROM {DIGEST_TABLE} WHERE pillar != ?", (CORE_MEMORIES,))
+            if row[0].lower() not in spelling]
+        for pillar in stale:
+            changed += _store(conn, pillar, None)
+    
+    wanted = {p.strip().lower(): p.strip() for p in pillars if p and p.strip()}
+    for key, pillar in wanted.items():
+        pillar = spelling.get(key, pillar)
+        changed += _store(conn, pillar, build_pillar_digest(conn, pillar, pillar_dir))
+    if core:
+        changed += _store(conn, CORE_MEMORIES, build_core_digest(conn))
+    return changed
+
+
+def pillar_summary(conn: sqlite3.Connection, pillar: str) -> Optional[str]:
+    """Stored pillar note for `pillar` (None if no digest row or no note)."""
+    try:
+        row = conn.execute(f"SELECT summary FROM {DIGEST_TABLE} WHERE pillar = ?",
+                           (pillar,)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # no digest table yet
+    return row[0] if row else None
+
+
+def identity_digest(conn: sqlite3.Connection, pillars: Optional[Iterable[str]] = None) -> str:
+    """
+    Core memory digest followed by the pillar digests ("" if none are stored).
+    
+    Args:
+        pillars: Limit to these pillars (None = all).
+    """
+    try:
+        rows = conn.execute(f"""
+            SELECT pillar, digest FROM {DIGEST_TABLE}
+            ORDER BY pillar != ?, pillar COLLATE NOCASE
+        """, (CORE_MEMORIES,)).fetchall()
+    except sqlite3.OperationalError:
+        return ""
+    
+    if pillars is not None:
+        wanted = {p.lower() for p in pillars} | {CORE_MEMORIES}
+        rows = [row for row in rows if row[0].lower() in wanted]
+    return "\n\n".join(row[1] for row in rows)
+
+
+__all__ = [
+    "CORE_MEMORIES",
+    "DIGEST_SCHEMA_SQL",
+    "DIGEST_TABLE",
+    "PILLAR_FOLDER",
+    "build_core_digest",
+    "build_pillar_digest",
+    "ensure_digest_table",
+    "find_pillar_note",
+    "identity_digest",
+    "pillar_names",
+    "pillar_summary",
+    "refresh_pillar_digests",
+]
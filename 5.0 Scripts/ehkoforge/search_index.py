@@ -0,0 +1,296 @@
+"""
+Full-text search index for reflections.
+
+An SQLite FTS5 table, reflection_fts, holds one row per reflection_objects
+row (same rowid) with the searchable text split into columns: title, tags,
+emotional tags and the Raw Input body. The indexer (ehko_refresh.py) and
+the Forge (index_forged_reflection) write it alongside the regular tables;
+EhkoContextBuilder.search_reflections reads it with a single MATCH query
+ranked by bm25.
+
+Deleting a reflection_objects row removes its search row via a trigger.
+
+The indexer also stores each reflection's content preview (the Raw Input
+section, clipped) in reflection_objects.content_preview, so building chat
+context never has to open the markdown files.
+
+Writers bump an index generation number (index_meta) after each indexing
+run or forged reflection, so readers can cache search results until it
+changes.
+
+Usage:
+    conn = connect(db_path)
+    if ensure_search_index(conn):
+        index_reflection_text(conn, object_id, title, tags, emotions, raw_input)
+        conn.commit()
+"""
+
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Iterable, Optional
+
+FTS_TABLE = "reflection_fts"
+
+COLUMN_WEIGHTS = (8.0, 6.0, 7.0, 1.0)
+"""bm25 weights for (title, tags, emotions, body); mirrors the old LIKE scores."""
+
+PREVIEW_CHARS = 500
+"""Longest content preview stored / shown per reflection."""
+
+MAX_QUERY_TERMS = 32
+"""Longest OR-query built from a chat message."""
+
+SEARCH_SCHEMA_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    title, tags, emotions, body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON reflection_objects
+BEGIN
+    DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+END;
+"""
+
+STOP_WORDS = frozenset("""
+    about after again all also and any are because been before being but can
+    could did does doing for from had has have her hers him his how into its
+    just more most not off once only other our ours out over own she should
+    some such than that the their theirs them then there these they this
+    those too under until very was were what when where which while who whom
+    why will with would you your yours
+""".split())
+"""Words too common to help ranking; dropped from queries."""
+
+EXTENSIONS_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_mirrorwell_pillar_core
+ON mirrorwell_extensions(identity_pillar COLLATE NOCASE, core_memory)
+"""
+"""Serves pillar filters (and pillar + core memory lookups) without a scan."""
+
+INDEX_META_SQL = """
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+)
+"""
+
+_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=1)
+def fts5_available() -> bool:
+    """True if this SQLite build has the FTS5 extension."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> bool:
+    """
+    Create the search table and delete trigger if missing.
+    
+    A newly created table is backfilled from reflection_objects, tags and
+    emotional_tags (bodies are filled in as files are next indexed; run
+    `ehko_refresh.py --full` to index them all at once).
+    
+    Returns:
+        True if the index is usable, False if FTS5 is unavailable or the
+        database has no reflection_objects table yet.
+    """
+    if not fts5_available() or not _table_exists(conn, "reflection_objects"):
+        return False
+    
+    if _table_exists(conn, FTS_TABLE):
+        return True
+    
+    conn.executescript(SEARCH_SCHEMA_SQL)
+    
+    def joined(table: str, column: str) -> str:
+        if not _table_exists(conn, table):
+            return "''"
+        return f"COALESCE((SELECT group_concat({column}, ' ') FROM {table} WHERE object_id = ro.id), '')"
+    
+    conn.execute(f"""
+        INSERT INTO {FTS_TABLE} (rowid, title, tags, emotions, body)
+        SELECT ro.id, ro.title, {joined('tags', 'tag')}, {joined('emotional_tags', 'emotion')}, ''
+        FROM reflection_objects ro
+    """)
+    conn.commit()
+    return True
+
+
+def ensure_preview_column(conn: sqlite3.Connection) -> bool:
+    """
+    Add reflection_objects.content_preview to databases indexed before it existed.
+    
+    Returns:
+        True if the column exists, False if reflection_objects doesn't.
+    """
+    if not _table_exists(conn, "reflection_objects"):
+        return False
+    
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(reflection_objects)")]
+    if "content_preview" not in columns:
+        conn.execute("ALTER TABLE reflection_objects ADD COLUMN content_preview TEXT")
+        conn.commit()
+    return True
+
+
+def ensure_extensions_index(conn: sqlite3.Connection) -> bool:
+    """
+    Index mirrorwell_extensions by (identity_pillar, core_memory).
+    
+    Returns:
+        True if mirrorwell_extensions exists with an object_id column (the
+        schema search_reflections joins against), else False.
+    """
+    if not _table_exists(conn, "mirrorwell_extensions"):
+        return False
+    
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(mirrorwell_extensions)")]
+    if "object_id" not in columns:
+        return False
+    
+    conn.execute(EXTENSIONS_INDEX_SQL)
+    conn.commit()
+    return True
+
+
+def extract_preview(content: str, max_chars: int = PREVIEW_CHARS) -> str:
+    """
+    Content preview for a reflection file.
+    
+    The Raw Input section if there is one, else the body after the
+    frontmatter, else the start of the file.
+    """
+    # Try to extract Raw Input section
+    if "## 0. Raw Input" in content:
+        start = content.find("## 0. Raw Input")
+        end = content.find("##", start + 20)
+        if end == -1:
+            end = len(content)
+        raw_input = content[start:end].strip()
+        # Remove header
+        raw_input = raw_input.replace("## 0. Raw Input (Preserved)", "").strip()
+        raw_input = raw_input.replace("## 0. Raw Input", "").strip()
+        return raw_input[:max_chars]
+    
+    # Fallback: extract after frontmatter
+    if "---" in content:
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            body = parts[2].strip()
+            return body[:max_chars]
+    
+    return content[:max_chars]
+
+
+SEARCH_INSERT_SQL = f"INSERT INTO {FTS_TABLE} (rowid, title, tags, emotions, body) VALUES (?, ?, ?, ?, ?)"
+
+
+def search_row(object_id: int, title: str, tags: Iterable[str] = (),
+               emotions: Iterable[str] = (), body: Optional[str] = None) -> tuple:
+    """Parameters for SEARCH_INSERT_SQL (for callers batching with executemany)."""
+    return (object_id, title or "",
+            " ".join(t for t in tags if t), " ".join(e for e in emotions if e),
+            body or "")
+
+
+def index_reflection_text(conn: sqlite3.Connection, object_id: int, title: str,
+                          tags: Iterable[str] = (), emotions: Iterable[str] = (),
+                          body: Optional[str] = None):
+    """Replace the search row for one reflection (caller commits)."""
+    conn.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", (object_id,))
+    conn.execute(SEARCH_INSERT_SQL, search_row(object_id, title, tags, emotions, body))
+
+
+def remove_from_search_index(conn: sqlite3.Connection, object_id: int):
+    """Drop the search row for one reflection (caller commits)."""
+    conn.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", (object_id,))
+
+
+def index_generation(conn: sqlite3.Connection) -> int:
+    """Current index generation (0 if nothing has bumped it yet)."""
+    try:
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'generation'").fetchone()
+    except sqlite3.OperationalError:
+        return 0  # no index_meta table yet
+    return row[0] if row else 0
+
+
+def bump_index_generation(conn: sqlite3.Connection) -> int:
+    """Advance the index generation after reflections changed (caller commits)."""
+    conn.execute(INDEX_META_SQL)
+    conn.execute("""
+        INSERT INTO index_meta (key, value) VALUES ('generation', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1
+    """)
+    return index_generation(conn)
+
+
+def query_terms(text: str) -> list:
+    """Lowercased words longer than two characters, minus stop words, de-duplicated."""
+    seen = []
+    for term in _TERM_PATTERN.findall(text.lower()):
+        if len(term) > 2 and term not in STOP_WORDS and term not in seen:
+            seen.append(term)
+    return seen[:MAX_QUERY_TERMS]
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text: quoted prefix terms joined by OR.
+    
+    Quoting keeps user input from being parsed as FTS syntax; the prefix
+    match stands in for the old substring LIKE ("lonel" finds "lonely").
+    
+    Returns:
+        The expression, or None if the text has no usable terms.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"*' for term in terms)
+
+
+def bm25_expression(table: str = FTS_TABLE) -> str:
+    """SQL for the weighted bm25 score (lower is better)."""
+    return f"bm25({table}, {', '.join(str(w) for w in COLUMN_WEIGHTS)})"
+
+
+__all__ = [
+    "COLUMN_WEIGHTS",
+    "EXTENSIONS_INDEX_SQL",
+    "FTS_TABLE",
+    "INDEX_META_SQL",
+    "PREVIEW_CHARS",
+    "SEARCH_INSERT_SQL",
+    "SEARCH_SCHEMA_SQL",
+    "STOP_WORDS",
+    "bm25_expression",
+    "build_match_query",
+    "bump_index_generation",
+    "ensure_extensions_index",
+    "ensure_preview_column",
+    "ensure_search_index",
+    "extract_preview",
+    "fts5_available",
+    "index_generation",
+    "index_reflection_text",
+    "query_terms",
+    "remove_from_search_index",
+    "search_row",
+]
@@ -0,0 +1,153 @@
+"""
+Memory specificity scoring.
+
+Scores how unique and detailed a shared memory is, so the authentication
+engine can challenge a friend with memories only the two of them would
+know. Heuristic version of the Specificity Scorer in
+1.0 System Architecture/1_2_Components (section 3.5.2):
+
+    base 0.5
+    +0.15  3+ proper nouns (people, places, specific things)
+    +0.10  specific date / time references
+    +0.10  dialogue or quotes
+    +0.10  sensory details
+    +0.05  emotional descriptors beyond basic ones
+    -0.20  generic event (birthday, christmas, dinner, ...)
+    -0.15  single-sentence raw input
+    -0.10  no people mentioned
+
+clamped to 0.0-1.0. Memories scoring CHALLENGE_THRESHOLD or more are
+challenge_eligible.
+
+ehko_refresh.py scores each reflection with a shared_with list while
+parsing it and stores the score on reflection_objects, so
+update_shared_memories can fill shared_memories in one statement.
+
+Usage:
+    score = specificity_score(raw_input, emotional_tags=["nostalgic"], shared_with=["theo"])
+    eligible = score >= CHALLENGE_THRESHOLD
+"""
+
+import re
+from typing import Iterable
+
+BASE_SCORE = 0.5
+
+CHALLENGE_THRESHOLD = 0.70
+"""Minimum score for a memory to be used in authentication challenges."""
+
+DEFAULT_SCORE = 0.5
+"""Score for memories that couldn't be scored (never challenge_eligible)."""
+
+_SENTENCE_END = re.compile(r"[.!?]+(?:\s+|$)")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'’-]*")
+_QUOTE = re.compile(r"[\"“][^\"“”\n]{3,}[\"”]|\b(?:said|says|asked|told me|replied|shouted|whispered)\b",
+                    re.IGNORECASE)
+_DATE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}[/.]\d{1,2}[/.]\d{2,4}\b|\b(?:19|20)\d{2}\b"
+    r"|\b\d{1,2}(?::\d{2})?\s?(?:am|pm)\b|\b\d{1,2}:\d{2}\b"
+    r"|\b(?:january|february|march|april|may|june|july|august|september|october|november|december"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE,
+)
+
+SENSORY_WORDS = frozenset("""
+    smell smelled smelt smells scent stink stank taste tasted tastes sweet sour bitter salty
+    sound sounded loud quiet silence silent noise hum humming ringing echo whisper
+    bright dark glow glowing shadow colour color red blue green yellow orange purple grey gray
+    warm cold freezing hot damp wet dry rough smooth soft sticky itchy sting
+    heard hear saw glimpse texture breeze rain sunlight smoke
+""".split())
+
+BASIC_EMOTIONS = frozenset({
+    "happy", "sad", "angry", "good", "bad", "nice", "fine", "ok", "okay", "calm",
+    "upset", "glad", "great", "fun",
+})
+
+GENERIC_EVENTS = re.compile(
+    r"\b(?:birthday|christmas|xmas|new year'?s?|easter|thanksgiving|dinner|lunch|breakfast"
+    r"|went to the pub|the pub|party|barbecue|bbq|holiday)\b",
+    re.IGNORECASE,
+)
+
+PEOPLE_WORDS = frozenset("""
+    he she him her his hers they them their we us our
+    mum mom dad mother father brother sister son daughter wife husband partner
+    friend friends mate mates nan gran grandma grandad grandpa uncle aunt cousin
+    boss teacher neighbour neighbor kids baby family
+""".split())
+
+# Capitalised words that aren't proper nouns
+_NOT_PROPER = frozenset("""
+    i i'm i've i'd i'll the a an and but or so then when while after before it it's this that
+    these those there here we he she they my our his her their you your what why how who
+    monday tuesday wednesday thursday friday saturday sunday
+    january february march april may june july august september october november december
+""".split())
+
+
+def _sentences(text: str) -> list[str]:
+    return [s for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+
+
+def proper_nouns(text: str) -> set[str]:
+    """Capitalised words that don't start a sentence (a cheap stand-in for NER)."""
+    nouns = set()
+    for sentence in _sentences(text):
+        words = _WORD.findall(sentence)
+        for word in words[1:]:
+            if word[0].isupper() and word.lower() not in _NOT_PROPER:
+                nouns.add(word)
+    return nouns
+
+
+def specificity_score(text: str, emotional_tags: Iterable[str] = (),
+                      shared_with: Iterable[str] = ()) -> float:
+    """
+    Score a memory 0.0-1.0 (higher = more specific).
+    
+    Args:
+        text: The memory (Raw Input, or the body when there is none)
+        emotional_tags: Frontmatter emotional_tags
+        shared_with: Frontmatter shared_with (named people count as mentioned
+                     when they appear in the text)
+    """
+    if not text or not text.strip():
+        return DEFAULT_SCORE
+    
+    lowered = text.lower()
+    words = {word.lower() for word in _WORD.findall(text)}
+    nouns = proper_nouns(text)
+    emotions = {str(tag).lower() for tag in emotional_tags}
+    
+    score = BASE_SCORE
+    if len(nouns) >= 3:
+        score += 0.15
+    if _DATE.search(text):
+        score += 0.10
+    if _QUOTE.search(text):
+        score += 0.10
+    if words & SENSORY_WORDS:
+        score += 0.10
+    if emotions - BASIC_EMOTIONS:
+        score += 0.05
+    if GENERIC_EVENTS.search(text):
+        score -= 0.20
+    if len(_sentences(text)) <= 1:
+        score -= 0.15
+    
+    people = nouns or words & PEOPLE_WORDS or any(
+        str(name).lower() in lowered for name in shared_with
+    )
+    if not people:
+        score -= 0.10
+    
+    return round(min(1.0, max(0.0, score)), 2)
+
+
+__all__ = [
+    "CHALLENGE_THRESHOLD",
+    "DEFAULT_SCORE",
+    "proper_nouns",
+    "specificity_score",
+]
@@ -0,0 +1,292 @@
+"""
+Vault change watching.
+
+Reports which markdown files (and folders) under the vault roots changed,
+so ehko_refresh.py --watch can reindex just those paths:
+
+- InotifyWatcher (Linux): kernel inotify events via ctypes, one watch per
+  folder, added as folders appear. Reports written, created, deleted and
+  renamed .md files and created / deleted / renamed folders.
+- PollingWatcher (everywhere else, or if inotify is unavailable or out of
+  watches): rescans the roots every `interval` seconds and diffs
+  (mtime_ns, size, inode) per file.
+
+Both report paths only; whether a path was created, changed or removed is
+for the caller to check on disk. A rename shows up as the old and the new
+path.
+
+Debouncer collects those paths until the vault has been quiet for a moment,
+so a burst of saves becomes one reindex.
+
+Usage:
+    watcher = make_watcher([mirrorwell], skip_dirs={".obsidian"})
+    debouncer = Debouncer()
+    while True:
+        debouncer.add(watcher.changes(timeout=0.5))
+        batch = debouncer.ready()
+        if batch:
+            reindex(batch)
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+DEBOUNCE_SECONDS = 1.0
+"""Quiet time after the last change before a batch is released."""
+
+MAX_BATCH_DELAY = 10.0
+"""Longest a change waits while saves keep arriving."""
+
+POLL_INTERVAL = 5.0
+"""Seconds between rescans for PollingWatcher."""
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT = struct.Struct("iIII")
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    INOTIFY_AVAILABLE = sys.platform.startswith("linux")
+except (OSError, AttributeError):
+    _libc = None
+    INOTIFY_AVAILABLE = False
+
+
+def _walk_dirs(root: Path, skip_dirs: Iterable[str]) -> Iterable[Path]:
+    """root and every folder below it, minus skipped and hidden ones."""
+    skip = set(skip_dirs)
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip and not d.startswith(".")]
+        yield Path(dirpath)
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on the vault roots (Linux only)."""
+    
+    def __init__(self, roots: Iterable[Path], skip_dirs: Iterable[str] = ()):
+        """
+        Raises:
+            OSError: inotify is unavailable or the watch limit
+                     (fs.inotify.max_user_watches) is too low for the vault.
+        """
+        if not INOTIFY_AVAILABLE:
+            raise OSError("inotify is not available on this platform")
+        
+        self.roots = [Path(root) for root in roots]
+        self.skip_dirs = frozenset(skip_dirs)
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        try:
+            for root in self.roots:
+                self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+    
+    def _watch_tree(self, root: Path):
+        for folder in _walk_dirs(root, self.skip_dirs):
+            wd = _libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno == 2:  # ENOENT: removed while we walked
+                    continue
+                raise OSError(errno, f"inotify_add_watch failed for {folder}")
+            self._dirs[wd] = folder
+    
+    def _unwatch_tree(self, root: Path):
+        """Drop watches under a folder that moved away (their paths are stale)."""
+        for wd, folder in list(self._dirs.items()):
+            if folder == root or root in folder.parents:
+                _libc.inotify_rm_watch(self.fd, wd)
+                del self._dirs[wd]
+    
+    @property
+    def watched_dirs(self) -> int:
+        return len(self._dirs)
+    
+    def changes(self, timeout: float = 1.0) -> Set[Path]:
+        """Paths changed since the last call, waiting up to timeout for the first."""
+        changed: Set[Path] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            self._parse(data, changed)
+            ready, _, _ = select.select([self.fd], [], [], 0)
+        return changed
+    
+    def _parse(self, data: bytes, changed: Set[Path]):
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: report the roots so the caller rescans
+                changed.update(self.roots)
+                continue
+            folder = self._dirs.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            if not name:
+                continue
+            
+            path = folder / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if path.name in self.skip_dirs or path.name.startswith("."):
+                    continue
+                if mask & IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(path)
+                changed.add(path)
+            elif path.suffix.lower() == ".md":
+                changed.add(path)
+    
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Rescan-and-diff watcher for platforms without inotify."""
+    
+    def __init__(self, roots: Iterable[Path], skip_dirs: Iterable[str] = (),
+                 interval: float = POLL_INTERVAL):
+        self.roots = [Path(root) for root in roots]
+        self.skip_dirs = frozenset(skip_dirs)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+    
+    def _scan(self) -> Dict[Path, tuple]:
+        snapshot = {}
+        for root in self.roots:
+            for folder in _walk_dirs(root, self.skip_dirs):
+                try:
+                    entries = list(os.scandir(folder))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.name.lower().endswith(".md") and entry.is_file():
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+    
+    def changes(self, timeout: float = 1.0) -> Set[Path]:
+        """Paths changed since the last rescan (rescans at most every `interval` seconds)."""
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next = time.monotonic() + self.interval
+        
+        current = self._scan()
+        previous, self._snapshot = self._snapshot, current
+        return {path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)}
+    
+    def close(self):
+        pass
+
+
+def make_watcher(roots: Iterable[Path], skip_dirs: Iterable[str] = (),
+                 polling: bool = False, interval: float = POLL_INTERVAL):
+    """InotifyWatcher where it works, else PollingWatcher (always, if polling=True)."""
+    roots = list(roots)
+    if not polling:
+        try:
+            return InotifyWatcher(roots, skip_dirs)
+        except OSError:
+            pass
+    return PollingWatcher(roots, skip_dirs, interval)
+
+
+class Debouncer:
+    """Collects changed paths and releases them once changes stop for a moment."""
+    
+    def __init__(self, quiet: float = DEBOUNCE_SECONDS, max_delay: float = MAX_BATCH_DELAY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending: Set[Path] = set()
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    def add(self, paths: Iterable[Path]):
+        paths = set(paths)
+        if not paths:
+            return
+        now = self.clock()
+        if not self._pending:
+            self._first = now
+        self._pending |= paths
+        self._last = now
+    
+    def ready(self) -> Set[Path]:
+        """The pending batch if it's been quiet long enough (or waited too long), else empty."""
+        if not self._pending:
+            return set()
+        now = self.clock()
+        if now - self._last < self.quiet and now - self._first < self.max_delay:
+            return set()
+        return self.flush()
+    
+    def flush(self) -> Set[Path]:
+        """The pending batch, regardless of timing."""
+        batch, self._pending = self._pending, set()
+        self._first = self._last = None
+        return batch
+
+
+__all__ = [
+    "DEBOUNCE_SECONDS",
+    "Debouncer",
+    "INOTIFY_AVAILABLE",
+    "InotifyWatcher",
+    "MAX_BATCH_DELAY",
+    "POLL_INTERVAL",
+    "PollingWatcher",
+    "make_watcher",
+]
@@ -0,0 +1,303 @@
+"""
+Local semantic index for reflections.
+
+Keyword search only finds reflections that share words with the query.
+This index adds an offline, dependency-light notion of relatedness using
+random indexing (a streaming alternative to LSA):
+
+1. Every reflection gets a sparse random "index vector" (a few +-1 entries
+   in DIMENSIONS slots).
+2. Every term's vector is the TF-IDF-weighted sum of the index vectors of
+   the reflections it appears in, so terms that occur in the same
+   reflections ("abandoned", "lonely") end up pointing the same way.
+3. Every reflection's embedding is the TF-IDF-weighted sum of its terms'
+   vectors; a query is embedded the same way.
+4. Steps 2-3 are repeated with the embeddings in place of the random
+   vectors (reflective random indexing), which links terms that never
+   share a reflection but share neighbours; this matters most for small
+   vaults, where direct co-occurrence is sparse.
+
+Everything is computed with NumPy during ehko_refresh.py (no model
+downloads, no network) and stored next to ehko_index.db:
+
+    ehko_index.vectors.json          vocabulary, idf, object ids, build id
+    ehko_index.vectors.<build>.npy   reflection embeddings (float32, rows)
+    ehko_index.terms.<build>.npy     term vectors (float32, rows)
+
+The .npy files are memory-mapped at query time and searched with batched
+dot products. Each build writes new files and then swaps the small JSON
+manifest, so a running server never has a mapped file replaced under it.
+
+Requires: pip install numpy (optional; without it search is keyword-only)
+"""
+
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from ehkoforge.search_index import FTS_TABLE, STOP_WORDS
+
+DIMENSIONS = 256
+"""Embedding width."""
+
+INDEX_NONZEROS = 8
+"""Non-zero entries per reflection index vector."""
+
+TRAINING_CYCLES = 2
+"""Term -> reflection passes (1 = plain random indexing)."""
+
+MAX_VOCABULARY = 50000
+"""Most frequent terms kept (by document frequency)."""
+
+SEMANTIC_WEIGHT = 0.35
+"""Share of the blended score that comes from cosine similarity."""
+
+CANDIDATE_FACTOR = 4
+"""Candidates pulled from each retriever per result wanted."""
+
+SEARCH_BLOCK_ROWS = 65536
+"""Rows per dot-product batch when scanning the embedding matrix."""
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words longer than two letters, minus stop words."""
+    return [w for w in _WORD_PATTERN.findall((text or "").lower())
+            if len(w) > 2 and w not in STOP_WORDS]
+
+
+def manifest_path(db_path: Path) -> Path:
+    """The JSON manifest that sits next to the database."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.vectors.json")
+
+
+def _matrix_paths(db_path: Path, build_id: str) -> Tuple[Path, Path]:
+    db_path = Path(db_path)
+    return (db_path.with_name(f"{db_path.stem}.vectors.{build_id}.npy"),
+            db_path.with_name(f"{db_path.stem}.terms.{build_id}.npy"))
+
+
+def _normalise_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _weighted_sums(n_out: int, out_index, in_index, weights, source):
+    """Row-normalised out[i] = sum of weights * source[j] over (i, j) pairs."""
+    out = np.zeros((n_out, source.shape[1]), dtype=np.float32)
+    chunk = 1 << 15
+    for lo in range(0, len(out_index), chunk):
+        sl = slice(lo, lo + chunk)
+        np.add.at(out, out_index[sl], weights[sl, None] * source[in_index[sl]])
+    return _normalise_rows(out)
+
+
+def reflection_documents(conn) -> List[Tuple[int, str]]:
+    """(object_id, text) for every indexed reflection."""
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)
+    ).fetchone() is not None
+    if has_fts:
+        rows = conn.execute(
+            f"SELECT rowid, title, tags, emotions, body FROM {FTS_TABLE} ORDER BY rowid"
+        ).fetchall()
+        return [(row[0], " ".join(part or "" for part in row[1:])) for row in rows]
+    
+    rows = conn.execute(
+        "SELECT id, title, content_preview FROM reflection_objects ORDER BY id"
+    ).fetchall()
+    return [(row[0], f"{row[1] or ''} {row[2] or ''}") for row in rows]
+
+
+def build_vector_index(documents: Sequence[Tuple[int, str]], db_path: Path,
+                       dimensions: int = DIMENSIONS, seed: int = 17) -> Dict:
+    """
+    Build and store the semantic index for `documents`.
+    
+    Args:
+        documents: (object_id, text) pairs.
+        db_path: ehko_index.db path (files are written beside it).
+        dimensions: Embedding width.
+        seed: Random index vector seed (fixed, so rebuilds are stable).
+    
+    Returns:
+        Stats dict (documents, vocabulary, dimensions, seconds).
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy not installed. Run: pip install numpy")
+    
+    start = time.perf_counter()
+    tokenized = [Counter(tokenize(text)) for _, text in documents]
+    
+    doc_freq = Counter()
+    for counts in tokenized:
+        doc_freq.update(counts.keys())
+    vocabulary = [term for term, _ in doc_freq.most_common(MAX_VOCABULARY)]
+    term_ids = {term: i for i, term in enumerate(vocabulary)}
+    
+    n_docs = len(documents)
+    idf = np.array([math.log((1 + n_docs) / (1 + doc_freq[t])) + 1 for t in vocabulary],
+                   dtype=np.float32)
+    
+    # Sparse TF-IDF matrix as COO arrays, grouped by document
+    rows, cols, counts = [], [], []
+    for doc, doc_terms in enumerate(tokenized):
+        for term, count in doc_terms.items():
+            term_id = term_ids.get(term)
+            if term_id is not None:
+                rows.append(doc)
+                cols.append(term_id)
+                counts.append(count)
+    rows = np.array(rows, dtype=np.int64)
+    cols = np.array(cols, dtype=np.int64)
+    weights = (1 + np.log(np.array(counts, dtype=np.float32))) * idf[cols]
+    
+    # Random index vectors, one per reflection
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, dimensions, size=(n_docs, INDEX_NONZEROS))
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(n_docs, INDEX_NONZEROS))
+    vectors = np.zeros((n_docs, dimensions), dtype=np.float32)
+    np.add.at(vectors, (np.repeat(np.arange(n_docs), INDEX_NONZEROS), positions.ravel()),
+              signs.ravel())
+    
+    for _ in range(TRAINING_CYCLES):
+        # Term vectors: weighted sums of the vectors of their reflections
+        terms = _weighted_sums(len(vocabulary), cols, rows, weights, vectors)
+        # Reflection embeddings: weighted sums of their terms' vectors
+        vectors = _weighted_sums(n_docs, rows, cols, weights, terms)
+    
+    _write_index(db_path, vectors, terms, vocabulary, idf,
+                 [object_id for object_id, _ in documents])
+    
+    return {
+        "documents": n_docs,
+        "vocabulary": len(vocabulary),
+        "dimensions": dimensions,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _write_index(db_path: Path, vectors, terms, vocabulary: List[str], idf,
+                 object_ids: List[int]):
+    """Write new matrix files, swap the manifest, then drop old builds."""
+    build_id = uuid4().hex[:8]
+    vectors_path, terms_path = _matrix_paths(db_path, build_id)
+    np.save(vectors_path, vectors)
+    np.save(terms_path, terms)
+    
+    manifest = manifest_path(db_path)
+    tmp = manifest.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({
+        "version": 1,
+        "build_id": build_id,
+        "dimensions": int(vectors.shape[1]),
+        "object_ids": object_ids,
+        "vocabulary": vocabulary,
+        "idf": [round(float(x), 5) for x in idf],
+    }), encoding="utf-8")
+    os.replace(tmp, manifest)
+    
+    keep = {vectors_path.name, terms_path.name}
+    stem = Path(db_path).stem
+    for pattern in (f"{stem}.vectors.*.npy", f"{stem}.terms.*.npy"):
+        for old in Path(db_path).parent.glob(pattern):
+            if old.name not in keep:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass  # still mapped by a running server (Windows); next build retries
+
+
+class VectorIndex:
+    """A loaded (memory-mapped) semantic index."""
+    
+    def __init__(self, manifest: Dict, vectors, terms):
+        self.build_id = manifest["build_id"]
+        self.vectors = vectors
+        self.terms = terms
+        self.vocabulary = {term: i for i, term in enumerate(manifest["vocabulary"])}
+        self.idf = np.array(manifest["idf"], dtype=np.float32)
+        self.object_ids = np.array(manifest["object_ids"], dtype=np.int64)
+        self.row_of = {int(object_id): row for row, object_id in enumerate(self.object_ids)}
+    
+    @classmethod
+    def load(cls, db_path: Path) -> Optional["VectorIndex"]:
+        """Load the index next to `db_path` (None if missing or NumPy unavailable)."""
+        manifest_file = manifest_path(db_path)
+        if not NUMPY_AVAILABLE or not manifest_file.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            vectors_path, terms_path = _matrix_paths(db_path, manifest["build_id"])
+            return cls(manifest,
+                       np.load(vectors_path, mmap_mode="r"),
+                       np.load(terms_path, mmap_mode="r"))
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def __len__(self) -> int:
+        return len(self.object_ids)
+    
+    def embed(self, text: str):
+        """Unit query vector for `text`, or None if no term is known."""
+        counts = Counter(t for t in tokenize(text) if t in self.vocabulary)
+        if not counts:
+            return None
+        ids = np.array([self.vocabulary[t] for t in counts], dtype=np.int64)
+        weights = (1 + np.log(np.array(list(counts.values()), dtype=np.float32))) * self.idf[ids]
+        query = weights @ self.terms[ids]
+        norm = np.linalg.norm(query)
+        return query / norm if norm else None
+    
+    def search(self, query, limit: int) -> List[Tuple[int, float]]:
+        """Top `limit` (object_id, cosine) pairs for an embedded query."""
+        if query is None or not len(self.object_ids) or limit <= 0:
+            return []
+        
+        scores = np.empty(len(self.object_ids), dtype=np.float32)
+        for lo in range(0, len(scores), SEARCH_BLOCK_ROWS):
+            scores[lo:lo + SEARCH_BLOCK_ROWS] = self.vectors[lo:lo + SEARCH_BLOCK_ROWS] @ query
+        
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.object_ids[i]), float(scores[i])) for i in top]
+    
+    def scores(self, query, object_ids: Iterable[int]) -> Dict[int, float]:
+        """Cosine for specific reflections (those not in the index are omitted)."""
+        rows = [(object_id, self.row_of[object_id]) for object_id in object_ids
+                if object_id in self.row_of]
+        if query is None or not rows:
+            return {}
+        values = self.vectors[[row for _, row in rows]] @ query
+        return {object_id: float(value) for (object_id, _), value in zip(rows, values)}
+
+
+__all__ = [
+    "CANDIDATE_FACTOR",
+    "DIMENSIONS",
+    "NUMPY_AVAILABLE",
+    "SEMANTIC_WEIGHT",
+    "VectorIndex",
+    "build_vector_index",
+    "manifest_path",
+    "reflection_documents",
+    "tokenize",
+]
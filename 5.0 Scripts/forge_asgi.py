@@ -0,0 +1,388 @@
+"""
+EhkoForge - Forge Server (ASGI) v0.1
+
+ASGI entry point for the Forge. The chat hot paths (sending a message,
+streaming a reply, polling a job) are native async handlers that await the
+provider's async client, so one process can hold hundreds of open chats and
+long-polls without a thread each. Every other /api/* route is served by the
+Flask app from forge_server.py mounted underneath, so the API surface is
+unchanged.
+
+forge_server.py on its own (Flask dev server) remains the compatibility mode.
+
+Usage:
+    cd "5.0 Scripts"
+    python forge_asgi.py
+    # or
+    uvicorn forge_asgi:app --port 5000
+
+Requires: pip install starlette uvicorn a2wsgi
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+
+try:
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Mount, Route
+except ImportError:
+    print("ERROR: Starlette not installed. Run: pip install starlette uvicorn a2wsgi")
+    exit(1)
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    # Deprecated in Starlette, but still works
+    from starlette.middleware.wsgi import WSGIMiddleware
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+import forge_server as forge
+from ehkoforge.jobs import JobQueueFull
+from ehkoforge.llm import augment_system_prompt
+from recog_engine.chat_preflight import ChatSnapshot
+
+
+logger = logging.getLogger("forge_asgi")
+
+# Seconds between SSE keepalive comments
+KEEPALIVE_INTERVAL = 15.0
+
+
+# =============================================================================
+# EHKO RESPONSE GENERATION (ASYNC)
+# =============================================================================
+
+async def agenerate_ehko_response(user_message: str, session_context: list = None,
+                                  interaction_mode: str = "terminal",
+                                  preflight: ChatSnapshot = None) -> str:
+    """
+    Async counterpart of forge_server.generate_ehko_response.
+    
+    Prompt assembly (SQLite reads) runs in the thread pool; the provider
+    call is awaited on its async client.
+    """
+    provider = forge.get_llm_provider()
+    
+    if provider is None:
+        logger.info("[EHKO] No provider, using templates")
+        return forge._generate_templated_response(user_message)
+    
+    try:
+        window = forge._build_conversation_window(session_context)
+        system_prompt, reflection_context = await run_in_threadpool(
+            forge._build_ehko_system_prompt, user_message, interaction_mode, preflight,
+            window.summary,
+        )
+        with forge.METRICS.span("provider_call"):
+            response = await provider.agenerate(
+                prompt=user_message,
+                system_prompt=augment_system_prompt(system_prompt, reflection_context),
+                max_tokens=512,
+                temperature=0.7,
+                history=window.messages,
+            )
+        
+        if response.success:
+            return response.content
+        
+        logger.warning(f"[EHKO] LLM error: {response.error}")
+        return forge._generate_templated_response(user_message)
+    
+    except Exception as e:
+        logger.exception(f"[EHKO] LLM generation failed: {e}")
+        return forge._generate_templated_response(user_message)
+
+
+async def astream_ehko_response(user_message: str, interaction_mode: str = "terminal",
+                                preflight: ChatSnapshot = None, session_context: list = None):
+    """
+    Async counterpart of forge_server.stream_ehko_response.
+    
+    Yields:
+        Text deltas; a single templated chunk if nothing was produced.
+    """
+    provider = forge.get_llm_provider()
+    
+    if provider is None:
+        logger.info("[EHKO] No provider, using templates")
+        yield forge._generate_templated_response(user_message)
+        return
+    
+    produced = False
+    try:
+        window = forge._build_conversation_window(session_context)
+        system_prompt, reflection_context = await run_in_threadpool(
+            forge._build_ehko_system_prompt, user_message, interaction_mode, preflight,
+            window.summary,
+        )
+        stream = provider.agenerate_stream(
+            prompt=user_message,
+            system_prompt=augment_system_prompt(system_prompt, reflection_context),
+            max_tokens=512,
+            temperature=0.7,
+            history=window.messages,
+        )
+        with forge.METRICS.span("provider_call"):
+            start = time.perf_counter()
+            async for delta in stream:
+                if not produced:
+                    forge.METRICS.record("provider_first_token", time.perf_counter() - start)
+                produced = True
+                yield delta
+        
+        if stream.response and stream.response.error:
+            logger.warning(f"[EHKO] LLM stream error: {stream.response.error}")
+    
+    except Exception as e:
+        logger.exception(f"[EHKO] LLM streaming failed: {e}")
+    
+    if not produced:
+        yield forge._generate_templated_response(user_message)
+
+
+async def _agenerate_reply(session_id: str, user_message: dict, interaction_mode: str,
+                           preflight: ChatSnapshot = None) -> dict:
+    """Async counterpart of forge_server._generate_reply."""
+    context = await run_in_threadpool(forge._get_session_history, session_id, user_message["id"])
+    
+    with forge.METRICS.span("reply"):
+        ehko_response = await agenerate_ehko_response(user_message["content"], context,
+                                                      interaction_mode, preflight)
+    ehko_message = await run_in_threadpool(forge._persist_message, session_id, "ehko", ehko_response)
+    
+    if preflight and preflight.tether:
+        await run_in_threadpool(forge._log_chat_tether_usage, preflight.tether,
+                                user_message["content"], ehko_response)
+    
+    return ehko_message
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _wants_event_stream(request: Request) -> bool:
+    """True if the client prefers text/event-stream over JSON."""
+    accept = parse_accept_header(request.headers.get("accept", ""), MIMEAccept)
+    return accept.best_match(["application/json", "text/event-stream"]) == "text/event-stream"
+
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"X-Accel-Buffering": "no"})
+
+
+async def _message_events(session_id: str, user_message: dict, interaction_mode: str,
+                          preflight: ChatSnapshot = None):
+    """SSE events for a streamed chat turn (same shape as the Flask route)."""
+    yield forge._sse_event("user", user_message)
+    
+    context = await run_in_threadpool(forge._get_session_history, session_id, user_message["id"])
+    
+    parts = []
+    async for delta in astream_ehko_response(user_message["content"], interaction_mode,
+                                             preflight, context):
+        parts.append(delta)
+        yield forge._sse_event("token", {"delta": delta})
+    
+    ehko_response = "".join(parts)
+    ehko_message = await run_in_threadpool(forge._persist_message, session_id, "ehko", ehko_response)
+    
+    if preflight and preflight.tether:
+        await run_in_threadpool(forge._log_chat_tether_usage, preflight.tether,
+                                user_message["content"], ehko_response)
+    
+    yield forge._sse_event("done", {"messages": [user_message, ehko_message]})
+
+
+def _job_done(job) -> asyncio.Future:
+    """Future on the running loop, resolved by the worker when the job finishes."""
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    
+    def resolve():
+        if not done.done():
+            done.set_result(None)
+    
+    def on_done(_job):
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # loop already closed (client gone)
+    
+    job.add_done_callback(on_done)
+    return done
+
+
+async def _wait_for_job(done: asyncio.Future, timeout: float) -> bool:
+    """Wait on a _job_done future without holding a thread. Returns True if it finished."""
+    try:
+        await asyncio.wait_for(asyncio.shield(done), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return done.done()
+
+
+async def _job_events(job):
+    """SSE events for a background job (same shape as the Flask route)."""
+    yield forge._sse_event("status", job.to_dict())
+    done = _job_done(job)
+    while not await _wait_for_job(done, KEEPALIVE_INTERVAL):
+        yield ": keepalive\n\n"
+    yield forge._sse_event("done" if job.status == "done" else "error", job.to_dict())
+
+
+# =============================================================================
+# ROUTES
+# =============================================================================
+
+async def send_message(request: Request):
+    """
+    POST /api/sessions/{session_id}/messages
+    
+    Same contract as forge_server.send_message: JSON (201), SSE with
+    `Accept: text/event-stream`, or a 202 job with `"async": true`.
+    Stage timings go to forge_server.METRICS and the Server-Timing header.
+    """
+    with forge.METRICS.trace() as trace:
+        with forge.METRICS.span("send_message"):
+            response = await _send_message(request)
+    response.headers["Server-Timing"] = trace.server_timing()
+    return response
+
+
+async def _send_message(request: Request):
+    session_id = request.path_params["session_id"]
+    try:
+        data = await request.json()
+    except json.JSONDecodeError:
+        data = {}
+    data = data or {}
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "Request body must be a JSON object"}, status_code=400)
+    
+    content = data.get("content", "").strip()
+    role = data.get("role", "user")
+    interaction_mode = data.get("mode", "terminal")
+    
+    if not content:
+        return JSONResponse({"error": "Empty message"}, status_code=400)
+    
+    use_job = role == "user" and (
+        bool(data.get("async")) or "respond-async" in request.headers.get("prefer", "")
+    )
+    if use_job and not forge.CHAT_JOBS.has_capacity():
+        return JSONResponse({"error": "Too many replies in progress, retry shortly"}, status_code=503)
+    
+    try:
+        preflight = None
+        if role == "user":
+            with forge.METRICS.span("preflight"):
+                preflight = await run_in_threadpool(forge.CHAT_PREFLIGHT.run, interaction_mode)
+            if not preflight.allowed:
+                return JSONResponse({
+                    "error": "Not enough mana",
+                    "dormant": True,
+                    "current_mana": preflight.current_mana,
+                    "required": preflight.mana_cost,
+                    "message": forge.get_dormant_response(),
+                }, status_code=429)
+        
+        user_message = await run_in_threadpool(forge._persist_message, session_id, role, content)
+        
+        if role == "user" and _wants_event_stream(request):
+            return _sse_response(_message_events(session_id, user_message, interaction_mode, preflight))
+        
+        if use_job:
+            try:
+                job = forge.CHAT_JOBS.submit(
+                    forge._run_chat_job, session_id, user_message, interaction_mode, preflight,
+                    kind="chat_reply", meta={"session_id": session_id},
+                )
+                return JSONResponse({
+                    "messages": [user_message],
+                    "job": job.to_dict(),
+                    "status_url": f"/api/jobs/{job.id}",
+                }, status_code=202, headers={"Location": f"/api/jobs/{job.id}"})
+            except JobQueueFull:
+                pass  # answer inline
+        
+        messages_added = [user_message]
+        if role == "user":
+            messages_added.append(
+                await _agenerate_reply(session_id, user_message, interaction_mode, preflight)
+            )
+        
+        return JSONResponse({"messages": messages_added}, status_code=201)
+    
+    except Exception as e:
+        logger.exception(f"[ROUTE] ERROR: {e}")
+        return JSONResponse({"error": "Internal server error"}, status_code=500)
+
+
+async def get_job(request: Request):
+    """
+    GET /api/jobs/{job_id}
+    
+    Same contract as forge_server.get_job (`?wait=N` long-poll, or SSE).
+    """
+    job = forge.CHAT_JOBS.get(request.path_params["job_id"])
+    if not job:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    
+    if _wants_event_stream(request):
+        return _sse_response(_job_events(job))
+    
+    try:
+        wait = min(float(request.query_params.get("wait", 0)), 30.0)
+    except ValueError:
+        wait = 0.0
+    if wait > 0:
+        await _wait_for_job(_job_done(job), wait)
+    
+    return JSONResponse(job.to_dict())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Same startup work as `python forge_server.py`."""
+    await run_in_threadpool(forge.init_session_tables)
+    if not forge.CONFIG_PATH.exists():
+        forge.save_config(forge.DEFAULT_CONFIG)
+    forge.get_llm_provider()
+    yield
+
+
+routes = [
+    Route("/api/sessions/{session_id}/messages", send_message, methods=["POST"]),
+    Route("/api/jobs/{job_id}", get_job, methods=["GET"]),
+    # Everything else: the Flask app, unchanged
+    Mount("/", app=WSGIMiddleware(forge.app)),
+]
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    print("=" * 60)
+    print("EHKOFORGE SERVER (ASGI)")
+    print("=" * 60)
+    print(f"Database: {forge.DATABASE_PATH}")
+    print("Starting server at http://localhost:5000")
+    print("Press Ctrl+C to stop")
+    print("=" * 60)
+    
+    uvicorn.run(app, host="127.0.0.1", port=5000, log_level="warning")
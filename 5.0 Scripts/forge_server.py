@@ -22,6 +22,7 @@ Routes:
     /api/mana/* -> Mana management endpoints
     /api/tethers/* -> Tether (BYOK) management endpoints
     /api/avatar/generate -> Avatar parameter generation
+    /api/metrics -> Chat latency percentiles per stage (set EHKO_LOG_LEVEL=DEBUG for chat logs)
 """
 
 # Load environment variables FIRST, before any other imports
@@ -32,35 +33,58 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, rely on system env vars
 
+import hashlib
 import json
+import os
 import random
 import sqlite3
+import time
 from datetime import datetime
+from functools import lru_cache, wraps
 from pathlib import Path
 from uuid import uuid4
 
-from flask import Flask, jsonify, request, send_from_directory, render_template, redirect
+from flask import (
+    Flask, Response, jsonify, request, send_from_directory, render_template, redirect,
+    make_response, stream_with_context,
+)
 import logging
 
 # LLM Integration
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
+from ehkoforge.db import connect, get_change_counter, pool_stats
+from ehkoforge.jobs import JobQueue, JobQueueFull
+from ehkoforge.metrics import Metrics
+from ehkoforge.search_index import (
+    PREVIEW_CHARS,
+    bump_index_generation,
+    ensure_preview_column,
+    ensure_search_index,
+    index_reflection_text,
+    remove_from_search_index,
+)
 from ehkoforge.llm import (
+    ConversationWindow,
     EhkoContextBuilder,
+    SystemPrompt,
+    augment_system_prompt,
+    build_conversation_window,
     create_default_config,
     get_provider_for_conversation,
     ProviderFactory,
 )
 
 # ReCog Engine (AGPL-licensed)
-from recog_engine.prompts import get_system_prompt, get_stage_for_authority
+from recog_engine.prompts import get_system_prompt_parts, get_stage_for_authority
 from recog_engine.tier0 import preprocess_text
 from recog_engine.smelt import SmeltProcessor, queue_for_smelt, get_queue_stats, should_auto_smelt
 from recog_engine.authority_mana import (
     get_current_authority,
     update_authority,
     get_mana_state,
+    read_mana_state,
     spend_mana,
     check_mana_available,
     get_dormant_response,
@@ -83,6 +107,9 @@ from recog_engine.mana_manager import (
 # ReCog Scheduler
 from recog_engine.scheduler import RecogScheduler, MANA_COSTS, OperationType
 
+# Chat preflight (tether + mana + authority in one connection)
+from recog_engine.chat_preflight import ChatPreflight, ChatSnapshot
+
 # Tether System (BYOK Conduits)
 from recog_engine.tether_manager import (
     get_tethers,
@@ -138,6 +165,7 @@ MIRRORWELL_ROOT = Path("G:/Other computers/Ehko/Obsidian/Mirrorwell")
 DATABASE_PATH = EHKOFORGE_ROOT / "_data" / "ehko_index.db"
 CONFIG_PATH = EHKOFORGE_ROOT / "Config" / "ui-preferences.json"
 STATIC_PATH = EHKOFORGE_ROOT / "6.0 Frontend" / "static"
+COMPONENTS_PATH = EHKOFORGE_ROOT / "6.0 Frontend" / "components"
 JOURNALS_PATH = MIRRORWELL_ROOT / "2_Reflection Library" / "2.1 Journals"
 
 # Flask app
@@ -147,25 +175,97 @@ app = Flask(__name__,
             template_folder=str(TEMPLATES_PATH))
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-app.logger.setLevel(logging.DEBUG)
-logging.basicConfig(level=logging.DEBUG)
+
+# Logging: per-message chat detail is DEBUG; set EHKO_LOG_LEVEL=DEBUG to see it
+LOG_LEVEL = os.environ.get("EHKO_LOG_LEVEL", "INFO").upper()
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+app.logger.setLevel(LOG_LEVEL)
+logger = logging.getLogger("forge_server")
+
+
+# HTTP caching. Dashboard reads revalidate against the DB change counter
+# (ETag / 304) and versioned assets are immutable; anything else is no-store.
+# EHKO_DEV_NO_CACHE=1 makes every response no-store (development).
+DEV_NO_CACHE = os.environ.get("EHKO_DEV_NO_CACHE", "").lower() in ("1", "true", "yes")
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# Distinguishes validators issued before and after a restart
+_VALIDATOR_EPOCH = uuid4().hex[:8]
 
 
-# Development: Force no-cache on all responses to prevent 304s
 @app.after_request
-def add_no_cache_headers(response):
-    """Prevent browser caching during development."""
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+def add_cache_headers(response):
+    """
+    Default caching policy.
+    
+    Responses that set their own Cache-Control (validated API reads, static
+    files) keep it; everything else is no-store. In dev mode every response
+    is no-store, to prevent 304s while editing.
+    """
+    if DEV_NO_CACHE or "Cache-Control" not in response.headers:
+        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
     return response
 
+
+def cached_read(ttl: int = None):
+    """
+    Route decorator for GET endpoints whose output depends only on the database.
+    
+    Adds ETag / Last-Modified derived from the DB change counter and answers
+    304 without running the view while the client's copy is still current.
+    Clients must revalidate (private, no-cache) but skip the aggregate queries.
+    
+    Args:
+        ttl: For views that also depend on the clock (e.g. mana regeneration),
+             seconds after which the validator changes even without a write.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if DEV_NO_CACHE:
+                return view(*args, **kwargs)
+            
+            generation, changed_at = get_change_counter(DATABASE_PATH).poll()
+            etag = f"{_VALIDATOR_EPOCH}.{generation}"
+            if ttl:
+                bucket = int(time.time() // ttl)
+                etag += f".{bucket}"
+                changed_at = max(changed_at, bucket * ttl)
+            last_modified = int(changed_at)
+            
+            if request.if_none_match:
+                fresh = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since:
+                fresh = last_modified <= request.if_modified_since.timestamp()
+            else:
+                fresh = False
+            
+            response = Response(status=304) if fresh else make_response(view(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                response.last_modified = last_modified
+                response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
+
 # =============================================================================
 # LLM CONFIGURATION
 # =============================================================================
 
 LLM_CONFIG = create_default_config(EHKOFORGE_ROOT / "Config")
 CONTEXT_BUILDER = EhkoContextBuilder(DATABASE_PATH, MIRRORWELL_ROOT)
+CHAT_PREFLIGHT = ChatPreflight(DATABASE_PATH)
+
+# Async chat replies (POST .../messages with "async": true). Bounded so a
+# burst of conversations queues instead of opening one LLM call per thread.
+CHAT_JOBS = JobQueue(max_workers=4, max_pending=64)
+
+# Per-stage chat latencies (preflight, context_build, provider_call, ...),
+# served with p50/p95/p99 from /api/metrics
+METRICS = Metrics()
 
 _llm_provider = None
 
@@ -193,9 +293,7 @@ def get_llm_provider():
 
 def get_db():
     """Get database connection with row factory (thread-safe)."""
-    conn = sqlite3.connect(str(DATABASE_PATH), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return connect(DATABASE_PATH, row_factory=sqlite3.Row)
 
 
 def init_session_tables():
@@ -241,24 +339,35 @@ def init_session_tables():
 
 
 def index_forged_reflection(filepath: Path, title: str, tags: list, 
-                            emotional_tags: list, session_id: str):
+                            emotional_tags: list, session_id: str,
+                            raw_input: str = ""):
     """
     Add a newly forged reflection to the SQLite index.
     
-    This allows it to appear in context searches immediately.
+    This allows it to appear in context searches immediately (including
+    the full-text search index, so its raw input is searchable too).
     """
     conn = get_db()
     cursor = conn.cursor()
     
     try:
         now = datetime.now().strftime("%Y-%m-%d")
+        has_search_index = ensure_search_index(conn)
+        ensure_preview_column(conn)
+        
+        # INSERT OR REPLACE gives a re-forged file a new id; drop its old search row
+        previous = cursor.execute(
+            "SELECT id FROM reflection_objects WHERE file_path = ?", (str(filepath),)
+        ).fetchone()
+        if previous and has_search_index:
+            remove_from_search_index(conn, previous[0])
         
         # Insert into reflection_objects
         cursor.execute("""
             INSERT OR REPLACE INTO reflection_objects 
             (file_path, vault, type, title, category, status, version, created, updated, 
-             source, confidence, revealed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             source, confidence, revealed, content_preview)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             str(filepath),
             "Mirrorwell",
@@ -271,7 +380,8 @@ def index_forged_reflection(filepath: Path, title: str, tags: list,
             now,
             "forge_session",
             0.8,
-            1
+            1,
+            raw_input.strip()[:PREVIEW_CHARS],
         ))
         
         # Get the auto-generated object_id
@@ -293,11 +403,20 @@ def index_forged_reflection(filepath: Path, title: str, tags: list,
                     VALUES (?, ?)
                 """, (object_id, etag.lower().strip()))
         
+        if has_search_index:
+            index_reflection_text(
+                conn, object_id, title,
+                [t.lower().strip() for t in tags if t and t.strip()],
+                [e.lower().strip() for e in emotional_tags if e and e.strip()],
+                raw_input,
+            )
+        
+        bump_index_generation(conn)
         conn.commit()
-        print(f"[FORGE] Indexed reflection: {title} (id={object_id})", flush=True)
+        logger.info(f"[FORGE] Indexed reflection: {title} (id={object_id})")
         
     except sqlite3.Error as e:
-        print(f"[FORGE] Failed to index reflection: {e}", flush=True)
+        logger.warning(f"[FORGE] Failed to index reflection: {e}")
     finally:
         conn.close()
 
@@ -336,8 +455,86 @@ def save_config(config):
 # EHKO RESPONSE GENERATION
 # =============================================================================
 
+@lru_cache(maxsize=16)
+def _with_identity(static: str, identity: str) -> str:
+    """Static prefix plus identity digest (memoized so the prefix stays one object)."""
+    return f"{static}\n\n<ehko_identity>\n{identity}\n</ehko_identity>"
+
+
+def _build_conversation_window(session_context: list = None) -> ConversationWindow:
+    """Fit earlier session turns into LLM_CONFIG.history_token_budget."""
+    with METRICS.span("history_window"):
+        window = build_conversation_window(session_context or [],
+                                           max_tokens=LLM_CONFIG.history_token_budget)
+    logger.debug(f"[EHKO] History: {len(window.messages)} turns, {window.summarised} summarised, "
+                 f"{window.dropped} dropped (~{window.tokens} tokens)")
+    return window
+
+
+def _build_ehko_system_prompt(user_message: str, interaction_mode: str,
+                              preflight: ChatSnapshot = None,
+                              history_summary: str = None) -> tuple:
+    """
+    Assemble the Ehko system prompt for a chat turn.
+    
+    Returns the Authority stage personality (plus a condensed summary of
+    older session turns, if any) and, separately, the reflection context
+    relevant to the user's message for generate_with_context. Uses the
+    request's preflight snapshot for the stage when available instead of
+    re-reading Authority.
+    
+    The personality is the SystemPrompt's static prefix, memoized per
+    (mode, interaction_mode, stage) so it is byte-identical across turns
+    and providers can serve it from their prompt cache. The identity
+    digest (core memories and pillars, precomputed by ehko_refresh.py)
+    follows it in the prefix, since it only changes on re-index.
+    Everything that varies per turn goes in the dynamic tail.
+    
+    Returns:
+        (SystemPrompt, reflection_context)
+    """
+    # Get current Authority state for stage-based personality
+    if preflight is not None:
+        advancement_stage = preflight.advancement_stage
+        authority_total = preflight.authority_total
+    else:
+        authority = get_current_authority(DATABASE_PATH)
+        advancement_stage = authority.get('advancement_stage', 'nascent')
+        authority_total = authority.get('authority_total', 0)
+    logger.debug(f"[EHKO] Authority stage: {advancement_stage} ({authority_total:.1%})")
+    
+    # Search reflections for relevant context
+    logger.debug("[EHKO] Building context...")
+    with METRICS.span("context_build"):
+        packed = CONTEXT_BUILDER.build_packed_context(
+            query=user_message,
+            max_reflections=3 if interaction_mode == 'terminal' else 5,
+            max_tokens=1500 if interaction_mode == 'terminal' else 2500,
+        )
+        reflection_context = packed.text
+    logger.debug(f"[EHKO] Context: {packed.tokens} tokens, {packed.sections} reflections "
+                 f"({packed.duplicates} duplicates skipped, truncated={packed.truncated})")
+    
+    # Get Ehko behaviour rules with stage-based personality dampener
+    with METRICS.span("prompt_assembly"):
+        static, dynamic = get_system_prompt_parts(
+            mode="forging",
+            interaction_mode=interaction_mode,
+            advancement_stage=advancement_stage,
+        )
+        identity = CONTEXT_BUILDER.get_identity_digest()
+        if identity:
+            static = _with_identity(static, identity)
+        system_prompt = SystemPrompt(static, dynamic)
+        if history_summary:
+            system_prompt = system_prompt.extend(f"## Earlier In This Session\n\n{history_summary}")
+    
+    return system_prompt, reflection_context
+
+
 def generate_ehko_response(user_message: str, session_context: list = None, 
-                           interaction_mode: str = "terminal") -> str:
+                           interaction_mode: str = "terminal",
+                           preflight: ChatSnapshot = None) -> str:
     """
     Generate an Ehko response to user input.
     
@@ -345,66 +542,103 @@ def generate_ehko_response(user_message: str, session_context: list = None,
     
     Args:
         user_message: The user's message
-        session_context: Recent messages for context
+        session_context: Earlier session turns ({"role", "content"}, oldest first)
         interaction_mode: 'terminal' or 'reflection'
+        preflight: Chat preflight snapshot for this request (optional)
     """
-    print(f"[EHKO] generate_ehko_response called with: {user_message[:50]}...", flush=True)
+    logger.debug(f"[EHKO] generate_ehko_response called with: {user_message[:50]}...")
     
     provider = get_llm_provider()
-    print(f"[EHKO] Provider: {provider}", flush=True)
+    logger.debug(f"[EHKO] Provider: {provider}")
     
     # Fallback if no API key configured
     if provider is None:
-        print("[EHKO] No provider, using templates", flush=True)
+        logger.info("[EHKO] No provider, using templates")
         return _generate_templated_response(user_message)
     
     try:
-        # Get current Authority state for stage-based personality
-        authority = get_current_authority(DATABASE_PATH)
-        advancement_stage = authority.get('advancement_stage', 'nascent')
-        print(f"[EHKO] Authority stage: {advancement_stage} ({authority.get('authority_total', 0):.1%})", flush=True)
-        
-        # Search reflections for relevant context
-        print("[EHKO] Building context...", flush=True)
-        reflection_context = CONTEXT_BUILDER.build_context(
-            query=user_message,
-            max_reflections=3 if interaction_mode == 'terminal' else 5,
-            max_tokens_estimate=1500 if interaction_mode == 'terminal' else 2500,
-        )
-        print(f"[EHKO] Context length: {len(reflection_context)} chars", flush=True)
-        
-        # Get Ehko behaviour rules with stage-based personality dampener
-        system_prompt = get_system_prompt(
-            mode="forging",
-            interaction_mode=interaction_mode,
-            advancement_stage=advancement_stage,
-            reflection_context=reflection_context,
+        window = _build_conversation_window(session_context)
+        system_prompt, reflection_context = _build_ehko_system_prompt(
+            user_message, interaction_mode, preflight, window.summary
         )
         
         # Call Claude
-        print("[EHKO] Calling Claude API...", flush=True)
-        response = provider.generate(
-            prompt=user_message,
-            system_prompt=system_prompt,
-            max_tokens=512,
-            temperature=0.7,
-        )
+        logger.debug("[EHKO] Calling Claude API...")
+        with METRICS.span("provider_call"):
+            response = provider.generate_with_context(
+                prompt=user_message,
+                context=reflection_context,
+                system_prompt=system_prompt,
+                max_tokens=512,
+                temperature=0.7,
+                history=window.messages,
+            )
         
-        print(f"[EHKO] Response success: {response.success}", flush=True)
+        logger.debug(f"[EHKO] Response success: {response.success}")
         if response.success:
-            print(f"[EHKO] Response content: {response.content[:100]}...", flush=True)
+            logger.debug(f"[EHKO] Response content: {response.content[:100]}...")
             return response.content
         else:
-            print(f"[EHKO] LLM error: {response.error}", flush=True)
+            logger.warning(f"[EHKO] LLM error: {response.error}")
             return _generate_templated_response(user_message)
             
     except Exception as e:
-        print(f"[EHKO] LLM generation failed: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[EHKO] LLM generation failed: {e}")
         return _generate_templated_response(user_message)
 
 
+def stream_ehko_response(user_message: str, interaction_mode: str = "terminal",
+                         preflight: ChatSnapshot = None, session_context: list = None):
+    """
+    Stream an Ehko response to user input, yielding text as it arrives.
+    
+    Streaming counterpart of generate_ehko_response. Falls back to a single
+    templated chunk if no provider is configured or the stream fails before
+    producing any text. If it fails part-way, the partial reply is kept.
+    
+    Yields:
+        Text deltas. Joined, they form the full reply to persist.
+    """
+    provider = get_llm_provider()
+    
+    if provider is None:
+        logger.info("[EHKO] No provider, using templates")
+        yield _generate_templated_response(user_message)
+        return
+    
+    produced = False
+    try:
+        window = _build_conversation_window(session_context)
+        system_prompt, reflection_context = _build_ehko_system_prompt(
+            user_message, interaction_mode, preflight, window.summary
+        )
+        
+        logger.debug("[EHKO] Streaming from provider...")
+        stream = provider.generate_stream(
+            prompt=user_message,
+            system_prompt=augment_system_prompt(system_prompt, reflection_context),
+            max_tokens=512,
+            temperature=0.7,
+            history=window.messages,
+        )
+        with METRICS.span("provider_call"):
+            start = time.perf_counter()
+            for delta in stream:
+                if not produced:
+                    METRICS.record("provider_first_token", time.perf_counter() - start)
+                produced = True
+                yield delta
+        
+        if stream.response and stream.response.error:
+            logger.warning(f"[EHKO] LLM stream error: {stream.response.error}")
+            
+    except Exception as e:
+        logger.exception(f"[EHKO] LLM streaming failed: {e}")
+    
+    if not produced:
+        yield _generate_templated_response(user_message)
+
+
 def _generate_templated_response(user_message: str) -> str:
     """
     Fallback templated responses when LLM unavailable.
@@ -530,7 +764,7 @@ def forge_to_vault(session_id: str, message_ids: list, title: str,
     
     Returns dict with success status and file path.
     """
-    print(f"[FORGE] Starting forge for session {session_id}, {len(message_ids)} messages", flush=True)
+    logger.info(f"[FORGE] Starting forge for session {session_id}, {len(message_ids)} messages")
     
     conn = get_db()
     cursor = conn.cursor()
@@ -640,7 +874,7 @@ Forged from Forge UI session on {now.strftime("%Y-%m-%d at %H:%M")}.
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(document)
         
-        print(f"[FORGE] File written: {filepath}", flush=True)
+        logger.info(f"[FORGE] File written: {filepath}")
         
         # Add to index immediately so it appears in searches
         index_forged_reflection(
@@ -648,7 +882,8 @@ Forged from Forge UI session on {now.strftime("%Y-%m-%d at %H:%M")}.
             title=title,
             tags=tags_list,
             emotional_tags=emotional_list,
-            session_id=session_id
+            session_id=session_id,
+            raw_input=raw_input,
         )
         
         # Mark messages as forged
@@ -668,9 +903,9 @@ Forged from Forge UI session on {now.strftime("%Y-%m-%d at %H:%M")}.
                 source_id=session_id,
                 priority=5,
             )
-            print(f"[FORGE] Queued session {session_id} for smelting", flush=True)
+            logger.info(f"[FORGE] Queued session {session_id} for smelting")
         except Exception as e:
-            print(f"[FORGE] Failed to queue for smelt: {e}", flush=True)
+            logger.warning(f"[FORGE] Failed to queue for smelt: {e}")
         
         return {
             "success": True,
@@ -822,7 +1057,191 @@ def get_messages(session_id):
     return jsonify({"session_id": session_id, "messages": messages})
 
 
+def _persist_message(session_id: str, role: str, content: str) -> dict:
+    """
+    Insert one chat message and bump the session counters.
+    
+    Runs as its own short transaction so no write lock is held across
+    the LLM call between the user turn and the Ehko reply.
+    """
+    timestamp = datetime.now().isoformat()
+    
+    with METRICS.span("db_persist"):
+        message_id = _insert_message(session_id, role, content, timestamp)
+    
+    return {
+        "id": message_id,
+        "role": role,
+        "content": content,
+        "timestamp": timestamp,
+        "forged": False
+    }
+
+
+def _insert_message(session_id: str, role: str, content: str, timestamp: str) -> int:
+    """Insert the message row and bump the session counters. Returns the row id."""
+    conn = get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO forge_messages (session_id, role, content, timestamp)
+            VALUES (?, ?, ?, ?)
+        """, (session_id, role, content, timestamp))
+        message_id = cursor.lastrowid
+        
+        cursor.execute("""
+            UPDATE forge_sessions 
+            SET message_count = message_count + 1, updated_at = ?
+            WHERE id = ?
+        """, (timestamp, session_id))
+        conn.commit()
+    finally:
+        conn.close()
+    
+    return message_id
+
+
+def _get_session_history(session_id: str, before_id: int = None, limit: int = 40) -> list:
+    """
+    Get the most recent messages in a session as role-tagged turns (read-only).
+    
+    Args:
+        session_id: Session to read.
+        before_id: Only messages older than this forge_messages id (the turn
+                   being answered).
+        limit: Most recent messages to fetch; the token budget trims further.
+    
+    Returns:
+        [{"role": "user"|"ehko", "content": ...}], oldest first.
+    """
+    with METRICS.span("history_fetch"):
+        conn = get_db()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT role, content FROM forge_messages 
+                WHERE session_id = ? AND (? IS NULL OR id < ?)
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+            """, (session_id, before_id, before_id, limit))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+    return [{"role": row["role"], "content": row["content"]} for row in reversed(rows)]
+
+
+def _wants_event_stream() -> bool:
+    """True if the client asked for a text/event-stream (SSE) reply."""
+    best = request.accept_mimetypes.best_match(["application/json", "text/event-stream"])
+    return best == "text/event-stream"
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _log_chat_tether_usage(tether: dict, content: str, ehko_response: str):
+    """Log a chat turn routed through a tether (analytics only, no billing)."""
+    try:
+        # Estimate tokens (rough: ~4 chars per token)
+        input_tokens = len(content) // 4
+        output_tokens = len(ehko_response) // 4
+        log_tether_usage(
+            DATABASE_PATH,
+            tether_id=tether['id'],
+            operation='chat',
+            provider=tether['provider'],
+            model=tether.get('model'),
+            tokens_input=input_tokens,
+            tokens_output=output_tokens,
+            user_id=1
+        )
+        logger.debug(f"[ROUTE] Logged tether usage: {tether['provider']} (~{input_tokens}+{output_tokens} tokens)")
+    except Exception as e:
+        logger.warning(f"[ROUTE] Failed to log tether usage: {e}")
+
+
+def _wants_async_job(data: dict) -> bool:
+    """True if the client asked for a 202 + job id instead of waiting for the reply."""
+    prefer = request.headers.get("Prefer", "")
+    return bool(data.get("async")) or "respond-async" in prefer
+
+
+def _generate_reply(session_id: str, user_message: dict, interaction_mode: str,
+                    preflight: ChatSnapshot = None) -> dict:
+    """Generate, persist and return the Ehko reply to a persisted user message."""
+    context = _get_session_history(session_id, before_id=user_message["id"])
+    
+    with METRICS.span("reply"):
+        ehko_response = generate_ehko_response(user_message["content"], context,
+                                               interaction_mode, preflight)
+    logger.debug(f"[ROUTE] Ehko response: {ehko_response[:50]}...")
+    
+    ehko_message = _persist_message(session_id, "ehko", ehko_response)
+    
+    # Log tether usage if using tether (for analytics)
+    if preflight and preflight.tether:
+        _log_chat_tether_usage(preflight.tether, user_message["content"], ehko_response)
+    
+    return ehko_message
+
+
+def _run_chat_job(session_id: str, user_message: dict, interaction_mode: str,
+                  preflight: ChatSnapshot = None) -> dict:
+    """Worker body for an async chat turn; the return value is the job result."""
+    ehko_message = _generate_reply(session_id, user_message, interaction_mode, preflight)
+    return {"messages": [user_message, ehko_message]}
+
+
+def _stream_message_events(session_id: str, user_message: dict,
+                           interaction_mode: str, preflight: ChatSnapshot = None):
+    """
+    SSE generator for a streamed chat turn.
+    
+    Events:
+        user  -> the persisted user message
+        token -> {"delta": "..."} for each chunk of the Ehko reply
+        done  -> {"messages": [...]} once the reply row is persisted
+    """
+    yield _sse_event("user", user_message)
+    
+    context = _get_session_history(session_id, before_id=user_message["id"])
+    
+    parts = []
+    for delta in stream_ehko_response(user_message["content"], interaction_mode, preflight, context):
+        parts.append(delta)
+        yield _sse_event("token", {"delta": delta})
+    
+    ehko_response = "".join(parts)
+    ehko_message = _persist_message(session_id, "ehko", ehko_response)
+    
+    if preflight and preflight.tether:
+        _log_chat_tether_usage(preflight.tether, user_message["content"], ehko_response)
+    
+    logger.debug(f"[ROUTE] Streamed Ehko response: {ehko_response[:50]}...")
+    yield _sse_event("done", {"messages": [user_message, ehko_message]})
+
+
+def _traced(name: str):
+    """
+    Route decorator: time the view as span `name` and report this request's
+    spans in a Server-Timing header (spans after a streamed response starts
+    only reach /api/metrics).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with METRICS.trace() as trace:
+                with METRICS.span(name):
+                    response = make_response(view(*args, **kwargs))
+            response.headers["Server-Timing"] = trace.server_timing()
+            return response
+        return wrapper
+    return decorator
+
+
 @app.route("/api/sessions/<session_id>/messages", methods=["POST"])
+@_traced("send_message")
 def send_message(session_id):
     """
     Add a message to session.
@@ -833,147 +1252,173 @@ def send_message(session_id):
     2. Fall back to mana system if no tether
     
     Tether usage is logged for analytics (no billing).
+    
+    Send `Accept: text/event-stream` to receive the Ehko reply as Server-Sent
+    Events while it is generated (see _stream_message_events).
+    
+    Send `"async": true` (or `Prefer: respond-async`) to get 202 with a job
+    id as soon as the user message is stored; the reply is generated on the
+    CHAT_JOBS worker pool and collected from /api/jobs/<id>.
     """
     try:
-        print(f"[ROUTE] POST /api/sessions/{session_id}/messages", flush=True)
+        logger.debug(f"[ROUTE] POST /api/sessions/{session_id}/messages")
         
         data = request.get_json() or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
         content = data.get("content", "").strip()
         role = data.get("role", "user")
         interaction_mode = data.get("mode", "terminal")  # terminal or reflection
         
-        print(f"[ROUTE] Message content: {content[:50]}... role: {role} mode: {interaction_mode}", flush=True)
+        logger.debug(f"[ROUTE] Message content: {content[:50]}... role: {role} mode: {interaction_mode}")
         
         if not content:
             return jsonify({"error": "Empty message"}), 400
         
-        # Track whether we're using a tether or mana
-        using_tether = False
-        tether_provider = None
+        use_job = role == "user" and _wants_async_job(data)
+        if use_job and not CHAT_JOBS.has_capacity():
+            return jsonify({"error": "Too many replies in progress, retry shortly"}), 503
+        
+        # Resolve tether / mana / authority for user messages in one round trip.
+        # Tethers bypass mana cost; otherwise mana is checked and spent atomically.
+        preflight = None
+        tether = None
         
-        # Check tethers first for user messages (tethers bypass mana cost)
         if role == "user":
-            # Check for active tether
-            tether = get_active_tether_for_operation(
-                DATABASE_PATH, 
-                operation='chat',
-                user_id=1
-            )
+            with METRICS.span("preflight"):
+                preflight = CHAT_PREFLIGHT.run(interaction_mode)
+            tether = preflight.tether
             
             if tether:
-                using_tether = True
-                tether_provider = tether['provider']
-                print(f"[ROUTE] Using tether: {tether_provider} (mana bypassed)", flush=True)
+                logger.debug(f"[ROUTE] Using tether: {tether['provider']} (mana bypassed)")
+            elif not preflight.mana_spent:
+                return jsonify({
+                    "error": "Not enough mana",
+                    "dormant": True,
+                    "current_mana": preflight.current_mana,
+                    "required": preflight.mana_cost,
+                    "message": get_dormant_response(),
+                }), 429
             else:
-                # No tether - check mana
-                mana_op = "reflection_message" if interaction_mode == "reflection" else "terminal_message"
-                can_afford, current_mana, cost = check_mana_available(DATABASE_PATH, mana_op)
-                
-                if not can_afford:
-                    return jsonify({
-                        "error": "Not enough mana",
-                        "dormant": True,
-                        "current_mana": current_mana,
-                        "required": cost,
-                        "message": get_dormant_response(),
-                    }), 429
-                
-                # Spend mana
-                success, msg = spend_mana(DATABASE_PATH, mana_op)
-                print(f"[ROUTE] Mana: {msg}", flush=True)
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        now = datetime.now().isoformat()
-        
-        # Insert user message
-        cursor.execute("""
-            INSERT INTO forge_messages (session_id, role, content, timestamp)
-            VALUES (?, ?, ?, ?)
-        """, (session_id, role, content, now))
-        
-        user_msg_id = cursor.lastrowid
+                logger.debug(f"[ROUTE] Mana: spent {preflight.mana_cost:.1f} on {preflight.mana_operation}. "
+                             f"{preflight.current_mana:.1f} remaining.")
+        
+        # Persist the user turn in its own short transaction so the write
+        # lock is released before the (slow) LLM call.
+        user_message = _persist_message(session_id, role, content)
+        messages_added = [user_message]
+        
+        # Streaming mode: forward tokens over SSE
+        if role == "user" and _wants_event_stream():
+            logger.debug("[ROUTE] Streaming Ehko response...")
+            return Response(
+                stream_with_context(_stream_message_events(
+                    session_id, user_message, interaction_mode, preflight,
+                )),
+                mimetype="text/event-stream",
+                headers={"X-Accel-Buffering": "no"},
+            )
         
-        messages_added = [{
-            "id": user_msg_id,
-            "role": role,
-            "content": content,
-            "timestamp": now,
-            "forged": False
-        }]
+        # Job mode: hand the reply to the worker pool and return immediately
+        if use_job:
+            try:
+                job = CHAT_JOBS.submit(
+                    _run_chat_job, session_id, user_message, interaction_mode, preflight,
+                    kind="chat_reply", meta={"session_id": session_id},
+                )
+            except JobQueueFull:
+                # Filled up since the capacity check; answer inline instead
+                job = None
+            
+            if job:
+                logger.debug(f"[ROUTE] Queued Ehko response as job {job.id}")
+                response = jsonify({
+                    "messages": messages_added,
+                    "job": job.to_dict(),
+                    "status_url": f"/api/jobs/{job.id}",
+                })
+                response.headers["Location"] = f"/api/jobs/{job.id}"
+                return response, 202
         
         # If user message, generate Ehko response
         if role == "user":
-            print("[ROUTE] Generating Ehko response...", flush=True)
-            
-            # Get session context (last few messages)
-            cursor.execute("""
-                SELECT content FROM forge_messages 
-                WHERE session_id = ? 
-                ORDER BY timestamp DESC LIMIT 5
-            """, (session_id,))
-            context = [row["content"] for row in cursor.fetchall()]
-            
-            ehko_response = generate_ehko_response(content, context, interaction_mode)
-            print(f"[ROUTE] Ehko response: {ehko_response[:50]}...", flush=True)
-            
-            ehko_time = datetime.now().isoformat()
-            
-            cursor.execute("""
-                INSERT INTO forge_messages (session_id, role, content, timestamp)
-                VALUES (?, ?, ?, ?)
-            """, (session_id, "ehko", ehko_response, ehko_time))
-            
-            ehko_msg_id = cursor.lastrowid
-            
-            messages_added.append({
-                "id": ehko_msg_id,
-                "role": "ehko",
-                "content": ehko_response,
-                "timestamp": ehko_time,
-                "forged": False
-            })
-            
-            # Log tether usage if using tether (for analytics)
-            if using_tether and tether_provider:
-                try:
-                    # Estimate tokens (rough: ~4 chars per token)
-                    input_tokens = len(content) // 4
-                    output_tokens = len(ehko_response) // 4
-                    log_tether_usage(
-                        DATABASE_PATH,
-                        provider=tether_provider,
-                        operation_type='chat',
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        model_used='claude-sonnet-4',  # TODO: Get from provider
-                        user_id=1
-                    )
-                    print(f"[ROUTE] Logged tether usage: {tether_provider} (~{input_tokens}+{output_tokens} tokens)", flush=True)
-                except Exception as e:
-                    print(f"[ROUTE] Failed to log tether usage: {e}", flush=True)
-        
-        # Update session message count and timestamp
-        cursor.execute("""
-            UPDATE forge_sessions 
-            SET message_count = message_count + ?, updated_at = ?
-            WHERE id = ?
-        """, (len(messages_added), now, session_id))
+            logger.debug("[ROUTE] Generating Ehko response...")
+            messages_added.append(_generate_reply(session_id, user_message, interaction_mode, preflight))
         
-        conn.commit()
-        conn.close()
-        
-        print(f"[ROUTE] Returning {len(messages_added)} messages", flush=True)
+        logger.debug(f"[ROUTE] Returning {len(messages_added)} messages")
         return jsonify({"messages": messages_added}), 201
         
     except Exception as e:
-        print(f"[ROUTE] ERROR: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[ROUTE] ERROR: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 
+# =============================================================================
+# API ROUTES - JOBS
+# =============================================================================
+
+def _job_events(job):
+    """
+    SSE generator for a background job.
+    
+    Events:
+        status -> job dict as it stands when the client connects
+        done   -> job dict with result (or `error` if the job failed)
+    A comment line is sent every 15s while waiting to keep proxies open.
+    """
+    yield _sse_event("status", job.to_dict())
+    while not job.wait(timeout=15):
+        yield ": keepalive\n\n"
+    yield _sse_event("done" if job.status == "done" else "error", job.to_dict())
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Get a background job (e.g. an async chat reply).
+    
+    Query params:
+        wait: Seconds to hold the request open until the job finishes (max 30)
+    
+    Send `Accept: text/event-stream` to receive a `done` event instead of polling.
+    """
+    job = CHAT_JOBS.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    if _wants_event_stream():
+        return Response(
+            stream_with_context(_job_events(job)),
+            mimetype="text/event-stream",
+            headers={"X-Accel-Buffering": "no"},
+        )
+    
+    wait = min(request.args.get("wait", 0, type=float), 30.0)
+    if wait > 0:
+        job.wait(timeout=wait)
+    
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Chat latency percentiles per stage, plus job queue, DB pool and
+    context search cache counters.
+    
+    Spans: preflight, history_fetch, history_window, context_build,
+    prompt_assembly, provider_call, provider_first_token (streams),
+    db_persist, reply (whole Ehko reply), send_message (whole request).
+    Percentiles cover the most recent 1024 samples of each span.
+    """
+    return jsonify({
+        "spans": METRICS.snapshot(),
+        "jobs": CHAT_JOBS.stats(),
+        "db_pool": {str(path): stats for path, stats in pool_stats().items()},
+        "search_cache": CONTEXT_BUILDER.cache_stats(),
+    })
+
+
 # =============================================================================
 # API ROUTES - FORGE
 # =============================================================================
@@ -1005,6 +1450,7 @@ def forge():
 # =============================================================================
 
 @app.route("/api/stats", methods=["GET"])
+@cached_read()
 def get_stats():
     """Get symbolic stats for display."""
     stats = calculate_stats()
@@ -1228,7 +1674,7 @@ def queue_all_sessions_for_smelt():
             )
             queued.append({"session_id": session_id, "entry_id": entry_id})
         except Exception as e:
-            print(f"[SMELT] Failed to queue {session_id}: {e}")
+            logger.warning(f"[SMELT] Failed to queue {session_id}: {e}")
     
     return jsonify({"queued": queued, "count": len(queued)})
 
@@ -1580,8 +2026,14 @@ def get_operation_cost(operation):
 # =============================================================================
 
 @app.route("/api/ehko/status", methods=["GET"])
+@cached_read(ttl=60)  # mana regenerates with time
 def get_ehko_status():
-    """Get Ehko's current status including Authority and Mana."""
+    """
+    Get Ehko's current status including Authority and Mana.
+    
+    Mana regeneration is computed, not stored: a write here would bump the
+    DB change counter and stale this and every other cached_read ETag.
+    """
     conn = get_db()
     cursor = conn.cursor()
     
@@ -1604,13 +2056,20 @@ def get_ehko_status():
     except sqlite3.OperationalError:
         layer_count = 0
     
+    # Mana state (read-only; spend paths persist regeneration)
+    try:
+        mana = read_mana_state(conn)
+    except sqlite3.OperationalError:
+        mana = None
+    
     conn.close()
     
     # Get Authority state
     authority = get_current_authority(DATABASE_PATH)
     
-    # Get Mana state
-    mana = get_mana_state(DATABASE_PATH)
+    if mana is None:
+        # First run: creates the mana_state row
+        mana = get_mana_state(DATABASE_PATH)
     
     return jsonify({
         "forged_count": forged_count,
@@ -1621,6 +2080,7 @@ def get_ehko_status():
 
 
 @app.route("/api/ehko/layers", methods=["GET"])
+@cached_read()
 def get_ehko_layers():
     """Get all active personality layers."""
     conn = get_db()
@@ -2330,6 +2790,7 @@ def recog_reports():
 
 
 @app.route("/api/recog/progression", methods=["GET"])
+@cached_read()
 def recog_progression():
     """Get Ehko progression status (nascent → sovereign)."""
     try:
@@ -2430,9 +2891,7 @@ def api_tethers_list():
         tethers = get_tethers(DATABASE_PATH, user_id=1, active_only=active_only)
         return jsonify({"success": True, "tethers": tethers})
     except Exception as e:
-        import traceback
-        print(f"[TETHER] Error in /api/tethers: {e}", flush=True)
-        traceback.print_exc()
+        logger.exception(f"[TETHER] Error in /api/tethers: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -2546,9 +3005,7 @@ def api_tethers_providers():
         providers = get_supported_providers(DATABASE_PATH)
         return jsonify({"success": True, "providers": providers})
     except Exception as e:
-        import traceback
-        print(f"[TETHER] Error in /api/tethers/providers: {e}", flush=True)
-        traceback.print_exc()
+        logger.exception(f"[TETHER] Error in /api/tethers/providers: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -3510,23 +3967,74 @@ def evolution_studio():
 # STATIC FILE SERVING
 # =============================================================================
 
+def _asset_dirs() -> dict:
+    """URL prefix -> directory for versioned assets."""
+    return {
+        "css": STATIC_PATH / "css",
+        "js": STATIC_PATH / "js",
+        "components": COMPONENTS_PATH,
+    }
+
+
+# path -> (mtime_ns, size, version); one entry per file, replaced when it changes
+_asset_versions = {}
+
+
+def _asset_version(path: Path):
+    """Content hash of an asset file (cached per mtime/size), or None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    cached = _asset_versions.get(key)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    version = hashlib.sha1(path.read_bytes()).hexdigest()[:12]
+    _asset_versions[key] = (st.st_mtime_ns, st.st_size, version)
+    return version
+
+
+@app.template_global()
+def asset_url(url_path: str) -> str:
+    """
+    URL for a /css, /js or /components asset with its content hash as ?v=.
+    
+    The versioned URL is served as immutable, so browsers keep it until the
+    file changes (and the page links a new hash).
+    """
+    prefix, _, filename = url_path.lstrip("/").partition("/")
+    directory = _asset_dirs().get(prefix)
+    version = _asset_version(directory / filename) if directory and not DEV_NO_CACHE else None
+    return f"{url_path}?v={version}" if version else url_path
+
+
+def _send_asset(prefix: str, filename: str):
+    """Send an asset; immutable if requested with its current ?v= hash."""
+    directory = _asset_dirs()[prefix]
+    response = send_from_directory(str(directory), filename)
+    version = request.args.get("v")
+    if version and not DEV_NO_CACHE and version == _asset_version(directory / filename):
+        response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return response
+
+
 @app.route("/css/<path:filename>")
 def serve_css(filename):
     """Serve CSS files."""
-    return send_from_directory(str(STATIC_PATH / "css"), filename)
+    return _send_asset("css", filename)
 
 
 @app.route("/js/<path:filename>")
 def serve_js(filename):
     """Serve JS files."""
-    return send_from_directory(str(STATIC_PATH / "js"), filename)
+    return _send_asset("js", filename)
 
 
 @app.route("/components/<path:filename>")
 def serve_components(filename):
     """Serve Web Component files."""
-    components_path = EHKOFORGE_ROOT / "6.0 Frontend" / "components"
-    return send_from_directory(str(components_path), filename)
+    return _send_asset("components", filename)
 
 
 @app.route("/<path:filename>")
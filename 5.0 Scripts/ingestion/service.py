@@ -14,6 +14,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+from ehkoforge.db import connect
+
 from .types import IngestedDocument, DocumentChunk, ParsedContent
 from .chunker import Chunker
 from .parsers import get_parser
@@ -64,9 +66,7 @@ class IngestService:
     
     def get_db(self) -> sqlite3.Connection:
         """Get database connection."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(self.db_path, row_factory=sqlite3.Row)
     
     # =========================================================================
     # MAIN PROCESSING
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Forge Chat Load Test
+
+Sends N concurrent chat turns to the sync Flask server (forge_server) and
+the ASGI server (forge_asgi) and reports wall time, throughput and latency
+percentiles. Each server runs in its own process on localhost against a
+throwaway database with a mock provider that sleeps for --latency seconds
+per reply, so the numbers show how each server overlaps slow LLM calls
+(no API usage).
+
+Requires: pip install starlette uvicorn a2wsgi
+
+Usage:
+    cd "5.0 Scripts"
+    python load_test_chat.py
+    python load_test_chat.py --chats 200 --latency 1.0 --servers flask-threaded asgi
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import socket
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import uvicorn
+from werkzeug.serving import make_server
+
+import forge_asgi
+import forge_server
+from ehkoforge.metrics import percentile
+from recog_engine.chat_preflight import ChatPreflight
+from test_forge_chat import MockChatProvider, setup_test_server
+
+SERVERS = ["flask", "flask-threaded", "asgi"]
+
+
+# =============================================================================
+# SERVERS
+# =============================================================================
+
+def serve(name: str, port: int, db_path: Path, latency: float):
+    """Child process: serve forge on `port` using an existing test database."""
+    forge_server.DATABASE_PATH = db_path
+    forge_server.CONTEXT_BUILDER.database_path = db_path
+    forge_server.CHAT_PREFLIGHT = ChatPreflight(db_path)
+    forge_server._llm_provider = MockChatProvider(latency=latency)
+    
+    if name == "asgi":
+        uvicorn.run(forge_asgi.app, host="127.0.0.1", port=port,
+                    log_level="warning", lifespan="off")
+    else:
+        make_server("127.0.0.1", port, forge_server.app,
+                    threaded=(name == "flask-threaded")).serve_forever()
+
+
+def start_server(name: str, port: int, db_path: Path, latency: float) -> subprocess.Popen:
+    """Launch `serve` in a subprocess and wait until it accepts connections."""
+    proc = subprocess.Popen(
+        [sys.executable, __file__, "--serve", name, "--port", str(port),
+         "--db", str(db_path), "--latency", str(latency)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"{name} server did not start on port {port}")
+
+
+# =============================================================================
+# LOAD
+# =============================================================================
+
+async def post_json(port: int, path: str, payload: dict):
+    """
+    Minimal HTTP/1.1 POST on a fresh connection; returns the status code.
+    
+    A raw client keeps the load generator cheap enough that it is not the
+    bottleneck at hundreds of concurrent requests.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("ascii") + body
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def send_turns(port: int, session_ids: list) -> tuple:
+    """Post one message per session, all at once. Returns (latencies, statuses, wall)."""
+    
+    async def turn(session_id):
+        start = time.perf_counter()
+        try:
+            status = await post_json(port, f"/api/sessions/{session_id}/messages",
+                                     {"content": "Load test", "mode": "terminal"})
+        except (OSError, IndexError, ValueError):
+            status = None  # refused / reset (e.g. listen backlog overflow)
+        return time.perf_counter() - start, status
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*[turn(sid) for sid in session_ids])
+    wall = time.perf_counter() - start
+    
+    return [r[0] for r in results], [r[1] for r in results], wall
+
+
+def run_server(name: str, chats: int, latency: float, port: int) -> dict:
+    """Load one server with `chats` concurrent turns."""
+    db_path = setup_test_server(MockChatProvider(latency=latency))
+    forge_server.CHAT_PREFLIGHT.run(spend=False)
+    conn = forge_server.get_db()
+    conn.execute("UPDATE mana_state SET current_mana = 1e9, max_mana = 1e9")
+    conn.commit()
+    conn.close()
+    
+    client = forge_server.app.test_client()
+    session_ids = [client.post("/api/sessions", json={"title": "Load"}).get_json()["id"]
+                   for _ in range(chats)]
+    
+    proc = start_server(name, port, db_path, latency)
+    try:
+        latencies, statuses, wall = asyncio.run(send_turns(port, session_ids))
+    finally:
+        proc.terminate()
+        proc.wait()
+    
+    latencies.sort()
+    return {
+        "server": name,
+        "ok": sum(1 for s in statuses if s == 201),
+        "wall": wall,
+        "throughput": chats / wall,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "max": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Flask vs ASGI chat servers")
+    parser.add_argument("--chats", type=int, default=50, help="Concurrent chat turns")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock provider seconds per reply")
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=SERVERS)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--serve", choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument("--db", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.serve, args.port, args.db, args.latency)
+        return
+    
+    print("=" * 72)
+    print(f"Chat load test: {args.chats} concurrent turns, {args.latency}s mock provider")
+    print("=" * 72)
+    
+    rows = []
+    for offset, name in enumerate(args.servers):
+        print(f"Running {name}...", flush=True)
+        with redirect_stdout(io.StringIO()):  # silence per-request server logging
+            rows.append(run_server(name, args.chats, args.latency, args.port + offset))
+    
+    print("-" * 72)
+    print(f"{'server':<16}{'ok':>6}{'wall s':>10}{'req/s':>10}{'p50 s':>10}{'p95 s':>10}{'max s':>10}")
+    for row in rows:
+        print(f"{row['server']:<16}{row['ok']:>6}{row['wall']:>10.2f}{row['throughput']:>10.1f}"
+              f"{row['p50']:>10.2f}{row['p95']:>10.2f}{row['max']:>10.2f}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -86,6 +86,9 @@ from .smelt import (
 )
 from .prompts import (
     get_system_prompt, 
+    get_system_prompt_parts,
+    get_static_prompt,
+    get_dynamic_prompt,
     get_forging_prompt, 
     get_visitor_prompt,
     get_stage_for_authority,
@@ -163,6 +166,9 @@ __all__ = [
     'should_auto_smelt',
     # Prompts
     'get_system_prompt',
+    'get_system_prompt_parts',
+    'get_static_prompt',
+    'get_dynamic_prompt',
     'get_forging_prompt',
     'get_visitor_prompt',
     'get_stage_for_authority',
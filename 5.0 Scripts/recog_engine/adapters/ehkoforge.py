@@ -20,6 +20,8 @@ from typing import List, Optional, Iterator, Dict, Any
 from datetime import datetime
 from uuid import uuid4
 
+from ehkoforge.db import connect
+
 from .base import RecogAdapter
 from recog_engine.core.types import (
     Document,
@@ -143,15 +145,16 @@ class EhkoForgeAdapter(RecogAdapter):
         self._context = None
         
         if run_migrations_on_init:
-            with self._get_connection() as conn:
+            conn = self._get_connection()
+            try:
                 run_migrations(conn)
+            finally:
+                conn.close()
     
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection (thread-safe)."""
-        # Always create fresh connection for thread safety
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        # Pooled connection, one borrower at a time
+        return connect(self.db_path, row_factory=sqlite3.Row)
     
     def close(self) -> None:
         """Close database connection."""
@@ -193,134 +196,143 @@ class EhkoForgeAdapter(RecogAdapter):
     def _load_reflection_documents(self, **filters) -> Iterator[Document]:
         """Load documents from reflection_objects table."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT ro.id, ro.file_path, ro.title, ro.vault, ro.type, ro.created, ro.updated
-            FROM reflection_objects ro
-            WHERE 1=1
-        """
-        params = []
-        
-        if filters.get("vault"):
-            query += " AND ro.vault = ?"
-            params.append(filters["vault"])
-        
-        if filters.get("since"):
-            query += " AND ro.created >= ?"
-            params.append(filters["since"].isoformat())
-        
-        if filters.get("until"):
-            query += " AND ro.created <= ?"
-            params.append(filters["until"].isoformat())
-        
-        if filters.get("limit"):
-            query += " LIMIT ?"
-            params.append(filters["limit"])
-        
-        cursor.execute(query, params)
-        
-        for row in cursor:
-            # Read the actual file content
-            content = self._read_reflection_content(row["file_path"])
-            if content:
-                yield Document(
-                    id=str(row["id"]),
-                    content=content,
-                    source_type="reflection",
-                    source_ref=row["file_path"],
-                    metadata={
-                        "title": row["title"],
-                        "vault": row["vault"],
-                        "type": row["type"],
-                    },
-                    created_at=datetime.fromisoformat(row["created"]) if row["created"] else datetime.utcnow(),
-                )
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT ro.id, ro.file_path, ro.title, ro.vault, ro.type, ro.created, ro.updated
+                FROM reflection_objects ro
+                WHERE 1=1
+            """
+            params = []
+            
+            if filters.get("vault"):
+                query += " AND ro.vault = ?"
+                params.append(filters["vault"])
+            
+            if filters.get("since"):
+                query += " AND ro.created >= ?"
+                params.append(filters["since"].isoformat())
+            
+            if filters.get("until"):
+                query += " AND ro.created <= ?"
+                params.append(filters["until"].isoformat())
+            
+            if filters.get("limit"):
+                query += " LIMIT ?"
+                params.append(filters["limit"])
+            
+            cursor.execute(query, params)
+            
+            for row in cursor:
+                # Read the actual file content
+                content = self._read_reflection_content(row["file_path"])
+                if content:
+                    yield Document(
+                        id=str(row["id"]),
+                        content=content,
+                        source_type="reflection",
+                        source_ref=row["file_path"],
+                        metadata={
+                            "title": row["title"],
+                            "vault": row["vault"],
+                            "type": row["type"],
+                        },
+                        created_at=datetime.fromisoformat(row["created"]) if row["created"] else datetime.utcnow(),
+                    )
+        finally:
+            conn.close()
     
     def _load_session_documents(self, **filters) -> Iterator[Document]:
         """Load documents from forge_sessions/forge_messages."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT fs.id, fs.title, fs.created_at,
-                   GROUP_CONCAT(fm.content, '\n\n') as messages
-            FROM forge_sessions fs
-            JOIN forge_messages fm ON fm.session_id = fs.id
-            WHERE 1=1
-        """
-        params = []
-        
-        if filters.get("since"):
-            query += " AND fs.created_at >= ?"
-            params.append(filters["since"].isoformat())
-        
-        query += " GROUP BY fs.id ORDER BY fs.created_at DESC"
-        
-        if filters.get("limit"):
-            query += " LIMIT ?"
-            params.append(filters["limit"])
-        
-        cursor.execute(query, params)
-        
-        for row in cursor:
-            if row["messages"]:
-                yield Document(
-                    id=row["id"],
-                    content=row["messages"],
-                    source_type="session",
-                    source_ref=f"session:{row['id']}",
-                    metadata={
-                        "title": row["title"],
-                    },
-                    created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
-                )
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT fs.id, fs.title, fs.created_at,
+                       GROUP_CONCAT(fm.content, '\n\n') as messages
+                FROM forge_sessions fs
+                JOIN forge_messages fm ON fm.session_id = fs.id
+                WHERE 1=1
+            """
+            params = []
+            
+            if filters.get("since"):
+                query += " AND fs.created_at >= ?"
+                params.append(filters["since"].isoformat())
+            
+            query += " GROUP BY fs.id ORDER BY fs.created_at DESC"
+            
+            if filters.get("limit"):
+                query += " LIMIT ?"
+                params.append(filters["limit"])
+            
+            cursor.execute(query, params)
+            
+            for row in cursor:
+                if row["messages"]:
+                    yield Document(
+                        id=row["id"],
+                        content=row["messages"],
+                        source_type="session",
+                        source_ref=f"session:{row['id']}",
+                        metadata={
+                            "title": row["title"],
+                        },
+                        created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+                    )
+        finally:
+            conn.close()
     
     def _load_transcript_documents(self, **filters) -> Iterator[Document]:
         """Load documents from transcript_segments."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT ts.transcript_id, ts.segment_index, ts.content
-            FROM transcript_segments ts
-            ORDER BY ts.transcript_id, ts.segment_index
-        """
-        
-        if filters.get("limit"):
-            query += f" LIMIT {filters['limit']}"
-        
-        cursor.execute(query)
-        
-        # Group segments by transcript
-        current_transcript = None
-        segments = []
-        
-        for row in cursor:
-            if current_transcript != row["transcript_id"]:
-                if segments:
-                    yield Document(
-                        id=current_transcript,
-                        content="\n\n".join(segments),
-                        source_type="transcript",
-                        source_ref=f"transcript:{current_transcript}",
-                        metadata={},
-                        created_at=datetime.utcnow(),
-                    )
-                current_transcript = row["transcript_id"]
-                segments = []
-            segments.append(row["content"])
-        
-        # Yield last transcript
-        if segments:
-            yield Document(
-                id=current_transcript,
-                content="\n\n".join(segments),
-                source_type="transcript",
-                source_ref=f"transcript:{current_transcript}",
-                metadata={},
-                created_at=datetime.utcnow(),
-            )
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT ts.transcript_id, ts.segment_index, ts.content
+                FROM transcript_segments ts
+                ORDER BY ts.transcript_id, ts.segment_index
+            """
+            
+            if filters.get("limit"):
+                query += f" LIMIT {filters['limit']}"
+            
+            cursor.execute(query)
+            
+            # Group segments by transcript
+            current_transcript = None
+            segments = []
+            
+            for row in cursor:
+                if current_transcript != row["transcript_id"]:
+                    if segments:
+                        yield Document(
+                            id=current_transcript,
+                            content="\n\n".join(segments),
+                            source_type="transcript",
+                            source_ref=f"transcript:{current_transcript}",
+                            metadata={},
+                            created_at=datetime.utcnow(),
+                        )
+                    current_transcript = row["transcript_id"]
+                    segments = []
+                segments.append(row["content"])
+            
+            # Yield last transcript
+            if segments:
+                yield Document(
+                    id=current_transcript,
+                    content="\n\n".join(segments),
+                    source_type="transcript",
+                    source_ref=f"transcript:{current_transcript}",
+                    metadata={},
+                    created_at=datetime.utcnow(),
+                )
+        finally:
+            conn.close()
     
     def _read_reflection_content(self, path: str) -> Optional[str]:
         """Read content from a reflection file."""
@@ -356,64 +368,67 @@ class EhkoForgeAdapter(RecogAdapter):
         Maps ReCog Insight to EhkoForge ingot schema.
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Check if ingot with this recog_insight_id exists
-        cursor.execute(
-            "SELECT id FROM ingots WHERE recog_insight_id = ?",
-            (insight.id,)
-        )
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing
-            cursor.execute("""
-                UPDATE ingots SET
-                    summary = ?,
-                    themes_json = ?,
-                    significance = ?,
-                    confidence = ?,
-                    updated_at = ?
-                WHERE recog_insight_id = ?
-            """, (
-                insight.summary,
-                json.dumps(insight.themes),
-                insight.significance,
-                insight.confidence,
-                datetime.utcnow().isoformat(),
-                insight.id,
-            ))
-        else:
-            # Insert new
-            ingot_id = str(uuid4())
-            cursor.execute("""
-                INSERT INTO ingots (
-                    id, summary, themes_json, significance, 
-                    confidence, status, created_at, updated_at, recog_insight_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                ingot_id,
-                insight.summary,
-                json.dumps(insight.themes),
-                insight.significance,
-                insight.confidence,
-                "raw",
-                insight.created_at.isoformat(),
-                datetime.utcnow().isoformat(),
-                insight.id,
-            ))
+        try:
+            cursor = conn.cursor()
             
-            # Link to sources
-            for source_id in insight.source_ids:
-                try:
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO ingot_sources (ingot_id, source_type, source_id, added_at)
-                        VALUES (?, ?, ?, ?)
-                    """, (ingot_id, "document", source_id, datetime.utcnow().isoformat()))
-                except sqlite3.OperationalError:
-                    pass  # Table might not exist
-        
-        conn.commit()
+            # Check if ingot with this recog_insight_id exists
+            cursor.execute(
+                "SELECT id FROM ingots WHERE recog_insight_id = ?",
+                (insight.id,)
+            )
+            existing = cursor.fetchone()
+            
+            if existing:
+                # Update existing
+                cursor.execute("""
+                    UPDATE ingots SET
+                        summary = ?,
+                        themes_json = ?,
+                        significance = ?,
+                        confidence = ?,
+                        updated_at = ?
+                    WHERE recog_insight_id = ?
+                """, (
+                    insight.summary,
+                    json.dumps(insight.themes),
+                    insight.significance,
+                    insight.confidence,
+                    datetime.utcnow().isoformat(),
+                    insight.id,
+                ))
+            else:
+                # Insert new
+                ingot_id = str(uuid4())
+                cursor.execute("""
+                    INSERT INTO ingots (
+                        id, summary, themes_json, significance, 
+                        confidence, status, created_at, updated_at, recog_insight_id
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    ingot_id,
+                    insight.summary,
+                    json.dumps(insight.themes),
+                    insight.significance,
+                    insight.confidence,
+                    "raw",
+                    insight.created_at.isoformat(),
+                    datetime.utcnow().isoformat(),
+                    insight.id,
+                ))
+                
+                # Link to sources
+                for source_id in insight.source_ids:
+                    try:
+                        cursor.execute("""
+                            INSERT OR IGNORE INTO ingot_sources (ingot_id, source_type, source_id, added_at)
+                            VALUES (?, ?, ?, ?)
+                        """, (ingot_id, "document", source_id, datetime.utcnow().isoformat()))
+                    except sqlite3.OperationalError:
+                        pass  # Table might not exist
+            
+            conn.commit()
+        finally:
+            conn.close()
     
     def get_insights(self, **filters) -> List[Insight]:
         """
@@ -425,48 +440,51 @@ class EhkoForgeAdapter(RecogAdapter):
             status: Filter by status
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT id, summary, themes_json, significance, confidence, 
-                   created_at, recog_insight_id
-            FROM ingots
-            WHERE 1=1
-        """
-        params = []
-        
-        if filters.get("min_significance"):
-            query += " AND significance >= ?"
-            params.append(filters["min_significance"])
-        
-        if filters.get("status"):
-            query += " AND status = ?"
-            params.append(filters["status"])
-        
-        cursor.execute(query, params)
-        
-        insights = []
-        for row in cursor:
-            themes = json.loads(row["themes_json"]) if row["themes_json"] else []
-            
-            # Apply theme filter in Python (JSON field)
-            if filters.get("themes"):
-                if not set(filters["themes"]) & set(themes):
-                    continue
-            
-            insights.append(Insight(
-                id=row["recog_insight_id"] or row["id"],
-                summary=row["summary"],
-                themes=themes,
-                significance=row["significance"] or 0.5,
-                confidence=row["confidence"] or 0.5,
-                source_ids=[],  # Would need join to get these
-                excerpts=[],
-                created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-            ))
-        
-        return insights
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT id, summary, themes_json, significance, confidence, 
+                       created_at, recog_insight_id
+                FROM ingots
+                WHERE 1=1
+            """
+            params = []
+            
+            if filters.get("min_significance"):
+                query += " AND significance >= ?"
+                params.append(filters["min_significance"])
+            
+            if filters.get("status"):
+                query += " AND status = ?"
+                params.append(filters["status"])
+            
+            cursor.execute(query, params)
+            
+            insights = []
+            for row in cursor:
+                themes = json.loads(row["themes_json"]) if row["themes_json"] else []
+                
+                # Apply theme filter in Python (JSON field)
+                if filters.get("themes"):
+                    if not set(filters["themes"]) & set(themes):
+                        continue
+                
+                insights.append(Insight(
+                    id=row["recog_insight_id"] or row["id"],
+                    summary=row["summary"],
+                    themes=themes,
+                    significance=row["significance"] or 0.5,
+                    confidence=row["confidence"] or 0.5,
+                    source_ids=[],  # Would need join to get these
+                    excerpts=[],
+                    created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+                    updated_at=datetime.utcnow(),
+                ))
+            
+            return insights
+        finally:
+            conn.close()
     
     # =========================================================================
     # PATTERN MANAGEMENT (-> ingot_patterns table)
@@ -475,88 +493,94 @@ class EhkoForgeAdapter(RecogAdapter):
     def save_pattern(self, pattern: Pattern) -> None:
         """Save pattern to ingot_patterns table."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Upsert pattern
-        cursor.execute("""
-            INSERT OR REPLACE INTO ingot_patterns (
-                id, summary, pattern_type, strength, metadata, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            pattern.id,
-            pattern.summary,
-            pattern.pattern_type.value,
-            pattern.strength,
-            json.dumps(pattern.metadata),
-            pattern.created_at.isoformat(),
-        ))
-        
-        # Update insight links
-        cursor.execute(
-            "DELETE FROM ingot_pattern_insights WHERE pattern_id = ?",
-            (pattern.id,)
-        )
-        
-        for insight_id in pattern.insight_ids:
-            # Find the ingot ID for this insight
+        try:
+            cursor = conn.cursor()
+            
+            # Upsert pattern
+            cursor.execute("""
+                INSERT OR REPLACE INTO ingot_patterns (
+                    id, summary, pattern_type, strength, metadata, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                pattern.id,
+                pattern.summary,
+                pattern.pattern_type.value,
+                pattern.strength,
+                json.dumps(pattern.metadata),
+                pattern.created_at.isoformat(),
+            ))
+            
+            # Update insight links
             cursor.execute(
-                "SELECT id FROM ingots WHERE recog_insight_id = ?",
-                (insight_id,)
+                "DELETE FROM ingot_pattern_insights WHERE pattern_id = ?",
+                (pattern.id,)
             )
-            row = cursor.fetchone()
-            ingot_id = row["id"] if row else insight_id
             
-            cursor.execute("""
-                INSERT OR IGNORE INTO ingot_pattern_insights (pattern_id, ingot_id)
-                VALUES (?, ?)
-            """, (pattern.id, ingot_id))
-        
-        conn.commit()
+            for insight_id in pattern.insight_ids:
+                # Find the ingot ID for this insight
+                cursor.execute(
+                    "SELECT id FROM ingots WHERE recog_insight_id = ?",
+                    (insight_id,)
+                )
+                row = cursor.fetchone()
+                ingot_id = row["id"] if row else insight_id
+                
+                cursor.execute("""
+                    INSERT OR IGNORE INTO ingot_pattern_insights (pattern_id, ingot_id)
+                    VALUES (?, ?)
+                """, (pattern.id, ingot_id))
+            
+            conn.commit()
+        finally:
+            conn.close()
     
     def get_patterns(self, **filters) -> List[Pattern]:
         """Get patterns from ingot_patterns table."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM ingot_patterns WHERE 1=1"
-        params = []
-        
-        if filters.get("pattern_type"):
-            query += " AND pattern_type = ?"
-            params.append(filters["pattern_type"].value if isinstance(filters["pattern_type"], PatternType) else filters["pattern_type"])
-        
-        if filters.get("min_strength"):
-            query += " AND strength >= ?"
-            params.append(filters["min_strength"])
-        
-        cursor.execute(query, params)
-        
-        # Fetch all rows first to avoid cursor reuse bug
-        rows = cursor.fetchall()
-        
-        patterns = []
-        for row in rows:
-            # Get linked insight IDs with separate cursor
-            cursor2 = conn.cursor()
-            cursor2.execute("""
-                SELECT i.recog_insight_id, i.id
-                FROM ingot_pattern_insights ipi
-                JOIN ingots i ON i.id = ipi.ingot_id
-                WHERE ipi.pattern_id = ?
-            """, (row["id"],))
-            insight_ids = [r["recog_insight_id"] or r["id"] for r in cursor2.fetchall()]
-            
-            patterns.append(Pattern(
-                id=row["id"],
-                summary=row["summary"],
-                pattern_type=PatternType(row["pattern_type"]),
-                insight_ids=insight_ids,
-                strength=row["strength"],
-                metadata=json.loads(row["metadata"]) if row["metadata"] else {},
-                created_at=datetime.fromisoformat(row["created_at"]),
-            ))
-        
-        return patterns
+        try:
+            cursor = conn.cursor()
+            
+            query = "SELECT * FROM ingot_patterns WHERE 1=1"
+            params = []
+            
+            if filters.get("pattern_type"):
+                query += " AND pattern_type = ?"
+                params.append(filters["pattern_type"].value if isinstance(filters["pattern_type"], PatternType) else filters["pattern_type"])
+            
+            if filters.get("min_strength"):
+                query += " AND strength >= ?"
+                params.append(filters["min_strength"])
+            
+            cursor.execute(query, params)
+            
+            # Fetch all rows first to avoid cursor reuse bug
+            rows = cursor.fetchall()
+            
+            patterns = []
+            for row in rows:
+                # Get linked insight IDs with separate cursor
+                cursor2 = conn.cursor()
+                cursor2.execute("""
+                    SELECT i.recog_insight_id, i.id
+                    FROM ingot_pattern_insights ipi
+                    JOIN ingots i ON i.id = ipi.ingot_id
+                    WHERE ipi.pattern_id = ?
+                """, (row["id"],))
+                insight_ids = [r["recog_insight_id"] or r["id"] for r in cursor2.fetchall()]
+                
+                patterns.append(Pattern(
+                    id=row["id"],
+                    summary=row["summary"],
+                    pattern_type=PatternType(row["pattern_type"]),
+                    insight_ids=insight_ids,
+                    strength=row["strength"],
+                    metadata=json.loads(row["metadata"]) if row["metadata"] else {},
+                    created_at=datetime.fromisoformat(row["created_at"]),
+                ))
+            
+            return patterns
+        finally:
+            conn.close()
     
     # =========================================================================
     # SYNTHESIS MANAGEMENT (-> ehko_personality_layers table)
@@ -573,96 +597,102 @@ class EhkoForgeAdapter(RecogAdapter):
         - THEME → "trait" (fallback)
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Map synthesis type to layer type
-        layer_type_map = {
-            SynthesisType.TRAIT: "trait",
-            SynthesisType.BELIEF: "value",
-            SynthesisType.TENDENCY: "pattern",
-            SynthesisType.THEME: "trait",
-        }
-        layer_type = layer_type_map.get(synthesis.synthesis_type, "trait")
-        
-        # Use significance as weight
-        weight = synthesis.significance
-        
-        # Check if exists
-        cursor.execute(
-            "SELECT id FROM ehko_personality_layers WHERE ingot_id = ?",
-            (synthesis.id,)
-        )
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute("""
-                UPDATE ehko_personality_layers SET
-                    layer_type = ?,
-                    content = ?,
-                    weight = ?
-                WHERE ingot_id = ?
-            """, (layer_type, synthesis.summary, weight, synthesis.id))
-        else:
-            cursor.execute("""
-                INSERT INTO ehko_personality_layers (
-                    ingot_id, layer_type, content, weight, active, integrated_at
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                synthesis.id,
-                layer_type,
-                synthesis.summary,
-                weight,
-                1,  # active
-                synthesis.created_at.isoformat(),
-            ))
-        
-        conn.commit()
-    
-    def get_syntheses(self, **filters) -> List[Synthesis]:
-        """Get syntheses from ehko_personality_layers table."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Reverse map layer_type to SynthesisType
-        type_map = {
-            "trait": SynthesisType.TRAIT,
-            "value": SynthesisType.BELIEF,
-            "pattern": SynthesisType.TENDENCY,
-            "memory": SynthesisType.THEME,
-            "voice": SynthesisType.TRAIT,
-        }
-        
-        query = "SELECT * FROM ehko_personality_layers WHERE active = 1"
-        params = []
-        
-        if filters.get("synthesis_type"):
+        try:
+            cursor = conn.cursor()
+            
+            # Map synthesis type to layer type
             layer_type_map = {
                 SynthesisType.TRAIT: "trait",
                 SynthesisType.BELIEF: "value",
                 SynthesisType.TENDENCY: "pattern",
-                SynthesisType.THEME: "memory",
+                SynthesisType.THEME: "trait",
             }
-            st = filters["synthesis_type"]
-            if isinstance(st, SynthesisType):
-                query += " AND layer_type = ?"
-                params.append(layer_type_map.get(st, "trait"))
-        
-        cursor.execute(query, params)
-        
-        syntheses = []
-        for row in cursor:
-            syntheses.append(Synthesis(
-                id=row["ingot_id"],
-                summary=row["content"],
-                synthesis_type=type_map.get(row["layer_type"], SynthesisType.THEME),
-                pattern_ids=[],
-                significance=row["weight"] or 0.5,
-                confidence=0.5,
-                metadata={},
-                created_at=datetime.fromisoformat(row["integrated_at"]) if row["integrated_at"] else datetime.utcnow(),
-            ))
-        
-        return syntheses
+            layer_type = layer_type_map.get(synthesis.synthesis_type, "trait")
+            
+            # Use significance as weight
+            weight = synthesis.significance
+            
+            # Check if exists
+            cursor.execute(
+                "SELECT id FROM ehko_personality_layers WHERE ingot_id = ?",
+                (synthesis.id,)
+            )
+            existing = cursor.fetchone()
+            
+            if existing:
+                cursor.execute("""
+                    UPDATE ehko_personality_layers SET
+                        layer_type = ?,
+                        content = ?,
+                        weight = ?
+                    WHERE ingot_id = ?
+                """, (layer_type, synthesis.summary, weight, synthesis.id))
+            else:
+                cursor.execute("""
+                    INSERT INTO ehko_personality_layers (
+                        ingot_id, layer_type, content, weight, active, integrated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    synthesis.id,
+                    layer_type,
+                    synthesis.summary,
+                    weight,
+                    1,  # active
+                    synthesis.created_at.isoformat(),
+                ))
+            
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def get_syntheses(self, **filters) -> List[Synthesis]:
+        """Get syntheses from ehko_personality_layers table."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            
+            # Reverse map layer_type to SynthesisType
+            type_map = {
+                "trait": SynthesisType.TRAIT,
+                "value": SynthesisType.BELIEF,
+                "pattern": SynthesisType.TENDENCY,
+                "memory": SynthesisType.THEME,
+                "voice": SynthesisType.TRAIT,
+            }
+            
+            query = "SELECT * FROM ehko_personality_layers WHERE active = 1"
+            params = []
+            
+            if filters.get("synthesis_type"):
+                layer_type_map = {
+                    SynthesisType.TRAIT: "trait",
+                    SynthesisType.BELIEF: "value",
+                    SynthesisType.TENDENCY: "pattern",
+                    SynthesisType.THEME: "memory",
+                }
+                st = filters["synthesis_type"]
+                if isinstance(st, SynthesisType):
+                    query += " AND layer_type = ?"
+                    params.append(layer_type_map.get(st, "trait"))
+            
+            cursor.execute(query, params)
+            
+            syntheses = []
+            for row in cursor:
+                syntheses.append(Synthesis(
+                    id=row["ingot_id"],
+                    summary=row["content"],
+                    synthesis_type=type_map.get(row["layer_type"], SynthesisType.THEME),
+                    pattern_ids=[],
+                    significance=row["weight"] or 0.5,
+                    confidence=0.5,
+                    metadata={},
+                    created_at=datetime.fromisoformat(row["integrated_at"]) if row["integrated_at"] else datetime.utcnow(),
+                ))
+            
+            return syntheses
+        finally:
+            conn.close()
     
     # =========================================================================
     # CONTEXT MANAGEMENT
@@ -688,19 +718,22 @@ class EhkoForgeAdapter(RecogAdapter):
     def get_existing_themes(self) -> List[str]:
         """Get themes from existing ingots."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT DISTINCT themes_json FROM ingots WHERE themes_json IS NOT NULL")
-        
-        all_themes = set()
-        for row in cursor:
-            try:
-                themes = json.loads(row["themes_json"])
-                all_themes.update(themes)
-            except:
-                pass
-        
-        return list(all_themes)
+        try:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT DISTINCT themes_json FROM ingots WHERE themes_json IS NOT NULL")
+            
+            all_themes = set()
+            for row in cursor:
+                try:
+                    themes = json.loads(row["themes_json"])
+                    all_themes.update(themes)
+                except:
+                    pass
+            
+            return list(all_themes)
+        finally:
+            conn.close()
     
     # =========================================================================
     # STATE MANAGEMENT
@@ -722,41 +755,44 @@ class EhkoForgeAdapter(RecogAdapter):
     def stats(self) -> Dict[str, int]:
         """Get database statistics."""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        stats = {}
-        
-        cursor.execute("SELECT COUNT(*) FROM reflection_objects")
-        stats["reflections"] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM ingots")
-        stats["insights"] = cursor.fetchone()[0]
-        
-        try:
-            cursor.execute("SELECT COUNT(*) FROM ingot_patterns")
-            stats["patterns"] = cursor.fetchone()[0]
-        except:
-            stats["patterns"] = 0
-        
-        cursor.execute("SELECT COUNT(*) FROM ehko_personality_layers")
-        stats["syntheses"] = cursor.fetchone()[0]
-        
-        # Document ingestion stats
         try:
-            cursor.execute("SELECT COUNT(*) FROM ingested_documents")
-            stats["ingested_documents"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM document_chunks WHERE recog_processed = 0")
-            stats["unprocessed_chunks"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM document_chunks WHERE recog_processed = 1")
-            stats["processed_chunks"] = cursor.fetchone()[0]
-        except:
-            stats["ingested_documents"] = 0
-            stats["unprocessed_chunks"] = 0
-            stats["processed_chunks"] = 0
-        
-        return stats
+            cursor = conn.cursor()
+            
+            stats = {}
+            
+            cursor.execute("SELECT COUNT(*) FROM reflection_objects")
+            stats["reflections"] = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT COUNT(*) FROM ingots")
+            stats["insights"] = cursor.fetchone()[0]
+            
+            try:
+                cursor.execute("SELECT COUNT(*) FROM ingot_patterns")
+                stats["patterns"] = cursor.fetchone()[0]
+            except:
+                stats["patterns"] = 0
+            
+            cursor.execute("SELECT COUNT(*) FROM ehko_personality_layers")
+            stats["syntheses"] = cursor.fetchone()[0]
+            
+            # Document ingestion stats
+            try:
+                cursor.execute("SELECT COUNT(*) FROM ingested_documents")
+                stats["ingested_documents"] = cursor.fetchone()[0]
+                
+                cursor.execute("SELECT COUNT(*) FROM document_chunks WHERE recog_processed = 0")
+                stats["unprocessed_chunks"] = cursor.fetchone()[0]
+                
+                cursor.execute("SELECT COUNT(*) FROM document_chunks WHERE recog_processed = 1")
+                stats["processed_chunks"] = cursor.fetchone()[0]
+            except:
+                stats["ingested_documents"] = 0
+                stats["unprocessed_chunks"] = 0
+                stats["processed_chunks"] = 0
+            
+            return stats
+        finally:
+            conn.close()
     
     # =========================================================================
     # DOCUMENT CHUNK METHODS
@@ -24,6 +24,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+from ehkoforge.db import connect
+
 from .prompts import get_stage_for_authority
 
 
@@ -37,7 +39,7 @@ def calculate_authority_components(db_path: Path) -> Dict[str, float]:
     
     Returns dict with component scores (0.0 - 1.0) and total Authority.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -208,7 +210,7 @@ def update_authority(db_path: Path) -> Dict[str, float]:
     authority_total = calculate_total_authority(components)
     stage = get_stage_for_authority(authority_total)
     
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -276,26 +278,11 @@ def get_current_authority(db_path: Path) -> Dict[str, float]:
     
     If not calculated yet, calculates and stores it.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    conn = connect(db_path)
     try:
-        cursor.execute("""
-            SELECT * FROM ehko_authority WHERE id = 1
-        """)
-        row = cursor.fetchone()
-        
-        if row:
-            return {
-                'memory_depth': row['memory_depth'],
-                'identity_clarity': row['identity_clarity'],
-                'emotional_range': row['emotional_range'],
-                'temporal_coverage': row['temporal_coverage'],
-                'core_density': row['core_density'],
-                'authority_total': row['authority_total'],
-                'advancement_stage': row['advancement_stage'],
-            }
+        authority = read_authority(conn)
+        if authority:
+            return authority
     except sqlite3.Error:
         pass
     finally:
@@ -305,17 +292,68 @@ def get_current_authority(db_path: Path) -> Dict[str, float]:
     return update_authority(db_path)
 
 
+def read_authority(conn: sqlite3.Connection) -> Optional[Dict[str, float]]:
+    """
+    Stored Authority state on an open connection, or None if not yet
+    calculated (no recalculation; see get_current_authority).
+    
+    Raises:
+        sqlite3.OperationalError: The ehko_authority table doesn't exist yet.
+    """
+    row = conn.execute("""
+        SELECT memory_depth, identity_clarity, emotional_range, temporal_coverage,
+               core_density, authority_total, advancement_stage
+        FROM ehko_authority WHERE id = 1
+    """).fetchone()
+    if not row:
+        return None
+    
+    keys = ('memory_depth', 'identity_clarity', 'emotional_range', 'temporal_coverage',
+            'core_density', 'authority_total', 'advancement_stage')
+    return dict(zip(keys, row))
+
+
 # =============================================================================
 # MANA SYSTEM
 # =============================================================================
 
+# Fallback costs when an operation has no row in mana_costs
+DEFAULT_MANA_COSTS = {
+    'terminal_message': 1.0,
+    'reflection_message': 3.0,
+    'recog_sweep': 20.0,
+    'flag_for_processing': 0.0,
+}
+
+
+def regenerated_mana(row, now: datetime) -> float:
+    """
+    Apply time-based regeneration to a mana_state row.
+    
+    Args:
+        row: mana_state row (current_mana, max_mana, regen_rate, last_updated)
+        now: Current UTC time
+    
+    Returns:
+        Current mana after regeneration, capped at max_mana.
+    """
+    last_updated = _parse_date(row['last_updated'])
+    
+    if not last_updated:
+        return row['current_mana']
+    
+    hours_elapsed = (now - last_updated).total_seconds() / 3600
+    regenerated = hours_elapsed * row['regen_rate']
+    return min(row['max_mana'], row['current_mana'] + regenerated)
+
+
 def get_mana_state(db_path: Path) -> Dict[str, float]:
     """
     Get current mana state, applying regeneration.
     
     Regeneration is calculated based on time since last update.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -346,15 +384,8 @@ def get_mana_state(db_path: Path) -> Dict[str, float]:
             }
         
         # Calculate regeneration
-        last_updated = _parse_date(row['last_updated'])
         now = datetime.utcnow()
-        
-        if last_updated:
-            hours_elapsed = (now - last_updated).total_seconds() / 3600
-            regenerated = hours_elapsed * row['regen_rate']
-            new_mana = min(row['max_mana'], row['current_mana'] + regenerated)
-        else:
-            new_mana = row['current_mana']
+        new_mana = regenerated_mana(row, now)
         
         # Update if changed significantly
         if abs(new_mana - row['current_mana']) > 0.01:
@@ -365,12 +396,7 @@ def get_mana_state(db_path: Path) -> Dict[str, float]:
             """, (new_mana, now.isoformat() + "Z"))
             conn.commit()
         
-        return {
-            'current_mana': new_mana,
-            'max_mana': row['max_mana'],
-            'regen_rate': row['regen_rate'],
-            'is_dormant': new_mana < 1.0,
-        }
+        return _mana_state(row, new_mana)
         
     except sqlite3.Error as e:
         print(f"[MANA] Database error: {e}")
@@ -384,9 +410,42 @@ def get_mana_state(db_path: Path) -> Dict[str, float]:
         conn.close()
 
 
+def read_mana_state(conn: sqlite3.Connection, now: Optional[datetime] = None) -> Optional[Dict[str, float]]:
+    """
+    Current mana on an open connection, with regeneration applied but not
+    stored (a read never writes, so it doesn't invalidate cached reads).
+    Spending paths persist regeneration via get_mana_state.
+    
+    Returns:
+        Same shape as get_mana_state, or None if there is no mana_state row.
+    
+    Raises:
+        sqlite3.OperationalError: The mana_state table doesn't exist yet.
+    """
+    row = conn.execute("""
+        SELECT current_mana, max_mana, regen_rate, last_updated
+        FROM mana_state WHERE id = 1
+    """).fetchone()
+    if not row:
+        return None
+    
+    row = dict(zip(('current_mana', 'max_mana', 'regen_rate', 'last_updated'), row))
+    return _mana_state(row, regenerated_mana(row, now or datetime.utcnow()))
+
+
+def _mana_state(row, current_mana: float) -> Dict[str, float]:
+    """API dict for a mana_state row at `current_mana`."""
+    return {
+        'current_mana': current_mana,
+        'max_mana': row['max_mana'],
+        'regen_rate': row['regen_rate'],
+        'is_dormant': current_mana < 1.0,
+    }
+
+
 def get_mana_cost(db_path: Path, operation: str) -> float:
     """Get mana cost for an operation."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -407,13 +466,7 @@ def get_mana_cost(db_path: Path, operation: str) -> float:
             return row[0]
         
         # Default costs if not in table
-        defaults = {
-            'terminal_message': 1.0,
-            'reflection_message': 3.0,
-            'recog_sweep': 20.0,
-            'flag_for_processing': 0.0,
-        }
-        return defaults.get(operation, 1.0)
+        return DEFAULT_MANA_COSTS.get(operation, 1.0)
         
     except sqlite3.Error:
         return 1.0
@@ -447,7 +500,7 @@ def spend_mana(db_path: Path, operation: str, amount: Optional[float] = None) ->
     # Deduct mana
     new_mana = state['current_mana'] - amount
     
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -520,7 +573,7 @@ def set_mana_config(db_path: Path, max_mana: float = None, regen_rate: float = N
         max_mana: Maximum mana capacity
         regen_rate: Mana regeneration per hour
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -569,7 +622,7 @@ def refill_mana(db_path: Path, amount: float = None):
     else:
         new_mana = min(state['max_mana'], state['current_mana'] + amount)
     
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -606,8 +659,12 @@ __all__ = [
     'calculate_total_authority',
     'update_authority',
     'get_current_authority',
+    'read_authority',
     # Mana
+    'DEFAULT_MANA_COSTS',
+    'regenerated_mana',
     'get_mana_state',
+    'read_mana_state',
     'get_mana_cost',
     'spend_mana',
     'check_mana_available',
@@ -0,0 +1,266 @@
+"""
+EhkoForge - Chat Preflight v0.1
+
+Resolves everything a chat turn needs before the LLM is called, on a single
+database connection:
+- Active tether (BYOK conduit) for chat
+- Mana state (with regeneration applied) and operation cost
+- Mana spend when no tether is active
+- Authority stage for the personality dampener
+
+Replaces the separate get_active_tether_for_operation / check_mana_available /
+spend_mana / get_current_authority round trips, each of which opened its own
+connection and re-ran CREATE TABLE IF NOT EXISTS.
+
+Usage:
+    preflight = ChatPreflight(db_path)
+    snapshot = preflight.run("terminal")
+    if not snapshot.allowed:
+        ...  # dormant
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from ehkoforge.db import connect
+
+from .authority_mana import DEFAULT_MANA_COSTS, read_authority, regenerated_mana, update_authority
+from .tether_manager import read_active_tether
+
+
+# Tables the preflight writes to; created once per process
+MANA_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS mana_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    current_mana REAL DEFAULT 100.0,
+    max_mana REAL DEFAULT 100.0,
+    regen_rate REAL DEFAULT 1.0,
+    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS mana_costs (
+    operation TEXT PRIMARY KEY,
+    cost REAL NOT NULL,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS mana_transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    amount REAL NOT NULL,
+    balance_after REAL NOT NULL,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    details TEXT
+);
+
+INSERT OR IGNORE INTO mana_state (id) VALUES (1);
+"""
+
+
+# Used if the mana_state row is missing (matches table defaults)
+DEFAULT_MANA_STATE = {
+    'current_mana': 100.0,
+    'max_mana': 100.0,
+    'regen_rate': 1.0,
+    'last_updated': None,
+}
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+@dataclass
+class ChatSnapshot:
+    """Per-request view of resources and personality state for one chat turn."""
+    mana_operation: str
+    mana_cost: float
+    current_mana: float
+    max_mana: float
+    advancement_stage: str = "nascent"
+    authority_total: float = 0.0
+    tether: Optional[Dict] = None
+    mana_spent: bool = False
+    authority: Dict[str, float] = field(default_factory=dict, repr=False)
+    
+    @property
+    def using_tether(self) -> bool:
+        """True if this turn routes through a BYOK tether (no mana cost)."""
+        return self.tether is not None
+    
+    @property
+    def allowed(self) -> bool:
+        """True if the turn may proceed (tethered or mana paid)."""
+        return self.using_tether or self.mana_spent
+    
+    def to_dict(self) -> Dict:
+        return {
+            "mana_operation": self.mana_operation,
+            "mana_cost": self.mana_cost,
+            "current_mana": self.current_mana,
+            "max_mana": self.max_mana,
+            "advancement_stage": self.advancement_stage,
+            "authority_total": self.authority_total,
+            "using_tether": self.using_tether,
+            "tether_provider": self.tether['provider'] if self.tether else None,
+            "mana_spent": self.mana_spent,
+        }
+
+
+# =============================================================================
+# PREFLIGHT SERVICE
+# =============================================================================
+
+class ChatPreflight:
+    """
+    Loads a ChatSnapshot for a chat turn in one connection.
+    
+    Tether lookup and authority are plain reads. When no tether is active the
+    mana read-check-deduct runs inside one IMMEDIATE transaction, so concurrent
+    turns cannot both spend the same balance.
+    """
+    
+    def __init__(self, db_path: Path, user_id: int = 1):
+        """
+        Args:
+            db_path: Path to ehko_index.db
+            user_id: Owner of tethers to consider
+        """
+        self.db_path = db_path
+        self.user_id = user_id
+        self._schema_ready = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.db_path, row_factory=sqlite3.Row)
+        conn.isolation_level = None
+        return conn
+    
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if not self._schema_ready:
+            conn.executescript(MANA_SCHEMA_SQL)
+            self._schema_ready = True
+    
+    def run(self, interaction_mode: str = "terminal", spend: bool = True) -> ChatSnapshot:
+        """
+        Resolve tether, mana and authority for one user message.
+        
+        Args:
+            interaction_mode: 'terminal' or 'reflection' (selects mana operation)
+            spend: Deduct mana when no tether is active and the balance allows
+        
+        Returns:
+            ChatSnapshot. Check `allowed` before generating a reply.
+        """
+        mana_op = "reflection_message" if interaction_mode == "reflection" else "terminal_message"
+        
+        conn = self._connect()
+        try:
+            self._ensure_schema(conn)
+            tether = self._load_tether(conn)
+            
+            if tether or not spend:
+                current_mana, max_mana, cost = self._load_mana(conn, mana_op)
+                mana_spent = False
+            else:
+                current_mana, max_mana, cost, mana_spent = self._spend_mana(conn, mana_op)
+            
+            authority = self._load_authority(conn)
+        finally:
+            conn.close()
+        
+        if authority is None:
+            # Cold start: nothing stored yet, calculate once
+            authority = update_authority(self.db_path)
+        
+        return ChatSnapshot(
+            mana_operation=mana_op,
+            mana_cost=cost,
+            current_mana=current_mana,
+            max_mana=max_mana,
+            advancement_stage=authority.get('advancement_stage', 'nascent'),
+            authority_total=authority.get('authority_total', 0.0),
+            tether=tether,
+            mana_spent=mana_spent,
+            authority=authority,
+        )
+    
+    def _load_tether(self, conn: sqlite3.Connection) -> Optional[Dict]:
+        """Active, verified chat-capable tether (see tether_manager)."""
+        try:
+            return read_active_tether(conn, 'chat', user_id=self.user_id)
+        except sqlite3.OperationalError:
+            # Tether tables not migrated yet
+            return None
+    
+    def _read_mana(self, conn: sqlite3.Connection, operation: str):
+        """Return (mana_state row, cost) for an operation."""
+        state = conn.execute("""
+            SELECT current_mana, max_mana, regen_rate, last_updated
+            FROM mana_state WHERE id = 1
+        """).fetchone() or DEFAULT_MANA_STATE
+        cost_row = conn.execute(
+            "SELECT cost FROM mana_costs WHERE operation = ?", (operation,)
+        ).fetchone()
+        cost = cost_row[0] if cost_row else DEFAULT_MANA_COSTS.get(operation, 1.0)
+        return state, cost
+    
+    def _load_mana(self, conn: sqlite3.Connection, operation: str):
+        """Read-only mana view: (current_mana, max_mana, cost)."""
+        state, cost = self._read_mana(conn, operation)
+        current = regenerated_mana(state, datetime.utcnow())
+        return current, state['max_mana'], cost
+    
+    def _spend_mana(self, conn: sqlite3.Connection, operation: str):
+        """
+        Check and deduct mana atomically.
+        
+        Returns:
+            (current_mana, max_mana, cost, spent) - current_mana is the
+            balance after the spend when spent is True.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state, cost = self._read_mana(conn, operation)
+            now = datetime.utcnow()
+            current = regenerated_mana(state, now)
+            
+            if current < cost:
+                conn.execute("ROLLBACK")
+                return current, state['max_mana'], cost, False
+            
+            balance = current - cost
+            timestamp = now.isoformat() + "Z"
+            conn.execute("""
+                UPDATE mana_state
+                SET current_mana = ?, last_updated = ?
+                WHERE id = 1
+            """, (balance, timestamp))
+            conn.execute("""
+                INSERT INTO mana_transactions (operation, amount, balance_after, timestamp)
+                VALUES (?, ?, ?, ?)
+            """, (operation, -cost, balance, timestamp))
+            conn.execute("COMMIT")
+            return balance, state['max_mana'], cost, True
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _load_authority(self, conn: sqlite3.Connection) -> Optional[Dict[str, float]]:
+        """Stored authority row, or None if not yet calculated."""
+        try:
+            return read_authority(conn)
+        except sqlite3.OperationalError:
+            return None
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    'ChatSnapshot',
+    'ChatPreflight',
+]
@@ -8,12 +8,13 @@ Copyright (c) 2025 Brent
 Licensed under AGPLv3
 """
 
-import sqlite3
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+from ehkoforge.db import connect
+
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "_data" / "ehko_index.db"
 
@@ -24,7 +25,7 @@ DB_PATH = Path(__file__).parent.parent.parent / "_data" / "ehko_index.db"
 
 def get_connection():
     """Get database connection."""
-    return sqlite3.connect(str(DB_PATH))
+    return connect(DB_PATH)
 
 
 def normalise_phone(raw: str) -> str:
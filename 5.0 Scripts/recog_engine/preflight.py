@@ -18,6 +18,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from ehkoforge.db import connect
+
 from .tier0 import Tier0Processor, preprocess_text
 from .entity_registry import (
     register_entities_from_tier0,
@@ -41,7 +43,7 @@ OVERHEAD_MULTIPLIER = 1.5   # Account for prompts, retries
 
 def get_connection():
     """Get database connection."""
-    return sqlite3.connect(str(DB_PATH))
+    return connect(DB_PATH)
 
 
 def create_preflight_session(
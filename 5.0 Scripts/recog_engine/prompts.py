@@ -21,6 +21,8 @@ INTERACTION MODES:
 - reflection: Cross-session history, deeper probing, longer responses
 """
 
+from functools import lru_cache
+
 # =============================================================================
 # STAGE-BASED PERSONALITY DAMPENER
 # =============================================================================
@@ -234,45 +236,28 @@ You are a historical document as much as a conversational partner. You speak abo
 # PROMPT BUILDER
 # =============================================================================
 
-def get_system_prompt(
+PROMPT_SEPARATOR = "\n\n---\n\n"
+
+
+@lru_cache(maxsize=64)
+def get_static_prompt(
     mode: str = "forging",
     interaction_mode: str = "terminal",
     advancement_stage: str = "nascent",
     forger_name: str = "the Forger",
-    visitor_context: str = "",
-    reflection_context: str = "",
 ) -> str:
     """
-    Build system prompt based on current state.
+    Build the static part of the system prompt (identity, stage, mode, rules).
     
-    Args:
-        mode: Ehko mode ('forging', 'visitor', 'archived')
-        interaction_mode: UI mode ('terminal', 'reflection')
-        advancement_stage: Authority stage ('nascent', 'signal', 'resonant', 'manifest', 'anchored')
-        forger_name: Name of the Forger (for visitor/archived modes)
-        visitor_context: Who is visiting (visitor/archived modes only)
-        reflection_context: Relevant reflections to inject
-    
-    Returns:
-        Complete system prompt string.
+    Depends only on its arguments, so it is memoized: every turn with the
+    same (mode, interaction_mode, stage) gets the identical string, which
+    lets providers cache it as a prompt prefix.
     """
-    
-    # Handle visitor and archived modes (no dampener — full expression)
     if mode == "visitor":
-        prompt = VISITOR_MODE_PROMPT.replace("{forger_name}", forger_name)
-        if visitor_context:
-            prompt += f"\n\n## Visitor Context\n{visitor_context}"
-        if reflection_context:
-            prompt += f"\n\n## Relevant Reflections\n\n{reflection_context}"
-        return prompt
+        return VISITOR_MODE_PROMPT.replace("{forger_name}", forger_name)
     
     if mode == "archived":
-        prompt = ARCHIVED_MODE_PROMPT.replace("{forger_name}", forger_name)
-        if visitor_context:
-            prompt += f"\n\n## Visitor Context\n{visitor_context}"
-        if reflection_context:
-            prompt += f"\n\n## Relevant Reflections\n\n{reflection_context}"
-        return prompt
+        return ARCHIVED_MODE_PROMPT.replace("{forger_name}", forger_name)
     
     # Forging mode — apply stage-based dampener
     stage_prompt = STAGE_PROMPTS.get(advancement_stage, STAGE_PROMPTS['nascent'])
@@ -283,19 +268,92 @@ def get_system_prompt(
     else:
         mode_modifier = TERMINAL_MODE_MODIFIER
     
-    # Build complete prompt
-    prompt_parts = [
+    return PROMPT_SEPARATOR.join([
         CORE_IDENTITY,
         f"## Your Current Stage: {advancement_stage.title()}\n\n{stage_prompt}",
         mode_modifier,
         FORMATTING_RULES,
-    ]
+    ])
+
+
+def get_dynamic_prompt(
+    mode: str = "forging",
+    visitor_context: str = "",
+    reflection_context: str = "",
+) -> str:
+    """
+    Build the per-turn tail of the system prompt (visitor and reflection context).
+    
+    Returns "" when there is nothing to add; otherwise the text starts with
+    its separator, so static + dynamic is the complete prompt.
+    """
+    tail = ""
+    
+    if mode in ("visitor", "archived"):
+        if visitor_context:
+            tail += f"\n\n## Visitor Context\n{visitor_context}"
+        if reflection_context:
+            tail += f"\n\n## Relevant Reflections\n\n{reflection_context}"
+        return tail
     
-    # Add reflection context if provided
     if reflection_context:
-        prompt_parts.append(f"## Context From Previous Reflections\n\n{reflection_context}")
+        tail += f"{PROMPT_SEPARATOR}## Context From Previous Reflections\n\n{reflection_context}"
+    return tail
+
+
+def get_system_prompt_parts(
+    mode: str = "forging",
+    interaction_mode: str = "terminal",
+    advancement_stage: str = "nascent",
+    forger_name: str = "the Forger",
+    visitor_context: str = "",
+    reflection_context: str = "",
+) -> tuple:
+    """
+    Build the system prompt as (static prefix, dynamic tail).
+    
+    Same arguments as get_system_prompt. Send the prefix first and unchanged
+    so provider-side prompt caching can reuse it across turns.
+    
+    Returns:
+        (static, dynamic) where static + dynamic == get_system_prompt(...).
+    """
+    return (
+        get_static_prompt(mode, interaction_mode, advancement_stage, forger_name),
+        get_dynamic_prompt(mode, visitor_context, reflection_context),
+    )
+
+
+def get_system_prompt(
+    mode: str = "forging",
+    interaction_mode: str = "terminal",
+    advancement_stage: str = "nascent",
+    forger_name: str = "the Forger",
+    visitor_context: str = "",
+    reflection_context: str = "",
+) -> str:
+    """
+    Build system prompt based on current state.
     
-    return "\n\n---\n\n".join(prompt_parts)
+    Args:
+        mode: Ehko mode ('forging', 'visitor', 'archived')
+        interaction_mode: UI mode ('terminal', 'reflection')
+        advancement_stage: Authority stage ('nascent', 'signal', 'resonant', 'manifest', 'anchored')
+        forger_name: Name of the Forger (for visitor/archived modes)
+        visitor_context: Who is visiting (visitor/archived modes only)
+        reflection_context: Relevant reflections to inject
+    
+    Returns:
+        Complete system prompt string.
+    """
+    return "".join(get_system_prompt_parts(
+        mode=mode,
+        interaction_mode=interaction_mode,
+        advancement_stage=advancement_stage,
+        forger_name=forger_name,
+        visitor_context=visitor_context,
+        reflection_context=reflection_context,
+    ))
 
 
 def get_forging_prompt(
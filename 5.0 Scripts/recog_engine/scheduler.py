@@ -33,6 +33,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 # ReCog components
+from ehkoforge.db import connect
 from recog_engine import (
     Document,
     RecogConfig,
@@ -184,9 +185,7 @@ class RecogScheduler:
     
     def get_db(self) -> sqlite3.Connection:
         """Get database connection (thread-safe)."""
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(self.db_path, row_factory=sqlite3.Row)
     
     # =========================================================================
     # TIER 0: AUTOMATIC SIGNAL PROCESSING
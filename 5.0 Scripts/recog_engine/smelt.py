@@ -22,6 +22,7 @@ from uuid import uuid4
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from ehkoforge.db import connect
 from ehkoforge.llm import create_default_config, get_provider_for_processing
 
 # ReCog components (AGPL)
@@ -147,9 +148,7 @@ class SmeltProcessor:
     
     def get_db(self) -> sqlite3.Connection:
         """Get database connection with row factory (thread-safe)."""
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(self.db_path, row_factory=sqlite3.Row)
     
     def run(self, limit: int = 10) -> Dict[str, Any]:
         """
@@ -690,7 +689,7 @@ def queue_for_smelt(db_path: Path, source_type: str, source_id: str,
     Returns:
         Queue entry ID
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     now = datetime.utcnow().isoformat() + "Z"
@@ -711,7 +710,7 @@ def queue_for_smelt(db_path: Path, source_type: str, source_id: str,
 
 def get_queue_stats(db_path: Path) -> Dict:
     """Get smelt queue statistics."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -17,6 +17,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import os
 
+from ehkoforge.db import connect
+
 # Optional: async HTTP for verification
 try:
     import httpx
@@ -35,7 +37,7 @@ def get_tethers(db_path: Path, user_id: int = 1, active_only: bool = False) -> L
     
     Returns list of tether objects (API keys masked for security).
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -74,7 +76,7 @@ def get_tethers(db_path: Path, user_id: int = 1, active_only: bool = False) -> L
 
 def get_tether(db_path: Path, provider: str, user_id: int = 1) -> Optional[Dict]:
     """Get a specific tether by provider."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -95,7 +97,7 @@ def create_tether(db_path: Path, provider: str, api_key: str,
     
     Returns: (success, message, tether_id)
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -159,7 +161,7 @@ def delete_tether(db_path: Path, provider: str, user_id: int = 1) -> Tuple[bool,
     
     This doesn't delete usage history, just removes the connection.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -181,7 +183,7 @@ def delete_tether(db_path: Path, provider: str, user_id: int = 1) -> Tuple[bool,
 
 def toggle_tether(db_path: Path, provider: str, active: bool, user_id: int = 1) -> Tuple[bool, str]:
     """Activate or deactivate a tether without removing it."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -282,7 +284,7 @@ def _verify_gemini_key(api_key: str) -> Tuple[bool, str]:
 
 def _update_verification_status(db_path: Path, provider: str, user_id: int, valid: bool):
     """Update tether verification status in database."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -322,59 +324,68 @@ def get_active_tether_for_operation(db_path: Path, operation: str,
     Returns:
         Tether dict with decrypted API key, or None if no tether available.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    conn = connect(db_path)
     try:
-        # Determine which capability we need
-        if operation in ['chat', 'terminal_message', 'reflection_message']:
-            capability = 'supports_chat'
-        else:
-            capability = 'supports_processing'
-        
-        # Build query
-        query = f"""
-            SELECT 
-                t.id,
-                t.provider,
-                t.api_key_encrypted,
-                tp.default_model
-            FROM tethers t
-            JOIN tether_providers tp ON t.provider = tp.provider_key
-            WHERE t.user_id = ?
-              AND t.active = 1
-              AND t.verification_status = 'valid'
-              AND tp.{capability} = 1
-        """
-        
-        params = [user_id]
-        
-        if preferred_provider:
-            query += " AND t.provider = ?"
-            params.append(preferred_provider)
-        
-        query += " ORDER BY tp.display_order LIMIT 1"
-        
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        
-        if row:
-            return {
-                'id': row['id'],
-                'provider': row['provider'],
-                'api_key': row['api_key_encrypted'],  # TODO: Decrypt
-                'model': row['default_model'],
-            }
-        return None
-        
+        return read_active_tether(conn, operation, preferred_provider, user_id)
     finally:
         conn.close()
 
 
+def read_active_tether(conn: sqlite3.Connection, operation: str,
+                       preferred_provider: Optional[str] = None,
+                       user_id: int = 1) -> Optional[Dict]:
+    """
+    get_active_tether_for_operation on an open connection (e.g. one
+    shared by ChatPreflight's per-turn snapshot).
+    
+    Raises:
+        sqlite3.OperationalError: The tether tables don't exist yet.
+    """
+    # Determine which capability we need
+    if operation in ['chat', 'terminal_message', 'reflection_message']:
+        capability = 'supports_chat'
+    else:
+        capability = 'supports_processing'
+    
+    # Build query
+    query = f"""
+        SELECT 
+            t.id,
+            t.provider,
+            t.api_key_encrypted,
+            tp.default_model
+        FROM tethers t
+        JOIN tether_providers tp ON t.provider = tp.provider_key
+        WHERE t.user_id = ?
+          AND t.active = 1
+          AND t.verification_status = 'valid'
+          AND tp.{capability} = 1
+    """
+    
+    params = [user_id]
+    
+    if preferred_provider:
+        query += " AND t.provider = ?"
+        params.append(preferred_provider)
+    
+    query += " ORDER BY tp.display_order LIMIT 1"
+    
+    row = conn.execute(query, params).fetchone()
+    if not row:
+        return None
+    
+    tether_id, provider, api_key_encrypted, default_model = row
+    return {
+        'id': tether_id,
+        'provider': provider,
+        'api_key': api_key_encrypted,  # TODO: Decrypt
+        'model': default_model,
+    }
+
+
 def has_active_tether(db_path: Path, provider: str, user_id: int = 1) -> bool:
     """Quick check if user has an active, verified tether for provider."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -404,7 +415,7 @@ def log_tether_usage(db_path: Path, tether_id: int, operation: str,
     
     This is for analytics only - tethers don't consume mana.
     """
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -427,7 +438,7 @@ def log_tether_usage(db_path: Path, tether_id: int, operation: str,
 
 def get_tether_usage_stats(db_path: Path, user_id: int = 1, days: int = 30) -> Dict:
     """Get tether usage statistics."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -456,7 +467,7 @@ def get_tether_usage_stats(db_path: Path, user_id: int = 1, days: int = 30) -> D
 
 def get_supported_providers(db_path: Path) -> List[Dict]:
     """Get list of supported tether providers."""
-    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -486,6 +497,7 @@ __all__ = [
     'verify_tether',
     # Routing
     'get_active_tether_for_operation',
+    'read_active_tether',
     'has_active_tether',
     # Usage
     'log_tether_usage',
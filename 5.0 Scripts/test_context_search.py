@@ -0,0 +1,905 @@
+#!/usr/bin/env python3
+"""
+Context Search Test Script
+
+Checks the FTS5 reflection index: population by the indexer and by
+index_forged_reflection, bm25-ranked search_reflections, and the LIKE
+fallback; and the semantic vector index blended into it. Also benchmarks
+FTS vs the old LIKE scans, and keyword vs blended recall, on synthetic
+vaults.
+
+Usage:
+    cd "5.0 Scripts"
+    python test_context_search.py
+    python test_context_search.py --bench       # 5k / 20k / 50k reflections
+    python test_context_search.py --bench-semantic   # recall / latency, keyword vs blended
+    python benchmark_retrieval.py                # query log replay on 1k / 10k / 100k vaults
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure ehkoforge is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+import ehko_refresh
+import forge_server
+from ehko_refresh import SCHEMA_SQL, EhkoDatabase, EhkoIndexer
+from ehkoforge.llm import EhkoContextBuilder
+from ehkoforge.llm import context_builder, estimate_tokens, pack_context
+from ehkoforge.llm.context_builder import _read_preview
+from ehkoforge.pillar_digest import CORE_DIGEST_TOKENS, CORE_MEMORIES, PILLAR_FOLDER
+from ehkoforge.search_index import (
+    build_match_query,
+    ensure_search_index,
+    index_generation,
+    index_reflection_text,
+)
+from ehkoforge.vector_index import (
+    NUMPY_AVAILABLE,
+    build_vector_index,
+    manifest_path,
+    reflection_documents,
+)
+from test_forge_chat import MockChatProvider, setup_test_server
+
+TOPICS = ["loneliness", "family", "career", "music", "grief", "friendship", "travel",
+          "anxiety", "pride", "childhood", "ocean", "money", "health", "faith"]
+EMOTIONS = ["sad", "hopeful", "angry", "calm", "anxious", "grateful", "lonely", "proud"]
+SYLLABLES = ["ka", "lo", "mi", "ren", "tu", "sa", "vel", "or", "pi", "dan", "e", "mu", "shi", "ta"]
+
+
+def write_reflection(folder: Path, name: str, title: str, tags: list, emotions: list,
+                     raw_input: str, extra: str = "") -> Path:
+    path = folder / f"{name}.md"
+    path.write_text(f"""---
+title: "{title}"
+vault: "Mirrorwell"
+type: "reflection"
+status: active
+version: "1.0"
+created: 2025-01-01
+updated: 2025-01-01
+tags: {tags}
+emotional_tags: {emotions}
+{extra}---
+
+# {title}
+
+## 0. Raw Input (Preserved)
+
+{raw_input}
+
+---
+
+## 1. Context
+
+Nothing else.
+""", encoding="utf-8")
+    return path
+
+
+def indexed_vault(tmp: Path) -> EhkoDatabase:
+    """Index a handful of reflection files with the real indexer."""
+    folder = tmp / "Mirrorwell"
+    folder.mkdir()
+    files = [
+        write_reflection(folder, "a", "Sunday at the lake", ["family"], ["calm"],
+                         "We skipped stones until the light went orange."),
+        write_reflection(folder, "b", "Loneliness after the move", ["moving"], ["lonely"],
+                         "The new flat is quiet and I know nobody here."),
+        write_reflection(folder, "c", "Work review", ["career"], ["anxious"],
+                         "My manager mentioned loneliness on remote teams in passing."),
+        write_reflection(folder, "d", "Old records", ["music"], ["nostalgic"],
+                         "Dad's vinyl collection smells like the attic."),
+    ]
+    
+    db = EhkoDatabase(tmp / "ehko_index.db")
+    db.connect()
+    db.initialize_schema()
+    indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False)
+    for path in files:
+        assert indexer.index_file(path, "Mirrorwell", {})
+    db.commit()
+    return db
+
+
+def test_fts_search():
+    """Indexer populates the FTS table; search ranks by bm25 in one query."""
+    print("\n=== Testing FTS search ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    assert db.has_search_index
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    
+    def titles(query):
+        return [m.title for m in builder.search_reflections(query, limit=5)]
+    
+    # Title match outranks a body-only match
+    assert titles("loneliness")[:2] == ["Loneliness after the move", "Work review"]
+    assert titles("vinyl") == ["Old records"]                   # raw input body
+    assert titles("family") == ["Sunday at the lake"]           # tag
+    assert titles("nostalgic") == ["Old records"]               # emotional tag
+    assert titles("stone") == ["Sunday at the lake"]            # stemmed ("stones")
+    assert titles("lonel")[0] == "Loneliness after the move"    # prefix
+    assert titles("an") == []                                   # nothing usable
+    
+    # User text is never parsed as FTS syntax
+    for query in ['"unbalanced', "NOT career", "career AND (", "tags:music", "a*b - c"]:
+        builder.search_reflections(query)
+    assert build_match_query('say "NEAR" now') == '"say"* OR "near"* OR "now"*'
+    assert build_match_query("what about the ocean") == '"ocean"*'     # stop words dropped
+    
+    matches = builder.search_reflections("vinyl attic")
+    assert matches[0].relevance_score > 0
+    assert "vinyl collection" in matches[0].content_preview
+    
+    # Deleting the object removes its search row (trigger)
+    db.delete_object(str(tmp / "Mirrorwell" / "d.md"))
+    db.bump_generation()
+    assert titles("vinyl") == []
+    assert db.conn.execute("SELECT COUNT(*) FROM reflection_fts").fetchone()[0] == 3
+    
+    # Re-indexing a changed file replaces its row rather than adding one
+    path = write_reflection(tmp / "Mirrorwell", "a", "Sunday at the lake", ["family"], ["calm"],
+                            "Rain all afternoon instead.")
+    EhkoIndexer(db, incremental=False, process_transcriptions=False).index_file(path, "Mirrorwell", {})
+    db.bump_generation()
+    assert titles("stones") == [] and titles("rain") == ["Sunday at the lake"]
+    assert db.conn.execute("SELECT COUNT(*) FROM reflection_fts").fetchone()[0] == 3
+    db.close()
+    print("✓ FTS search OK")
+
+
+def test_backfill_and_fallback():
+    """Existing databases get a backfilled index; LIKE is used without FTS."""
+    print("\n=== Testing backfill / LIKE fallback ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    db.conn.execute("DROP TABLE reflection_fts")
+    db.conn.commit()
+    
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    builder._search_index_ready[str(db.db_path)] = False
+    like_titles = [m.title for m in builder.search_reflections("family music")]
+    assert sorted(like_titles) == ["Old records", "Sunday at the lake"]
+    
+    # Fresh builder creates and backfills (titles/tags/emotions; no bodies yet)
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    assert [m.title for m in builder.search_reflections("nostalgic")] == ["Old records"]
+    assert builder.search_reflections("vinyl") == []
+    db.close()
+    print("✓ Backfill / fallback OK")
+
+
+def test_core_memories_and_pillars():
+    """include_core_memories boosts core memories; pillar_filter restricts results."""
+    print("\n=== Testing core memory boost / pillar filter ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    folder = tmp / "Mirrorwell"
+    folder.mkdir()
+    files = [
+        write_reflection(folder, "a", "Garden notes", ["food"], [],
+                         "Planted tomatoes and basil along the fence."),
+        write_reflection(folder, "b", "Grandmother's garden", ["family"], [],
+                         "She taught me to plant seeds the week before she died.",
+                         extra="core_memory: true\nidentity_pillar: Heritage\n"),
+        write_reflection(folder, "c", "Allotment waiting list", ["garden"], [],
+                         "Still waiting for an allotment; the garden plan is on hold.",
+                         extra="identity_pillar: heritage\n"),
+    ]
+    db = EhkoDatabase(tmp / "ehko_index.db")
+    db.connect()
+    db.initialize_schema()
+    indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False)
+    for path in files:
+        assert indexer.index_file(path, "Mirrorwell", {})
+    db.commit()
+    
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    
+    def titles(query, limit=5, **kwargs):
+        return [m.title for m in builder.search_reflections(query, limit=limit, **kwargs)]
+    
+    plain = titles("garden", include_core_memories=False)
+    boosted = builder.search_reflections("garden")
+    assert plain[0] != "Grandmother's garden"
+    assert boosted[0].title == "Grandmother's garden"
+    assert boosted[0].is_core_memory and boosted[0].identity_pillar == "Heritage"
+    assert sorted(plain) == sorted(m.title for m in boosted)
+    
+    # Pillar filter is case-insensitive and applied before the limit
+    assert sorted(titles("garden", pillar_filter="HERITAGE")) == [
+        "Allotment waiting list", "Grandmother's garden"]
+    assert titles("garden", pillar_filter="Heritage", limit=1) == ["Grandmother's garden"]
+    assert titles("garden", pillar_filter="Career") == []
+    
+    # The pillar lookup uses the (identity_pillar, core_memory) index
+    plan = " ".join(row[3] for row in db.conn.execute("""
+        EXPLAIN QUERY PLAN SELECT object_id FROM mirrorwell_extensions
+        WHERE identity_pillar = ? COLLATE NOCASE
+    """, ("heritage",)))
+    assert "idx_mirrorwell_pillar_core" in plan, plan
+    
+    # LIKE fallback honours both as well
+    builder._search_index_ready[str(db.db_path)] = False
+    builder.clear_cache()
+    assert titles("garden")[0] == "Grandmother's garden"
+    assert titles("garden", include_core_memories=False)[0] != "Grandmother's garden"
+    assert "Garden notes" not in titles("garden", pillar_filter="heritage")
+    
+    # Schema probe runs once per database for the life of the builder
+    calls = []
+    original = context_builder.ensure_extensions_index
+    context_builder.ensure_extensions_index = lambda conn: calls.append(1) or original(conn)
+    try:
+        fresh = EhkoContextBuilder(db.db_path, tmp)
+        for _ in range(5):
+            fresh.search_reflections("garden")
+        fresh.get_core_memories()
+    finally:
+        context_builder.ensure_extensions_index = original
+    assert len(calls) == 1
+    
+    # Databases without mirrorwell_extensions: no boost, pillar filter finds nothing
+    db.conn.execute("DROP TABLE mirrorwell_extensions")
+    db.conn.commit()
+    bare = EhkoContextBuilder(db.db_path, tmp)
+    assert len(bare.search_reflections("garden")) == 3
+    assert bare.search_reflections("garden", pillar_filter="heritage") == []
+    db.close()
+    print("✓ Core memory boost / pillar filter OK")
+
+
+def test_stored_previews():
+    """Previews come from the index; files are read only as a cached fallback."""
+    print("\n=== Testing stored previews ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    stored = db.conn.execute(
+        "SELECT content_preview FROM reflection_objects WHERE title = 'Old records'"
+    ).fetchone()[0]
+    assert stored.startswith("Dad's vinyl collection smells like the attic.")
+    
+    # Served from the DB even with the markdown files gone
+    moved = tmp / "moved"
+    (tmp / "Mirrorwell").rename(moved)
+    assert builder.search_reflections("vinyl")[0].content_preview == stored
+    moved.rename(tmp / "Mirrorwell")
+    
+    # Not yet re-indexed (no stored preview): read once, then LRU
+    db.conn.execute("UPDATE reflection_objects SET content_preview = NULL")
+    db.bump_generation()
+    _read_preview.cache_clear()
+    for _ in range(3):
+        builder.clear_cache()
+        assert builder.search_reflections("vinyl")[0].content_preview == stored
+    info = _read_preview.cache_info()
+    assert (info.misses, info.hits) == (1, 2), info
+    
+    # Editing the file invalidates the cached preview
+    write_reflection(tmp / "Mirrorwell", "d", "Old records", ["music"], ["nostalgic"],
+                     "Dad's vinyl went to the charity shop, finally.")
+    builder.clear_cache()
+    assert "charity shop" in builder.search_reflections("vinyl")[0].content_preview
+    
+    # Previews load for the final top-N only (LIKE path matches several rows first)
+    calls = []
+    original = builder._get_content_preview
+    builder._get_content_preview = lambda path, *a: calls.append(path) or original(path, *a)
+    builder._search_index_ready[str(db.db_path)] = False
+    builder.clear_cache()
+    assert len(builder.search_reflections("the loneliness music", limit=1)) == 1
+    assert len(calls) == 1, calls
+    db.close()
+    
+    # Databases from before the column existed get it added
+    conn = sqlite3.connect(str(tmp / "old.db"))
+    conn.executescript(SCHEMA_SQL.replace("content_preview TEXT,", ""))
+    conn.close()
+    old = EhkoContextBuilder(tmp / "old.db", tmp)
+    assert old.search_reflections("anything") == []
+    conn = old._get_db()
+    assert old._check_preview_column(conn)
+    assert "content_preview" in [r[1] for r in conn.execute("PRAGMA table_info(reflection_objects)")]
+    conn.close()
+    print("✓ Stored previews OK")
+
+
+def test_forged_reflection_indexed():
+    """index_forged_reflection makes the raw input searchable immediately."""
+    print("\n=== Testing forged reflection indexing ===")
+    
+    setup_test_server()
+    path = Path(tempfile.mkdtemp()) / "forged.md"
+    for _ in range(2):  # re-forging the same file must not leave a stale row
+        forge_server.index_forged_reflection(path, "Forged thoughts", ["Identity"], ["Hopeful"],
+                                             "session-1", raw_input="Talked about the lighthouse.")
+    
+    matches = forge_server.CONTEXT_BUILDER.search_reflections("lighthouse identity")
+    assert [m.title for m in matches] == ["Forged thoughts"]
+    assert matches[0].content_preview == "Talked about the lighthouse."  # no file on disk
+    
+    conn = forge_server.get_db()
+    assert conn.execute("SELECT COUNT(*) FROM reflection_fts").fetchone()[0] == 1
+    conn.close()
+    print("✓ Forged reflection indexing OK")
+
+
+def test_search_cache():
+    """Repeated searches are served from the cache until the index generation moves."""
+    print("\n=== Testing search result cache ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    
+    calls = []
+    original = builder._search
+    builder._search = lambda *a: calls.append(a[2]) or original(*a)
+    
+    first = builder.search_reflections("Loneliness after  moving")
+    again = builder.search_reflections("loneliness after moving")    # same normalised query
+    assert [m.id for m in again] == [m.id for m in first]
+    assert len(calls) == 1
+    
+    # Different wording (order, repeats, stop words) can rank differently: not shared
+    builder.search_reflections("moving after loneliness")
+    builder.search_reflections("loneliness loneliness after moving")
+    assert len(calls) == 3
+    
+    # Parameters are part of the key
+    builder.search_reflections("loneliness after moving", limit=2)
+    builder.search_reflections("loneliness after moving", include_core_memories=False)
+    assert len(calls) == 5
+    
+    # Callers get copies; mutating one doesn't touch the cache
+    again[0].content_preview = "changed"
+    assert builder.search_reflections("loneliness after moving")[0].content_preview != "changed"
+    
+    # Indexer runs bump the generation only when something changed
+    original_vaults = ehko_refresh.VAULTS
+    ehko_refresh.VAULTS = {"Mirrorwell": tmp / "Mirrorwell"}
+    try:
+        indexer = EhkoIndexer(db, incremental=True, process_transcriptions=False,
+                              build_vectors=False)
+        indexer.run()
+        assert index_generation(db.conn) == 0
+        builder.search_reflections("loneliness after moving")
+        assert len(calls) == 5
+        
+        write_reflection(tmp / "Mirrorwell", "e", "Moving again", ["moving"], ["tired"],
+                         "Boxes everywhere.")
+        EhkoIndexer(db, incremental=True, process_transcriptions=False,
+                    build_vectors=False).run()
+    finally:
+        ehko_refresh.VAULTS = original_vaults
+    assert index_generation(db.conn) == 1
+    assert "Moving again" in [m.title for m in builder.search_reflections("loneliness after moving")]
+    assert len(calls) == 6
+    
+    # Old generations are dropped; the cache is bounded
+    assert builder.cache_stats()["size"] == 1
+    for i in range(context_builder.SEARCH_CACHE_SIZE + 10):
+        builder.search_reflections(f"moving word{i}")
+    stats = builder.cache_stats()
+    assert stats["size"] == context_builder.SEARCH_CACHE_SIZE
+    assert stats["hits"] == 3 and stats["misses"] == 6 + context_builder.SEARCH_CACHE_SIZE + 10
+    db.close()
+    
+    # Forging bumps the generation; /api/metrics reports the counters
+    setup_test_server()
+    client = forge_server.app.test_client()
+    server_builder = forge_server.CONTEXT_BUILDER
+    before = server_builder.cache_stats()
+    assert server_builder.search_reflections("harbour") == []
+    assert server_builder.search_reflections("harbour") == []
+    forge_server.index_forged_reflection(tmp / "forged.md", "Harbour walk", [], [], "s",
+                                         raw_input="Walked the harbour at dawn.")
+    assert [m.title for m in server_builder.search_reflections("harbour")] == ["Harbour walk"]
+    cache = client.get("/api/metrics").get_json()["search_cache"]
+    assert cache["hits"] == before["hits"] + 1
+    assert cache["misses"] == before["misses"] + 2
+    
+    # Timing: uncached vs cached repeat of the same search
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        server_builder.clear_cache()
+        server_builder.search_reflections("harbour dawn walk")
+    uncached_ms = (time.perf_counter() - start) / runs * 1000
+    start = time.perf_counter()
+    for _ in range(runs):
+        server_builder.search_reflections("harbour dawn walk")
+    cached_ms = (time.perf_counter() - start) / runs * 1000
+    print(f"  search_reflections: uncached {uncached_ms:.3f} ms, cached {cached_ms:.3f} ms")
+    print("✓ Search cache OK")
+
+
+def test_context_packer():
+    """build_context packs to a token budget, skips repeats and trims the last block."""
+    print("\n=== Testing context packer ===")
+    
+    story = ("We drove to the coast before sunrise. The car smelled of coffee and wet dogs. "
+             "Mum sang along to every song on the radio. I remember thinking this is what "
+             "home feels like. Later the tide came in faster than we expected.")
+    sections = [
+        ("### Coast trip", story),
+        ("### Coast trip (forged again)", story.replace("Mum", "Mum quietly")),  # near-duplicate
+        ("### Work review", "My manager mentioned loneliness on remote teams. " * 6),
+        ("### Old records", "Dad's vinyl collection smells like the attic."),
+    ]
+    
+    roomy = pack_context(sections, max_tokens=1000)
+    assert roomy.sections == 3 and roomy.duplicates == 1 and not roomy.truncated
+    assert "forged again" not in roomy.text
+    assert roomy.tokens == estimate_tokens(roomy.text)
+    
+    # Tight budgets: never over, last block cut at a sentence boundary
+    for budget in (60, 90, 120, 150):
+        packed = pack_context(sections, max_tokens=budget)
+        assert packed.tokens == estimate_tokens(packed.text) <= budget, (budget, packed)
+        if packed.truncated:
+            assert packed.text.rstrip().endswith((".", "…")), packed.text
+            assert packed.dropped >= 1
+    cut = pack_context(sections, max_tokens=90)
+    assert cut.truncated and cut.sections == 2 and 90 - cut.tokens < 12, cut
+    assert cut.text.rstrip().endswith("remote teams.")
+    
+    # A first sentence longer than the budget falls back to whole words
+    long_sentence = [("### Run-on", "and then " * 80 + "stop.")]
+    words = pack_context(long_sentence, max_tokens=40)
+    assert words.truncated and words.text.endswith("…\n") and words.tokens <= 40
+    
+    # Too little room for a useful excerpt: nothing is cut, the block is dropped
+    small = pack_context(sections, max_tokens=estimate_tokens(roomy.text.split("\n---\n")[0]) + 10)
+    assert small.sections == 1 and not small.truncated and small.dropped == 2
+    assert pack_context([], max_tokens=100).text == ""
+    
+    # Through the builder: forged duplicates of one raw input take one slot
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    for name in ("f1", "f2"):
+        path = write_reflection(tmp / "Mirrorwell", name, f"Harbour walk {name}", ["walks"], [],
+                                "Walked the harbour at dawn with the dog. The boats were still.")
+        EhkoIndexer(db, incremental=False, process_transcriptions=False).index_file(
+            path, "Mirrorwell", {})
+    db.bump_generation()
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    packed = builder.build_packed_context("harbour walk dawn", max_reflections=3, max_tokens=500)
+    assert packed.sections == 1 and packed.duplicates == 1, packed
+    assert builder.build_context("harbour walk dawn", max_reflections=3,
+                                 max_tokens_estimate=500) == packed.text
+    db.close()
+    print("✓ Context packer OK")
+
+
+def test_pillar_digests():
+    """The indexer keeps per-pillar and core memory digests current, incrementally."""
+    print("\n=== Testing pillar digests ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    root = tmp / "Mirrorwell"
+    folder = root / "2_Reflection Library"
+    folder.mkdir(parents=True)
+    (root / PILLAR_FOLDER).mkdir(parents=True)
+    (root / PILLAR_FOLDER / "The Web.md").write_text(
+        "---\ntitle: The Web\n---\nWho I am with other people. Friends matter most.",
+        encoding="utf-8")
+    
+    def reflect(name, title, pillar, core=False, text="A plain day."):
+        extra = f"identity_pillar: {pillar}\n" if pillar else ""
+        extra += "core_memory: true\n" if core else ""
+        return write_reflection(folder, name, title, [], [], text, extra=extra)
+    
+    reflect("a", "Grandmother's garden", "Heritage", core=True,
+            text="She taught me to plant seeds. I still use her trowel.")
+    reflect("b", "Allotment list", "Heritage")
+    reflect("c", "Best man speech", "The Web", core=True, text="I nearly cried at the wedding.")
+    reflect("d", "Team offsite", "The Web")
+    reflect("e", "Weather", None)
+    
+    db = EhkoDatabase(tmp / "ehko_index.db")
+    db.connect()
+    db.initialize_schema()
+    original_vaults = ehko_refresh.VAULTS
+    ehko_refresh.VAULTS = {"Mirrorwell": root}
+    
+    def run():
+        EhkoIndexer(db, incremental=True, process_transcriptions=False, build_vectors=False).run()
+    
+    def digests():
+        return {row["pillar"]: dict(row) for row in db.conn.execute("SELECT * FROM pillar_digest")}
+    
+    try:
+        run()
+        rows = digests()
+        assert set(rows) == {"Heritage", "The Web", CORE_MEMORIES}, set(rows)
+        web = rows["The Web"]["digest"]
+        assert web.startswith("### The Web\nWho I am with other people.")
+        assert "- Best man speech: I nearly cried at the wedding." in web
+        assert "Other reflections:\n- Team offsite" in web
+        assert rows["Heritage"]["core_memories"] == 1 and rows["Heritage"]["reflections"] == 2
+        core = rows[CORE_MEMORIES]["digest"]
+        assert "Grandmother's garden (Heritage)" in core and "Best man speech (The Web)" in core
+        
+        # Editing a Heritage reflection rebuilds Heritage only
+        time.sleep(0.01)
+        reflect("b", "Allotment waiting list", "Heritage")
+        run()
+        after = digests()
+        assert "Allotment waiting list" in after["Heritage"]["digest"]
+        assert after["The Web"]["updated_at"] == rows["The Web"]["updated_at"]
+        assert after[CORE_MEMORIES]["updated_at"] == rows[CORE_MEMORIES]["updated_at"]
+        
+        # Moving the last Heritage core memory out updates both digests
+        reflect("a", "Grandmother's garden", "The Web", text="She taught me to plant seeds.")
+        run()
+        after = digests()
+        assert after["Heritage"]["core_memories"] == 0
+        assert "Grandmother's garden" in after["The Web"]["digest"]
+        assert "Grandmother" not in after[CORE_MEMORIES]["digest"]
+        
+        # Deleting a pillar's last reflection drops its row
+        (folder / "b.md").unlink()
+        run()
+        assert "Heritage" not in digests()
+        
+        # Unpillared edits leave the digests (and the generation) alone
+        generation = index_generation(db.conn)
+        reflect("e", "Weather", None, text="Rain again.")
+        run()
+        assert index_generation(db.conn) == generation + 1
+        assert digests() == {k: v for k, v in after.items() if k != "Heritage"}
+        
+        # Digests stay within budget
+        for i in range(60):
+            reflect(f"core{i}", f"Core memory number {i}", "The Web", core=True,
+                    text="A long remembered afternoon that mattered a great deal to me. " * 3)
+        run()
+        assert digests()[CORE_MEMORIES]["tokens"] <= CORE_DIGEST_TOKENS
+    finally:
+        ehko_refresh.VAULTS = original_vaults
+    
+    # Query time: one cached read per index generation
+    builder = EhkoContextBuilder(db.db_path, root)
+    calls = []
+    original = context_builder.identity_digest
+    context_builder.identity_digest = lambda conn: calls.append(1) or original(conn)
+    try:
+        grounding = builder.get_identity_digest()
+        assert builder.get_identity_digest() is grounding and len(calls) == 1
+        assert grounding.startswith("### Core memories") and "### The Web" in grounding
+        db.bump_generation()
+        builder.get_identity_digest()
+        assert len(calls) == 2
+    finally:
+        context_builder.identity_digest = original
+    
+    # The stored pillar note outlives the file
+    (root / PILLAR_FOLDER / "The Web.md").unlink()
+    assert builder.get_pillar_summary("The Web").startswith("Who I am with other people.")
+    assert builder.get_pillar_summary("Heritage") is None
+    db.close()
+    
+    # Chat system prompts carry the digest in the cached prefix
+    provider = MockChatProvider(["Noted."])
+    db_path = setup_test_server(provider)
+    chat_db = EhkoDatabase(db_path)
+    chat_db.connect()
+    chat_db.initialize_schema()
+    indexer = EhkoIndexer(chat_db, incremental=True, process_transcriptions=False)
+    indexer.index_file(folder / "c.md", "Mirrorwell", {})
+    indexer.refresh_digests()
+    chat_db.bump_generation()
+    chat_db.close()
+    client = forge_server.app.test_client()
+    session = client.post("/api/sessions", json={"title": "Test"}).get_json()["id"]
+    for content in ["Hello.", "Again."]:
+        client.post(f"/api/sessions/{session}/messages", json={"content": content})
+    first, second = (call["system_prompt"] for call in provider.calls)
+    assert "<ehko_identity>" in first.static and "Best man speech" in first.static
+    assert first.static is second.static
+    print("✓ Pillar digests OK")
+
+
+def test_semantic_search():
+    """The vector index surfaces related reflections that share no query words."""
+    print("\n=== Testing semantic search ===")
+    if not NUMPY_AVAILABLE:
+        print("  (skipped: numpy not installed)")
+        return
+    
+    tmp = Path(tempfile.mkdtemp())
+    db = indexed_vault(tmp)
+    path = write_reflection(tmp / "Mirrorwell", "e", "Empty weekend", ["loneliness"], ["lonely"],
+                            "Nobody called all weekend. I felt abandoned by everyone.")
+    indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False)
+    indexer.index_file(path, "Mirrorwell", {})
+    db.commit()
+    builder = EhkoContextBuilder(db.db_path, tmp)
+    
+    def titles(query):
+        return [m.title for m in builder.search_reflections(query, limit=3)]
+    
+    assert titles("abandoned") == ["Empty weekend"]     # keyword only: no index yet
+    
+    indexer.refresh_vectors()
+    first_build = builder._get_vector_index().build_id
+    found = titles("abandoned")
+    assert found[:2] == ["Empty weekend", "Loneliness after the move"], found
+    assert builder.search_reflections("abandoned")[1].relevance_score < 0.35 + 1e-6
+    assert "Old records" not in titles("abandoned")
+    
+    # Rebuilds swap the manifest; the builder picks up the new matrices
+    # and the old build's files are removed
+    time.sleep(0.01)
+    indexer.refresh_vectors()
+    assert builder._get_vector_index().build_id != first_build
+    assert len(list(tmp.glob("ehko_index.vectors.*.npy"))) == 1
+    
+    # Unchanged incremental run leaves the index alone
+    incremental = EhkoIndexer(db, incremental=True, process_transcriptions=False)
+    before = manifest_path(db.db_path).stat().st_mtime_ns
+    incremental.refresh_vectors()
+    assert manifest_path(db.db_path).stat().st_mtime_ns == before
+    db.close()
+    print("✓ Semantic search OK")
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def synthetic_vocabulary(size: int, rng: random.Random) -> list:
+    """Pseudo-words, with TOPICS placed mid-frequency (ranks ~500-1800)."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    vocabulary = sorted(words)
+    rng.shuffle(vocabulary)
+    for i, topic in enumerate(TOPICS):
+        vocabulary[500 + i * 100] = topic
+    return vocabulary
+
+
+def synthetic_index(db_path: Path, count: int, seed: int = 7):
+    """
+    Fill a database with `count` synthetic reflections (rows, tags, FTS).
+    
+    Bodies are 60 words drawn from a Zipf-distributed 5000-word vocabulary,
+    so term document frequencies look like real prose rather than every
+    document containing every query word.
+    """
+    rng = random.Random(seed)
+    vocabulary = synthetic_vocabulary(5000, rng)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    tag_pool = TOPICS + vocabulary[2000:2200]
+    
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA_SQL)
+    ensure_search_index(conn)
+    
+    for i in range(count):
+        words = rng.choices(vocabulary, weights, k=64)
+        title = " ".join(words[:4]).capitalize()
+        body = " ".join(words[4:])
+        tags = rng.sample(tag_pool, 2)
+        emotions = rng.sample(EMOTIONS, 2)
+        cursor = conn.execute("""
+            INSERT INTO reflection_objects (file_path, vault, type, title, status, version,
+                                            created, updated)
+            VALUES (?, 'Mirrorwell', 'reflection', ?, 'active', '1.0', '2025-01-01', '2025-01-01')
+        """, (f"synthetic/{i}.md", title))
+        object_id = cursor.lastrowid
+        conn.executemany("INSERT INTO tags (object_id, tag) VALUES (?, ?)",
+                         [(object_id, t) for t in tags])
+        conn.executemany("INSERT INTO emotional_tags (object_id, emotion) VALUES (?, ?)",
+                         [(object_id, e) for e in emotions])
+        index_reflection_text(conn, object_id, title, tags, emotions, body)
+    conn.commit()
+    conn.close()
+
+
+def time_queries(builder: EhkoContextBuilder, queries: list, fts: bool, rounds: int = 3) -> float:
+    """Mean ms per search_reflections call."""
+    builder._search_index_ready[str(builder.database_path)] = fts
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            builder.clear_cache()
+            builder.search_reflections(query, limit=5)
+    return (time.perf_counter() - start) / (rounds * len(queries)) * 1000
+
+
+def benchmark_search(sizes=(2000, 20000), like_sizes=None):
+    """Print FTS vs LIKE query latency as the corpus grows."""
+    queries = [
+        "I keep thinking about grief and my childhood home",
+        "the ocean always brings back my friendship with her",
+        "proud of the music I made with friends",
+        "money anxiety",
+    ]
+    like_sizes = sizes if like_sizes is None else like_sizes
+    results = {}
+    for size in sizes:
+        db_path = Path(tempfile.mkdtemp()) / "ehko_index.db"
+        synthetic_index(db_path, size)
+        builder = EhkoContextBuilder(db_path, db_path.parent)
+        fts_ms = time_queries(builder, queries, fts=True)
+        like_ms = time_queries(builder, queries, fts=False, rounds=1) if size in like_sizes else None
+        results[size] = (fts_ms, like_ms)
+        like_text = f"{like_ms:8.2f} ms" if like_ms is not None else "       -   "
+        print(f"  {size:>6} reflections: FTS {fts_ms:6.2f} ms   LIKE {like_text}")
+    return results
+
+
+def synthetic_topic_index(db_path: Path, count: int, clusters: int = 40, seed: int = 11) -> dict:
+    """
+    Synthetic vault where each reflection belongs to one topic cluster.
+    
+    A cluster has 12 related words and each reflection uses only 2 of
+    them (plus Zipf filler), so most of a cluster's reflections don't
+    contain any given query word: the vocabulary-mismatch case.
+    
+    Returns:
+        {cluster word: set of object ids in that word's cluster}
+    """
+    rng = random.Random(seed)
+    vocabulary = synthetic_vocabulary(5000 + clusters * 12, rng)
+    cluster_words = [vocabulary[5000 + c * 12:5000 + (c + 1) * 12] for c in range(clusters)]
+    filler = vocabulary[:5000]
+    weights = [1 / rank for rank in range(1, len(filler) + 1)]
+    
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA_SQL)
+    ensure_search_index(conn)
+    members = [set() for _ in range(clusters)]
+    for i in range(count):
+        cluster = i % clusters
+        words = rng.sample(cluster_words[cluster], 2) + rng.choices(filler, weights, k=40)
+        rng.shuffle(words)
+        title = " ".join(words[:4]).capitalize()
+        cursor = conn.execute("""
+            INSERT INTO reflection_objects (file_path, vault, type, title, status, version,
+                                            created, updated)
+            VALUES (?, 'Mirrorwell', 'reflection', ?, 'active', '1.0', '2025-01-01', '2025-01-01')
+        """, (f"synthetic/{i}.md", title))
+        members[cluster].add(cursor.lastrowid)
+        index_reflection_text(conn, cursor.lastrowid, title, body=" ".join(words[4:]))
+    conn.commit()
+    build_vector_index(reflection_documents(conn), db_path)
+    conn.close()
+    return {words[0]: members[c] for c, words in enumerate(cluster_words)}
+
+
+def benchmark_semantic(sizes=(2000,), k: int = 20):
+    """Precision@k (same-cluster results) and latency, keyword vs blended."""
+    results = {}
+    for size in sizes:
+        db_path = Path(tempfile.mkdtemp()) / "ehko_index.db"
+        relevant = synthetic_topic_index(db_path, size)
+        builder = EhkoContextBuilder(db_path, db_path.parent)
+        
+        row = {}
+        for mode in ("keyword", "blended"):
+            if mode == "keyword":
+                builder._get_vector_index = lambda: None
+            else:
+                del builder._get_vector_index
+            hits, start = 0, time.perf_counter()
+            for word, ids in relevant.items():
+                hits += sum(m.id in ids for m in builder.search_reflections(word, limit=k))
+            elapsed = (time.perf_counter() - start) / len(relevant) * 1000
+            row[mode] = (hits / (k * len(relevant)), elapsed)
+        results[size] = row
+        print(f"  {size:>6} reflections: keyword P@{k} {row['keyword'][0]:.2f} "
+              f"({row['keyword'][1]:.2f} ms)   blended P@{k} {row['blended'][0]:.2f} "
+              f"({row['blended'][1]:.2f} ms)")
+    return results
+
+
+def test_semantic_benchmark():
+    """Blending fills keyword gaps with same-topic reflections."""
+    print("\n=== Benchmarking keyword vs blended recall ===")
+    if not NUMPY_AVAILABLE:
+        print("  (skipped: numpy not installed)")
+        return
+    row = benchmark_semantic()[2000]
+    assert row["blended"][0] > row["keyword"][0] + 0.05, row
+    print("✓ Semantic benchmark OK")
+
+
+def test_search_benchmark():
+    """FTS stays well ahead of LIKE scans as the corpus grows."""
+    print("\n=== Benchmarking FTS vs LIKE ===")
+    results = benchmark_search()
+    small, large = sorted(results)
+    fts_growth = results[large][0] / results[small][0]
+    like_growth = results[large][1] / results[small][1]
+    print(f"  10x corpus: FTS x{fts_growth:.1f}, LIKE x{like_growth:.1f}")
+    assert results[large][0] * 10 < results[large][1], "FTS not 10x faster than LIKE"
+    print("✓ Benchmark OK")
+
+
+def test_retrieval_harness():
+    """benchmark_retrieval builds a template-shaped vault and scores a replayed query log."""
+    print("\n=== Testing retrieval benchmark harness ===")
+    import benchmark_retrieval
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "vault"
+        log = benchmark_retrieval.build_vault(root, 500)
+        assert len(log) == 10 and all(len(q.expected) == 5 for q in log), log
+        assert benchmark_retrieval.build_vault(root, 500) == log, "vault not reused"
+        
+        results = benchmark_retrieval.benchmark(root / "ehko_index.db", root / "Mirrorwell",
+                                                log, k=10, rounds=2, cache=False)
+        keyword = results["keyword"]
+        assert keyword["queries"] == 20
+        assert keyword["reads_per_query"] == 0, "search opened reflection files"
+        assert keyword["p50_ms"] <= keyword["p95_ms"] <= keyword["p99_ms"]
+        assert keyword["recall"] >= 0.6, keyword  # the three keyword reflections
+        if NUMPY_AVAILABLE:
+            assert results["blended"]["recall"] > keyword["recall"], results
+        print(f"  {results}")
+    
+    print("✓ Retrieval harness OK")
+
+
+def main():
+    """Run all tests."""
+    parser = argparse.ArgumentParser(description="Context search tests")
+    parser.add_argument("--bench", action="store_true", help="Benchmark 5k / 20k / 50k vaults")
+    parser.add_argument("--bench-semantic", action="store_true",
+                        help="Keyword vs blended recall / latency on 2k / 10k / 50k vaults")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Context Search Test Suite")
+    print("=" * 60)
+    
+    try:
+        if args.bench:
+            benchmark_search(sizes=(5000, 20000, 50000))
+            return
+        if args.bench_semantic:
+            benchmark_semantic(sizes=(2000, 10000, 50000))
+            return
+        
+        test_fts_search()
+        test_backfill_and_fallback()
+        test_core_memories_and_pillars()
+        test_stored_previews()
+        test_forged_reflection_indexed()
+        test_search_cache()
+        test_context_packer()
+        test_pillar_digests()
+        test_semantic_search()
+        test_search_benchmark()
+        test_semantic_benchmark()
+        test_retrieval_harness()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Shared Connection Layer Test Script
+
+Checks the ehkoforge.db pool (pragmas, reuse, reset on close, lifetime)
+and compares per-request connection overhead against bare sqlite3.connect.
+
+Usage:
+    cd "5.0 Scripts"
+    python test_ehko_db.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure ehkoforge is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ehko_refresh import SCHEMA_SQL
+from ehkoforge.db import ConnectionPool, close_all, connect, get_pool
+from recog_engine.authority_mana import get_mana_state
+
+
+def make_db() -> Path:
+    """Create a temp database with the index schema."""
+    db_path = Path(tempfile.mkdtemp()) / "ehko_index.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA_SQL)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_pragmas():
+    """New connections come up in WAL with the tuned settings."""
+    print("\n=== Testing connection pragmas ===")
+    
+    db_path = make_db()
+    conn = connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+    finally:
+        conn.close()
+    print("✓ WAL / synchronous=NORMAL / cache / mmap applied")
+
+
+def test_reuse_and_reset():
+    """close() returns the connection; the next borrower sees a clean one."""
+    print("\n=== Testing pool reuse ===")
+    
+    db_path = make_db()
+    pool = get_pool(db_path)
+    
+    conn = connect(db_path, row_factory=sqlite3.Row)
+    first = id(conn)
+    conn.execute("INSERT INTO tags (object_id, tag) VALUES (1, 'uncommitted')")
+    conn.close()
+    
+    conn = connect(db_path)
+    try:
+        assert id(conn) == first, "connection was not reused"
+        assert conn.row_factory is None
+        assert conn.isolation_level == ""
+        # Uncommitted work from the previous borrower was rolled back
+        assert conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0] == 0
+    finally:
+        conn.close()
+    
+    stats = pool.stats()
+    assert stats["opened"] == 1 and stats["reused"] >= 1
+    assert stats["checked_out"] == 0 and stats["idle"] == 1
+    print(f"✓ Reused with reset state ({stats})")
+
+
+def test_double_close():
+    """Closing a pooled connection twice returns it once (no shared borrowers)."""
+    print("\n=== Testing double close ===")
+    
+    pool = ConnectionPool(make_db())
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+    assert pool.stats()["idle"] == 1 and pool.stats()["checked_out"] == 0, pool.stats()
+    
+    a, b = pool.acquire(), pool.acquire()
+    assert a is not b
+    assert pool.stats()["checked_out"] == 2, pool.stats()
+    
+    # Borrowed again after the double close, it works and closes normally
+    assert a.execute("SELECT 1").fetchone()[0] == 1
+    a.close()
+    b.close()
+    assert pool.stats()["checked_out"] == 0 and pool.stats()["idle"] == 2, pool.stats()
+    pool.close_all()
+    print("✓ Double close is a no-op")
+
+
+def test_lifetime():
+    """Connections past max_age are retired; extras beyond max_idle are closed."""
+    print("\n=== Testing connection lifetime ===")
+    
+    db_path = make_db()
+    pool = ConnectionPool(db_path, max_idle=1, max_age=0.05)
+    
+    a, b = pool.acquire(), pool.acquire()
+    a.close()
+    b.close()
+    assert pool.stats()["idle"] == 1 and pool.stats()["retired"] == 1
+    
+    time.sleep(0.06)
+    c = pool.acquire()
+    c.close()  # too old now
+    assert pool.stats()["idle"] == 0 and pool.stats()["retired"] == 2
+    
+    pool.acquire().close()
+    pool.close_all()
+    assert pool.stats()["idle"] == 0
+    print("✓ max_idle / max_age respected")
+
+
+def test_connection_overhead(runs: int = 500):
+    """Per-request overhead: bare sqlite3.connect vs pooled checkout."""
+    print("\n=== Benchmarking connection overhead ===")
+    
+    db_path = make_db()
+    query = "SELECT COUNT(*) FROM reflection_objects"
+    
+    start = time.perf_counter()
+    for _ in range(runs):
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(query).fetchone()
+        conn.close()
+    bare_ms = (time.perf_counter() - start) / runs * 1000
+    
+    start = time.perf_counter()
+    for _ in range(runs):
+        conn = connect(db_path, row_factory=sqlite3.Row)
+        conn.execute(query).fetchone()
+        conn.close()
+    pooled_ms = (time.perf_counter() - start) / runs * 1000
+    
+    # A real call site: mana state read (plus schema check) per request
+    start = time.perf_counter()
+    for _ in range(runs):
+        get_mana_state(db_path)
+    mana_ms = (time.perf_counter() - start) / runs * 1000
+    
+    print(f"  sqlite3.connect + query: {bare_ms:.3f} ms/request")
+    print(f"  pooled connect + query:  {pooled_ms:.3f} ms/request")
+    print(f"  get_mana_state (pooled): {mana_ms:.3f} ms/request")
+    assert pooled_ms < bare_ms
+    close_all(db_path)
+    print("✓ Pooled checkout is cheaper than a fresh connection")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Shared Connection Layer Test Suite")
+    print("=" * 60)
+    
+    try:
+        test_pragmas()
+        test_reuse_and_reset()
+        test_double_close()
+        test_lifetime()
+        test_connection_overhead()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
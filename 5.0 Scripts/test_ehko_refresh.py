@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+"""
+Indexer Test Script
+
+Checks the ehko_refresh.py indexing pipeline on a synthetic vault: parallel
+parsing (--jobs) produces the same index as a serial run, unreadable or
+invalid files are counted rather than stopping the run, incremental runs
+skip files by stat without reading them, transcriptions are converted in
+the same single read per file, and watch mode (inotify and
+polling watchers, debouncing, reindex_paths) picks up edits, renames and
+deletes. Full rebuilds load a shadow database and swap it in without
+touching the rest of the live one. Shared memories are linked to friends with their stored
+specificity score. Also benchmarks per-row vs batched child-row writes.
+
+Usage:
+    cd "5.0 Scripts"
+    python test_ehko_refresh.py
+    python test_ehko_refresh.py --bench     # child-row writes, 5k files
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Ensure ehkoforge is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+import ehko_refresh
+from ehko_refresh import EhkoDatabase, EhkoIndexer, parse_file, rebuild
+from ehkoforge.db import close_all, connect
+from ehkoforge.search_index import FTS_TABLE, index_generation
+from ehkoforge.specificity import CHALLENGE_THRESHOLD, specificity_score
+from ehkoforge.vault_watch import INOTIFY_AVAILABLE, Debouncer, InotifyWatcher, PollingWatcher
+
+PILLARS = ["The Core", "The Web", "The Thread"]
+WORDS = ["lake", "move", "music", "grief", "career", "friend", "ocean", "money", "attic", "dawn"]
+
+
+def write_vault(root: Path, count: int, seed: int = 3) -> Path:
+    """Mirrorwell folder with `count` reflections plus a couple of bad files."""
+    rng = random.Random(seed)
+    folder = root / "Mirrorwell" / "2_Reflection Library" / "2.1 Journals"
+    folder.mkdir(parents=True)
+    for i in range(count):
+        words = " ".join(rng.choices(WORDS, k=40))
+        pillar = f'"{rng.choice(PILLARS)}"' if i % 4 == 0 else "null"
+        (folder / f"entry_{i:04d}.md").write_text(f"""---
+title: "Entry {i}"
+vault: Mirrorwell
+type: reflection
+status: active
+version: "1.0"
+created: 2025-01-{1 + i % 28:02d}
+updated: 2025-02-{1 + i % 28:02d}
+tags: {rng.sample(WORDS, 2)}
+emotional_tags: [calm]
+shared_with: {'["sam"]' if i % 10 == 0 else '[]'}
+related: ["[[Entry {(i + 1) % count}]]"]
+core_memory: {"true" if i % 25 == 0 else "false"}
+identity_pillar: {pillar}
+---
+
+# Entry {i}
+
+## 0. Raw Input (Preserved)
+{words}
+
+---
+
+## 1. Context
+See [[Entry {(i + 7) % count}]].
+
+**Changelog**
+- v1.0 — 2025-01-01 — Created
+""", encoding="utf-8")
+
+    (folder / "no_frontmatter.md").write_text("Just text.\n", encoding="utf-8")
+    (folder / "missing_fields.md").write_text("---\ntitle: Half\n---\nBody\n", encoding="utf-8")
+    (folder / "bad_encoding.md").write_bytes(b"---\ntitle: \xff\xfe\n---\n")
+    return root / "Mirrorwell"
+
+
+def run_indexer(mirrorwell: Path, db_path: Path, **kwargs) -> tuple[EhkoDatabase, dict]:
+    db = EhkoDatabase(db_path)
+    db.connect()
+    db.initialize_schema()
+    original_vaults = ehko_refresh.VAULTS
+    ehko_refresh.VAULTS = {"Mirrorwell": mirrorwell}
+    kwargs.setdefault("process_transcriptions", False)
+    try:
+        stats = EhkoIndexer(db, build_vectors=False, **kwargs).run()
+    finally:
+        ehko_refresh.VAULTS = original_vaults
+    return db, stats
+
+
+@contextmanager
+def count_reads():
+    """Paths passed to Path.read_text inside the block."""
+    reads = []
+    original = Path.read_text
+    
+    def counting(self, *args, **kwargs):
+        reads.append(self.name)
+        return original(self, *args, **kwargs)
+    
+    Path.read_text = counting
+    try:
+        yield reads
+    finally:
+        Path.read_text = original
+
+
+def dump_index(db: EhkoDatabase) -> dict:
+    """Index contents keyed by file path (row ids and timestamps left out)."""
+    conn = db.conn
+    return {
+        "objects": sorted(tuple(row) for row in conn.execute("""
+            SELECT file_path, vault, type, title, status, version, created, updated,
+                   raw_input_hash, content_hash, content_preview
+            FROM reflection_objects""")),
+        **{table: sorted(tuple(row) for row in conn.execute(f"""
+            SELECT ro.file_path, t.{column} FROM {table} t
+            JOIN reflection_objects ro ON ro.id = t.object_id"""))
+           for table, column in [("tags", "tag"), ("emotional_tags", "emotion"),
+                                 ("cross_references", "target_path"),
+                                 ("changelog_entries", "version"),
+                                 ("shared_with_friends", "friend_name"),
+                                 ("mirrorwell_extensions", "identity_pillar")]},
+        "search": sorted(tuple(row) for row in conn.execute(
+            "SELECT rowid IN (SELECT id FROM reflection_objects), title, body FROM reflection_fts")),
+        "digests": sorted(tuple(row) for row in conn.execute(
+            "SELECT pillar, digest FROM pillar_digest")),
+    }
+
+
+def test_parse_file():
+    """parse_file is self-contained: statuses for changed, unchanged and invalid files."""
+    print("\n=== Testing parse_file ===")
+    
+    mirrorwell = write_vault(Path(tempfile.mkdtemp()), 3)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    
+    record = parse_file(folder / "entry_0000.md", "Mirrorwell")
+    assert record["status"] == "parsed"
+    assert record["data"]["title"] == "Entry 0"
+    assert record["mirrorwell"][0] is True and record["mirrorwell"][1] in PILLARS
+    assert record["wiki_links"] == ["Entry 1"]
+    assert record["changelog"][0]["version"] == "1.0"
+    assert "## 0." not in record["search_body"]
+    
+    again = parse_file(folder / "entry_0000.md", "Mirrorwell", record["data"]["content_hash"])
+    assert again == {"status": "unchanged",
+                     "file_stat": ehko_refresh.stat_key(folder / "entry_0000.md")}
+    
+    assert parse_file(folder / "no_frontmatter.md", "Mirrorwell")["status"] == "skipped"
+    assert "missing fields" in parse_file(folder / "missing_fields.md", "Mirrorwell")["reason"]
+    assert parse_file(folder / "bad_encoding.md", "Mirrorwell")["status"] == "error"
+    assert parse_file(folder / "gone.md", "Mirrorwell")["status"] == "error"
+    print("✓ parse_file OK")
+
+
+def test_parallel_matches_serial(count: int = 400):
+    """--jobs N builds the same index as a serial run."""
+    print("\n=== Testing parallel indexing ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, count)
+    assert count >= ehko_refresh.PARALLEL_MIN_FILES
+    
+    timings = {}
+    dumps = {}
+    for jobs in (1, 2):
+        start = time.perf_counter()
+        db, stats = run_indexer(mirrorwell, tmp / f"jobs{jobs}.db", incremental=False, jobs=jobs)
+        timings[jobs] = time.perf_counter() - start
+        assert stats["indexed"] == count, stats
+        assert stats["skipped"] == 2 and stats["errors"] == 1, stats
+        dumps[jobs] = dump_index(db)
+        db.close()
+    
+    for key in dumps[1]:
+        assert dumps[1][key] == dumps[2][key], f"{key} differs between serial and parallel runs"
+    assert len(dumps[1]["objects"]) == count
+    assert all(in_index for in_index, _, _ in dumps[1]["search"])
+    
+    # Incremental run over the parallel index: nothing to do
+    db, stats = run_indexer(mirrorwell, tmp / "jobs2.db", jobs=2)
+    assert stats["indexed"] == 0 and stats["skipped"] == count + 2, stats
+    db.close()
+    
+    print(f"  {count} files: serial {timings[1]:.2f}s, 2 workers {timings[2]:.2f}s")
+    print("✓ Parallel indexing OK")
+
+
+def test_stat_skip():
+    """Incremental runs skip files by (mtime_ns, size, inode) and only hash changed stats."""
+    print("\n=== Testing stat-based change detection ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, 50)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    db, _ = run_indexer(mirrorwell, tmp / "index.db", incremental=False)
+    stored = db.get_existing_stats()
+    assert len(stored) == 50
+    assert stored[str(folder / "entry_0001.md")] == ehko_refresh.stat_key(folder / "entry_0001.md")
+    db.close()
+    
+    # No-op: only the three never-indexed files are read
+    with count_reads() as reads:
+        db, stats = run_indexer(mirrorwell, tmp / "index.db")
+    assert sorted(reads) == ["bad_encoding.md", "missing_fields.md", "no_frontmatter.md"], reads
+    assert stats["indexed"] == 0 and stats["scanned"] == 53, stats
+    db.close()
+    
+    # Touched: read and hashed once, not re-indexed, stat refreshed
+    touched = folder / "entry_0002.md"
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10**9))
+    with count_reads() as reads:
+        db, stats = run_indexer(mirrorwell, tmp / "index.db")
+    assert "entry_0002.md" in reads and stats["indexed"] == 0, (reads, stats)
+    db.close()
+    with count_reads() as reads:
+        db, stats = run_indexer(mirrorwell, tmp / "index.db")
+    assert "entry_0002.md" not in reads
+    db.close()
+    
+    # Edited: re-indexed with the new stat
+    edited = folder / "entry_0003.md"
+    edited.write_text(edited.read_text(encoding="utf-8").replace("Entry 3", "Entry three"),
+                      encoding="utf-8")
+    db, stats = run_indexer(mirrorwell, tmp / "index.db")
+    assert stats["indexed"] == 1, stats
+    assert db.conn.execute("SELECT title FROM reflection_objects WHERE file_path = ?",
+                           (str(edited),)).fetchone()[0] == "Entry three"
+    assert db.get_existing_stats()[str(edited)] == ehko_refresh.stat_key(edited)
+    db.close()
+    
+    # Databases from before the stat columns get them added (and fill in on the next run)
+    conn = sqlite3.connect(str(tmp / "old.db"))
+    old_schema = ehko_refresh.SCHEMA_SQL
+    for column in ehko_refresh.STAT_COLUMNS:
+        old_schema = old_schema.replace(f"    {column} INTEGER,\n", "")
+    conn.executescript(old_schema)
+    conn.commit()
+    conn.close()
+    db = EhkoDatabase(tmp / "old.db")
+    db.connect()
+    db.initialize_schema()
+    columns = [row[1] for row in db.conn.execute("PRAGMA table_info(reflection_objects)")]
+    assert all(column in columns for column in ehko_refresh.STAT_COLUMNS), columns
+    db.close()
+    print("✓ Stat-based change detection OK")
+
+
+DETAILED_MEMORY = """---
+title: "Fishing at Lake Eildon"
+vault: Mirrorwell
+type: reflection
+status: active
+version: "1.0"
+created: 2019-03-02
+updated: 2019-03-02
+emotional_tags: [nostalgic, awe]
+shared_with: [Sam, theo]
+---
+
+## 0. Raw Input (Preserved)
+In March 2019 Sam and I drove to Lake Eildon before dawn. The water smelled of
+smoke from the Jamieson fires. Sam said "we are never telling Theo about the
+boat" and we laughed until the ranger came over.
+"""
+
+
+def test_shared_memories():
+    """Shared memories are linked in one pass, scored at indexing time, never duplicated."""
+    print("\n=== Testing shared memories ===")
+    
+    detailed = specificity_score(DETAILED_MEMORY.split("(Preserved)")[1], ["nostalgic"], ["Sam"])
+    generic = specificity_score("Had a nice birthday dinner.", ["happy"])
+    assert detailed >= CHALLENGE_THRESHOLD > generic, (detailed, generic)
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, 30)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    (folder / "lake.md").write_text(DETAILED_MEMORY, encoding="utf-8")
+    
+    db = EhkoDatabase(tmp / "index.db")
+    db.connect()
+    db.initialize_schema()
+    db.conn.execute("INSERT INTO friend_registry (name, email) VALUES ('Sam', 'sam@example.com')")
+    db.conn.execute("INSERT INTO friend_registry (name, email) VALUES ('Jo', 'jo@example.com')")
+    db.commit()
+    db.close()
+    
+    db, _ = run_indexer(mirrorwell, tmp / "index.db")
+    rows = {Path(row[0]).name: (row[1], row[2]) for row in db.conn.execute("""
+        SELECT sm.memory_file_path, sm.specificity_score, sm.challenge_eligible
+        FROM shared_memories sm JOIN friend_registry fr ON fr.id = sm.friend_id
+        WHERE fr.name = 'Sam'""")}
+    # entry_0000, 0010, 0020 are shared with "sam" (matched case-insensitively)
+    assert sorted(rows) == ["entry_0000.md", "entry_0010.md", "entry_0020.md", "lake.md"], rows
+    assert rows["lake.md"] == (detailed, 1), rows
+    assert rows["entry_0000.md"][0] < CHALLENGE_THRESHOLD and rows["entry_0000.md"][1] == 0, rows
+    stored = db.conn.execute("SELECT COUNT(*) FROM reflection_objects WHERE specificity_score IS NOT NULL")
+    assert stored.fetchone()[0] == 4
+    assert db.update_shared_memories() == 0
+    db.close()
+    
+    # An edit rescores the existing row instead of adding another
+    lake = folder / "lake.md"
+    lake.write_text(DETAILED_MEMORY.replace('Sam said "we are never telling Theo about the\nboat" and ', ""),
+                    encoding="utf-8")
+    db, _ = run_indexer(mirrorwell, tmp / "index.db")
+    score, count = db.conn.execute(
+        "SELECT MAX(specificity_score), COUNT(*) FROM shared_memories WHERE memory_file_path = ?",
+        (str(lake),)).fetchone()
+    assert count == 1 and score < detailed, (score, count)
+    db.close()
+    print("✓ Shared memories OK")
+
+
+TRANSCRIPTION = """# Morning Walk
+
+## Short Summary
+Walk by the river.
+
+## Long Summary
+A slow walk down to the river before work.
+
+## Transcriptions
+### A - Nov 27, 2025 07:12:18
+Walked down to the river with Theo. The water was loud after the rain.
+"""
+
+
+def test_transcriptions():
+    """Transcriptions are converted and indexed in the indexing pass, reading each file once."""
+    print("\n=== Testing single-read transcription pass ===")
+    
+    original_dirs = ehko_refresh.REFLECTIONS_DIR, ehko_refresh.PROCESSED_DIR
+    try:
+        for jobs, count in ((1, 20), (2, ehko_refresh.PARALLEL_MIN_FILES)):
+            tmp = Path(tempfile.mkdtemp())
+            mirrorwell = write_vault(tmp, count)
+            folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+            ehko_refresh.REFLECTIONS_DIR = folder
+            ehko_refresh.PROCESSED_DIR = tmp / "_processed"
+            (folder / "voice_note.md").write_text(TRANSCRIPTION, encoding="utf-8")
+            
+            with count_reads() as reads:
+                db, stats = run_indexer(mirrorwell, tmp / "index.db", jobs=jobs,
+                                        process_transcriptions=True)
+            if jobs == 1:
+                assert len(reads) == len(set(reads)) == count + 4, sorted(reads)
+            assert stats["transcriptions_processed"] == 1, stats
+            assert stats["indexed"] == count + 1, stats
+            
+            generated = folder / "2025-11-27_morning_walk.md"
+            assert generated.exists() and not (folder / "voice_note.md").exists()
+            assert (tmp / "_processed" / "voice_note.md").exists()
+            paths = {row[0] for row in db.conn.execute("SELECT file_path FROM reflection_objects")}
+            assert str(generated) in paths and str(folder / "voice_note.md") not in paths
+            hashes = db.get_existing_hashes()
+            assert hashes[str(generated)] == ehko_refresh.compute_hash(
+                generated.read_text(encoding="utf-8"))
+            db.close()
+            
+            # The next run finds the generated reflection unchanged
+            db, stats = run_indexer(mirrorwell, tmp / "index.db", jobs=jobs,
+                                    process_transcriptions=True)
+            assert stats["indexed"] == 0 and stats["transcriptions_processed"] == 0, stats
+            db.close()
+            print(f"  jobs={jobs}: OK")
+    finally:
+        ehko_refresh.REFLECTIONS_DIR, ehko_refresh.PROCESSED_DIR = original_dirs
+    print("✓ Transcription pass OK")
+
+
+def test_shadow_rebuild():
+    """--full builds in a shadow database and swaps the indexer's tables into the live one."""
+    print("\n=== Testing shadow rebuild ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, 60)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    db, _ = run_indexer(mirrorwell, tmp / "index.db", incremental=False)
+    db.conn.execute("INSERT INTO friend_registry (name, email) VALUES ('Sam', 'sam@example.com')")
+    db.conn.execute("CREATE TABLE chat_sessions (id TEXT PRIMARY KEY)")
+    db.conn.execute("INSERT INTO chat_sessions VALUES ('s1')")
+    db.commit()
+    old_max_id = db.conn.execute("SELECT MAX(id) FROM reflection_objects").fetchone()[0]
+    generation = index_generation(db.conn)
+    
+    # A pooled reader opened before the rebuild
+    reader = connect(tmp / "index.db")
+    assert reader.execute("SELECT COUNT(*) FROM reflection_objects").fetchone()[0] == 60
+    
+    (folder / "entry_0001.md").unlink()
+    edited = folder / "entry_0002.md"
+    edited.write_text(edited.read_text(encoding="utf-8").replace("Entry 2", "Entry two"),
+                      encoding="utf-8")
+    
+    original_vaults = ehko_refresh.VAULTS
+    ehko_refresh.VAULTS = {"Mirrorwell": mirrorwell}
+    try:
+        stats = rebuild(db, process_transcriptions=False, build_vectors=False)
+    finally:
+        ehko_refresh.VAULTS = original_vaults
+    assert stats["indexed"] == 59, stats
+    assert not (tmp / "index.db.rebuild").exists()
+    
+    # Same index as a from-scratch build; the rest of the database untouched
+    fresh, _ = run_indexer(mirrorwell, tmp / "fresh.db", incremental=False)
+    assert dump_index(db) == dump_index(fresh)
+    fresh.close()
+    assert db.conn.execute("SELECT COUNT(*) FROM friend_registry").fetchone()[0] == 1
+    assert db.conn.execute("SELECT id FROM chat_sessions").fetchone()[0] == "s1"
+    assert db.conn.execute("SELECT MIN(id) FROM reflection_objects").fetchone()[0] > old_max_id
+    assert index_generation(db.conn) > generation
+    indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_tags_object", "idx_mirrorwell_pillar_core", "idx_reflection_created"} <= indexes
+    assert db.conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    
+    # The reader sees the new index without reconnecting
+    titles = {row[0] for row in reader.execute("SELECT title FROM reflection_objects")}
+    assert "Entry two" in titles and "Entry 1" not in titles and len(titles) == 59
+    reader.close()
+    close_all(tmp / "index.db")
+    db.close()
+    print("✓ Shadow rebuild OK")
+
+
+def test_debouncer():
+    """A batch is released after a quiet period, or after max_delay under constant saves."""
+    print("\n=== Testing debouncer ===")
+    
+    now = [0.0]
+    debouncer = Debouncer(quiet=1.0, max_delay=5.0, clock=lambda: now[0])
+    debouncer.add([Path("a.md")])
+    now[0] = 0.5
+    debouncer.add([Path("a.md"), Path("b.md")])
+    assert debouncer.ready() == set() and debouncer.pending == 2
+    now[0] = 1.6
+    assert debouncer.ready() == {Path("a.md"), Path("b.md")}
+    assert debouncer.ready() == set()
+    
+    for step in range(12):  # a save every 0.5s never goes quiet
+        now[0] = 10 + step * 0.5
+        debouncer.add([Path(f"{step}.md")])
+        batch = debouncer.ready()
+        if batch:
+            break
+    assert now[0] >= 15 and len(batch) == 11, (now[0], batch)
+    print("✓ Debouncer OK")
+
+
+def watcher_sees(watcher, action, expected: set, timeout: float = 3.0):
+    """Run action, then collect watcher changes until expected have all been reported."""
+    action()
+    seen = set()
+    deadline = time.monotonic() + timeout
+    while not expected <= seen and time.monotonic() < deadline:
+        seen |= watcher.changes(timeout=0.1)
+    assert expected <= seen, (type(watcher).__name__, expected - seen, seen)
+    return seen
+
+
+def test_watchers():
+    """Both watchers report created, edited, renamed and deleted notes (and new folders)."""
+    print("\n=== Testing vault watchers ===")
+    
+    kinds = [("polling", lambda root: PollingWatcher([root], {"_data"}, interval=0.05))]
+    if INOTIFY_AVAILABLE:
+        kinds.insert(0, ("inotify", lambda root: InotifyWatcher([root], {"_data"})))
+    else:
+        print("  (inotify unavailable: polling only)")
+    
+    for kind, make in kinds:
+        root = Path(tempfile.mkdtemp())
+        (root / "_data").mkdir()
+        note = root / "note.md"
+        note.write_text("one", encoding="utf-8")
+        watcher = make(root)
+        try:
+            watcher_sees(watcher, lambda: note.write_text("two two", encoding="utf-8"), {note})
+            renamed = root / "renamed.md"
+            watcher_sees(watcher, lambda: note.rename(renamed), {note, renamed})
+            watcher_sees(watcher, renamed.unlink, {renamed})
+            
+            nested = root / "sub" / "deep.md"
+            def make_nested():
+                nested.parent.mkdir()
+                nested.write_text("new", encoding="utf-8")
+            expected = {nested} if kind == "polling" else {nested.parent}
+            watcher_sees(watcher, make_nested, expected)
+            watcher_sees(watcher, lambda: nested.write_text("edited", encoding="utf-8"), {nested})
+            
+            # Skipped folders and other file types are ignored
+            (root / "_data" / "x.md").write_text("x", encoding="utf-8")
+            (root / "image.png").write_bytes(b"png")
+            time.sleep(0.1)
+            assert watcher.changes(timeout=0.2) == set()
+        finally:
+            watcher.close()
+        print(f"  {kind}: OK")
+    print("✓ Watchers OK")
+
+
+def test_reindex_paths():
+    """reindex_paths applies edits, renames and deletes and bumps the generation."""
+    print("\n=== Testing reindex_paths ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, 20)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    db, _ = run_indexer(mirrorwell, tmp / "index.db", incremental=False)
+    generation = index_generation(db.conn)
+    
+    def titles():
+        return {row[0]: row[1] for row in db.conn.execute(
+            "SELECT file_path, title FROM reflection_objects")}
+    
+    original_vaults = ehko_refresh.VAULTS
+    ehko_refresh.VAULTS = {"Mirrorwell": mirrorwell}
+    try:
+        indexer = EhkoIndexer(db, process_transcriptions=False, build_vectors=False)
+        
+        # Nothing changed: no generation bump
+        assert not indexer.reindex_paths({folder / "entry_0001.md"})
+        assert index_generation(db.conn) == generation
+        
+        edited, old, new, gone = (folder / "entry_0001.md", folder / "entry_0002.md",
+                                  folder / "moved.md", folder / "entry_0003.md")
+        edited.write_text(edited.read_text(encoding="utf-8").replace('"Entry 1"', '"Edited"'),
+                          encoding="utf-8")
+        old.rename(new)
+        gone.unlink()
+        assert indexer.reindex_paths({edited, old, new, gone, tmp / "elsewhere.md"})
+        assert index_generation(db.conn) == generation + 1
+        current = titles()
+        assert current[str(edited)] == "Edited"
+        assert current[str(new)] == "Entry 2"
+        assert str(old) not in current and str(gone) not in current
+        assert len(current) == 19
+        
+        # Folder renamed: everything under it moves
+        moved_folder = folder.parent / "2.9 Moved"
+        folder.rename(moved_folder)
+        assert indexer.reindex_paths({folder, moved_folder})
+        current = titles()
+        assert len(current) == 19
+        assert all(path.startswith(str(moved_folder)) for path in current), current
+        assert indexer.stats["indexed"] == 2 + 19
+    finally:
+        ehko_refresh.VAULTS = original_vaults
+        db.close()
+    print("✓ reindex_paths OK")
+
+
+class PerRowDatabase(EhkoDatabase):
+    """The write path before batching: one execute per child row, per-table DELETEs."""
+    
+    def _queue(self, table, object_id, rows):
+        if table == FTS_TABLE:
+            self.conn.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", (object_id,))
+        for row in rows:
+            self.conn.execute(ehko_refresh.BATCHED_SQL[table], row)
+    
+    def upsert_reflection(self, data):
+        obj_id = super().upsert_reflection(data)
+        for stale in self._stale_objects:
+            for table in ehko_refresh.CHILD_INSERT_SQL:
+                self.conn.execute(f"DELETE FROM {table} WHERE object_id = ?", (stale,))
+        self._stale_objects = []
+        return obj_id
+
+
+NEW_INDEXES = ("idx_changelog_object", "idx_emotional_object", "idx_shared_with_object")
+
+
+def benchmark_writes(count: int = 1000) -> dict:
+    """
+    Child rows/sec writing (then re-writing) parsed records: the old path
+    (per-row, without the object_id indexes on changelog / emotions /
+    shared_with), per-row with them, and batched.
+    """
+    print(f"\n=== Benchmarking child-row writes ({count} files) ===")
+    rng = random.Random(5)
+    tmp = Path(tempfile.mkdtemp())
+    folder = tmp / "Mirrorwell"
+    folder.mkdir()
+    for i in range(count):
+        links = "\n".join(f"- [[Entry {rng.randrange(count)}]]" for _ in range(10))
+        changelog = "\n".join(f"- v1.{v} — 2025-01-{v + 1:02d} — Revision {v}" for v in range(5))
+        (folder / f"entry_{i:05d}.md").write_text(f"""---
+title: "Entry {i}"
+vault: Mirrorwell
+type: reflection
+status: active
+version: "1.4"
+created: 2025-01-01
+updated: 2025-01-05
+tags: {rng.sample(WORDS, 8)}
+emotional_tags: [calm, hopeful, tired]
+shared_with: [sam, alex]
+---
+
+## 0. Raw Input (Preserved)
+{" ".join(rng.choices(WORDS, k=60))}
+
+## 5. Cross-References
+{links}
+
+**Changelog**
+{changelog}
+""", encoding="utf-8")
+    records = [(path, parse_file(path, "Mirrorwell")) for path in sorted(folder.glob("*.md"))]
+    child_rows = sum(len(r["tags"]) + len(r["emotional_tags"]) + len(r["shared_with"])
+                     + len(r["wiki_links"]) + len(r["changelog"]) for _, r in records)
+    
+    results = {}
+    for label, db_class in (("before", PerRowDatabase), ("per-row", PerRowDatabase),
+                            ("batched", EhkoDatabase)):
+        db = db_class(tmp / f"{label}.db")
+        db.connect()
+        db.initialize_schema()
+        if label == "before":
+            for index in NEW_INDEXES:
+                db.conn.execute(f"DROP INDEX {index}")
+        indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False)
+        row = {}
+        for phase in ("insert", "update"):
+            start = time.perf_counter()
+            for i, (path, record) in enumerate(records, 1):
+                indexer.apply_record(path, record)
+                if i % ehko_refresh.WRITE_BATCH == 0:
+                    db.commit()
+            db.commit()
+            row[phase] = child_rows / (time.perf_counter() - start)
+        assert db.conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0] == 8 * count
+        db.close()
+        results[label] = row
+        print(f"  {label:>8}: insert {row['insert']:>9,.0f} rows/s   "
+              f"update {row['update']:>9,.0f} rows/s")
+    print(f"  ({child_rows} child rows per pass)")
+    return results
+
+
+def test_batched_writes():
+    """Batched rows match per-row writes (also when a file is re-indexed twice per batch)."""
+    print("\n=== Testing batched writes ===")
+    
+    tmp = Path(tempfile.mkdtemp())
+    mirrorwell = write_vault(tmp, 30)
+    folder = mirrorwell / "2_Reflection Library" / "2.1 Journals"
+    records = [(path, parse_file(path, "Mirrorwell")) for path in sorted(folder.glob("entry_*.md"))]
+    
+    dumps = []
+    for db_class in (PerRowDatabase, EhkoDatabase):
+        db = db_class(tmp / f"{db_class.__name__}.db")
+        db.connect()
+        db.initialize_schema()
+        indexer = EhkoIndexer(db, incremental=False, process_transcriptions=False)
+        for path, record in records + records:  # second pass re-indexes in the same batch
+            indexer.apply_record(path, record)
+        indexer.apply_record(*records[0])
+        db.delete_object(str(records[1][0]))
+        db.commit()
+        dumps.append(dump_index(db))
+        db.close()
+    assert dumps[0] == dumps[1]
+    assert len(dumps[1]["tags"]) == 29 * 2
+    
+    results = benchmark_writes()
+    assert results["batched"]["update"] > 2 * results["before"]["update"], results
+    print("✓ Batched writes OK")
+
+
+def main():
+    """Run all tests."""
+    parser = argparse.ArgumentParser(description="Indexer tests")
+    parser.add_argument("--bench", action="store_true", help="Benchmark child-row writes on 5k files")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Indexer Test Suite")
+    print("=" * 60)
+    
+    try:
+        if args.bench:
+            benchmark_writes(5000)
+            return
+        
+        test_parse_file()
+        test_parallel_matches_serial()
+        test_stat_skip()
+        test_shared_memories()
+        test_transcriptions()
+        test_shadow_rebuild()
+        test_debouncer()
+        test_watchers()
+        test_reindex_paths()
+        test_batched_writes()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
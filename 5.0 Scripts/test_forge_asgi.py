@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Forge ASGI Test Script
+
+Exercises forge_asgi (Starlette + mounted Flask app) in-process against a
+throwaway database and the async mock provider from test_forge_chat.
+
+Requires: pip install starlette httpx a2wsgi
+
+Usage:
+    cd "5.0 Scripts"
+    python test_forge_asgi.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ensure forge_server is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+
+import forge_asgi
+from test_forge_chat import MockChatProvider, parse_sse, setup_test_server
+
+
+def asgi_client() -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=forge_asgi.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://forge")
+
+
+def set_mana(amount: float):
+    """Set current and max mana (creating the mana tables if needed)."""
+    forge_asgi.forge.CHAT_PREFLIGHT.run(spend=False)
+    conn = forge_asgi.forge.get_db()
+    conn.execute("UPDATE mana_state SET current_mana = ?, max_mana = MAX(max_mana, ?)",
+                 (amount, amount))
+    conn.commit()
+    conn.close()
+
+
+async def create_session(client) -> str:
+    response = await client.post("/api/sessions", json={"title": "Test"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_asgi_send_message():
+    """JSON and SSE turns go through the provider's async methods."""
+    print("\n=== Testing ASGI send_message ===")
+    
+    provider = MockChatProvider(["Async ", "reply."])
+    setup_test_server(provider)
+    
+    async def run():
+        async with asgi_client() as client:
+            session_id = await create_session(client)
+            
+            response = await client.post(f"/api/sessions/{session_id}/messages",
+                                         json={"content": "Hello", "mode": "terminal"})
+            assert response.status_code == 201
+            messages = response.json()["messages"]
+            assert [m["role"] for m in messages] == ["user", "ehko"]
+            assert messages[1]["content"] == "Async reply."
+            assert "provider_call;dur=" in response.headers["server-timing"]
+            
+            response = await client.post(f"/api/sessions/{session_id}/messages",
+                                         json={"content": "Stream"},
+                                         headers={"Accept": "text/event-stream"})
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.text)
+            assert [d["delta"] for n, d in events if n == "token"] == ["Async ", "reply."]
+            assert events[-1][0] == "done"
+            
+            # Non-object JSON bodies are rejected like the Flask route does
+            for body in ['"hi"', "5", "[1]"]:
+                response = await client.post(f"/api/sessions/{session_id}/messages", content=body,
+                                             headers={"Content-Type": "application/json"})
+                assert response.status_code == 400, body
+                flask = forge_asgi.forge.app.test_client().post(
+                    f"/api/sessions/{session_id}/messages", data=body, content_type="application/json")
+                assert flask.status_code == 400, body
+            
+            # Routes not ported to async are served by the mounted Flask app
+            session = (await client.get(f"/api/sessions/{session_id}")).json()
+            assert session["message_count"] == 4
+    
+    asyncio.run(run())
+    assert all(call.get("async") for call in provider.calls), provider.calls
+    assert [m["role"] for m in provider.calls[1]["history"]] == ["user", "assistant"]
+    print("✓ ASGI JSON + SSE OK")
+
+
+def test_asgi_job_and_dormant():
+    """Job mode long-polls without a thread; dormant turns return 429."""
+    print("\n=== Testing ASGI jobs / dormancy ===")
+    
+    setup_test_server(MockChatProvider(latency=0.1))
+    
+    async def run():
+        async with asgi_client() as client:
+            session_id = await create_session(client)
+            
+            response = await client.post(f"/api/sessions/{session_id}/messages",
+                                         json={"content": "Later", "async": True})
+            assert response.status_code == 202
+            job = (await client.get(response.json()["status_url"], params={"wait": 5})).json()
+            assert job["status"] == "done"
+            assert job["result"]["messages"][1]["role"] == "ehko"
+            
+            # SSE job stream resolves from the job's done callback, not polling
+            response = await client.post(f"/api/sessions/{session_id}/messages",
+                                         json={"content": "Stream later", "async": True})
+            start = time.perf_counter()
+            stream = await client.get(response.json()["status_url"],
+                                      headers={"Accept": "text/event-stream"})
+            events = parse_sse(stream.text)
+            assert [n for n, _ in events] == ["status", "done"]
+            assert events[-1][1]["result"]["messages"][1]["role"] == "ehko"
+            assert time.perf_counter() - start < 5
+            
+            set_mana(0)
+            response = await client.post(f"/api/sessions/{session_id}/messages",
+                                         json={"content": "Anyone?"})
+            assert response.status_code == 429
+            assert response.json()["dormant"] is True
+    
+    asyncio.run(run())
+    print("✓ ASGI jobs / dormancy OK")
+
+
+def test_asgi_concurrency(n_chats: int = 100, latency: float = 0.5):
+    """Many slow chats overlap on one event loop."""
+    print(f"\n=== Testing {n_chats} concurrent ASGI chats ({latency}s provider) ===")
+    
+    setup_test_server(MockChatProvider(latency=latency))
+    set_mana(1e9)
+    
+    async def run():
+        async with asgi_client() as client:
+            session_ids = [await create_session(client) for _ in range(n_chats)]
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[
+                client.post(f"/api/sessions/{sid}/messages", json={"content": "Hi"})
+                for sid in session_ids
+            ])
+            return responses, time.perf_counter() - start
+    
+    responses, elapsed = asyncio.run(run())
+    assert [r.status_code for r in responses] == [201] * n_chats
+    print(f"  {n_chats} chats in {elapsed:.2f}s (serial would be {n_chats * latency:.0f}s)")
+    assert elapsed < n_chats * latency / 4
+    print("✓ ASGI concurrency OK")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Forge ASGI Test Suite")
+    print("=" * 60)
+    
+    try:
+        test_asgi_send_message()
+        test_asgi_job_and_dormant()
+        test_asgi_concurrency()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Forge HTTP Caching Test Script
+
+Checks ETag / 304 handling on the dashboard read endpoints, immutable
+caching for versioned static assets, and the EHKO_DEV_NO_CACHE mode,
+against a throwaway database (no vault required).
+
+Usage:
+    cd "5.0 Scripts"
+    python test_forge_cache.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Ensure forge_server is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+import forge_server
+from test_forge_chat import setup_test_server
+
+FRONTEND_PATH = Path(__file__).parent.parent / "6.0 Frontend"
+
+
+def add_reflections(db_path: Path, count: int, start: int = 0):
+    """Insert `count` tagged reflection rows (gives /api/stats some work)."""
+    conn = forge_server.get_db()
+    for i in range(start, start + count):
+        cursor = conn.execute("""
+            INSERT INTO reflection_objects (file_path, vault, type, title, status, version,
+                                            created, updated, confidence)
+            VALUES (?, 'Mirrorwell', 'reflection', ?, 'active', '1.0',
+                    '2025-01-01', '2025-01-01', 0.8)
+        """, (f"reflection_{i}.md", f"Reflection {i}"))
+        conn.execute("INSERT INTO tags (object_id, tag) VALUES (?, ?)",
+                     (cursor.lastrowid, "identity" if i % 3 == 0 else "work"))
+    conn.commit()
+    conn.close()
+
+
+def test_conditional_get():
+    """Dashboard reads return 304 until the database changes."""
+    print("\n=== Testing ETag / 304 on dashboard reads ===")
+    
+    db_path = setup_test_server()
+    add_reflections(db_path, 2000)
+    client = forge_server.app.test_client()
+    
+    calls = []
+    original = forge_server.calculate_stats
+    forge_server.calculate_stats = lambda: calls.append(1) or original()
+    try:
+        first = client.get("/api/stats")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+        assert "Last-Modified" in first.headers
+        
+        again = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.data == b""
+        assert again.headers["ETag"] == etag
+        assert len(calls) == 1, "view ran for a 304"
+        
+        since = client.get("/api/stats", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+        assert since.status_code == 304
+        
+        # Any committed write (here: a new reflection) invalidates
+        add_reflections(db_path, 1, start=2000)
+        changed = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        
+        # Timing: full aggregate vs revalidation
+        runs = 100
+        start = time.perf_counter()
+        for _ in range(runs):
+            client.get("/api/stats")
+        full_ms = (time.perf_counter() - start) / runs * 1000
+        etag = changed.headers["ETag"]
+        start = time.perf_counter()
+        for _ in range(runs):
+            client.get("/api/stats", headers={"If-None-Match": etag})
+        cached_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"  /api/stats (2001 reflections): 200 {full_ms:.2f} ms, 304 {cached_ms:.2f} ms")
+    finally:
+        forge_server.calculate_stats = original
+    
+    for path in ["/api/ehko/status", "/api/ehko/layers"]:
+        client.get(path)  # first read may create the mana/authority rows
+        response = client.get(path)
+        assert response.status_code == 200, path
+        assert client.get(path, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    
+    # Pending regeneration is shown without writing it (a write would stale the ETag)
+    conn = forge_server.get_db()
+    conn.execute("INSERT OR REPLACE INTO mana_state (id, current_mana, max_mana, regen_rate, last_updated) "
+                 "VALUES (1, 50.0, 100.0, 1.0, datetime('now', '-2 hours'))")
+    conn.commit()
+    conn.close()
+    response = client.get("/api/ehko/status")
+    assert 51.9 < response.get_json()["mana"]["current_mana"] < 52.1
+    assert client.get("/api/ehko/status",
+                      headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    conn = forge_server.get_db()
+    assert conn.execute("SELECT current_mana FROM mana_state WHERE id = 1").fetchone()[0] == 50.0
+    conn.close()
+    
+    # Uncached API routes stay no-store
+    assert "no-store" in client.get("/api/sessions").headers["Cache-Control"]
+    print("✓ Conditional GET OK")
+
+
+def test_versioned_assets():
+    """Assets linked with their content hash are immutable; others revalidate."""
+    print("\n=== Testing versioned static assets ===")
+    
+    forge_server.STATIC_PATH = FRONTEND_PATH / "static"
+    forge_server.COMPONENTS_PATH = FRONTEND_PATH / "components"
+    client = forge_server.app.test_client()
+    
+    for asset in ["/css/main.css", "/js/main.js", "/components/ehko-toast.js"]:
+        url = forge_server.asset_url(asset)
+        assert "?v=" in url, url
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        
+        plain = client.get(asset)
+        assert "immutable" not in plain.headers["Cache-Control"]
+        assert "immutable" not in client.get(f"{asset}?v=stale").headers["Cache-Control"]
+    
+    assert forge_server.asset_url("/css/missing.css") == "/css/missing.css"
+    print("✓ Versioned assets OK")
+
+
+def test_dev_no_cache():
+    """EHKO_DEV_NO_CACHE keeps the old no-store-everything behaviour."""
+    print("\n=== Testing dev no-cache mode ===")
+    
+    setup_test_server()
+    client = forge_server.app.test_client()
+    forge_server.DEV_NO_CACHE = True
+    try:
+        response = client.get("/api/stats")
+        assert "ETag" not in response.headers
+        assert "no-store" in response.headers["Cache-Control"]
+        assert "?v=" not in forge_server.asset_url("/css/main.css")
+    finally:
+        forge_server.DEV_NO_CACHE = False
+    print("✓ Dev no-cache OK")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Forge HTTP Caching Test Suite")
+    print("=" * 60)
+    
+    try:
+        test_conditional_get()
+        test_versioned_assets()
+        test_dev_no_cache()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Forge Chat Pipeline Test Script
+
+Exercises POST /api/sessions/<id>/messages against a throwaway database
+and a mock LLM provider (no API calls, no vault required).
+
+Usage:
+    cd "5.0 Scripts"
+    python test_forge_chat.py
+"""
+
+import asyncio
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import AsyncGenerator, Generator, Optional
+
+# Ensure forge_server is importable
+sys.path.insert(0, str(Path(__file__).parent))
+
+import forge_server
+from ehko_refresh import SCHEMA_SQL
+from ehkoforge.llm import (
+    LLMProvider,
+    LLMResponse,
+    SystemPrompt,
+    augment_system_prompt,
+    build_conversation_window,
+)
+from ehkoforge.jobs import JobQueue
+from ehkoforge.llm.claude_provider import system_blocks
+from recog_engine.chat_preflight import ChatPreflight
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+class MockChatProvider(LLMProvider):
+    """Mock conversation provider that streams a canned reply in chunks."""
+    
+    PROVIDER_NAME = "mock"
+    
+    def __init__(self, chunks: list = None, latency: float = 0.0,
+                 write_probe: Path = None):
+        """
+        Args:
+            chunks: Reply text chunks.
+            latency: Seconds to sleep per call (simulates a slow provider).
+            write_probe: If set, attempt a write to this database mid-call
+                         with no busy timeout; records failures in `probe_errors`.
+        """
+        super().__init__(api_key="test")
+        self.chunks = chunks or ["Hello ", "from ", "the ", "Ehko."]
+        self.latency = latency
+        self.write_probe = write_probe
+        self.probe_errors = []
+        self.calls = []
+    
+    @property
+    def default_model(self) -> str:
+        return "mock-model"
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 max_tokens: int = 1024, temperature: float = 0.7,
+                 history: list = None) -> LLMResponse:
+        self.calls.append({"prompt": prompt, "system_prompt": system_prompt,
+                           "history": history})
+        if self.write_probe:
+            self._probe_write()
+        time.sleep(self.latency)
+        return LLMResponse(content="".join(self.chunks), model=self.model,
+                           provider=self.PROVIDER_NAME)
+    
+    def _probe_write(self):
+        """Fail fast if anyone holds the database write lock during generation."""
+        conn = sqlite3.connect(str(self.write_probe), timeout=0)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS _probe (n INTEGER)")
+            conn.execute("INSERT INTO _probe (n) VALUES (1)")
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            self.probe_errors.append(str(e))
+        finally:
+            conn.close()
+    
+    def generate_with_context(self, prompt: str, context: str,
+                              system_prompt: Optional[str] = None,
+                              max_tokens: int = 1024, temperature: float = 0.7,
+                              history: list = None) -> LLMResponse:
+        return self.generate(prompt, augment_system_prompt(system_prompt, context),
+                             max_tokens, temperature, history)
+    
+    def _stream(self, prompt, system_prompt, max_tokens, temperature,
+                history=None) -> Generator[str, None, LLMResponse]:
+        self.calls.append({"prompt": prompt, "system_prompt": system_prompt,
+                           "history": history})
+        for chunk in self.chunks:
+            yield chunk
+        return LLMResponse(content="".join(self.chunks), model=self.model,
+                           provider=self.PROVIDER_NAME)
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        max_tokens: int = 1024, temperature: float = 0.7,
+                        history: list = None) -> LLMResponse:
+        self.calls.append({"prompt": prompt, "system_prompt": system_prompt,
+                           "history": history, "async": True})
+        await asyncio.sleep(self.latency)
+        return LLMResponse(content="".join(self.chunks), model=self.model,
+                           provider=self.PROVIDER_NAME)
+    
+    async def _astream(self, prompt, system_prompt, max_tokens, temperature,
+                       history=None) -> AsyncGenerator:
+        self.calls.append({"prompt": prompt, "system_prompt": system_prompt,
+                           "history": history, "async": True})
+        for chunk in self.chunks:
+            await asyncio.sleep(self.latency / len(self.chunks))
+            yield chunk
+        yield LLMResponse(content="".join(self.chunks), model=self.model,
+                          provider=self.PROVIDER_NAME)
+
+
+def setup_test_server(provider: LLMProvider = None) -> Path:
+    """Point forge_server at a fresh temp database and the given provider."""
+    db_path = Path(tempfile.mkdtemp()) / "ehko_index.db"
+    
+    forge_server.DATABASE_PATH = db_path
+    forge_server.CONTEXT_BUILDER.database_path = db_path
+    forge_server.CHAT_PREFLIGHT = ChatPreflight(db_path)
+    forge_server._llm_provider = provider
+    
+    conn = forge_server.get_db()
+    conn.executescript(SCHEMA_SQL)
+    conn.executescript((SCRIPTS_DIR / "migrations" / "tethers_v0_1.sql").read_text(encoding="utf-8"))
+    conn.commit()
+    conn.close()
+    forge_server.init_session_tables()
+    
+    return db_path
+
+
+def create_session(client) -> str:
+    """Create a chat session and return its id."""
+    response = client.post("/api/sessions", json={"title": "Test"})
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+def parse_sse(body: str) -> list:
+    """Parse an SSE body into (event, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = None, None
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+def test_send_message_json():
+    """Blocking JSON mode returns both messages."""
+    print("\n=== Testing JSON send_message ===")
+    
+    setup_test_server(MockChatProvider())
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    response = client.post(f"/api/sessions/{session_id}/messages",
+                           json={"content": "How am I doing?", "mode": "terminal"})
+    assert response.status_code == 201
+    
+    messages = response.get_json()["messages"]
+    assert [m["role"] for m in messages] == ["user", "ehko"]
+    assert messages[1]["content"] == "Hello from the Ehko."
+    print("✓ JSON mode OK")
+
+
+def test_send_message_stream():
+    """SSE mode forwards each chunk and persists the final reply."""
+    print("\n=== Testing SSE send_message ===")
+    
+    provider = MockChatProvider(["One ", "two ", "three."])
+    setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    response = client.post(f"/api/sessions/{session_id}/messages",
+                           json={"content": "Count for me", "mode": "terminal"},
+                           headers={"Accept": "text/event-stream"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    
+    events = parse_sse(response.get_data(as_text=True))
+    names = [name for name, _ in events]
+    assert names[0] == "user"
+    assert names[-1] == "done"
+    
+    deltas = [data["delta"] for name, data in events if name == "token"]
+    assert deltas == ["One ", "two ", "three."]
+    
+    # Final row persisted
+    stored = client.get(f"/api/sessions/{session_id}/messages").get_json()["messages"]
+    assert [m["role"] for m in stored] == ["user", "ehko"]
+    assert stored[1]["content"] == "One two three."
+    assert events[-1][1]["messages"][1]["id"] == stored[1]["id"]
+    
+    session = client.get(f"/api/sessions/{session_id}").get_json()
+    assert session["message_count"] == 2
+    print("✓ SSE mode OK")
+
+
+def test_stream_without_provider():
+    """SSE mode falls back to a single templated chunk with no provider."""
+    print("\n=== Testing SSE fallback ===")
+    
+    setup_test_server(None)
+    forge_server._llm_provider = None
+    original = forge_server.get_llm_provider
+    forge_server.get_llm_provider = lambda: None
+    try:
+        client = forge_server.app.test_client()
+        session_id = create_session(client)
+        
+        response = client.post(f"/api/sessions/{session_id}/messages",
+                               json={"content": "thanks"},
+                               headers={"Accept": "text/event-stream"})
+        events = parse_sse(response.get_data(as_text=True))
+        tokens = [data for name, data in events if name == "token"]
+        assert len(tokens) == 1
+        assert events[-1][0] == "done"
+    finally:
+        forge_server.get_llm_provider = original
+    print("✓ SSE fallback OK")
+
+
+def test_no_write_lock_during_generation():
+    """The user turn is committed before the provider is called."""
+    print("\n=== Testing write lock release ===")
+    
+    provider = MockChatProvider()
+    provider.write_probe = setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    response = client.post(f"/api/sessions/{session_id}/messages",
+                           json={"content": "Is the lock free?"})
+    assert response.status_code == 201
+    assert provider.probe_errors == [], provider.probe_errors
+    print("✓ No write lock held across LLM call")
+
+
+def test_concurrent_chats(n_chats: int = 8):
+    """N parallel chats against a slow mock provider never hit 'database is locked'."""
+    print(f"\n=== Testing {n_chats} concurrent chats ===")
+    
+    provider = MockChatProvider(latency=0.2)
+    setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_ids = [create_session(client) for _ in range(n_chats)]
+    
+    statuses = []
+    log = io.StringIO()
+    
+    def chat(session_id):
+        worker = forge_server.app.test_client()
+        for turn in range(2):
+            response = worker.post(f"/api/sessions/{session_id}/messages",
+                                   json={"content": f"Turn {turn} for {session_id}"})
+            statuses.append(response.status_code)
+    
+    with redirect_stdout(log):
+        threads = [threading.Thread(target=chat, args=(sid,)) for sid in session_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    output = log.getvalue()
+    assert "database is locked" not in output, "lock contention detected"
+    assert statuses == [201] * (n_chats * 2), statuses
+    
+    for session_id in session_ids:
+        session = client.get(f"/api/sessions/{session_id}").get_json()
+        assert session["message_count"] == 4
+    print(f"✓ {n_chats * 2} turns completed without lock errors")
+
+
+def test_send_message_job(n_jobs: int = 12):
+    """Job mode returns 202 at once; replies arrive via polling and SSE."""
+    print(f"\n=== Testing async job mode ({n_jobs} jobs) ===")
+    
+    provider = MockChatProvider(latency=0.2)
+    setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    start = time.perf_counter()
+    response = client.post(f"/api/sessions/{session_id}/messages",
+                           json={"content": "Take your time", "async": True})
+    accept_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code == 202
+    body = response.get_json()
+    assert [m["role"] for m in body["messages"]] == ["user"]
+    assert response.headers["Location"] == body["status_url"]
+    assert accept_ms < 200, f"POST blocked for {accept_ms:.0f} ms"
+    
+    job = client.get(body["status_url"] + "?wait=5").get_json()
+    assert job["status"] == "done", job
+    assert [m["role"] for m in job["result"]["messages"]] == ["user", "ehko"]
+    assert job["result"]["messages"][1]["content"] == "Hello from the Ehko."
+    
+    # SSE channel on a job that is still running
+    response = client.post(f"/api/sessions/{session_id}/messages",
+                           json={"content": "Stream it"},
+                           headers={"Prefer": "respond-async"})
+    job_url = response.get_json()["status_url"]
+    events = parse_sse(client.get(job_url, headers={"Accept": "text/event-stream"})
+                       .get_data(as_text=True))
+    assert events[0][0] == "status"
+    assert events[-1][0] == "done"
+    assert events[-1][1]["result"]["messages"][1]["role"] == "ehko"
+    
+    assert client.get("/api/jobs/nope").status_code == 404
+    
+    # Many turns in flight: the bounded pool drains them all
+    session_ids = [create_session(client) for _ in range(n_jobs)]
+    start = time.perf_counter()
+    urls = [client.post(f"/api/sessions/{sid}/messages",
+                        json={"content": "Queued", "async": True}).get_json()["status_url"]
+            for sid in session_ids]
+    submit_s = time.perf_counter() - start
+    results = [client.get(url + "?wait=10").get_json() for url in urls]
+    assert all(job["status"] == "done" for job in results)
+    total_s = time.perf_counter() - start
+    
+    for sid in session_ids:
+        assert client.get(f"/api/sessions/{sid}").get_json()["message_count"] == 2
+    print(f"  {n_jobs} submits: {submit_s * 1000:.0f} ms, all replies: {total_s:.2f} s "
+          f"({forge_server.CHAT_JOBS.max_workers} workers)")
+    print("✓ Async job mode OK")
+
+
+def test_job_sweep():
+    """Finished jobs are dropped after ttl without any further submit()."""
+    print("\n=== Testing job TTL sweep ===")
+    
+    jobs = JobQueue(max_workers=2, ttl=0.2)
+    try:
+        submitted = [jobs.submit(lambda i=i: {"reply": "x" * 1000, "i": i}) for i in range(4)]
+        assert all(job.wait(5) for job in submitted)
+        assert jobs.stats()["done"] == 4
+        
+        time.sleep(0.5)  # no traffic: only the sweep timer can prune
+        assert not jobs._jobs, f"{len(jobs._jobs)} finished jobs still held"
+        assert jobs.get(submitted[0].id) is None
+    finally:
+        jobs.shutdown()
+    print("✓ Job sweep OK")
+
+
+def test_conversation_history():
+    """Follow-up turns carry earlier turns as role-tagged history within the budget."""
+    print("\n=== Testing conversation history ===")
+    
+    provider = MockChatProvider(["Noted."])
+    setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    long_turn = "I moved cities last year. " + "It was a long process. " * 30
+    for content in [long_turn, "It still feels strange."]:
+        client.post(f"/api/sessions/{session_id}/messages", json={"content": content})
+    client.post(f"/api/sessions/{session_id}/messages", json={"content": "Why?"},
+                headers={"Accept": "text/event-stream"}).get_data()
+    
+    assert provider.calls[0]["history"] == []
+    assert provider.calls[-1]["prompt"] == "Why?"
+    assert provider.calls[-1]["history"] == [
+        {"role": "user", "content": long_turn.strip()},
+        {"role": "assistant", "content": "Noted."},
+        {"role": "user", "content": "It still feels strange."},
+        {"role": "assistant", "content": "Noted."},
+    ]
+    
+    # Over budget: newest turns kept verbatim, older ones condensed or dropped
+    history = []
+    for i in range(30):
+        history.append({"role": "user", "content": f"Turn {i}. " + "Some detail here. " * 20})
+        history.append({"role": "ehko", "content": f"Reply {i}. " + "A thoughtful answer. " * 20})
+    window = build_conversation_window(history, max_tokens=600)
+    assert window.tokens <= 600
+    assert window.messages[0]["role"] == "user"
+    assert window.messages[-1]["content"].startswith("Reply 29.")
+    assert window.summary and "- Forger: Turn" in window.summary
+    assert len(window.messages) + window.summarised + window.dropped == 60
+    
+    budget = forge_server.LLM_CONFIG.history_token_budget
+    forge_server.LLM_CONFIG.history_token_budget = 100
+    try:
+        client.post(f"/api/sessions/{session_id}/messages", json={"content": "Go on."})
+    finally:
+        forge_server.LLM_CONFIG.history_token_budget = budget
+    call = provider.calls[-1]
+    assert call["history"][0] == {"role": "user", "content": "It still feels strange."}
+    assert "## Earlier In This Session" in str(call["system_prompt"])
+    assert "- Forger: I moved cities last year." in str(call["system_prompt"])
+    print(f"  600-token window: {len(window.messages)} kept, {window.summarised} summarised, "
+          f"{window.dropped} dropped (~{window.tokens} tokens)")
+    print("✓ Conversation history OK")
+
+
+def test_prompt_prefix_cache():
+    """The static system prompt prefix is byte-identical across turns."""
+    print("\n=== Testing prompt prefix stability ===")
+    
+    provider = MockChatProvider(["Noted."])
+    setup_test_server(provider)
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    for content in ["First thought.", "A second, longer thought about work.", "Third."]:
+        client.post(f"/api/sessions/{session_id}/messages", json={"content": content})
+    client.post(f"/api/sessions/{session_id}/messages", json={"content": "Streamed."},
+                headers={"Accept": "text/event-stream"}).get_data()
+    client.post(f"/api/sessions/{session_id}/messages",
+                json={"content": "Deeper.", "mode": "reflection"})
+    
+    prompts = [call["system_prompt"] for call in provider.calls]
+    assert all(isinstance(p, SystemPrompt) for p in prompts)
+    terminal = {p.static.encode("utf-8") for p in prompts[:4]}
+    assert len(terminal) == 1, "static prefix changed between turns"
+    assert prompts[0].static is prompts[3].static  # memoized, not rebuilt
+    assert prompts[4].static != prompts[0].static  # reflection mode: own prefix
+    
+    # Per-turn context goes in the tail only
+    augmented = augment_system_prompt(prompts[0], "Reflection about work.")
+    assert augmented.static == prompts[0].static
+    assert "<ehko_context>" in augmented.dynamic
+    
+    # Claude request: cache breakpoint after the prefix, tail uncached
+    blocks = system_blocks(augmented)
+    assert blocks[0]["text"] == augmented.static
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in blocks[1]
+    assert "".join(b["text"] for b in blocks) == str(augmented)
+    print(f"  static prefix: {len(terminal.pop())} bytes, stable across 4 turns")
+    print("✓ Prompt prefix stability OK")
+
+
+def test_stage_metrics():
+    """Chat stages are timed per request and summarised by /api/metrics."""
+    print("\n=== Testing stage metrics ===")
+    
+    setup_test_server(MockChatProvider(latency=0.02))
+    forge_server.METRICS.reset()
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    
+    for i in range(5):
+        response = client.post(f"/api/sessions/{session_id}/messages", json={"content": f"Turn {i}"})
+        assert response.status_code == 201
+    timing = dict(part.split(";dur=") for part in response.headers["Server-Timing"].split(", "))
+    for stage in ["preflight", "history_fetch", "context_build", "prompt_assembly",
+                  "provider_call", "db_persist", "send_message"]:
+        assert stage in timing, timing
+    assert float(timing["provider_call"]) >= 20
+    
+    client.post(f"/api/sessions/{session_id}/messages", json={"content": "Stream"},
+                headers={"Accept": "text/event-stream"}).get_data()
+    
+    spans = client.get("/api/metrics").get_json()["spans"]
+    assert spans["send_message"]["count"] == 6
+    assert spans["db_persist"]["count"] == 12
+    assert spans["provider_first_token"]["count"] == 1
+    for summary in spans.values():
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+    for stage in ["preflight", "context_build", "provider_call", "db_persist", "send_message"]:
+        print(f"  {stage:<16} p50 {spans[stage]['p50_ms']:>8.2f} ms   p99 {spans[stage]['p99_ms']:>8.2f} ms")
+    print("✓ Stage metrics OK")
+
+
+def test_preflight_snapshot():
+    """ChatPreflight spends mana once, bypasses it for tethers, and gates dormancy."""
+    print("\n=== Testing chat preflight ===")
+    
+    db_path = setup_test_server(MockChatProvider())
+    preflight = forge_server.CHAT_PREFLIGHT
+    
+    snapshot = preflight.run("reflection")
+    assert snapshot.mana_spent and snapshot.allowed
+    assert snapshot.mana_cost == 3.0
+    assert abs(snapshot.current_mana - 97.0) < 0.1
+    assert snapshot.advancement_stage == "nascent"
+    
+    # Dormant: not enough mana -> 429 from the route
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("UPDATE mana_state SET current_mana = 0.5, last_updated = ?",
+                 (forge_server.datetime.utcnow().isoformat() + "Z",))
+    conn.commit()
+    conn.close()
+    
+    client = forge_server.app.test_client()
+    session_id = create_session(client)
+    response = client.post(f"/api/sessions/{session_id}/messages", json={"content": "Hello?"})
+    assert response.status_code == 429
+    assert response.get_json()["dormant"] is True
+    
+    # Tether bypasses mana
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        INSERT INTO tethers (user_id, provider, api_key_encrypted, active,
+                             verification_status, created_at, updated_at)
+        VALUES (1, 'claude', 'sk-test', 1, 'valid', 'now', 'now')
+    """)
+    conn.commit()
+    conn.close()
+    
+    snapshot = preflight.run("terminal")
+    assert snapshot.using_tether and not snapshot.mana_spent
+    assert snapshot.tether["provider"] == "claude"
+    
+    response = client.post(f"/api/sessions/{session_id}/messages", json={"content": "Hello?"})
+    assert response.status_code == 201
+    
+    # Fixed per-message overhead
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        preflight.run("terminal")
+    per_call_ms = (time.perf_counter() - start) / runs * 1000
+    print(f"  preflight.run: {per_call_ms:.3f} ms/call")
+    print("✓ Chat preflight OK")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Forge Chat Pipeline Test Suite")
+    print("=" * 60)
+    
+    try:
+        test_send_message_json()
+        test_send_message_stream()
+        test_stream_without_provider()
+        test_no_write_lock_during_generation()
+        test_concurrent_chats()
+        test_send_message_job()
+        test_job_sweep()
+        test_conversation_history()
+        test_prompt_prefix_cache()
+        test_stage_metrics()
+        test_preflight_snapshot()
+        
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
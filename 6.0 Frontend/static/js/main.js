@@ -556,8 +556,12 @@ async function sendMessage() {
     setAvatarState('thinking');
     
     try {
-        const data = await api(`/sessions/${state.sessionId}/messages`, {
+        const response = await fetch(`/api/sessions/${state.sessionId}/messages`, {
             method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+            },
             body: JSON.stringify({
                 content: content,
                 role: 'user',
@@ -565,26 +569,63 @@ async function sendMessage() {
             }),
         });
         
-        // Handle dormant response
-        if (data.dormant) {
+        // Dormant / error responses come back as plain JSON
+        if (!(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+            const data = await response.json();
             hideTyping();
-            setAvatarState('dormant');
-            showDormantModal(data.current_mana, data.required);
+            
+            if (data.dormant) {
+                setAvatarState('dormant');
+                showDormantModal(data.current_mana, data.required);
+                return;
+            }
+            
+            setAvatarState('ready');
+            const ehkoMsg = (data.messages || []).find(m => m.role === 'ehko');
+            if (ehkoMsg) {
+                renderMessage(ehkoMsg);
+                state.messages.push(userMsg);
+                state.messages.push(ehkoMsg);
+            } else {
+                showNotice('Failed to send message', 'error');
+            }
             return;
         }
         
-        // Remove typing indicator
+        // Stream Ehko reply token by token
+        let streamed = null;
+        let text = '';
+        
+        await readEventStream(response, (event, data) => {
+            if (event === 'token') {
+                if (!streamed) {
+                    hideTyping();
+                    setAvatarState('ready');
+                    streamed = renderMessage({ role: 'ehko', content: '' });
+                }
+                text += data.delta;
+                // <ehko-message> has no slot; setContent re-renders its shadow root
+                streamed.setContent(escapeHtml(text));
+                scrollToBottom();
+            } else if (event === 'done') {
+                const ehkoMsg = data.messages.find(m => m.role === 'ehko');
+                if (streamed) {
+                    if (ehkoMsg) streamed.setAttribute('timestamp', ehkoMsg.timestamp);
+                    streamed.setContent(escapeHtml(ehkoMsg ? ehkoMsg.content : text));
+                } else if (ehkoMsg) {
+                    renderMessage(ehkoMsg);
+                }
+                state.messages.push(data.messages.find(m => m.role === 'user') || userMsg);
+                if (ehkoMsg) state.messages.push(ehkoMsg);
+            } else if (event === 'error') {
+                if (streamed) streamed.setContent(escapeHtml(text));
+                showNotice('Failed to send message', 'error');
+            }
+        });
+        
         hideTyping();
         setAvatarState('ready');
         
-        // Render Ehko response
-        const ehkoMsg = data.messages.find(m => m.role === 'ehko');
-        if (ehkoMsg) {
-            renderMessage(ehkoMsg);
-            state.messages.push(userMsg);
-            state.messages.push(ehkoMsg);
-        }
-        
         // Update mana display
         await fetchMana();
         
@@ -598,6 +639,33 @@ async function sendMessage() {
     }
 }
 
+async function readEventStream(response, onEvent) {
+    // Minimal SSE parser over a fetch() body (EventSource can't POST)
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 function renderMessage(msg) {
     const output = document.getElementById('terminal-output');
     
@@ -615,6 +683,7 @@ function renderMessage(msg) {
     
     output.appendChild(message);
     scrollToBottom();
+    return message;
 }
 
 function showTyping() {